@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK DO CAMINHO DE EXECUÇÃO
+Compara build_transaction + sign_transaction do web3.py com o encoder/assinador
+enxuto de src/core/raw_rpc.py, e o trabalho com endereços de um ciclo de scan
+(checksum + whitelist) com os Address internados (sem rede: só CPU)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from eth_account import Account
+from web3 import Web3
+
+from src.core.address import checksum, to_address
+from src.core.raw_rpc import LegacyTransactionSigner, encode_execute_arbitrage
+from src.core.rpc_pool import ORJSON_AVAILABLE, json_dumps
+from src.strategies.real_flashloan import FLASH_LOAN_CONTRACT_ABI
+
+PRIVATE_KEY = "0x" + "11" * 32
+CONTRACT = "0xabababababababababababababababababababab"
+USDC = "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913"
+WETH = "0x4200000000000000000000000000000000000006"
+ARGS = (USDC, 1_000 * 10**6, "0x" + "12" * 20, "0x" + "34" * 20, USDC, WETH, 12_345, 1_700_000_000)
+TX_PARAMS = {'nonce': 5, 'gas': 800000, 'gasPrice': 1_234_567, 'chainId': 8453}
+
+# Um ciclo de scan: candidatos recotados (2 tokens cada: anti-scam + path do router) e uma execução
+CANDIDATES_PER_CYCLE = 10
+CHECKSUMS_PER_EXECUTION = 5
+TRUSTED = ["0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", "0x4200000000000000000000000000000000000006"]
+
+
+def bench(name: str, func, iterations: int) -> float:
+    """Executa func N vezes e imprime µs por chamada"""
+    func()  # aquecimento
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call = (time.perf_counter() - start) / iterations * 1e6
+    print(f"  {name:<42} {per_call:>10.1f} µs")
+    return per_call
+
+
+def main():
+    account = Account.from_key(PRIVATE_KEY)
+    signer = LegacyTransactionSigner(account.key)
+    w3 = Web3()
+    contract = w3.eth.contract(address=Web3.to_checksum_address(CONTRACT), abi=FLASH_LOAN_CONTRACT_ABI)
+
+    def web3_path() -> bytes:
+        args = [Web3.to_checksum_address(a) if isinstance(a, str) else a for a in ARGS]
+        tx = contract.functions.executeArbitrage(*args).build_transaction({
+            'from': account.address,
+            **TX_PARAMS
+        })
+        return account.sign_transaction(tx).rawTransaction
+
+    def raw_path() -> bytes:
+        return signer.sign(
+            TX_PARAMS['nonce'], TX_PARAMS['gasPrice'], TX_PARAMS['gas'],
+            CONTRACT, 0, encode_execute_arbitrage(*ARGS), TX_PARAMS['chainId']
+        )
+
+    assert web3_path() == raw_path(), "transações assinadas diferentes!"
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=" * 70)
+    print(f"  CAMINHO DE EXECUÇÃO ({iterations} iterações, orjson={ORJSON_AVAILABLE})")
+    print("=" * 70)
+
+    web3_build = bench("web3: build_transaction",
+                       lambda: contract.functions.executeArbitrage(
+                           *[Web3.to_checksum_address(a) if isinstance(a, str) else a for a in ARGS]
+                       ).build_transaction({'from': account.address, **TX_PARAMS}),
+                       iterations)
+    raw_build = bench("raw: encode_execute_arbitrage", lambda: encode_execute_arbitrage(*ARGS), iterations)
+
+    web3_total = bench("web3: build + sign_transaction", web3_path, iterations)
+    raw_total = bench("raw: encode + LegacyTransactionSigner.sign", raw_path, iterations)
+
+    raw_tx = raw_path()
+    payload = {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_sendRawTransaction', 'params': ['0x' + raw_tx.hex()]}
+    import json
+    bench("json.dumps (payload de envio)", lambda: json.dumps(payload).encode(), iterations * 10)
+    bench("json_dumps (codec do pool)", lambda: json_dumps(payload), iterations * 10)
+
+    print("-" * 70)
+    print(f"  Calldata: {web3_build / raw_build:.0f}x mais rápido")
+    print(f"  Build + assinatura: {web3_total / raw_total:.1f}x mais rápido "
+          f"({web3_total - raw_total:.0f} µs economizados por transação)")
+    print("=" * 70)
+
+    bench_addresses(iterations)
+
+
+def bench_addresses(iterations: int):
+    """CPU de endereços por ciclo: Web3.to_checksum_address + whitelist em lista vs Address internado"""
+    tokens = [USDC, WETH] * CANDIDATES_PER_CYCLE
+    trusted = frozenset(to_address(a) for a in TRUSTED)
+
+    def before():
+        for token in tokens:
+            address = Web3.to_checksum_address(token)                  # is_token_safe
+            address.lower() in [a.lower() for a in TRUSTED]            # _is_whitelisted
+            Web3.to_checksum_address(token)                            # path do getAmountsOut
+        for _ in range(CHECKSUMS_PER_EXECUTION):
+            Web3.to_checksum_address(USDC)
+
+    def after():
+        for token in tokens:
+            to_address(token) in trusted
+            checksum(token)
+        for _ in range(CHECKSUMS_PER_EXECUTION):
+            checksum(USDC)
+
+    print("\n" + "=" * 70)
+    print(f"  ENDEREÇOS POR CICLO ({CANDIDATES_PER_CYCLE} candidatos + 1 execução)")
+    print("=" * 70)
+    old = bench("web3: to_checksum_address + lista", before, iterations)
+    new = bench("Address internado + frozenset", after, iterations)
+    print("-" * 70)
+    print(f"  {old / new:.0f}x mais rápido ({old - new:.0f} µs de CPU economizados por ciclo)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
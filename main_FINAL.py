@@ -7,6 +7,7 @@ TODAS AS MELHORIAS INTEGRADAS
 import sys
 import time
 import signal
+from typing import Dict, List, Optional
 from loguru import logger
 from colorama import init, Fore, Style
 
@@ -24,6 +25,8 @@ from src.config.config import (
 # Importar módulos core
 from src.core.blockchain import blockchain
 from src.core.dex import MultiDEXScanner
+from src.core.block_listener import BlockScanScheduler
+from src.core.rpc_metrics import endpoint_label, rpc_metrics
 
 # Importar estratégias - VERSÃO REAL
 try:
@@ -65,6 +68,7 @@ class FinalMEVBot:
         self.flash_loan_strategy = None
         self.ml_engine = None
         self.risk_manager = RiskManager()
+        self.block_scheduler = None
         
         self.stats = {
             'start_time': time.time(),
@@ -76,7 +80,8 @@ class FinalMEVBot:
             'total_profit_usd': 0.0,
             'total_gas_spent_usd': 0.0,
             'best_trade': None,
-            'worst_trade': None
+            'worst_trade': None,
+            'unhealthy_networks': []
         }
         
         # Configurar signal handlers
@@ -148,6 +153,9 @@ class FinalMEVBot:
                     self.dex_scanner
                 )
             
+            # Resultados confirmados (receipts) alimentam Risk Manager e IA
+            self.flash_loan_strategy.add_result_callback(self._on_trade_result)
+            
             # Inicializar IA
             logger.info("🧠 Inicializando Motor de IA...")
             if ADVANCED_ML_AVAILABLE:
@@ -218,13 +226,19 @@ class FinalMEVBot:
             logger.info(f"🎯 Lucro mínimo: ${BotConfig.MIN_PROFIT_USD} ({BotConfig.MIN_PROFIT_PERCENTAGE}%)")
             logger.info(f"🧠 Confiança mínima da IA: {BotConfig.ML_CONFIDENCE_THRESHOLD*100:.0f}%\n")
             
+            # Modo orientado a blocos: um scan por bloco novo em cada rede
+            if BotConfig.BLOCK_DRIVEN_SCAN:
+                self._run_block_driven()
+                return
+            
             while self.running:
                 try:
                     self.stats['cycles'] += 1
                     
-                    # Verificar saúde das conexões periodicamente
+                    # Saúde das conexões: score contínuo dos endpoints (sem RPC extra)
+                    self._check_health()
+                    
                     if self.stats['cycles'] % 100 == 0:
-                        self._check_health()
                         self.risk_manager.print_stats()
                     
                     # Imprimir stats periodicamente
@@ -253,74 +267,151 @@ class FinalMEVBot:
         finally:
             self.stop()
     
-    def _execute_cycle(self):
-        """Executa um ciclo de busca e execução"""
+    def _run_block_driven(self):
+        """Loop orientado a blocos: exatamente um scan por bloco novo em cada rede"""
+        logger.info("📡 Modo orientado a blocos (newHeads / polling rápido)")
+        
+        self.block_scheduler = BlockScanScheduler(self.blockchain)
+        self.block_scheduler.start()
+        
+        try:
+            while self.running:
+                try:
+                    event = self.block_scheduler.next_block(timeout=1.0)
+                    if event is None:
+                        continue
+                    
+                    self.stats['cycles'] += 1
+                    
+                    # Saúde e saldo a cada 100 blocos (somando todas as redes), como em
+                    # main.py/main_real.py: get_balances() faz um RPC por rede
+                    if self.stats['cycles'] % 100 == 0:
+                        self._check_health()
+                        self._check_emergency_stop()
+                        self.risk_manager.print_stats()
+                        if not self.running:
+                            break
+                    
+                    # Imprimir stats periodicamente
+                    if self.stats['cycles'] % 50 == 0:
+                        self._print_stats()
+                    
+                    # Escanear apenas a rede que recebeu o bloco
+                    self._execute_cycle(networks=[event.network])
+                    
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Erro no ciclo: {e}")
+                    time.sleep(1)
+        finally:
+            self.block_scheduler.stop()
+    
+    def _execute_cycle(self, networks: Optional[List[str]] = None):
+        """Executa um ciclo de busca e execução (opcionalmente só em `networks`)"""
         try:
             # Buscar oportunidade
-            result = self.flash_loan_strategy.find_and_execute()
+            result = self.flash_loan_strategy.find_and_execute(networks)
             
             if result:
                 self.stats['opportunities_found'] += 1
                 self.stats['trades_executed'] += 1
-                
-                opportunity = result['opportunity']
-                profit = result.get('profit', {})
-                tx_hash = result.get('tx_hash')
-                
-                # Verificar se foi bem-sucedido
-                success = profit.get('profitable', False) and tx_hash
-                
-                if success:
-                    self.stats['successful_trades'] += 1
-                else:
-                    self.stats['failed_trades'] += 1
-                
-                # Registrar na IA
-                actual_profit = profit.get('net_profit_usd', 0)
-                self.ml_engine.record_result(opportunity, success, actual_profit)
-                
-                if success and actual_profit > 0:
-                    self.stats['total_profit_usd'] += actual_profit
-                    
-                    # Atualizar melhor trade
-                    if not self.stats['best_trade'] or actual_profit > self.stats['best_trade']['profit']:
-                        self.stats['best_trade'] = {
-                            'profit': actual_profit,
-                            'tx_hash': tx_hash,
-                            'timestamp': time.time()
-                        }
-                    
-                    logger.success(f"💰 Lucro acumulado: ${self.stats['total_profit_usd']:.2f}")
+                logger.info(f"📤 Trade enviado ({result['tx_hash'][:10]}...), confirmação em segundo plano")
                 
         except Exception as e:
             logger.error(f"❌ Erro no ciclo de execução: {e}")
             import traceback
             traceback.print_exc()
     
+    def _on_trade_result(self, trade: Dict):
+        """Resultado confirmado de um trade (thread do ReceiptTracker)"""
+        try:
+            success = trade['success']
+            actual_profit = trade['profit_usd']
+            tx_hash = trade['tx_hash']
+            
+            if success:
+                self.stats['successful_trades'] += 1
+            else:
+                self.stats['failed_trades'] += 1
+            self.stats['total_gas_spent_usd'] += trade['gas_cost_usd']
+            
+            # Registrar no Risk Manager e na IA
+            self.risk_manager.record_trade_result(success, actual_profit, trade['gas_cost_usd'])
+            self.ml_engine.record_result(trade['opportunity'], success, actual_profit)
+            
+            if success and actual_profit > 0:
+                self.stats['total_profit_usd'] += actual_profit
+                
+                # Atualizar melhor trade
+                if not self.stats['best_trade'] or actual_profit > self.stats['best_trade']['profit']:
+                    self.stats['best_trade'] = {
+                        'profit': actual_profit,
+                        'tx_hash': tx_hash,
+                        'timestamp': trade['timestamp']
+                    }
+                
+                logger.success(f"💰 Lucro acumulado: ${self.stats['total_profit_usd']:.2f}")
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao registrar resultado: {e}")
+    
     def _check_health(self):
-        """Verifica saúde das conexões"""
+        """Verifica saúde das conexões (score por endpoint, atualizado a cada chamada)"""
         try:
             health = self.blockchain.check_health()
             
             unhealthy = [net for net, status in health.items() if not status]
             
-            if unhealthy:
+            # O pool já desvia de endpoints ruins; só avisamos quando TODOS estão degradados
+            if unhealthy and unhealthy != self.stats.get('unhealthy_networks'):
                 logger.warning(f"⚠️ Redes com problema: {unhealthy}")
-                
-                # Tentar reconectar
-                for network in unhealthy:
-                    logger.info(f"🔄 Reconectando {network}...")
-                    self.blockchain.reconnect(network)
+            self.stats['unhealthy_networks'] = unhealthy
             
         except Exception as e:
             logger.error(f"❌ Erro ao verificar saúde: {e}")
     
+    def _print_endpoint_stats(self):
+        """Imprime latência p50/p99 e taxa de erro de cada endpoint RPC"""
+        try:
+            for network, endpoints in self.blockchain.get_endpoint_stats().items():
+                logger.info(f"🌐 RPCs {network}:")
+                for ep in endpoints:
+                    status = "⏸️" if ep['cooling_down'] else "🟢"
+                    shed = sum(ep.get('scheduler', {}).get('shed', {}).values())
+                    logger.info(
+                        f"   {status} {endpoint_label(ep['url'])} p50={ep['p50_ms']:.0f}ms "
+                        f"p99={ep['p99_ms']:.0f}ms erros={ep['error_rate']*100:.1f}% "
+                        f"({ep['requests']} req, {shed} descartadas)"
+                    )
+        except Exception as e:
+            logger.error(f"❌ Erro ao imprimir stats de RPC: {e}")
+    
+    def _print_rpc_metrics(self, limit: int = 10):
+        """Imprime os métodos RPC que mais consomem tempo (rede/endpoint/método)"""
+        try:
+            rows = rpc_metrics.top(limit)
+            if not rows:
+                return
+            
+            logger.info(f"⏱️ Top {len(rows)} chamadas RPC por tempo total:")
+            for row in rows:
+                logger.info(
+                    f"   {row['network']:<10} {row['endpoint'][:28]:<28} {row['method'][:34]:<34} "
+                    f"{row['calls']:>6}x total={row['total_ms']/1000:.1f}s "
+                    f"p50={row['p50_ms']:.0f}ms p99={row['p99_ms']:.0f}ms "
+                    f"erros={row['error_rate']*100:.1f}%"
+                )
+        except Exception as e:
+            logger.error(f"❌ Erro ao imprimir métricas de RPC: {e}")
+    
     def _check_emergency_stop(self):
         """Verifica se deve parar por saldo baixo - CORRIGIDO"""
         try:
-            for network_name in self.blockchain.web3_instances.keys():
-                balance = self.blockchain.get_balance(network_name)
-                
+            # Um batch JSON-RPC por rede, todas as redes em paralelo
+            balances = self.blockchain.get_balances()
+            
+            for network_name, balance in balances.items():
                 # CORRIGIDO: Agora compara ETH com ETH!
                 if balance < BotConfig.EMERGENCY_STOP_BALANCE:
                     # Converter para USD para mostrar
@@ -366,6 +457,19 @@ class FinalMEVBot:
             if self.stats['best_trade']:
                 logger.info(f"🏆 Melhor trade: ${self.stats['best_trade']['profit']:.2f}")
             
+            # Endpoints RPC
+            self._print_endpoint_stats()
+            self._print_rpc_metrics()
+            
+            # Latência bloco → scan (modo orientado a blocos)
+            if self.block_scheduler:
+                for network, block_stats in self.block_scheduler.get_stats().items():
+                    logger.info(
+                        f"📡 {network} [{block_stats['source']}]: {block_stats['scans']} scans, "
+                        f"{block_stats['skipped_blocks']} blocos pulados, bloco→scan "
+                        f"p50={block_stats['p50_ms']:.1f}ms p99={block_stats['p99_ms']:.1f}ms"
+                    )
+            
             # Stats da IA
             ml_stats = self.ml_engine.get_performance_stats()
             logger.info(f"🧠 IA treinada: {'Sim' if ml_stats.get('is_trained') else 'Não'}")
@@ -418,6 +522,10 @@ class FinalMEVBot:
             except Exception as e:
                 logger.error(f"❌ Erro ao salvar modelos: {e}")
         
+        # Estado dos pools para reinício a quente (antes de fechar as conexões)
+        if self.dex_scanner:
+            self.dex_scanner.save_pool_snapshots()
+        
         # Fechar conexões
         if self.blockchain:
             self.blockchain.close_all()
@@ -7,6 +7,7 @@ FUNCIONA EM TODAS AS REDES (Base, Arbitrum, Ethereum Sepolia)
 import sys
 import time
 import signal
+from typing import Dict, List, Optional
 from loguru import logger
 from colorama import init, Fore, Style
 
@@ -17,6 +18,7 @@ init(autoreset=True)
 from src.config.config import BotConfig, validate_config, print_config_summary, convert_native_to_usd
 from src.core.blockchain import blockchain
 from src.core.dex import MultiDEXScanner
+from src.core.block_listener import BlockScanScheduler
 
 # Usar estratégia HÍBRIDA
 from src.strategies.real_flashloan_hybrid import HybridFlashLoanStrategy
@@ -41,6 +43,7 @@ class MEVBotHybrid:
         self.flash_loan_strategy = None
         self.ml_engine = None
         self.risk_manager = RiskManager()
+        self.block_scheduler = None
         self.stats = {
             'start_time': time.time(),
             'cycles': 0,
@@ -101,6 +104,9 @@ class MEVBotHybrid:
                 self.dex_scanner
             )
             
+            # Resultados confirmados (receipts) alimentam Risk Manager e IA
+            self.flash_loan_strategy.add_result_callback(self._on_trade_result)
+            
             # Inicializar IA
             logger.info("🧠 Inicializando Motor de IA...")
             self.ml_engine = MLEngine()
@@ -129,6 +135,11 @@ class MEVBotHybrid:
             logger.success("🎯 BOT HÍBRIDO INICIADO! Rodando 24/7...")
             logger.info(f"⏱️ Intervalo de checagem: {BotConfig.CHECK_INTERVAL_SECONDS}s")
             
+            # Modo orientado a blocos: um scan por bloco novo em cada rede
+            if BotConfig.BLOCK_DRIVEN_SCAN:
+                self._run_block_driven()
+                return
+            
             while self.running:
                 try:
                     self.stats['cycles'] += 1
@@ -155,27 +166,47 @@ class MEVBotHybrid:
         finally:
             self.stop()
     
-    def _execute_cycle(self):
-        """Executa um ciclo de busca e execução"""
+    def _run_block_driven(self):
+        """Loop orientado a blocos: exatamente um scan por bloco novo em cada rede"""
+        logger.info("📡 Modo orientado a blocos (newHeads / polling rápido)")
+        
+        self.block_scheduler = BlockScanScheduler(self.blockchain)
+        self.block_scheduler.start()
+        
+        try:
+            while self.running:
+                try:
+                    event = self.block_scheduler.next_block(timeout=1.0)
+                    if event is None:
+                        continue
+                    
+                    self.stats['cycles'] += 1
+                    
+                    # Verificar saúde das conexões
+                    if self.stats['cycles'] % 100 == 0:
+                        self._check_health()
+                        self.risk_manager.print_stats()
+                    
+                    # Escanear apenas a rede que recebeu o bloco
+                    self._execute_cycle(networks=[event.network])
+                    
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Erro no ciclo: {e}")
+                    time.sleep(1)
+        finally:
+            self.block_scheduler.stop()
+    
+    def _execute_cycle(self, networks: Optional[List[str]] = None):
+        """Executa um ciclo de busca e execução (opcionalmente só em `networks`)"""
         try:
             # Buscar oportunidade
-            result = self.flash_loan_strategy.find_and_execute()
+            result = self.flash_loan_strategy.find_and_execute(networks)
             
             if result:
                 self.stats['trades_executed'] += 1
-                
-                opportunity = result['opportunity']
-                profit = result['profit']
-                
-                # Registrar na IA
-                success = profit.get('profitable', False)
-                actual_profit = profit.get('net_profit_usd', 0)
-                
-                self.ml_engine.record_result(opportunity, success, actual_profit)
-                
-                if success:
-                    self.stats['total_profit'] += actual_profit
-                    logger.success(f"💰 Lucro acumulado: ${self.stats['total_profit']:.2f}")
+                logger.info(f"📤 Trade enviado ({result['tx_hash'][:10]}...), confirmação em segundo plano")
                 
                 # Exibir estatísticas periodicamente
                 if self.stats['trades_executed'] % 10 == 0:
@@ -187,6 +218,23 @@ class MEVBotHybrid:
         except Exception as e:
             logger.error(f"❌ Erro no ciclo de execução: {e}")
     
+    def _on_trade_result(self, trade: Dict):
+        """Resultado confirmado de um trade (thread do ReceiptTracker)"""
+        try:
+            success = trade['success']
+            actual_profit = trade['profit_usd']
+            
+            # Registrar no Risk Manager e na IA
+            self.risk_manager.record_trade_result(success, actual_profit, trade['gas_cost_usd'])
+            self.ml_engine.record_result(trade['opportunity'], success, actual_profit)
+            
+            if success:
+                self.stats['total_profit'] += actual_profit
+                logger.success(f"💰 Lucro acumulado: ${self.stats['total_profit']:.2f}")
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao registrar resultado: {e}")
+    
     def _check_health(self):
         """Verifica saúde das conexões"""
         try:
@@ -38,6 +38,7 @@ except ImportError:
 
 from loguru import logger
 from src.config.config import BotConfig
+from src.core.token_metadata import opportunity_usd
 
 class ReinforcementLearningAgent:
     """
@@ -365,7 +366,7 @@ class AdvancedMLEngine:
             
             features = [
                 opportunity.get('profit_percentage', 0),  # price_diff_pct
-                opportunity.get('amount_in', 0) / 1e6,  # amount_usd
+                opportunity_usd(opportunity),  # amount_usd (decimais do token)
                 50.0,  # gas_price_gwei (placeholder)
                 0.8,  # liquidity_score (placeholder)
                 now.hour,  # hour_of_day
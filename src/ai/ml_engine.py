@@ -16,6 +16,7 @@ import time
 from datetime import datetime
 
 from src.config.config import BotConfig
+from src.core.token_metadata import opportunity_usd
 
 class MLEngine:
     """Motor de Machine Learning para decisões de arbitragem"""
@@ -104,7 +105,7 @@ class MLEngine:
             
             features = [
                 opportunity.get('profit_percentage', 0),  # price_diff_pct
-                opportunity.get('amount_in', 0) / 1e6,  # amount_usd
+                opportunity_usd(opportunity),  # amount_usd (decimais do token)
                 50.0,  # gas_price_gwei (placeholder)
                 0.8,  # liquidity_score (placeholder)
                 now.hour,  # hour_of_day
@@ -4,11 +4,13 @@ Todas as configurações centralizadas e validadas
 """
 
 import os
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from loguru import logger
 
+from src.core.address import to_address
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -22,6 +24,32 @@ class NetworkConfig:
     explorer_url: str
     priority: float  # 0.0 a 1.0
     enabled: bool = True
+    rpc_urls: List[str] = field(default_factory=list)  # Endpoints extras (fallback/hedge)
+    ws_url: str = ""  # WebSocket para newHeads (vazio = polling)
+    
+    @property
+    def endpoints(self) -> List[str]:
+        """Todos os endpoints RPC da rede, sem duplicatas (rpc_url primeiro)"""
+        urls = []
+        for url in [self.rpc_url] + list(self.rpc_urls):
+            if url and url not in urls:
+                urls.append(url)
+        return urls
+
+
+def _env_list(name: str) -> List[str]:
+    """Lê lista separada por vírgula de uma variável de ambiente"""
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def _env_rates(name: str) -> Dict[str, float]:
+    """Lê pares trecho_da_url=req_por_segundo separados por vírgula"""
+    rates = {}
+    for item in _env_list(name):
+        pattern, _, rps = item.partition("=")
+        if pattern and rps:
+            rates[pattern.strip()] = float(rps)
+    return rates
 
 
 class BotConfig:
@@ -54,6 +82,9 @@ class BotConfig:
     MIN_PROFIT_USD = float(os.getenv("MIN_PROFIT_USD", "5"))
     MIN_PROFIT_PERCENTAGE = float(os.getenv("MIN_PROFIT_PERCENTAGE", "0.5"))
     MAX_SLIPPAGE = float(os.getenv("MAX_SLIPPAGE", "1.0"))
+    ARBITRAGE_GAS_UNITS = int(os.getenv("ARBITRAGE_GAS_UNITS", "500000"))  # Flash loan + 2 swaps
+    GOOD_ENOUGH_PROFIT_USD = float(os.getenv("GOOD_ENOUGH_PROFIT_USD", "0"))  # Lucro líquido que executa sem esperar as outras redes (0 = desliga)
+    OPPORTUNITY_HEAP_SIZE = int(os.getenv("OPPORTUNITY_HEAP_SIZE", "20"))  # Melhores oportunidades mantidas por ciclo
     
     # ============================================================================
     # GESTÃO DE RISCO (CORRIGIDO!)
@@ -79,6 +110,11 @@ class BotConfig:
     # OPERAÇÃO
     # ============================================================================
     CHECK_INTERVAL_SECONDS = int(os.getenv("CHECK_INTERVAL_SECONDS", "5"))
+    BLOCK_DRIVEN_SCAN = os.getenv("BLOCK_DRIVEN_SCAN", "false").lower() == "true"  # 1 scan por bloco novo
+    BLOCK_POLL_INTERVAL_MS = float(os.getenv("BLOCK_POLL_INTERVAL_MS", "200"))  # Fallback sem WebSocket
+    BLOCK_WS_RETRY_SECONDS = float(os.getenv("BLOCK_WS_RETRY_SECONDS", "60"))
+    RECEIPT_POLL_INTERVAL_MS = float(os.getenv("RECEIPT_POLL_INTERVAL_MS", "1000"))  # Sem listener de blocos
+    RECEIPT_TIMEOUT = float(os.getenv("RECEIPT_TIMEOUT", "300"))
     PRICE_UPDATE_INTERVAL = int(os.getenv("PRICE_UPDATE_INTERVAL", "10"))
     RUN_24_7 = os.getenv("RUN_24_7", "true").lower() == "true"
     
@@ -95,6 +131,21 @@ class BotConfig:
     ENABLE_TOKEN_VERIFICATION = os.getenv("ENABLE_TOKEN_VERIFICATION", "true").lower() == "true"
     MIN_TOKEN_SECURITY_SCORE = int(os.getenv("MIN_TOKEN_SECURITY_SCORE", "70"))
     API_TIMEOUT = int(os.getenv("API_TIMEOUT", "10"))
+    RPC_CONNECT_TIMEOUT = float(os.getenv("RPC_CONNECT_TIMEOUT", "15"))  # Prazo por rede na inicialização
+    RPC_REQUEST_TIMEOUT = float(os.getenv("RPC_REQUEST_TIMEOUT", "60"))
+    
+    # ============================================================================
+    # POOL DE RPCs (vários endpoints por rede)
+    # ============================================================================
+    RPC_HEDGE_ENABLED = os.getenv("RPC_HEDGE_ENABLED", "true").lower() == "true"
+    RPC_HEDGE_DELAY_MS = float(os.getenv("RPC_HEDGE_DELAY_MS", "250"))
+    RPC_LATENCY_WINDOW = int(os.getenv("RPC_LATENCY_WINDOW", "256"))
+    RPC_MAX_CONSECUTIVE_ERRORS = int(os.getenv("RPC_MAX_CONSECUTIVE_ERRORS", "3"))
+    RPC_ENDPOINT_COOLDOWN = float(os.getenv("RPC_ENDPOINT_COOLDOWN", "30"))
+    RPC_RATE_LIMIT_RPS = float(os.getenv("RPC_RATE_LIMIT_RPS", "25"))  # Por endpoint (0 = sem limite)
+    RPC_RATE_LIMIT_BURST_SECONDS = float(os.getenv("RPC_RATE_LIMIT_BURST_SECONDS", "2"))
+    RPC_RATE_LIMITS = _env_rates("RPC_RATE_LIMITS")  # Ex.: "alchemy.com=25,llamarpc.com=10"
+    RPC_QUOTE_MAX_WAIT_MS = float(os.getenv("RPC_QUOTE_MAX_WAIT_MS", "250"))  # Cotações esperam no máximo isso
     MAX_RECONNECTION_ATTEMPTS = int(os.getenv("MAX_RECONNECTION_ATTEMPTS", "3"))
     
     # ============================================================================
@@ -102,8 +153,34 @@ class BotConfig:
     # ============================================================================
     PRICE_CACHE_DURATION = int(os.getenv("PRICE_CACHE_DURATION", "5"))
     TOKEN_VERIFICATION_CACHE = int(os.getenv("TOKEN_VERIFICATION_CACHE", "3600"))
-    SCANNING_THREADS = int(os.getenv("SCANNING_THREADS", "3"))
-    
+    SCANNING_THREADS = int(os.getenv("SCANNING_THREADS", "3"))  # Redes escaneadas em paralelo
+    SCAN_NETWORK_TIMEOUT = float(os.getenv("SCAN_NETWORK_TIMEOUT", "10"))  # Prazo por rede; atrasada fica fora do ciclo
+    SCAN_PAIR_SHARDS = int(os.getenv("SCAN_PAIR_SHARDS", "1"))  # Pares cotados em paralelo por rede (cotação por RPC)
+    SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "0"))  # Processos de cotação sobre a memória compartilhada (0 = no processo)
+    SHARED_POOL_CAPACITY = int(os.getenv("SHARED_POOL_CAPACITY", "65536"))  # Pools por rede no segmento compartilhado
+    HEAD_CACHE_TTL = float(os.getenv("HEAD_CACHE_TTL", "1.0"))  # Validade de gas/saldo sem listener de blocos
+    V3_TICK_WORDS = int(os.getenv("V3_TICK_WORDS", "2"))  # Palavras do tick bitmap lidas de cada lado do tick atual
+    POOL_EVENT_UPDATES = os.getenv("POOL_EVENT_UPDATES", "true").lower() == "true"  # Estado dos pools via logs
+    POOL_EVENTS_MAX_GAP = int(os.getenv("POOL_EVENTS_MAX_GAP", "100"))  # Blocos; acima disso relê tudo
+    USE_MULTICALL = os.getenv("USE_MULTICALL", "true").lower() == "true"  # eth_calls agregados via Multicall3
+    MULTICALL_MAX_CALLS = int(os.getenv("MULTICALL_MAX_CALLS", "500"))  # Chamadas por aggregate3
+    VECTOR_SCAN = os.getenv("VECTOR_SCAN", "true").lower() == "true"  # Scan em arrays NumPy (pares × venues)
+    VECTOR_SCAN_TOP_K = int(os.getenv("VECTOR_SCAN_TOP_K", "10"))  # Candidatos recotados com matemática exata
+    CYCLE_SCAN = os.getenv("CYCLE_SCAN", "true").lower() == "true"  # Ciclos de 3+ pools no grafo de log-preços
+    CYCLE_MAX_HOPS = int(os.getenv("CYCLE_MAX_HOPS", "4"))  # Pools por ciclo (3..N)
+    CYCLE_TOP_K = int(os.getenv("CYCLE_TOP_K", "10"))  # Ciclos dimensionados por bloco
+    EXECUTION_MAX_HOPS = int(os.getenv("EXECUTION_MAX_HOPS", "2"))  # Swaps por rota que o contrato executa
+    TOKEN_METADATA_DIR = os.getenv("TOKEN_METADATA_DIR", "data/tokens")  # Decimais/símbolos por rede
+    POOL_REGISTRY = os.getenv("POOL_REGISTRY", "true").lower() == "true"  # Índice de pools em disco
+    POOL_REGISTRY_DIR = os.getenv("POOL_REGISTRY_DIR", "data/pools")
+    POOL_REGISTRY_CHUNK_BLOCKS = int(os.getenv("POOL_REGISTRY_CHUNK_BLOCKS", "2000"))  # Blocos por eth_getLogs
+    POOL_REGISTRY_LOOKBACK_BLOCKS = int(os.getenv("POOL_REGISTRY_LOOKBACK_BLOCKS", "1000000"))  # Factory nova
+    POOL_REGISTRY_REQUESTS_PER_SCAN = int(os.getenv("POOL_REGISTRY_REQUESTS_PER_SCAN", "20"))
+    POOL_SNAPSHOT = os.getenv("POOL_SNAPSHOT", "true").lower() == "true"  # Estado dos pools em disco para reinício a quente
+    POOL_SNAPSHOT_DIR = os.getenv("POOL_SNAPSHOT_DIR", "data/pools")
+    POOL_SNAPSHOT_INTERVAL = float(os.getenv("POOL_SNAPSHOT_INTERVAL", "300"))  # Segundos entre gravações periódicas
+    POOL_SNAPSHOT_MAX_GAP = int(os.getenv("POOL_SNAPSHOT_MAX_GAP", "5000"))  # Blocos de logs reaplicados após reinício
+
     # ============================================================================
     # PATHS
     # ============================================================================
@@ -151,6 +228,8 @@ if BotConfig.ENABLE_BASE:
         name="Base Sepolia",
         chain_id=84532,
         rpc_url=os.getenv("BASE_RPC_URL", f"https://base-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
+        rpc_urls=_env_list("BASE_RPC_URLS"),
+        ws_url=os.getenv("BASE_WS_URL", f"wss://base-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
         native_token="ETH",
         explorer_url="https://sepolia.basescan.org",
         priority=BotConfig.BASE_PRIORITY,
@@ -162,6 +241,8 @@ if BotConfig.ENABLE_ARBITRUM:
         name="Arbitrum Sepolia",
         chain_id=421614,
         rpc_url=os.getenv("ARBITRUM_RPC_URL", f"https://arb-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
+        rpc_urls=_env_list("ARBITRUM_RPC_URLS"),
+        ws_url=os.getenv("ARBITRUM_WS_URL", f"wss://arb-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
         native_token="ETH",
         explorer_url="https://sepolia.arbiscan.io",
         priority=BotConfig.ARBITRUM_PRIORITY,
@@ -174,6 +255,8 @@ if BotConfig.ENABLE_BSC:
         name="Ethereum Sepolia",
         chain_id=11155111,
         rpc_url=os.getenv("SEPOLIA_RPC_URL", f"https://eth-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
+        rpc_urls=_env_list("SEPOLIA_RPC_URLS"),
+        ws_url=os.getenv("SEPOLIA_WS_URL", f"wss://eth-sepolia.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
         native_token="ETH",
         explorer_url="https://sepolia.etherscan.io",
         priority=BotConfig.BSC_PRIORITY,
@@ -188,6 +271,8 @@ if BotConfig.ENABLE_BASE:
         name="Base",
         chain_id=8453,
         rpc_url=os.getenv("BASE_RPC_URL", f"https://base-mainnet.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
+        rpc_urls=_env_list("BASE_RPC_URLS"),
+        ws_url=os.getenv("BASE_WS_URL", f"wss://base-mainnet.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
         native_token="ETH",
         explorer_url="https://basescan.org",
         priority=BotConfig.BASE_PRIORITY,
@@ -199,6 +284,8 @@ if BotConfig.ENABLE_ARBITRUM:
         name="Arbitrum One",
         chain_id=42161,
         rpc_url=os.getenv("ARBITRUM_RPC_URL", f"https://arb-mainnet.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
+        rpc_urls=_env_list("ARBITRUM_RPC_URLS"),
+        ws_url=os.getenv("ARBITRUM_WS_URL", f"wss://arb-mainnet.g.alchemy.com/v2/{BotConfig.ALCHEMY_API_KEY}"),
         native_token="ETH",
         explorer_url="https://arbiscan.io",
         priority=BotConfig.ARBITRUM_PRIORITY,
@@ -210,6 +297,8 @@ if BotConfig.ENABLE_BSC:
         name="BSC",
         chain_id=56,
         rpc_url=os.getenv("BSC_RPC_URL", "https://bsc-dataseed1.bnbchain.org"),
+        rpc_urls=_env_list("BSC_RPC_URLS"),
+        ws_url=os.getenv("BSC_WS_URL", ""),
         native_token="BNB",
         explorer_url="https://bscscan.com",
         priority=BotConfig.BSC_PRIORITY,
@@ -246,6 +335,35 @@ UNISWAP_V3_ROUTER = {
     "bsc_testnet": "0x0000000000000000000000000000000000000000",
 }
 
+# Multicall3 (mesmo endereço em todas as redes suportadas)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Uniswap V3 Factory (descoberta de pools para cotação local)
+UNISWAP_V3_FACTORY = {
+    # Mainnet
+    "base": "0x33128a8fC17869897dcE68Ed026d694621f6FDfD",
+    "arbitrum": "0x1F98431c8aD98523631AE4a59f267346ea31F984",
+    "bsc": "0x0000000000000000000000000000000000000000",
+    
+    # Testnet
+    "base_sepolia": "0x4752ba5DBc23f44D87826276BF6Fd6b1C372aD24",
+    "arbitrum_sepolia": "0x248AB79Bbb9bC29bB72f7Cd42F17e054Fc40188e",
+    "bsc_testnet": "0x0000000000000000000000000000000000000000",
+}
+
+# Uniswap V3 QuoterV2 (fallback da cotação local via eth_call)
+UNISWAP_V3_QUOTER_V2 = {
+    # Mainnet
+    "base": "0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a",
+    "arbitrum": "0x61fFE014bA17989E743c5F6cB21bF9697530B21e",
+    "bsc": "0x0000000000000000000000000000000000000000",
+    
+    # Testnet
+    "base_sepolia": "0xC5290058841028F1614F3A6F0F5816cAd0df5E27",
+    "arbitrum_sepolia": "0x2779a0CC1c3e0E44D2542EC3e79e3864Ae93Ef0B",
+    "bsc_testnet": "0x0000000000000000000000000000000000000000",
+}
+
 # PancakeSwap V3 Router
 PANCAKESWAP_V3_ROUTER = {
     # Mainnet
@@ -259,6 +377,19 @@ PANCAKESWAP_V3_ROUTER = {
     "bsc_testnet": "0x9a489505a00cE272eAa5e07Dba6491314CaE3796",
 }
 
+# PancakeSwap V2 Factory (pares V2: cotação local a partir de getReserves)
+PANCAKESWAP_V2_FACTORY = {
+    # Mainnet
+    "base": "0x02a84c1b3BBD7401a5f7fa98a384EBC70bB5749E",
+    "arbitrum": "0x02a84c1b3BBD7401a5f7fa98a384EBC70bB5749E",
+    "bsc": "0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73",
+    
+    # Testnet
+    "base_sepolia": "0x0000000000000000000000000000000000000000",
+    "arbitrum_sepolia": "0x0000000000000000000000000000000000000000",
+    "bsc_testnet": "0x6725F303b657a9451d8BA641348b6761A6CC7a17",
+}
+
 # Aerodrome Router (Base only)
 AERODROME_ROUTER = {
     "base": "0xcF77a3Ba9A5CA399B7c97c74d54e5b1Beb874E43",
@@ -392,4 +523,8 @@ def print_config_summary():
 # MAJOR TOKENS - Lista de tokens principais para arbitragem
 # ============================================================================
 
-MAJOR_TOKENS = TOKENS  # Alias para compatibilidade
+# Endereços canônicos (Address): chaves de dict prontas e checksum memoizado
+MAJOR_TOKENS = {
+    network: {symbol: to_address(address) for symbol, address in tokens.items()}
+    for network, tokens in TOKENS.items()
+}
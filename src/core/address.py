@@ -0,0 +1,73 @@
+"""
+🏷️ ENDEREÇOS CANÔNICOS
+Cada endereço vira uma única instância de Address (hex minúsculo, hash pronto
+para chave de dict) com os 20 bytes e o checksum EIP-55 calculados uma vez;
+qualquer grafia já vista (checksum, maiúsculas) resolve por lookup, sem keccak
+"""
+
+import threading
+from functools import cached_property
+from typing import Dict, Union
+
+from eth_utils import to_checksum_address
+
+
+class Address(str):
+    """
+    Endereço de 20 bytes em hex minúsculo ('0x' + 40)
+
+    É um str: compara e indexa dicts igual aos endereços minúsculos usados no
+    resto do código. Não instanciar direto: to_address() devolve a instância
+    internada.
+    """
+
+    @cached_property
+    def checksum(self) -> str:
+        """Grafia EIP-55 (a que o web3.py exige)"""
+        return to_checksum_address(str(self))
+
+    @cached_property
+    def raw(self) -> bytes:
+        """20 bytes (codificação ABI, chaves binárias)"""
+        return bytes.fromhex(self[2:])
+
+
+# Qualquer grafia já vista (str ou 20 bytes) -> instância canônica
+_interned: Dict[Union[str, bytes], Address] = {}
+_lock = threading.Lock()
+
+
+def to_address(value: Union[str, bytes]) -> Address:
+    """Instância canônica de um endereço (hex com ou sem checksum, ou 20 bytes)"""
+    address = _interned.get(value)
+    if address is not None:
+        return address
+
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) != 20:
+            raise ValueError(f"Endereço inválido: {value!r}")
+        text = '0x' + bytes(value).hex()
+    else:
+        text = value.lower()
+        if not text.startswith('0x'):
+            text = '0x' + text
+        if len(text) != 42:
+            raise ValueError(f"Endereço inválido: {value}")
+        int(text, 16)   # ValueError se não for hex
+
+    with _lock:
+        address = _interned.get(text)
+        if address is None:
+            address = _interned[text] = Address(text)
+        _interned[bytes(value) if isinstance(value, bytearray) else value] = address
+    return address
+
+
+def checksum(value: Union[str, bytes]) -> str:
+    """Grafia EIP-55 memoizada (substitui Web3.to_checksum_address no caminho quente)"""
+    return to_address(value).checksum
+
+
+def interned_count() -> int:
+    """Endereços distintos internados"""
+    return len(set(_interned.values()))
@@ -0,0 +1,127 @@
+"""
+🗃️ CACHE DE LEITURAS POR BLOCO
+Constantes da rede (chain ID) ficam em cache para sempre; valores que dependem
+da cabeça da cadeia (gas price, base fee, saldos, nonces) valem só para o
+bloco em que foram lidos
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.config.config import BotConfig
+
+_MISSING = object()
+
+
+class BlockReadCache:
+    """
+    Cache chaveado por (rede, bloco)
+
+    - on_new_block() invalida automaticamente os valores de cabeça da rede
+    - sem listener de blocos, valores de cabeça expiram após HEAD_CACHE_TTL
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else BotConfig.HEAD_CACHE_TTL
+        self._immutable: Dict[Tuple[str, Hashable], Any] = {}
+        self._heads: Dict[str, int] = {}
+        # rede -> (bloco, instante da leitura, {chave: valor})
+        self._head_values: Dict[str, Tuple[Optional[int], float, Dict[Hashable, Any]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Constantes
+    # ------------------------------------------------------------------
+
+    def get_immutable(self, network: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retorna constante da rede, carregando uma única vez"""
+        cache_key = (network, key)
+        value = self._immutable.get(cache_key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = loader()
+        if value is not None:
+            self._immutable[cache_key] = value
+        return value
+
+    def set_immutable(self, network: str, key: Hashable, value: Any):
+        self._immutable[(network, key)] = value
+
+    # ------------------------------------------------------------------
+    # Valores da cabeça da cadeia
+    # ------------------------------------------------------------------
+
+    def head_block(self, network: str) -> Optional[int]:
+        """Último bloco conhecido da rede (None sem listener)"""
+        return self._heads.get(network)
+
+    def on_new_block(self, network: str, block_number: int):
+        """Novo bloco: descarta todos os valores de cabeça da rede"""
+        with self._lock:
+            if block_number <= self._heads.get(network, -1):
+                return
+            self._heads[network] = block_number
+            self._head_values.pop(network, None)
+
+    def _bucket(self, network: str) -> Dict[Hashable, Any]:
+        """Valores válidos para a cabeça atual (chamar com o lock)"""
+        head = self._heads.get(network)
+        entry = self._head_values.get(network)
+
+        if entry is not None:
+            block, created, values = entry
+            if head is not None and block == head:
+                return values
+            if head is None and time.monotonic() - created < self.ttl:
+                return values
+
+        values = {}
+        self._head_values[network] = (head, time.monotonic(), values)
+        return values
+
+    def get_head(self, network: str, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._bucket(network).get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set_head(self, network: str, key: Hashable, value: Any):
+        with self._lock:
+            self._bucket(network)[key] = value
+
+    def get_or_load_head(self, network: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retorna valor da cabeça atual, carregando se necessário"""
+        value = self.get_head(network, key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        if value is not None:
+            self.set_head(network, key, value)
+        return value
+
+    def invalidate(self, network: str, key: Optional[Hashable] = None):
+        """Remove um valor de cabeça (ou todos da rede)"""
+        with self._lock:
+            if key is None:
+                self._head_values.pop(network, None)
+            elif network in self._head_values:
+                self._head_values[network][2].pop(key, None)
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'heads': dict(self._heads)
+        }
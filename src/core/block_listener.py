@@ -0,0 +1,233 @@
+"""
+📡 MÓDULO DE NOVOS BLOCOS
+Assina newHeads via WebSocket (fallback: polling rápido de eth_blockNumber)
+e agenda exatamente UM scan por bloco novo em cada rede
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.config.config import BotConfig
+
+try:
+    from websockets.sync.client import connect as ws_connect
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+
+@dataclass
+class BlockEvent:
+    """Bloco novo pronto para ser escaneado"""
+    network: str
+    block_number: int
+    arrival_time: float      # time.perf_counter() na chegada do bloco
+    latency: float = 0.0     # chegada → início do scan (segundos)
+    skipped: int = 0         # blocos intermediários descartados (scan anterior ainda rodando)
+
+
+class BlockListener:
+    """Observa novos blocos de UMA rede em uma thread dedicada"""
+
+    def __init__(
+        self,
+        network: str,
+        on_block: Callable[[str, int], None],
+        poll_block_number: Callable[[], int],
+        ws_url: str = "",
+        poll_interval: Optional[float] = None
+    ):
+        self.network = network
+        self.on_block = on_block
+        self.poll_block_number = poll_block_number
+        self.ws_url = ws_url if WEBSOCKETS_AVAILABLE else ""
+        self.poll_interval = poll_interval if poll_interval is not None else BotConfig.BLOCK_POLL_INTERVAL_MS / 1000
+        self.source = "ws" if self.ws_url else "poll"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"blocks-{self.network}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.ws_url:
+                try:
+                    self.source = "ws"
+                    self._run_websocket()
+                except Exception as e:
+                    logger.warning(f"⚠️ WebSocket {self.network} caiu ({e}), usando polling")
+
+            # Fallback: polling até a próxima tentativa de WebSocket
+            self.source = "poll"
+            deadline = time.time() + BotConfig.BLOCK_WS_RETRY_SECONDS if self.ws_url else float('inf')
+            self._run_polling(deadline)
+
+    def _run_websocket(self):
+        """Assina newHeads e repassa cada cabeçalho novo"""
+        with ws_connect(self.ws_url, open_timeout=BotConfig.RPC_CONNECT_TIMEOUT) as ws:
+            ws.send(json.dumps({
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'eth_subscribe',
+                'params': ['newHeads']
+            }))
+            logger.info(f"📡 {self.network}: assinatura newHeads ativa")
+
+            while not self._stop.is_set():
+                try:
+                    message = json.loads(ws.recv(timeout=1.0))
+                except TimeoutError:
+                    continue
+
+                if message.get('method') != 'eth_subscription':
+                    if 'error' in message:
+                        raise RuntimeError(message['error'])
+                    continue
+
+                head = message['params']['result']
+                self.on_block(self.network, int(head['number'], 16))
+
+    def _run_polling(self, deadline: float):
+        """Consulta eth_blockNumber a cada poll_interval"""
+        while not self._stop.is_set() and time.time() < deadline:
+            try:
+                self.on_block(self.network, self.poll_block_number())
+            except Exception as e:
+                logger.debug(f"Polling de blocos falhou em {self.network}: {e}")
+            self._stop.wait(self.poll_interval)
+
+
+class BlockLatencyStats:
+    """Latência chegada-do-bloco → início-do-scan de uma rede"""
+
+    def __init__(self, window: int = 512):
+        self.samples = deque(maxlen=window)
+        self.scans = 0
+        self.skipped = 0
+        self.last_block = 0
+
+    def record(self, event: BlockEvent):
+        self.samples.append(event.latency)
+        self.scans += 1
+        self.skipped += event.skipped
+        self.last_block = event.block_number
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+        p50 = ordered[len(ordered) // 2] if ordered else 0.0
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+        return {
+            'scans': self.scans,
+            'skipped_blocks': self.skipped,
+            'last_block': self.last_block,
+            'p50_ms': p50 * 1000,
+            'p99_ms': p99 * 1000,
+        }
+
+
+class BlockScanScheduler:
+    """
+    Junta os BlockListeners de todas as redes em uma fila de scans
+
+    - cada bloco novo dispara no máximo UM scan na sua rede
+    - se chegarem vários blocos enquanto um scan roda, só o mais recente é
+      escaneado (os intermediários são contados em `skipped_blocks`)
+    """
+
+    def __init__(self, blockchain_connector, networks: Optional[List[str]] = None):
+        self.blockchain = blockchain_connector
+        self.networks = networks or list(blockchain_connector.web3_instances.keys())
+        self.listeners: Dict[str, BlockListener] = {}
+        self.stats: Dict[str, BlockLatencyStats] = {n: BlockLatencyStats() for n in self.networks}
+        self._last_seen: Dict[str, int] = {}
+        self._pending: Dict[str, BlockEvent] = {}
+        self._block_callbacks: List[Callable[[str, int], None]] = []
+        self._cond = threading.Condition()
+
+        # Cada bloco novo invalida o cache de leituras do connector
+        self.add_block_callback(blockchain_connector.on_new_block)
+
+    def add_block_callback(self, callback: Callable[[str, int], None]):
+        """Registra callback chamado (na thread do listener) a cada bloco novo"""
+        self._block_callbacks.append(callback)
+
+    def start(self):
+        for network in self.networks:
+            w3 = self.blockchain.get_web3(network)
+            if not w3:
+                continue
+
+            config = self.blockchain.networks[network]
+            listener = BlockListener(
+                network,
+                self._on_block,
+                lambda w3=w3: w3.eth.block_number,
+                ws_url=getattr(config, 'ws_url', "")
+            )
+            listener.start()
+            self.listeners[network] = listener
+            logger.info(f"📡 Escutando blocos de {network} ({listener.source})")
+
+    def stop(self):
+        for listener in self.listeners.values():
+            listener.stop()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _on_block(self, network: str, block_number: int):
+        arrival = time.perf_counter()
+        with self._cond:
+            if block_number <= self._last_seen.get(network, -1):
+                return
+            self._last_seen[network] = block_number
+
+            previous = self._pending.get(network)
+            skipped = previous.skipped + 1 if previous else 0
+            self._pending[network] = BlockEvent(network, block_number, arrival, skipped=skipped)
+            self._cond.notify()
+
+        for callback in self._block_callbacks:
+            try:
+                callback(network, block_number)
+            except Exception as e:
+                logger.debug(f"Callback de bloco falhou: {e}")
+
+    def next_block(self, timeout: float = 1.0) -> Optional[BlockEvent]:
+        """Retorna o próximo bloco a escanear (o que chegou há mais tempo)"""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            if not self._pending:
+                return None
+
+            network = min(self._pending, key=lambda n: self._pending[n].arrival_time)
+            event = self._pending.pop(network)
+
+        event.latency = time.perf_counter() - event.arrival_time
+        self.stats[network].record(event)
+        return event
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Métricas por rede: scans, blocos pulados e latência bloco→scan"""
+        result = {}
+        for network, stats in self.stats.items():
+            data = stats.to_dict()
+            listener = self.listeners.get(network)
+            data['source'] = listener.source if listener else 'off'
+            result[network] = data
+        return result
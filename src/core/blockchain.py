@@ -4,11 +4,13 @@ Gerencia conexões Web3 com Base, Arbitrum e BSC
 """
 
 import asyncio
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from web3 import Web3, AsyncWeb3
 # Middleware POA não é mais necessário na versão mais recente do web3.py
 from eth_account import Account
 from loguru import logger
+import threading
 import time
 
 from src.config.config import (
@@ -16,6 +18,40 @@ from src.config.config import (
     NETWORKS_TESTNET,
     BotConfig
 )
+from src.core.block_cache import BlockReadCache
+from src.core.nonce_manager import NonceManager
+from src.core.raw_rpc import LegacyTransactionSigner, RawRPCClient
+from src.core.receipt_tracker import ReceiptResult, ReceiptTracker
+from src.core.multicall import MulticallBatch
+from src.core.rpc_batch import RPCBatch
+from src.core.rpc_metrics import count_rpc_errors, rpc_metrics
+from src.core.rpc_pool import PooledHTTPProvider, RPCEndpointPool
+from src.core.rpc_scheduler import EndpointScheduler, RPCThrottledError, priority_for
+
+def async_rpc_middleware(network: str, url: str, scheduler: Optional[EndpointScheduler] = None):
+    """Middleware AsyncWeb3: token bucket do endpoint + registro em rpc_metrics"""
+    
+    async def middleware_factory(make_request, w3):
+        async def middleware(method, params):
+            if scheduler is not None and scheduler.enabled:
+                priority = priority_for([method])
+                granted = await asyncio.get_running_loop().run_in_executor(None, scheduler.acquire, priority)
+                if not granted:
+                    raise RPCThrottledError(f"{network}: orçamento de RPC esgotado ({priority.name}, {method})")
+            
+            start = time.perf_counter()
+            try:
+                response = await make_request(method, params)
+            except Exception:
+                rpc_metrics.record(network, url, method, time.perf_counter() - start, ok=False)
+                raise
+            rpc_metrics.record(network, url, method, time.perf_counter() - start,
+                               rpc_errors=count_rpc_errors(response))
+            return response
+        return middleware
+    
+    return middleware_factory
+
 
 class BlockchainConnector:
     """Gerenciador de conexões blockchain"""
@@ -23,11 +59,26 @@ class BlockchainConnector:
     def __init__(self):
         self.networks = NETWORKS_TESTNET if BotConfig.USE_TESTNET else NETWORKS_MAINNET
         self.web3_instances: Dict[str, Web3] = {}
+        self.async_web3_instances: Dict[str, AsyncWeb3] = {}
+        self.rpc_pools: Dict[str, RPCEndpointPool] = {}
         self.account: Optional[Account] = None
+        self.signer: Optional[LegacyTransactionSigner] = None
+        self.raw_clients: Dict[str, RawRPCClient] = {}
+        self.cache = BlockReadCache()
+        self.nonces = NonceManager(self._fetch_pending_nonce)
+        self.receipts = ReceiptTracker(self)
         self.connected = False
         
     def initialize(self) -> bool:
-        """Inicializa todas as conexões"""
+        """Inicializa todas as conexões (wrapper síncrono de initialize_async)"""
+        try:
+            return self._run_async(self.initialize_async())
+        except Exception as e:
+            logger.error(f"❌ Erro ao inicializar: {e}")
+            return False
+    
+    async def initialize_async(self) -> bool:
+        """Inicializa todas as conexões em paralelo"""
         try:
             logger.info("🔗 Inicializando conexões blockchain...")
             
@@ -35,11 +86,8 @@ class BlockchainConnector:
             if not self._load_account():
                 return False
             
-            # Conectar em todas as redes
-            for network_name, network_config in self.networks.items():
-                if not self._connect_network(network_name, network_config):
-                    logger.warning(f"⚠️ Falha ao conectar em {network_name}")
-                    continue
+            # Conectar em todas as redes ao mesmo tempo (cada uma com seu prazo)
+            await self._connect_all_networks()
                     
             if not self.web3_instances:
                 logger.error("❌ Nenhuma rede conectada!")
@@ -53,6 +101,32 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao inicializar: {e}")
             return False
     
+    async def _connect_all_networks(self) -> Dict[str, bool]:
+        """Conecta em todas as redes concorrentemente, com prazo por rede"""
+        names = list(self.networks.keys())
+        tasks = [
+            self._connect_network_with_deadline(name, self.networks[name])
+            for name in names
+        ]
+        results = await asyncio.gather(*tasks)
+        
+        for name, ok in zip(names, results):
+            if not ok:
+                logger.warning(f"⚠️ Falha ao conectar em {name}")
+        
+        return dict(zip(names, results))
+    
+    async def _connect_network_with_deadline(self, name: str, config) -> bool:
+        """Conecta em uma rede respeitando RPC_CONNECT_TIMEOUT"""
+        try:
+            return await asyncio.wait_for(
+                self._connect_network_async(name, config),
+                timeout=BotConfig.RPC_CONNECT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ {config.name} não respondeu em {BotConfig.RPC_CONNECT_TIMEOUT}s")
+            return False
+    
     def _load_account(self) -> bool:
         """Carrega conta da private key"""
         try:
@@ -61,6 +135,7 @@ class BlockchainConnector:
                 return False
                 
             self.account = Account.from_key(BotConfig.PRIVATE_KEY)
+            self.signer = LegacyTransactionSigner(self.account.key)
             logger.info(f"✅ Conta carregada: {self.account.address}")
             
             # Validar endereço
@@ -74,43 +149,51 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao carregar conta: {e}")
             return False
     
-    def _connect_network(self, name: str, config) -> bool:
-        """Conecta em uma rede específica"""
+    async def _connect_network_async(self, name: str, config) -> bool:
+        """Conecta em uma rede específica (AsyncWeb3)"""
         try:
             logger.info(f"🔌 Conectando em {config.name}...")
             
-            # Criar instância Web3
-            w3 = Web3(Web3.HTTPProvider(
-                config.rpc_url,
-                request_kwargs={'timeout': 60}
-            ))
-            
-            # Middleware POA não é mais necessário na versão recente do web3.py
-            # BSC funciona sem middleware adicional
+            # Pool com todos os endpoints da rede (mantém estatísticas entre reconexões)
+            pool = self.rpc_pools.get(name) or RPCEndpointPool(name, config.endpoints)
             
-            # Testar conexão
-            if not w3.is_connected():
+            # Testar todos os endpoints em paralelo: o primeiro a responder vira o primário async
+            aw3 = await self._first_responsive_endpoint(pool)
+            if aw3 is None:
                 logger.error(f"❌ Não foi possível conectar em {config.name}")
                 return False
             
-            # Verificar chain ID
-            chain_id = w3.eth.chain_id
+            # Chain ID, último bloco, saldo e nonce pendente em paralelo
+            reads = [aw3.eth.chain_id, aw3.eth.block_number]
+            if self.account:
+                reads.append(aw3.eth.get_balance(self.account.address))
+                reads.append(aw3.eth.get_transaction_count(self.account.address, 'pending'))
+            values = await asyncio.gather(*reads)
+            chain_id, block_number = values[0], values[1]
+            
+            # Verificar chain ID (constante: fica em cache até o fim da execução)
             if chain_id != config.chain_id:
                 logger.warning(f"⚠️ Chain ID diferente: esperado {config.chain_id}, obtido {chain_id}")
+            self.cache.set_immutable(name, 'chain_id', chain_id)
             
-            # Obter block number
-            block_number = w3.eth.block_number
-            logger.info(f"  📦 Último bloco: {block_number:,}")
+            logger.info(f"  📦 {config.name} - último bloco: {block_number:,}")
             
             # Verificar saldo
             if self.account:
-                balance_wei = w3.eth.get_balance(self.account.address)
-                balance = w3.from_wei(balance_wei, 'ether')
+                balance = AsyncWeb3.from_wei(values[2], 'ether')
                 logger.info(f"  💰 Saldo: {balance:.6f} {config.native_token}")
                 
                 if balance == 0:
                     logger.warning(f"⚠️ Saldo zero em {config.name}!")
+                
+                self.nonces.sync(name, self.account.address, values[3])
             
+            # Instância síncrona roteada pelo pool (endpoint mais rápido + hedge)
+            w3 = Web3(PooledHTTPProvider(pool))
+            
+            self.rpc_pools[name] = pool
+            self.raw_clients[name] = RawRPCClient(pool)
+            self.async_web3_instances[name] = aw3
             self.web3_instances[name] = w3
             logger.success(f"✅ {config.name} conectado!")
             return True
@@ -119,19 +202,83 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao conectar em {name}: {e}")
             return False
     
+    async def _first_responsive_endpoint(self, pool: RPCEndpointPool) -> Optional[AsyncWeb3]:
+        """Retorna AsyncWeb3 do primeiro endpoint do pool que responder"""
+        
+        async def probe(url: str) -> Optional[AsyncWeb3]:
+            aw3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+                url,
+                request_kwargs={'timeout': BotConfig.RPC_CONNECT_TIMEOUT}
+            ))
+            start = time.perf_counter()
+            ok = await aw3.is_connected()
+            latency = time.perf_counter() - start
+            pool.record(url, latency, ok)
+            rpc_metrics.record(pool.network, url, 'web3_clientVersion', latency, ok=ok)
+            if not ok:
+                return None
+            
+            aw3.middleware_onion.add(
+                async_rpc_middleware(pool.network, url, pool.schedulers.get(url)),
+                'rpc_pool'
+            )
+            return aw3
+        
+        tasks = [asyncio.ensure_future(probe(endpoint.url)) for endpoint in pool.endpoints]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    aw3 = await next_done
+                except Exception:
+                    continue
+                if aw3 is not None:
+                    return aw3
+            return None
+        finally:
+            # Sondas ainda pendentes: cancelar e aguardar (sem tasks órfãs no fim do loop)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    @staticmethod
+    def _run_async(coro):
+        """Executa uma corrotina a partir de código síncrono"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        # Já existe um event loop nesta thread: executar em uma thread separada
+        result = {}
+        
+        def runner():
+            result['value'] = asyncio.run(coro)
+        
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        thread.join()
+        return result.get('value')
+    
     def get_web3(self, network: str) -> Optional[Web3]:
         """Retorna instância Web3 de uma rede"""
         return self.web3_instances.get(network)
     
+    def raw_client(self, network: str) -> Optional[RawRPCClient]:
+        """Cliente JSON-RPC enxuto da rede (caminho de execução)"""
+        return self.raw_clients.get(network)
+    
     def get_balance(self, network: str, address: Optional[str] = None) -> float:
-        """Retorna saldo em uma rede"""
+        """Retorna saldo em uma rede (cache do bloco atual)"""
         try:
             w3 = self.get_web3(network)
             if not w3:
                 return 0.0
             
             addr = address or self.account.address
-            balance_wei = w3.eth.get_balance(addr)
+            balance_wei = self.cache.get_or_load_head(
+                network, ('balance', addr.lower()),
+                lambda: w3.eth.get_balance(addr)
+            )
             return float(w3.from_wei(balance_wei, 'ether'))
             
         except Exception as e:
@@ -139,19 +286,72 @@ class BlockchainConnector:
             return 0.0
     
     def get_gas_price(self, network: str) -> int:
-        """Retorna gas price atual em wei"""
+        """Retorna gas price atual em wei (cache do bloco atual)"""
         try:
             w3 = self.get_web3(network)
             if not w3:
                 return 0
             
-            gas_price = w3.eth.gas_price
-            return gas_price
+            return self.cache.get_or_load_head(network, 'gas_price', lambda: w3.eth.gas_price)
             
         except Exception as e:
             logger.error(f"❌ Erro ao obter gas price: {e}")
             return 0
     
+    def get_base_fee(self, network: str) -> int:
+        """Retorna base fee do último bloco em wei (0 em redes sem EIP-1559)"""
+        try:
+            w3 = self.get_web3(network)
+            if not w3:
+                return 0
+            
+            def load():
+                block = w3.eth.get_block('latest')
+                # Só o listener avança a cabeça; aqui o número vale até o próximo bloco/TTL
+                self.cache.set_head(network, 'block_number', block['number'])
+                return block.get('baseFeePerGas', 0)
+            
+            return self.cache.get_or_load_head(network, 'base_fee', load)
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao obter base fee: {e}")
+            return 0
+    
+    def get_chain_id(self, network: str) -> int:
+        """Retorna chain ID (lido uma única vez por rede)"""
+        try:
+            w3 = self.get_web3(network)
+            if not w3:
+                return self.networks[network].chain_id if network in self.networks else 0
+            
+            return self.cache.get_immutable(network, 'chain_id', lambda: w3.eth.chain_id)
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao obter chain ID: {e}")
+            return 0
+    
+    def get_block_number(self, network: str) -> Optional[int]:
+        """Último bloco: o do listener, ou eth_blockNumber em cache até o próximo bloco/TTL"""
+        try:
+            head = self.cache.head_block(network)
+            if head is not None:
+                return head
+            
+            w3 = self.get_web3(network)
+            if not w3:
+                return None
+            
+            return self.cache.get_or_load_head(network, 'block_number', lambda: w3.eth.block_number)
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao obter número do bloco: {e}")
+            return None
+    
+    def on_new_block(self, network: str, block_number: int):
+        """Chamado a cada bloco novo: invalida gas, base fee e saldos e consulta receipts pendentes"""
+        self.cache.on_new_block(network, block_number)
+        self.receipts.on_new_block(network, block_number)
+    
     def estimate_gas(self, network: str, transaction: dict) -> int:
         """Estima gas necessário para uma transação"""
         try:
@@ -167,29 +367,34 @@ class BlockchainConnector:
             return 0
     
     def send_transaction(self, network: str, transaction: dict) -> Optional[str]:
-        """Envia uma transação"""
+        """
+        Assina e envia uma transação
+
+        Nonce / gas price / chain ID ausentes são completados via get_tx_params
+        (nonce reservado localmente). Em falha, o nonce é devolvido ou
+        ressincronizado com o nó.
+        """
         try:
             w3 = self.get_web3(network)
             if not w3 or not self.account:
                 return None
             
-            # Adicionar nonce
-            if 'nonce' not in transaction:
-                transaction['nonce'] = w3.eth.get_transaction_count(self.account.address)
-            
-            # Adicionar gas price
-            if 'gasPrice' not in transaction and 'maxFeePerGas' not in transaction:
-                transaction['gasPrice'] = w3.eth.gas_price
+            has_fee = 'gasPrice' in transaction or 'maxFeePerGas' in transaction
+            if not ('nonce' in transaction and has_fee and 'chainId' in transaction):
+                params = self.get_tx_params(network, reserve_nonce='nonce' not in transaction)
+                if has_fee:
+                    params.pop('gasPrice', None)
+                for key, value in params.items():
+                    transaction.setdefault(key, value)
             
-            # Adicionar chain ID
-            if 'chainId' not in transaction:
-                transaction['chainId'] = w3.eth.chain_id
-            
-            # Assinar transação
-            signed_txn = w3.eth.account.sign_transaction(transaction, self.account.key)
-            
-            # Enviar transação
-            tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            try:
+                # Assinar e enviar transação
+                signed_txn = w3.eth.account.sign_transaction(transaction, self.account.key)
+                tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            except Exception as e:
+                self.nonces.handle_send_error(network, self.account.address, transaction['nonce'], e)
+                raise
+            self.invalidate_account_state(network)
             
             logger.info(f"📤 Transação enviada: {tx_hash.hex()}")
             return tx_hash.hex()
@@ -198,18 +403,21 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao enviar transação: {e}")
             return None
     
+    def send_transactions(self, network: str, transactions: List[dict]) -> List[Optional[str]]:
+        """Envia várias transações em sequência sem aguardar receipts (nonces consecutivos)"""
+        return [self.send_transaction(network, tx) for tx in transactions]
+    
     def wait_for_transaction(self, network: str, tx_hash: str, timeout: int = 120) -> bool:
-        """Aguarda confirmação de transação"""
+        """Aguarda confirmação de transação (bloqueante; prefira track_receipt)"""
         try:
-            w3 = self.get_web3(network)
-            if not w3:
+            if not self.get_web3(network):
                 return False
             
             logger.info(f"⏳ Aguardando confirmação de {tx_hash[:10]}...")
             
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+            result = self.track_receipt(network, tx_hash).result(timeout=timeout)
             
-            if receipt.status == 1:
+            if result.success:
                 logger.success(f"✅ Transação confirmada!")
                 return True
             else:
@@ -220,6 +428,12 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao aguardar transação: {e}")
             return False
     
+    def track_receipt(self, network: str, tx_hash: str,
+                      callback: Optional[Callable[[ReceiptResult], None]] = None,
+                      context: Optional[Dict] = None):
+        """Acompanha a transação em segundo plano; retorna Future[ReceiptResult]"""
+        return self.receipts.track(network, tx_hash, callback, context)
+    
     def get_transaction_receipt(self, network: str, tx_hash: str) -> Optional[dict]:
         """Retorna receipt de uma transação"""
         try:
@@ -234,65 +448,270 @@ class BlockchainConnector:
             logger.error(f"❌ Erro ao obter receipt: {e}")
             return None
     
-    def check_health(self) -> Dict[str, bool]:
-        """Verifica saúde de todas as conexões"""
-        health = {}
+    # ========================================================================
+    # BATCHING JSON-RPC
+    # ========================================================================
+    
+    def batch(self, network: str) -> Optional[RPCBatch]:
+        """Cria um batch JSON-RPC (uma requisição HTTP) para a rede"""
+        if network not in self.web3_instances:
+            return None
         
-        for network_name, w3 in self.web3_instances.items():
-            try:
-                w3.eth.block_number
-                health[network_name] = True
-            except:
-                health[network_name] = False
-                logger.warning(f"⚠️ {network_name} não está respondendo!")
+        if BotConfig.USE_MULTICALL:
+            # eth_calls do batch viram um aggregate3 (uma chamada de nó)
+            return MulticallBatch(self.rpc_pools[network])
+        return RPCBatch(self.rpc_pools[network])
+    
+    def batch_call(self, network: str, calls: List[tuple]) -> List:
+        """Executa [(method, params), ...] em um batch e retorna os resultados brutos"""
+        batch = self.batch(network)
+        if batch is None:
+            return [None] * len(calls)
         
-        return health
+        futures = [batch.add(method, params) for method, params in calls]
+        batch.execute()
+        return [f.result_or(None) for f in futures]
     
-    def reconnect(self, network: str) -> bool:
-        """Reconecta em uma rede específica"""
-        logger.info(f"🔄 Reconectando em {network}...")
+    def get_tx_params(self, network: str, address: Optional[str] = None,
+                      reserve_nonce: bool = True) -> Dict[str, int]:
+        """
+        Retorna nonce, gasPrice e chainId para uma nova transação
+
+        - o nonce é reservado no NonceManager (sem RPC depois da 1ª sincronização);
+          quem não enviar a transação deve chamar release_nonce()
+        - gas price e chain ID vêm do cache do bloco; os que faltam são buscados
+          em um único round-trip
+        """
+        try:
+            batch = self.batch(network)
+            if batch is None or not (address or self.account):
+                return {}
+            
+            addr = address or self.account.address
+            
+            params = {
+                'gasPrice': self.cache.get_head(network, 'gas_price'),
+                'chainId': self.cache.get_immutable(network, 'chain_id', lambda: None)
+            }
+            
+            missing = {}
+            if params['gasPrice'] is None:
+                missing['gasPrice'] = batch.gas_price()
+            if params['chainId'] is None:
+                missing['chainId'] = batch.chain_id()
+            
+            if missing:
+                batch.execute()
+                for key, future in missing.items():
+                    params[key] = future.result()
+                
+                if 'gasPrice' in missing:
+                    self.cache.set_head(network, 'gas_price', params['gasPrice'])
+                if 'chainId' in missing:
+                    self.cache.set_immutable(network, 'chain_id', params['chainId'])
+            
+            if reserve_nonce:
+                params['nonce'] = self.nonces.reserve(network, addr)
+            
+            return params
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao obter parâmetros da transação: {e}")
+            return {}
+    
+    def reserve_nonce(self, network: str, address: Optional[str] = None) -> int:
+        """Reserva o próximo nonce local da conta"""
+        return self.nonces.reserve(network, address or self.account.address)
+    
+    def release_nonce(self, network: str, nonce: int, address: Optional[str] = None):
+        """Devolve um nonce reservado por get_tx_params que não foi usado"""
+        self.nonces.release(network, address or self.account.address, nonce)
+    
+    def handle_send_error(self, network: str, nonce: int, error: Exception,
+                          address: Optional[str] = None) -> bool:
+        """Repassa falha de envio ao NonceManager (True se era erro de nonce)"""
+        return self.nonces.handle_send_error(network, address or self.account.address, nonce, error)
+    
+    def _fetch_pending_nonce(self, network: str, address: str) -> int:
+        """eth_getTransactionCount(address, 'pending') para o NonceManager"""
+        with self.batch(network) as batch:
+            count = batch.get_transaction_count(address, 'pending')
+        return count.result()
+    
+    def invalidate_account_state(self, network: str, address: Optional[str] = None):
+        """Após enviar uma transação, o saldo em cache deixa de valer"""
+        addr = (address or self.account.address).lower()
+        self.cache.invalidate(network, ('balance', addr))
+    
+    def get_balances(self, address: Optional[str] = None) -> Dict[str, float]:
+        """Retorna saldo em todas as redes (cache do bloco; um batch por rede, redes em paralelo)"""
+        networks = list(self.web3_instances.keys())
+        if not networks or not (address or self.account):
+            return {}
+        
+        addr = address or self.account.address
+        key = ('balance', addr.lower())
+        
+        def fetch(network: str) -> float:
+            balance_wei = self.cache.get_head(network, key)
+            if balance_wei is None:
+                batch = self.batch(network)
+                with batch:
+                    balance = batch.get_balance(addr)
+                balance_wei = balance.result()
+                self.cache.set_head(network, key, balance_wei)
+            return float(Web3.from_wei(balance_wei, 'ether'))
         
-        if network in self.networks:
-            return self._connect_network(network, self.networks[network])
+        balances = {}
+        with ThreadPoolExecutor(max_workers=len(networks)) as pool:
+            futures = {network: pool.submit(fetch, network) for network in networks}
+            for network, future in futures.items():
+                try:
+                    balances[network] = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Erro ao obter saldo em {network}: {e}")
         
-        return False
+        return balances
     
-    def close_all(self):
-        """Fecha todas as conexões"""
-        logger.info("🔌 Fechando todas as conexões...")
-        self.web3_instances.clear()
-        self.connected = False
+    # ========================================================================
+    # API ASSÍNCRONA (AsyncWeb3)
+    # ========================================================================
     
-    def get_connected_networks(self) -> list:
-        """Retorna lista de redes conectadas"""
-        return list(self.web3_instances.keys())
+    def get_async_web3(self, network: str) -> Optional[AsyncWeb3]:
+        """Retorna instância AsyncWeb3 de uma rede"""
+        return self.async_web3_instances.get(network)
+    
+    async def get_gas_price_async(self, network: str) -> int:
+        """Retorna gas price atual em wei (async)"""
+        try:
+            aw3 = self.get_async_web3(network)
+            if not aw3:
+                return 0
+            
+            return await aw3.eth.gas_price
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao obter gas price: {e}")
+            return 0
+    
+    async def send_transaction_async(self, network: str, transaction: dict) -> Optional[str]:
+        """Envia uma transação (async)"""
+        try:
+            aw3 = self.get_async_web3(network)
+            if not aw3 or not self.account:
+                return None
+            
+            # Nonce local; buscar apenas os demais campos que faltam, em paralelo
+            if 'nonce' not in transaction:
+                transaction['nonce'] = self.nonces.reserve(network, self.account.address)
+            missing = {}
+            if 'gasPrice' not in transaction and 'maxFeePerGas' not in transaction:
+                missing['gasPrice'] = aw3.eth.gas_price
+            if 'chainId' not in transaction:
+                transaction['chainId'] = self.cache.get_immutable(network, 'chain_id', lambda: None)
+                if transaction['chainId'] is None:
+                    missing['chainId'] = aw3.eth.chain_id
+            
+            try:
+                if missing:
+                    values = await asyncio.gather(*missing.values())
+                    transaction.update(zip(missing.keys(), values))
+                
+                # Assinar e enviar transação
+                signed_txn = aw3.eth.account.sign_transaction(transaction, self.account.key)
+                tx_hash = await aw3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            except Exception as e:
+                self.nonces.handle_send_error(network, self.account.address, transaction['nonce'], e)
+                raise
+            self.invalidate_account_state(network)
+            
+            logger.info(f"📤 Transação enviada: {tx_hash.hex()}")
+            return tx_hash.hex()
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao enviar transação: {e}")
+            return None
+    
+    async def wait_for_transaction_async(self, network: str, tx_hash: str, timeout: int = 120) -> bool:
+        """Aguarda confirmação de transação sem bloquear o event loop"""
+        try:
+            aw3 = self.get_async_web3(network)
+            if not aw3:
+                return False
+            
+            logger.info(f"⏳ Aguardando confirmação de {tx_hash[:10]}...")
+            
+            receipt = await aw3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+            
+            if receipt.status == 1:
+                logger.success(f"✅ Transação confirmada!")
+                return True
+            else:
+                logger.error(f"❌ Transação falhou!")
+                return False
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao aguardar transação: {e}")
+            return False
     
     def check_health(self) -> Dict[str, bool]:
-        """Verifica saúde de todas as conexões"""
+        """
+        Saúde de todas as redes a partir do score contínuo dos endpoints
+        (nenhuma chamada RPC extra é feita aqui)
+        """
         health = {}
         
-        for network_name, w3 in self.web3_instances.items():
-            try:
-                # Tentar obter último bloco
-                w3.eth.block_number
-                health[network_name] = True
-            except:
-                health[network_name] = False
+        for network_name, pool in self.rpc_pools.items():
+            health[network_name] = pool.is_healthy()
+            if not health[network_name]:
+                logger.warning(f"⚠️ {network_name}: todos os endpoints degradados!")
         
         return health
     
+    def get_endpoint_stats(self) -> Dict[str, List[Dict]]:
+        """Latência p50/p99 e taxa de erro de cada endpoint, por rede"""
+        return {name: pool.get_stats() for name, pool in self.rpc_pools.items()}
+    
+    def get_rpc_metrics(self, network: Optional[str] = None) -> List[Dict]:
+        """Histogramas por (rede, endpoint, método), do mais caro para o mais barato"""
+        return rpc_metrics.snapshot(network)
+    
     def reconnect(self, network: str) -> bool:
         """Reconecta uma rede específica"""
         try:
             if network not in self.networks:
                 return False
             
+            # Rede já conectada: basta liberar endpoints em cooldown
+            if network in self.rpc_pools:
+                logger.info(f"🔄 Liberando endpoints de {network}...")
+                self.rpc_pools[network].reset()
+                return True
+            
             logger.info(f"🔄 Reconectando {network}...")
-            return self._connect_network(network, self.networks[network])
+            return self._run_async(
+                self._connect_network_with_deadline(network, self.networks[network])
+            )
             
         except Exception as e:
             logger.error(f"❌ Erro ao reconectar: {e}")
             return False
+    
+    def close_all(self):
+        """Fecha todas as conexões"""
+        logger.info("🔌 Fechando todas as conexões...")
+        self.receipts.stop()
+        self.web3_instances.clear()
+        self.async_web3_instances.clear()
+        for pool in self.rpc_pools.values():
+            pool.close()
+        self.rpc_pools.clear()
+        self.raw_clients.clear()
+        self.connected = False
+    
+    def get_connected_networks(self) -> list:
+        """Retorna lista de redes conectadas"""
+        return list(self.web3_instances.keys())
 
 # Instância global
 blockchain = BlockchainConnector()
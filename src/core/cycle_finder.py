@@ -0,0 +1,265 @@
+"""
+🔺 CICLOS MULTI-HOP NO GRAFO DE LOG-PREÇOS
+Tokens como vértices, cada pool como duas arestas com peso −log(taxa marginal
+após a taxa do pool): um ciclo de peso negativo é uma arbitragem. A busca
+(Bellman-Ford limitado em saltos) parte só das arestas que mudaram no bloco;
+o grafo vive na PoolTable (arrays), arestas viram objetos só quando usadas
+"""
+
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import BotConfig, MAJOR_TOKENS
+from src.core.opportunity import Opportunity
+from src.core.pool_table import KINDS, PoolTable
+from src.core.trade_sizing import optimal_path_input
+
+# Ganho mínimo do ciclo (em log) para descartar ruído de ponto flutuante
+MIN_LOG_GAIN = 1e-9
+
+
+class Edge(NamedTuple):
+    token_in: str
+    token_out: str
+    dex: str
+    kind: str           # 'v2' ou 'v3'
+    fee: int            # V3: fee tier; V2: 0
+    pool: str
+    reserve_in: float   # reservas (virtuais, no V3) na direção da aresta
+    reserve_out: float
+    gamma: float        # fração que entra no pool (1 - taxa)
+
+    @property
+    def weight(self) -> float:
+        return -math.log(self.gamma * self.reserve_out / self.reserve_in)
+
+
+class Cycle(NamedTuple):
+    edges: Tuple[Edge, ...]
+    weight: float       # soma dos pesos (negativa)
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        return tuple(edge.token_in for edge in self.edges)
+
+
+class CycleFinder:
+    """
+    Grafo de log-preços de uma rede e busca incremental de ciclos
+
+    - refresh(): reservas da PoolTable a partir das caches V2/V3 do bloco;
+      retorna as arestas dos pools novos ou alterados
+    - find_cycles(): Bellman-Ford de até max_hops − 1 saltos, vetorizado sobre a
+      matriz densa de melhores arestas, a partir do destino de cada aresta
+      alterada; um ciclo novo sempre passa por alguma aresta alterada
+    - scan(): ciclos de 3..max_hops pools dimensionados pelo TradeSizer
+    """
+
+    def __init__(self, dex_interface, sizer, max_hops: Optional[int] = None, top_k: Optional[int] = None,
+                 table: Optional[PoolTable] = None):
+        self.dex = dex_interface
+        self.sizer = sizer
+        self.max_hops = max_hops or BotConfig.CYCLE_MAX_HOPS
+        self.top_k = top_k or BotConfig.CYCLE_TOP_K
+        if table is None:
+            table = dex_interface.pool_table if dex_interface is not None else PoolTable()
+        self.table = table
+        self.stats = {'refreshes': 0, 'edges': 0, 'touched': 0, 'cycles': 0, 'confirmed': 0}
+
+    # ------------------------------------------------------------------
+    # Grafo
+    # ------------------------------------------------------------------
+
+    def edge(self, row: int, direction: int) -> Edge:
+        """Aresta de uma linha da tabela (direção 0 = token0 → token1)"""
+        t = self.table
+        token0, token1 = t.tokens[t.token0[row]], t.tokens[t.token1[row]]
+        reserve0, reserve1 = float(t.reserve0[row]), float(t.reserve1[row])
+        if direction:
+            token0, token1, reserve0, reserve1 = token1, token0, reserve1, reserve0
+        return Edge(token0, token1, t.venues[t.venue[row]], KINDS[t.kind[row]], int(t.fee[row]),
+                    t.addresses[row], reserve0, reserve1, float(t.gamma[row]))
+
+    def edges_for(self, rows) -> List[Edge]:
+        """Arestas (nas duas direções) das linhas com liquidez"""
+        return [
+            self.edge(int(row), direction)
+            for row in rows if self.table.reserve0[row] > 0 and self.table.reserve1[row] > 0
+            for direction in (0, 1)
+        ]
+
+    def refresh(self) -> List[Edge]:
+        """Atualiza as reservas; retorna as arestas dos pools novos ou com reservas alteradas"""
+        touched = self.edges_for(self.table.sync(self.dex))
+        self.stats['refreshes'] += 1
+        self.stats['edges'] = 2 * len(self.table.valid())
+        self.stats['touched'] += len(touched)
+        return touched
+
+    def _matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Peso da melhor aresta para cada par ordenado de tokens (inf = sem pool), com linha e direção dela"""
+        size = len(self.table.tokens)
+        weights = np.full((size, size), np.inf)
+        best_row = np.full((size, size), -1, dtype=np.int64)
+        best_direction = np.zeros((size, size), dtype=np.int8)
+
+        rows = self.table.valid()
+        if len(rows):
+            row, direction, token_in, token_out, reserve_in, reserve_out = self.table.directed(rows)
+            weight = -np.log(self.table.gamma[row] * reserve_out / reserve_in)
+            # Menor peso de cada (token_in, token_out): primeira ocorrência na ordem crescente
+            order = np.argsort(weight, kind='stable')
+            _, first = np.unique((token_in * size + token_out)[order], return_index=True)
+            pick = order[first]
+            weights[token_in[pick], token_out[pick]] = weight[pick]
+            best_row[token_in[pick], token_out[pick]] = row[pick]
+            best_direction[token_in[pick], token_out[pick]] = direction[pick]
+        return weights, best_row, best_direction
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+
+    def find_cycles(self, touched: List[Edge]) -> List[Cycle]:
+        """Ciclos negativos de 3..max_hops arestas que passam por alguma aresta alterada"""
+        size = len(self.table.tokens)
+        if not touched or size < 3:
+            return []
+
+        weights, best_row, best_direction = self._matrix()
+        index = self.table.token_index
+        hops = self.max_hops - 1   # caminho de volta: destino da aresta → origem
+        closing: Dict[int, Set[int]] = {}
+        for edge in touched:
+            closing.setdefault(index[edge.token_out], set()).add(index[edge.token_in])
+
+        cycles: Dict[Tuple[int, ...], Cycle] = {}
+        for source, targets in closing.items():
+            # dist[k][v]: menor peso de source a v em exatamente k saltos; parent[k][v]: vértice anterior
+            dist = [np.full(size, np.inf)]
+            dist[0][source] = 0.0
+            parent = [np.full(size, -1)]
+            for _ in range(hops):
+                candidates = dist[-1][:, None] + weights      # (de, para)
+                parent.append(candidates.argmin(axis=0))
+                dist.append(candidates.min(axis=0))
+                dist[-1][source] = np.inf   # voltar à origem no meio do caminho não forma ciclo simples
+
+            for target in targets:
+                for length in range(2, hops + 1):
+                    total = dist[length][target] + weights[target, source]
+                    if not total < -MIN_LOG_GAIN:
+                        continue
+                    path = [target]
+                    for k in range(length, 0, -1):
+                        path.append(int(parent[k][path[-1]]))
+                    path.reverse()   # source, ..., target
+                    if path[0] != source or len(set(path)) != len(path):
+                        continue     # caminho com vértice repetido: não é ciclo simples
+
+                    # Forma canônica: começa no menor índice (ciclo igual visto de outra aresta)
+                    start = path.index(min(path))
+                    rotated = tuple(path[start:] + path[:start])
+                    if rotated in cycles:
+                        continue
+                    nodes = rotated + (rotated[0],)
+                    edges = tuple(
+                        self.edge(best_row[nodes[i], nodes[i + 1]], best_direction[nodes[i], nodes[i + 1]])
+                        for i in range(len(rotated))
+                    )
+                    cycles[rotated] = Cycle(edges, float(total))
+
+        found = sorted(cycles.values(), key=lambda cycle: cycle.weight)
+        self.stats['cycles'] += len(found)
+        return found
+
+    # ------------------------------------------------------------------
+    # Oportunidades
+    # ------------------------------------------------------------------
+
+    def _start(self, cycle: Cycle) -> Cycle:
+        """Gira o ciclo para começar no token de maior prioridade (ordem de MAJOR_TOKENS)"""
+        order = {address.lower(): i for i, address in enumerate(MAJOR_TOKENS.get(self.dex.network, {}).values())}
+        tokens = cycle.tokens
+        start = min(range(len(tokens)), key=lambda i: (order.get(tokens[i], len(order)), tokens[i]))
+        return Cycle(cycle.edges[start:] + cycle.edges[:start], cycle.weight)
+
+    def _confirm(self, cycle: Cycle, cap: int) -> Optional[Opportunity]:
+        """Dimensiona e recota o ciclo com a matemática inteira exata"""
+        for token in cycle.tokens:
+            safe, reason = self.dex.token_security.is_token_safe(token)
+            if not safe:
+                logger.debug(f"❌ Token rejeitado: {reason}")
+                return None
+
+        # Cada perna recotada no pool exato da aresta (fee tier V3), não no melhor tier da DEX
+        route = [(edge.dex, edge.token_in, edge.token_out, edge.fee if edge.kind == 'v3' else None)
+                 for edge in cycle.edges]
+        estimate = optimal_path_input(
+            [(edge.reserve_in, edge.reserve_out, edge.gamma) for edge in cycle.edges], BotConfig.FLASH_LOAN_FEE
+        )
+        closed_form = all(edge.kind == 'v2' for edge in cycle.edges)
+        amount_in = self.sizer.refine_path(route, int(estimate), cap, closed_form)
+        _, outputs = self.sizer.path_profit(route, amount_in)
+        if len(outputs) != len(route):
+            return None
+
+        profit = outputs[-1] - amount_in
+        if profit <= 0:
+            return None
+
+        first = cycle.edges[0]
+        return Opportunity(
+            self.dex.network, first.dex, cycle.edges[-1].dex, first.token_in, first.token_out,
+            amount_in, outputs[0], outputs[-1], profit, kind='cycle',
+            route=[
+                {'dex': edge.dex, 'token_in': edge.token_in, 'token_out': edge.token_out, 'fee': edge.fee}
+                for edge in cycle.edges
+            ],
+            pools=[self.table.row(edge.pool) for edge in cycle.edges]
+        )
+
+    def scan(self, touched: Optional[List[Edge]] = None,
+             on_opportunity: Optional[Callable[[Opportunity], None]] = None) -> List[Opportunity]:
+        """
+        Ciclos novos do bloco, dimensionados e confirmados (os top_k de maior
+        ganho marginal); touched: resultado de refresh() já feito neste bloco;
+        on_opportunity: chamado com cada ciclo assim que confirmado
+        """
+        opportunities = []
+        try:
+            if touched is None:
+                touched = self.refresh()
+            cycles = [self._start(cycle) for cycle in self.find_cycles(touched)[:self.top_k]]
+            if not cycles:
+                return []
+
+            caps = dict(zip(
+                [cycle.edges[0].token_in for cycle in cycles],
+                self.sizer.caps([cycle.edges[0].token_in for cycle in cycles])
+            ))
+            symbols = {address.lower(): symbol for symbol, address in MAJOR_TOKENS.get(self.dex.network, {}).items()}
+
+            for cycle in cycles:
+                opp = self._confirm(cycle, caps[cycle.edges[0].token_in])
+                if opp:
+                    opp['symbol_in'] = symbols.get(opp['token_in'], opp['token_in'][:10])
+                    opp['symbol_out'] = symbols.get(opp['token_out'], opp['token_out'][:10])
+                    opportunities.append(opp)
+                    if on_opportunity is not None:
+                        on_opportunity(opp)
+
+            self.stats['confirmed'] += len(opportunities)
+            if opportunities:
+                logger.info(f"🔺 {len(opportunities)} ciclos multi-hop em {self.dex.network}")
+
+        except Exception as e:
+            logger.error(f"❌ Erro na busca de ciclos: {e}")
+
+        return opportunities
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'tokens': len(self.table.tokens), 'pools': len(self.table)}
@@ -3,17 +3,42 @@
 Gerencia interações com Uniswap, PancakeSwap, Aerodrome, etc
 """
 
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from eth_abi import decode, encode
+from eth_utils import keccak
 from web3 import Web3
 from loguru import logger
+import heapq
+import itertools
 import json
+import queue
+import time
 
 from src.config.config import (
     UNISWAP_V3_ROUTER,
+    UNISWAP_V3_FACTORY,
+    UNISWAP_V3_QUOTER_V2,
     PANCAKESWAP_V3_ROUTER,
+    PANCAKESWAP_V2_FACTORY,
     AERODROME_ROUTER,
-    MAJOR_TOKENS
+    MAJOR_TOKENS,
+    convert_native_to_usd
 )
+from src.config.config import BotConfig
+from src.core.address import checksum, to_address
+from src.core.cycle_finder import CycleFinder
+from src.core.opportunity import Opportunity
+from src.core.pool_events import PoolEventUpdater
+from src.core.pool_registry import PoolRegistry
+from src.core.pool_snapshot import PoolSnapshotStore
+from src.core.pool_table import PoolTable
+from src.core.shared_pools import SharedPoolTable, get_route_workers
+from src.core.rpc_batch import RPCError
+from src.core.token_metadata import get_token_store, opportunity_usd
+from src.core.v2_pools import ZERO_ADDRESS, V2PoolCache, sort_tokens
+from src.core.v3_pools import V3PoolCache
+from src.core.vector_scan import VectorScanner
 # Tentar usar versão REAL primeiro
 try:
     from src.utils.real_token_security import RealTokenSecurity as TokenSecurity
@@ -27,15 +52,56 @@ UNISWAP_V3_QUOTER_ABI = json.loads('[{"inputs":[{"internalType":"address","name"
 
 ROUTER_ABI = json.loads('[{"inputs":[{"internalType":"uint256","name":"amountIn","type":"uint256"},{"internalType":"uint256","name":"amountOutMin","type":"uint256"},{"internalType":"address[]","name":"path","type":"address[]"},{"internalType":"address","name":"to","type":"address"},{"internalType":"uint256","name":"deadline","type":"uint256"}],"name":"swapExactTokensForTokens","outputs":[{"internalType":"uint256[]","name":"amounts","type":"uint256[]"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amountIn","type":"uint256"},{"internalType":"address[]","name":"path","type":"address[]"}],"name":"getAmountsOut","outputs":[{"internalType":"uint256[]","name":"amounts","type":"uint256[]"}],"stateMutability":"view","type":"function"}]')
 
+GET_AMOUNTS_OUT_SELECTOR = keccak(text="getAmountsOut(uint256,address[])")[:4]
+
 class DEXInterface:
     """Interface para interagir com DEXs"""
     
-    def __init__(self, web3: Web3, network: str):
+    def __init__(self, web3: Web3, network: str, blockchain=None):
         self.w3 = web3
         self.network = network
+        self.blockchain = blockchain
+        self.pool_registry: Optional[PoolRegistry] = None  # aberto no primeiro scan
+        # Com o conector: pares V2 cotados localmente a partir das reservas do bloco
+        self.v2_pools = V2PoolCache(blockchain, network) if blockchain is not None else None
+        self.v3_pools = V3PoolCache(blockchain, network) if blockchain is not None else None
+        # Estado dos pools mantido por logs: só pares com pool alterado são reavaliados
+        self.pool_events = (
+            PoolEventUpdater(blockchain, network, self.v2_pools, self.v3_pools)
+            if blockchain is not None and BotConfig.POOL_EVENT_UPDATES else None
+        )
+        # Reinício a quente: endereços e último estado dos pools do snapshot em disco
+        self.pool_snapshot = (
+            PoolSnapshotStore(network) if blockchain is not None and BotConfig.POOL_SNAPSHOT else None
+        )
+        if self.pool_snapshot is not None:
+            try:
+                self.pool_snapshot.restore(self.v2_pools, self.v3_pools, self.pool_events)
+            except Exception as e:
+                logger.error(f"❌ Erro ao restaurar snapshot de pools em {network}: {e}")
+        # Estado dos pools em arrays (uma linha por pool), referenciado pelas oportunidades
+        self.pool_table = PoolTable() if blockchain is not None else None
+        self.shared_pools: Optional[SharedPoolTable] = None  # criada no primeiro scan com SCAN_WORKERS
+        self._pair_results: Dict[Tuple[str, str, int], Optional[Opportunity]] = {}
+        # getAmountsOut do scan atual: (router, token_in, token_out, amount_in) -> amount_out
+        self._router_quotes: Dict[Tuple[str, str, str, int], Optional[int]] = {}
+        # Cabeça lida uma vez por scan: toda eth_call do scan usa esse número de bloco
+        self.scan_block: Optional[int] = None
         self.dexs = self._initialize_dexs()
+        self.vector_scanner = VectorScanner(self) if blockchain is not None and BotConfig.VECTOR_SCAN else None
+        self.cycle_finder = (
+            CycleFinder(self, self.vector_scanner.sizer)
+            if self.vector_scanner is not None and BotConfig.CYCLE_SCAN else None
+        )
         self.token_security = TokenSecurity(web3, network)
         logger.info(f"🛡️ Sistema anti-scam ativado para {network}")
+        # Decimais/símbolos dos tokens da rede: do disco, o que faltar em um batch
+        self.tokens = get_token_store(network)
+        if blockchain is not None:
+            try:
+                self.tokens.load(blockchain, MAJOR_TOKENS.get(network, {}).values())
+            except Exception as e:
+                logger.error(f"❌ Erro ao carregar metadados de tokens em {network}: {e}")
         
     def _initialize_dexs(self) -> Dict:
         """Inicializa contratos das DEXs"""
@@ -48,6 +114,8 @@ class DEXInterface:
                 dexs['uniswap_v3'] = {
                     'name': 'Uniswap V3',
                     'router': router_address,
+                    'factory': UNISWAP_V3_FACTORY.get(self.network, ZERO_ADDRESS),
+                    'quoter': UNISWAP_V3_QUOTER_V2.get(self.network, ZERO_ADDRESS),
                     'type': 'v3'
                 }
             
@@ -58,9 +126,11 @@ class DEXInterface:
                     'name': 'PancakeSwap',
                     'router': router_address,
                     'contract': self.w3.eth.contract(
-                        address=Web3.to_checksum_address(router_address),
+                        address=checksum(router_address),
                         abi=ROUTER_ABI
                     ),
+                    'factory': PANCAKESWAP_V2_FACTORY.get(self.network, ZERO_ADDRESS),
+                    'fee_bps': 25,
                     'type': 'v2'
                 }
             
@@ -80,8 +150,9 @@ class DEXInterface:
         
         return dexs
     
-    def get_price(self, dex_name: str, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
-        """Obtém preço de um token em uma DEX"""
+    def get_price(self, dex_name: str, token_in: str, token_out: str, amount_in: int,
+                  fee: Optional[int] = None) -> Optional[int]:
+        """Obtém preço de um token em uma DEX (V3: `fee` fixa o pool; None = melhor fee tier)"""
         try:
             if dex_name not in self.dexs:
                 return None
@@ -91,7 +162,7 @@ class DEXInterface:
             if dex['type'] == 'v2':
                 return self._get_price_v2(dex, token_in, token_out, amount_in)
             elif dex['type'] == 'v3':
-                return self._get_price_v3(dex, token_in, token_out, amount_in)
+                return self._get_price_v3(dex, token_in, token_out, amount_in, fee)
             
             return None
             
@@ -102,25 +173,44 @@ class DEXInterface:
     def _get_price_v2(self, dex: dict, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
         """Obtém preço em DEX V2 (Uniswap V2, PancakeSwap)"""
         try:
+            # Cotação local: reservas do bloco atual, zero chamadas RPC por quantidade
+            if self.v2_pools is not None and dex.get('factory', ZERO_ADDRESS) != ZERO_ADDRESS:
+                return self.v2_pools.quote(dex['factory'], token_in, token_out, amount_in, dex['fee_bps'])
+            
             if 'contract' not in dex:
                 return None
             
-            path = [
-                Web3.to_checksum_address(token_in),
-                Web3.to_checksum_address(token_out)
-            ]
+            key = (to_address(dex['router']), to_address(token_in), to_address(token_out), amount_in)
+            if key in self._router_quotes:
+                return self._router_quotes[key]
+            
+            path = [checksum(token_in), checksum(token_out)]
             
-            amounts = dex['contract'].functions.getAmountsOut(amount_in, path).call()
+            amounts = dex['contract'].functions.getAmountsOut(amount_in, path).call(
+                block_identifier=self.scan_block or 'latest'
+            )
+            # Mesmo bloco do scan: a próxima cotação igual não repete a chamada
+            self._router_quotes[key] = amounts[1]
             return amounts[1]  # amount_out
             
         except Exception as e:
             logger.debug(f"Erro V2: {e}")
             return None
     
-    def _get_price_v3(self, dex: dict, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
-        """Obtém preço em DEX V3 (Uniswap V3)"""
-        # Implementação simplificada - na prática usaria quoter contract
-        return None
+    def _get_price_v3(self, dex: dict, token_in: str, token_out: str, amount_in: int,
+                      fee: Optional[int] = None) -> Optional[int]:
+        """Obtém preço em DEX V3 (Uniswap V3): simulação local, QuoterV2 como fallback"""
+        try:
+            if self.v3_pools is None or dex.get('factory', ZERO_ADDRESS) == ZERO_ADDRESS:
+                return None
+            
+            if fee:
+                return self.v3_pools.quote_pool(dex['factory'], dex['quoter'], token_in, token_out, amount_in, fee)
+            return self.v3_pools.quote(dex['factory'], dex['quoter'], token_in, token_out, amount_in)
+            
+        except Exception as e:
+            logger.debug(f"Erro V3: {e}")
+            return None
     
     def find_arbitrage_opportunity(
         self,
@@ -190,33 +280,199 @@ class DEXInterface:
             logger.error(f"❌ Erro ao buscar arbitragem: {e}")
             return None
     
-    def scan_all_pairs(self, amount_usd: int = 10000) -> List[Dict]:
-        """Escaneia todos os pares de tokens buscando oportunidades"""
+    def _prices_event_tracked(self) -> bool:
+        """True se toda DEX que cota nesta rede tem o estado mantido pelos logs"""
+        for dex in self.dexs.values():
+            if dex.get('factory', ZERO_ADDRESS) == ZERO_ADDRESS and 'contract' in dex:
+                return False  # cotação pelo router: muda sem log rastreado
+        return True
+    
+    def _prefetch_router_quotes(self, pairs, amounts: List[int]):
+        """
+        getAmountsOut de todos os pares (com a entrada de cada um) nas DEXs
+        cotadas pelo router, em um batch (um aggregate3 no Multicall3) em vez
+        de uma eth_call por cotação
+        """
+        self._router_quotes = {}
+        routers = [
+            dex['router'] for dex in self.dexs.values()
+            if dex.get('factory', ZERO_ADDRESS) == ZERO_ADDRESS and 'contract' in dex
+        ]
+        if self.blockchain is None or not routers or not pairs:
+            return
+        
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return
+        
+        futures = []
+        for ((_, addr_in), (_, addr_out)), amount_in in zip(pairs, amounts):
+            data = '0x' + (GET_AMOUNTS_OUT_SELECTOR + encode(['uint256', 'address[]'], [amount_in, [addr_in, addr_out]])).hex()
+            for router in routers:
+                key = (to_address(router), to_address(addr_in), to_address(addr_out), amount_in)
+                futures.append((key, batch.call(router, data, self.scan_block or 'latest')))
+        batch.execute()
+        
+        for key, future in futures:
+            try:
+                self._router_quotes[key] = decode(['uint256[]'], future.result())[0][-1]
+            except RPCError:
+                self._router_quotes[key] = None  # revertido: par inexistente no router
+            except Exception:
+                pass  # falha de transporte: cotação individual no momento do uso
+    
+    def save_pool_snapshot(self) -> Optional[int]:
+        """Grava o estado dos pools para o próximo reinício; retorna o bloco gravado"""
+        if self.pool_snapshot is None or self.pool_events is None:
+            return None
+        try:
+            return self.pool_events.save_snapshot(self.pool_snapshot)
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar snapshot de pools em {self.network}: {e}")
+            return None
+    
+    def _indexed_factories(self) -> List[Tuple[str, str, str]]:
+        """(dex, tipo, factory) de cada DEX com factory conhecida"""
+        return [
+            (dex_name, dex['type'], dex['factory'])
+            for dex_name, dex in self.dexs.items()
+            if dex.get('factory', ZERO_ADDRESS) != ZERO_ADDRESS
+        ]
+    
+    def _registry_candidates(self, tokens, head: Optional[int]) -> Optional[set]:
+        """
+        Pares com pool em 2+ DEXs segundo o registro em disco (None = registro
+        ainda incompleto ou desativado: testar todas as combinações)
+        """
+        if self.blockchain is None or not BotConfig.POOL_REGISTRY or head is None:
+            return None
+        
+        factories = self._indexed_factories()
+        if not factories:
+            return None
+        
+        if self.pool_registry is None:
+            self.pool_registry = PoolRegistry(self.network)
+        
+        self.pool_registry.index(self.blockchain, factories, head)
+        
+        if not all(self.pool_registry.is_synced(factory, head) for _, _, factory in factories):
+            return None
+        
+        # DEXs cotadas só pelo router (sem factory) podem completar o par
+        untracked = sum(
+            1 for dex in self.dexs.values()
+            if dex.get('factory', ZERO_ADDRESS) == ZERO_ADDRESS and 'contract' in dex
+        )
+        if untracked >= 2:
+            return None
+        
+        candidates = self.pool_registry.candidate_pairs(tokens, min_dexes=2 - untracked)
+        self.pool_registry.seed(self.v2_pools, self.v3_pools, candidates, factories)
+        return candidates
+    
+    def scan_all_pairs(self, amount_usd: int = 10000,
+                       on_opportunity: Optional[Callable[[Opportunity], None]] = None) -> List[Opportunity]:
+        """
+        Escaneia todos os pares de tokens buscando oportunidades
+
+        on_opportunity: chamado com cada oportunidade assim que confirmada
+        (antes do fim do scan), para o consumidor poder sair antes
+        """
         opportunities = []
         
         try:
-            # Obter tokens da rede
-            tokens = MAJOR_TOKENS
-            network_tokens = {}
+            # Obter tokens da rede (MAJOR_TOKENS é rede -> {símbolo: endereço})
+            network_tokens = dict(MAJOR_TOKENS.get(self.network, {}))
+            
+            # Cabeça do scan: registro, logs, reservas, ticks e routers lidos nesse bloco
+            head = self.blockchain.get_block_number(self.network) if self.blockchain is not None else None
+            self.scan_block = head
+            if self.v2_pools is not None:
+                self.v2_pools.scan_block = head
+            if self.v3_pools is not None:
+                self.v3_pools.scan_block = head
+            
+            # Registro de pools: só pares que existem em 2+ DEXs (e endereços sem getPair/getPool)
+            candidates = self._registry_candidates(network_tokens.values(), head)
             
-            for symbol, addresses in tokens.items():
-                if self.network in addresses:
-                    network_tokens[symbol] = addresses[self.network]
+            # Pares V2 resolvidos uma vez; reservas de todos em um batch por bloco
+            if self.v2_pools is not None and candidates is None:
+                factories = [
+                    dex['factory'] for dex in self.dexs.values()
+                    if dex['type'] == 'v2' and dex.get('factory', ZERO_ADDRESS) != ZERO_ADDRESS
+                ]
+                self.v2_pools.prepare(factories, network_tokens.values())
             
-            # Testar todos os pares
+            if self.v3_pools is not None and candidates is None:
+                for dex in self.dexs.values():
+                    if dex['type'] == 'v3' and dex.get('factory', ZERO_ADDRESS) != ZERO_ADDRESS:
+                        self.v3_pools.prepare(dex['factory'], network_tokens.values())
+            
+            # Logs desde o último scan: pares sem pool alterado reaproveitam o resultado
+            dirty_pairs = None
+            if self.pool_events is not None and self._prices_event_tracked():
+                self.pool_events.sync(head)
+                dirty_pairs = self.pool_events.take_dirty_pairs()
+                if self.pool_snapshot is not None and self.pool_snapshot.due():
+                    self.save_pool_snapshot()
+            
+            # Pares a testar: só os que existem no registro, ou todas as combinações
             token_list = list(network_tokens.items())
+            if candidates is not None:
+                position = {addr.lower(): i for i, (_, addr) in enumerate(token_list)}
+                indexes = sorted(tuple(sorted((position[a], position[b]))) for a, b in candidates)
+                pairs = [(token_list[i], token_list[j]) for i, j in indexes]
+            else:
+                pairs = [(a, b) for i, a in enumerate(token_list) for b in token_list[i+1:]]
+            
+            # Todos os venues com estado local: tamanho ótimo por rota em arrays, só os top-k recotados
+            if self.vector_scanner is not None and self._prices_event_tracked():
+                # Tabela de pools do bloco; preço de referência dos tokens sem stablecoin/nativo
+                if self.cycle_finder is not None:
+                    touched = self.cycle_finder.refresh()
+                else:
+                    touched = None
+                    self.pool_table.sync(self)
+                self.tokens.update_prices(self.pool_table.rates())
+                if BotConfig.SCAN_WORKERS > 0:
+                    # Tabela publicada na memória compartilhada; rotas avaliadas em N processos
+                    if self.shared_pools is None:
+                        self.shared_pools = SharedPoolTable.create()
+                    self.shared_pools.publish(self.pool_table, self.v2_pools.live_block or 0)
+                    candidates = get_route_workers().scan(self.shared_pools, BotConfig.FLASH_LOAN_FEE)
+                    opportunities = self.vector_scanner.confirm_rows(candidates, on_opportunity)
+                else:
+                    opportunities = self.vector_scanner.scan(pairs, on_opportunity=on_opportunity)
+                # Ciclos de 3+ pools a partir das arestas que mudaram no bloco
+                if self.cycle_finder is not None:
+                    opportunities.extend(self.cycle_finder.scan(touched, on_opportunity))
+                if opportunities:
+                    logger.info(f"🎯 {len(opportunities)} oportunidades encontradas!")
+                return opportunities
+            
+            # Converter USD para amount pelos decimais e preço do token (limitado a MAX_TRADE_AMOUNT_USD)
+            amount_usd = min(amount_usd, BotConfig.MAX_TRADE_AMOUNT_USD)
+            sized = []
+            for pair in pairs:
+                amount_in = self.tokens.to_raw(pair[0][1], amount_usd)
+                if amount_in:
+                    sized.append((pair, amount_in))
+                else:
+                    logger.debug(f"⚠️ {pair[0][0]} sem decimais/preço de referência em {self.network}")
+            
+            # Cotações de router (perna de compra) de todos os pares em um batch
+            self._prefetch_router_quotes([pair for pair, _ in sized], [amount_in for _, amount_in in sized])
             
-            for i, (symbol_in, addr_in) in enumerate(token_list):
-                for symbol_out, addr_out in token_list[i+1:]:
-                    # Converter USD para amount baseado no token
-                    amount_in = self.w3.to_wei(amount_usd, 'mwei')  # Assumindo 6 decimals
-                    
-                    opp = self.find_arbitrage_opportunity(addr_in, addr_out, amount_in)
-                    
-                    if opp:
-                        opp['symbol_in'] = symbol_in
-                        opp['symbol_out'] = symbol_out
-                        opportunities.append(opp)
+            # Pares cotados por RPC: fatias em paralelo (SCAN_PAIR_SHARDS)
+            shards = max(1, min(BotConfig.SCAN_PAIR_SHARDS, len(sized)))
+            if shards > 1:
+                with ThreadPoolExecutor(max_workers=shards, thread_name_prefix=f"pairs-{self.network}") as pool:
+                    results = pool.map(lambda item: self._scan_pair(*item, dirty_pairs), sized)
+                    opportunities = self._collect(results, on_opportunity)
+            else:
+                results = (self._scan_pair(pair, amount_in, dirty_pairs) for pair, amount_in in sized)
+                opportunities = self._collect(results, on_opportunity)
             
             if opportunities:
                 logger.info(f"🎯 {len(opportunities)} oportunidades encontradas!")
@@ -225,6 +481,62 @@ class DEXInterface:
             logger.error(f"❌ Erro ao escanear pares: {e}")
         
         return opportunities
+    
+    @staticmethod
+    def _collect(results, on_opportunity: Optional[Callable[[Opportunity], None]]) -> List[Opportunity]:
+        """Oportunidades dos pares à medida que ficam prontas (entregues uma a uma ao consumidor)"""
+        opportunities = []
+        for opp in results:
+            if opp:
+                opportunities.append(opp)
+                if on_opportunity is not None:
+                    on_opportunity(opp)
+        return opportunities
+    
+    def _scan_pair(self, pair, amount_in: int, dirty_pairs: Optional[set]) -> Optional[Opportunity]:
+        """Oportunidade de um par (reaproveita o resultado anterior se nenhum pool do par mudou)"""
+        (symbol_in, addr_in), (symbol_out, addr_out) = pair
+        key = (*sort_tokens(addr_in, addr_out), amount_in)
+        if dirty_pairs is not None and key in self._pair_results and key[:2] not in dirty_pairs:
+            opp = self._pair_results[key]
+            opp = opp.copy() if opp else None
+        else:
+            found = self.find_arbitrage_opportunity(addr_in, addr_out, amount_in)
+            opp = Opportunity.from_dict(found) if found else None
+            self._pair_results[key] = opp.copy() if opp else None
+        
+        if opp:
+            opp['symbol_in'] = symbol_in
+            opp['symbol_out'] = symbol_out
+        return opp
+
+class OpportunityHeap:
+    """As `size` melhores oportunidades pelo lucro líquido em USD (min-heap limitado)"""
+    
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._heap: List[Tuple[float, int, Dict]] = []
+        self._order = itertools.count()  # desempate sem comparar dicts
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, opportunity: Dict) -> bool:
+        """Insere se couber entre as melhores; retorna se entrou"""
+        entry = (opportunity['net_profit_usd'], next(self._order), opportunity)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+    
+    def best(self) -> Optional[Dict]:
+        return max(self._heap)[2] if self._heap else None
+    
+    def ranked(self) -> List[Dict]:
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
 
 class MultiDEXScanner:
     """Scanner de múltiplas DEXs em múltiplas redes"""
@@ -233,35 +545,148 @@ class MultiDEXScanner:
         self.blockchain = blockchain_connector
         self.dex_interfaces: Dict[str, DEXInterface] = {}
         self._initialize_interfaces()
+        # Redes em paralelo: latência do ciclo = rede mais lenta, não a soma
+        self._executor = ThreadPoolExecutor(max_workers=max(1, BotConfig.SCANNING_THREADS), thread_name_prefix="scan")
+        self._running: Dict[str, Future] = {}
+        self.last_candidates: List[Dict] = []  # melhores do último get_best_opportunity (para tentar a próxima)
     
     def _initialize_interfaces(self):
         """Inicializa interfaces para todas as redes"""
         for network_name, w3 in self.blockchain.web3_instances.items():
-            self.dex_interfaces[network_name] = DEXInterface(w3, network_name)
+            self.dex_interfaces[network_name] = DEXInterface(w3, network_name, self.blockchain)
             logger.info(f"✅ DEX interface criada para {network_name}")
     
-    def scan_all_networks(self, amount_usd: int = 10000) -> List[Dict]:
-        """Escaneia todas as redes buscando oportunidades"""
-        all_opportunities = []
+    def save_pool_snapshots(self) -> Dict[str, Optional[int]]:
+        """Snapshot de pools de todas as redes (no encerramento); rede -> bloco gravado"""
+        saved = {name: dex.save_pool_snapshot() for name, dex in self.dex_interfaces.items()}
+        written = {name: block for name, block in saved.items() if block is not None}
+        if written:
+            logger.info(f"💾 Snapshot de pools gravado: {', '.join(f'{n}@{b:,}' for n, b in written.items())}")
+        return saved
+    
+    def _gas_cost_usd(self, network_name: str) -> float:
+        """Custo em USD de uma arbitragem de 2 swaps (ARBITRAGE_GAS_UNITS) no gas price do bloco"""
+        try:
+            gas_price = self.blockchain.get_gas_price(network_name)
+            return convert_native_to_usd(gas_price * BotConfig.ARBITRAGE_GAS_UNITS / 1e18, network_name)
+        except Exception as e:
+            logger.error(f"❌ Erro ao estimar gas em {network_name}: {e}")
+            return 0.0
+    
+    def _scan_network(self, network_name: str, amount_usd: int, results: queue.Queue) -> List[Dict]:
+        """
+        Escaneia uma rede entregando cada oportunidade em `results` assim que
+        confirmada, como (rede, oportunidade); (rede, None) marca o fim
+        """
+        logger.info(f"🔍 Escaneando {network_name}...")
+        gas_per_swap = None
         
-        for network_name, dex_interface in self.dex_interfaces.items():
-            logger.info(f"🔍 Escaneando {network_name}...")
-            opportunities = dex_interface.scan_all_pairs(amount_usd)
-            all_opportunities.extend(opportunities)
+        def emit(opp: Dict):
+            nonlocal gas_per_swap
+            if gas_per_swap is None:
+                gas_per_swap = self._gas_cost_usd(network_name) / 2
+            opp['amount_usd'] = opportunity_usd(opp, 'amount_in')
+            opp['profit_usd'] = opportunity_usd(opp, 'profit')
+            # Líquido de taxa do flash loan e gas (ciclos pagam por swap)
+            swaps = max(2, len(opp.get('route', ())))
+            opp['net_profit_usd'] = (
+                opp['profit_usd'] - opp['amount_usd'] * BotConfig.FLASH_LOAN_FEE - gas_per_swap * swaps
+            )
+            results.put((network_name, opp))
         
-        # Ordenar por lucro
-        all_opportunities.sort(key=lambda x: x['profit_percentage'], reverse=True)
+        try:
+            return self.dex_interfaces[network_name].scan_all_pairs(amount_usd, emit)
+        except Exception as e:
+            logger.error(f"❌ Erro ao escanear {network_name}: {e}")
+            return []
+        finally:
+            results.put((network_name, None))
+    
+    def iter_opportunities(self, amount_usd: int = 10000, networks: Optional[List[str]] = None,
+                           timeout: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Oportunidades de todas as redes (ou só `networks`), na ordem em que são confirmadas
+        
+        Redes escaneadas em paralelo e cada oportunidade sai assim que a rede
+        a confirma, sem esperar o fim do scan daquela rede. Cada ciclo tem até
+        SCAN_NETWORK_TIMEOUT segundos: o que uma rede atrasada ainda não
+        entregou fica fora deste ciclo, e ela só volta a ser escaneada quando
+        o scan em andamento terminar. Parar de consumir o gerador não espera
+        as redes restantes.
+        """
+        timeout = BotConfig.SCAN_NETWORK_TIMEOUT if timeout is None else timeout
+        results: queue.Queue = queue.Queue()   # deste ciclo: scans atrasados não vazam para o próximo
+        pending = set()
         
+        for network_name in self.dex_interfaces:
+            if networks is not None and network_name not in networks:
+                continue
+            
+            running = self._running.get(network_name)
+            if running is not None and not running.done():
+                logger.warning(f"⏳ {network_name} ainda no scan anterior, fora deste ciclo")
+                continue
+            
+            self._running[network_name] = self._executor.submit(self._scan_network, network_name, amount_usd, results)
+            pending.add(network_name)
+        
+        deadline = time.monotonic() + timeout
+        while pending:
+            try:
+                network_name, opp = results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                logger.warning(f"⏰ {', '.join(sorted(pending))} não terminou o scan em {timeout}s, restante descartado")
+                return
+            if opp is None:
+                pending.discard(network_name)
+            else:
+                yield opp
+    
+    def scan_all_networks(self, amount_usd: int = 10000, networks: Optional[List[str]] = None,
+                          timeout: Optional[float] = None) -> List[Dict]:
+        """Escaneia todas as redes (ou só `networks`) em paralelo, ordenado por lucro líquido em USD"""
+        all_opportunities = [self._as_dict(opp) for opp in self.iter_opportunities(amount_usd, networks, timeout)]
+        all_opportunities.sort(key=lambda x: (x['net_profit_usd'], x['profit_percentage']), reverse=True)
         return all_opportunities
     
-    def get_best_opportunity(self, min_profit_usd: float = 50, min_profit_pct: float = 1.0) -> Optional[Dict]:
-        """Retorna a melhor oportunidade que atende aos critérios"""
-        opportunities = self.scan_all_networks()
+    def get_best_opportunity(
+        self,
+        min_profit_usd: float = 50,
+        min_profit_pct: float = 1.0,
+        networks: Optional[List[str]] = None,
+        max_hops: Optional[int] = None,
+        good_enough_usd: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Retorna a melhor oportunidade que atende aos critérios (e que o contrato consegue executar)
         
-        for opp in opportunities:
-            profit_usd = self.blockchain.get_web3(opp['network']).from_wei(opp['profit'], 'mwei')
+        Critério e ordem pelo lucro líquido em USD (gas e taxa de flash loan).
+        As redes são consumidas à medida que terminam: a primeira oportunidade
+        com lucro líquido ≥ good_enough_usd (padrão GOOD_ENOUGH_PROFIT_USD;
+        0 = esperar todas) volta sem esperar as demais.
+        """
+        max_hops = max_hops or BotConfig.EXECUTION_MAX_HOPS
+        good_enough = BotConfig.GOOD_ENOUGH_PROFIT_USD if good_enough_usd is None else good_enough_usd
+        candidates = OpportunityHeap(BotConfig.OPPORTUNITY_HEAP_SIZE)
+        
+        for opp in self.iter_opportunities(networks=networks):
+            if len(opp.get('route', ())) > max_hops:
+                continue
+            
+            if opp['net_profit_usd'] < min_profit_usd or opp['profit_percentage'] < min_profit_pct:
+                continue
             
-            if profit_usd >= min_profit_usd and opp['profit_percentage'] >= min_profit_pct:
-                return opp
+            if good_enough > 0 and opp['net_profit_usd'] >= good_enough:
+                logger.info(f"⚡ ${opp['net_profit_usd']:.2f} em {opp['network']}: executando sem esperar as outras redes")
+                self.last_candidates = [self._as_dict(opp)]
+                return self.last_candidates[0]
+            
+            candidates.push(opp)
         
-        return None
+        self.last_candidates = [self._as_dict(opp) for opp in candidates.ranked()]
+        return self.last_candidates[0] if self.last_candidates else None
+    
+    @staticmethod
+    def _as_dict(opp) -> Dict:
+        """Opportunity → dict para quem consome fora do scanner (executores anotam chaves novas)"""
+        return opp.to_dict() if isinstance(opp, Opportunity) else opp
@@ -0,0 +1,109 @@
+"""
+📞 AGREGAÇÃO DE eth_call VIA MULTICALL3
+Batch JSON-RPC que junta todas as eth_call simples em chamadas aggregate3
+(allowFailure = true) por bloco: centenas de leituras viram uma ou poucas
+eth_call, enviadas na mesma requisição HTTP que o resto do batch
+"""
+
+from typing import Dict, List, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+
+from src.config.config import BotConfig, MULTICALL3_ADDRESS
+from src.core.rpc_batch import RPCBatch, RPCError, RPCFuture, block_param, to_bytes
+
+AGGREGATE3_SELECTOR = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+def encode_aggregate3(calls: List[Tuple[str, bytes]]) -> str:
+    """[(alvo, calldata)] → calldata hex de aggregate3 com allowFailure em todas"""
+    encoded = encode(['(address,bool,bytes)[]'], [[(target, True, data) for target, data in calls]])
+    return '0x' + (AGGREGATE3_SELECTOR + encoded).hex()
+
+
+def decode_aggregate3(raw: bytes) -> List[Tuple[bool, bytes]]:
+    """Retorno de aggregate3 → [(sucesso, returnData)]"""
+    return list(decode(['(bool,bytes)[]'], raw)[0])
+
+
+def _aggregatable(future: RPCFuture) -> bool:
+    """eth_call sem from/value/gas: pode ser executada pelo Multicall3"""
+    if future.method != 'eth_call' or not future.params:
+        return False
+    call = future.params[0]
+    return isinstance(call, dict) and set(call) <= {'to', 'data'} and 'to' in call
+
+
+class MulticallBatch(RPCBatch):
+    """
+    RPCBatch que agrega as eth_call via Multicall3
+
+    Mesma interface do RPCBatch (call(), add(), execute()); as demais
+    chamadas do batch seguem como JSON-RPC normal na mesma requisição.
+    Falha de uma chamada vira erro só no futuro dela; falha do aggregate3
+    inteiro reenvia aquelas chamadas individualmente.
+    """
+
+    def __init__(self, transport, address: str = MULTICALL3_ADDRESS, max_calls: int = None):
+        super().__init__(transport)
+        self.address = address
+        self.max_calls = max_calls or BotConfig.MULTICALL_MAX_CALLS
+
+    def execute(self) -> List[RPCFuture]:
+        pending = [f for f in self.futures if not f.done()]
+        calls = [f for f in pending if _aggregatable(f)]
+        if len(calls) < 2:
+            return super().execute()
+
+        # Agrupar por bloco: cada aggregate3 lê um estado consistente
+        by_block: Dict[str, List[RPCFuture]] = {}
+        for future in calls:
+            block = future.params[1] if len(future.params) > 1 else 'latest'
+            by_block.setdefault(block, []).append(future)
+        
+        # 'latest' em várias fatias: cada eth_call poderia cair em um bloco
+        # diferente, então a cabeça é resolvida antes e todas usam o mesmo número
+        latest = by_block.get('latest')
+        if latest is not None and len(latest) > self.max_calls:
+            head = RPCBatch(self.transport)
+            block_number = head.block_number()
+            head.execute()
+            pinned = block_param(block_number.result())
+            by_block.setdefault(pinned, []).extend(by_block.pop('latest'))
+
+        inner = RPCBatch(self.transport)
+        aggregates = []
+        for block, futures in by_block.items():
+            for i in range(0, len(futures), self.max_calls):
+                chunk = futures[i:i + self.max_calls]
+                data = encode_aggregate3([(f.params[0]['to'], to_bytes(f.params[0]['data'])) for f in chunk])
+                aggregates.append((chunk, inner.call(self.address, data, block)))
+
+        aggregated = set(map(id, calls))
+        inner.futures.extend(f for f in pending if id(f) not in aggregated)
+        inner.execute()
+
+        fallback = []
+        for chunk, aggregate in aggregates:
+            try:
+                results = decode_aggregate3(aggregate.result())
+                if len(results) != len(chunk):
+                    raise ValueError(f"aggregate3 retornou {len(results)} de {len(chunk)} resultados")
+            except Exception:
+                fallback.extend(chunk)
+                continue
+
+            for future, (success, data) in zip(chunk, results):
+                if success:
+                    future.set_result('0x' + data.hex())
+                else:
+                    future.set_error(RPCError('eth_call', {'message': 'execution reverted', 'data': '0x' + data.hex()}))
+
+        if fallback:
+            # Multicall3 indisponível/sem gas: chamadas individuais no mesmo batch
+            retry = RPCBatch(self.transport)
+            retry.futures = fallback
+            retry.execute()
+
+        return self.futures
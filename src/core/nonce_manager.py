@@ -0,0 +1,143 @@
+"""
+🔢 GERENCIADOR DE NONCES
+Reserva nonces localmente por (rede, conta) para enviar várias transações
+seguidas sem consultar eth_getTransactionCount a cada envio
+"""
+
+import threading
+from typing import Callable, Dict, Tuple
+
+from loguru import logger
+from web3.exceptions import ContractLogicError
+
+from src.core.rpc_batch import RPCError
+
+# Mensagens de erro dos nós que indicam nonce local dessincronizado
+NONCE_ERRORS = (
+    'nonce too low',
+    'nonce too high',
+    'invalid nonce',
+    'already known',
+    'known transaction',
+    'replacement transaction underpriced',
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Verifica se o erro de envio foi causado por nonce inválido"""
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+def is_rejected(error: Exception) -> bool:
+    """
+    Verifica se o nó respondeu recusando a transação (objeto de erro JSON-RPC)
+
+    Timeouts e conexões derrubadas depois do POST são ambíguos: a transação
+    pode ter chegado ao mempool, então o nonce não pode ser reaproveitado.
+    """
+    if isinstance(error, (RPCError, ContractLogicError)):
+        return True
+    # web3.py: ValueError({'code': ..., 'message': ...}) com o erro do nó
+    return (isinstance(error, ValueError) and bool(error.args)
+            and isinstance(error.args[0], dict) and 'code' in error.args[0])
+
+
+class _AccountNonce:
+    """Estado de nonce de uma conta em uma rede"""
+
+    __slots__ = ('lock', 'next_nonce', 'synced')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_nonce = 0
+        self.synced = False
+
+
+class NonceManager:
+    """
+    Alocador de nonces por (rede, conta)
+
+    - o primeiro reserve() sincroniza com a contagem `pending` do nó
+    - os seguintes apenas incrementam o contador local
+    - erros de nonce ou lacunas (nonce reservado e não enviado) forçam
+      nova sincronização no próximo reserve()
+    """
+
+    def __init__(self, fetch_pending: Callable[[str, str], int]):
+        # fetch_pending(network, address) -> eth_getTransactionCount(address, 'pending')
+        self.fetch_pending = fetch_pending
+        self._accounts: Dict[Tuple[str, str], _AccountNonce] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, network: str, address: str) -> _AccountNonce:
+        key = (network, address.lower())
+        with self._lock:
+            state = self._accounts.get(key)
+            if state is None:
+                state = self._accounts[key] = _AccountNonce()
+            return state
+
+    def reserve(self, network: str, address: str) -> int:
+        """Reserva o próximo nonce da conta"""
+        state = self._state(network, address)
+        with state.lock:
+            if not state.synced:
+                state.next_nonce = self.fetch_pending(network, address)
+                state.synced = True
+            nonce = state.next_nonce
+            state.next_nonce += 1
+            return nonce
+
+    def sync(self, network: str, address: str, pending_count: int):
+        """Define o próximo nonce a partir de uma contagem `pending` já lida"""
+        state = self._state(network, address)
+        with state.lock:
+            state.next_nonce = pending_count
+            state.synced = True
+
+    def release(self, network: str, address: str, nonce: int):
+        """Devolve um nonce reservado cuja transação não chegou ao nó"""
+        state = self._state(network, address)
+        with state.lock:
+            if nonce == state.next_nonce - 1:
+                state.next_nonce = nonce
+            else:
+                # Lacuna: transações posteriores ficariam presas no mempool
+                logger.warning(f"⚠️ Lacuna no nonce {nonce} em {network}, ressincronizando")
+                state.synced = False
+
+    def resync(self, network: str, address: str):
+        """Força leitura da contagem `pending` no próximo reserve()"""
+        state = self._state(network, address)
+        with state.lock:
+            state.synced = False
+
+    def handle_send_error(self, network: str, address: str, nonce: int, error: Exception) -> bool:
+        """
+        Trata falha de envio
+
+        - erro de nonce: ressincroniza
+        - recusa explícita do nó: devolve o nonce
+        - erro de transporte (timeout, conexão): a transação pode ter sido
+          aceita, então ressincroniza com a contagem `pending` em vez de devolver
+
+        Returns:
+            True se o erro era de nonce (estado local ressincronizado)
+        """
+        if is_nonce_error(error):
+            logger.warning(f"⚠️ Erro de nonce em {network} ({error}), ressincronizando")
+            self.resync(network, address)
+            return True
+
+        if is_rejected(error):
+            self.release(network, address, nonce)
+        else:
+            logger.warning(f"⚠️ Envio incerto em {network} ({error}), ressincronizando nonce")
+            self.resync(network, address)
+        return False
+
+    def peek(self, network: str, address: str) -> int:
+        """Próximo nonce que seria reservado (-1 se ainda não sincronizado)"""
+        state = self._state(network, address)
+        return state.next_nonce if state.synced else -1
@@ -0,0 +1,126 @@
+"""
+🎯 OPORTUNIDADE DE ARBITRAGEM
+Registro com __slots__ (sem __dict__ por instância) que referencia os pools
+pelo índice na PoolTable; aceita o acesso por chave dos dicts antigos
+(opp['profit'], opp.get('route')) e converte de/para dict
+"""
+
+from typing import Dict, Optional, Tuple
+
+# chave antiga -> atributo
+_ALIASES = {'type': 'kind'}
+
+
+class Opportunity:
+    """
+    Oportunidade de uma rota (compra → venda, ou ciclo multi-hop)
+
+    Valores em unidades cruas de token_in; os campos *_usd são preenchidos
+    pelo MultiDEXScanner. `pools` são linhas da PoolTable da rede (-1 =
+    pool fora da tabela, ex.: DEX cotada pelo router).
+    """
+
+    __slots__ = (
+        'network', 'kind', 'buy_dex', 'sell_dex', 'token_in', 'token_out',
+        'amount_in', 'amount_out_buy', 'amount_out_sell', 'profit', 'profit_percentage',
+        'symbol_in', 'symbol_out', 'route', 'pools',
+        'amount_usd', 'profit_usd', 'net_profit_usd',
+    )
+
+    def __init__(self, network: str, buy_dex: str, sell_dex: str, token_in: str, token_out: str,
+                 amount_in: int, amount_out_buy: int, amount_out_sell: int, profit: Optional[int] = None,
+                 profit_percentage: Optional[float] = None, kind: str = 'pair', route: Tuple = (),
+                 pools: Tuple[int, ...] = (), symbol_in: Optional[str] = None, symbol_out: Optional[str] = None):
+        self.network = network
+        self.kind = kind
+        self.buy_dex = buy_dex
+        self.sell_dex = sell_dex
+        self.token_in = token_in
+        self.token_out = token_out
+        self.amount_in = amount_in
+        self.amount_out_buy = amount_out_buy
+        self.amount_out_sell = amount_out_sell
+        self.profit = amount_out_sell - amount_in if profit is None else profit
+        if profit_percentage is None:
+            profit_percentage = (self.profit / amount_in) * 100 if amount_in else 0.0
+        self.profit_percentage = profit_percentage
+        self.symbol_in = symbol_in
+        self.symbol_out = symbol_out
+        self.route = tuple(route)
+        self.pools = tuple(pools)
+        self.amount_usd = None
+        self.profit_usd = None
+        self.net_profit_usd = None
+
+    # ------------------------------------------------------------------
+    # Acesso por chave (compatível com os dicts de find_arbitrage_opportunity)
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str):
+        value = getattr(self, _ALIASES.get(key, key), None) if isinstance(key, str) else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, _ALIASES.get(key, key), value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [name for name in self.__slots__ if getattr(self, name) is not None]
+
+    def __repr__(self) -> str:
+        return (f"Opportunity({self.network} {self.symbol_in or self.token_in} → {self.symbol_out or self.token_out}, "
+                f"{self.buy_dex} → {self.sell_dex}, profit={self.profit})")
+
+    # ------------------------------------------------------------------
+    # Conversão
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, data: Dict, pools: Tuple[int, ...] = ()) -> 'Opportunity':
+        """Dict no formato de find_arbitrage_opportunity (ou to_dict) → Opportunity"""
+        opportunity = cls(
+            data['network'], data['buy_dex'], data['sell_dex'], data['token_in'], data['token_out'],
+            data['amount_in'], data['amount_out_buy'], data['amount_out_sell'], data.get('profit'),
+            data.get('profit_percentage'), data.get('type', 'pair'), data.get('route', ()),
+            data.get('pools', pools), data.get('symbol_in'), data.get('symbol_out')
+        )
+        for name in ('amount_usd', 'profit_usd', 'net_profit_usd'):
+            opportunity[name] = data.get(name)
+        return opportunity
+
+    def to_dict(self) -> Dict:
+        """Dict no formato antigo (ciclos com 'type' e 'route'), para logs, estatísticas e JSON"""
+        data = {}
+        for name in self.keys():
+            if name == 'kind':
+                if self.kind != 'pair':
+                    data['type'] = self.kind
+            elif name in ('route', 'pools'):
+                if getattr(self, name):
+                    data[name] = list(getattr(self, name))
+            else:
+                data[name] = getattr(self, name)
+        return data
+
+    def copy(self) -> 'Opportunity':
+        clone = Opportunity.__new__(Opportunity)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
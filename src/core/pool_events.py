@@ -0,0 +1,238 @@
+"""
+📜 ATUALIZAÇÃO DE POOLS POR EVENTOS
+Em vez de reler todos os pools a cada bloco, busca os logs Sync (V2) e
+Swap/Mint/Burn (V3) desde o último bloco sincronizado em UMA chamada
+eth_getLogs, aplica só nos pools que mudaram e marca esses pools como sujos
+"""
+
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from eth_utils import keccak
+from loguru import logger
+
+from src.config.config import BotConfig
+
+SYNC_TOPIC = '0x' + keccak(text="Sync(uint112,uint112)").hex()
+SWAP_V3_TOPIC = '0x' + keccak(text="Swap(address,address,int256,int256,uint160,uint128,int24)").hex()
+MINT_V3_TOPIC = '0x' + keccak(text="Mint(address,address,int24,int24,uint128,uint256,uint256)").hex()
+BURN_V3_TOPIC = '0x' + keccak(text="Burn(address,int24,int24,uint128,uint256,uint256)").hex()
+
+POOL_TOPICS = [SYNC_TOPIC, SWAP_V3_TOPIC, MINT_V3_TOPIC, BURN_V3_TOPIC]
+
+# Limite de endereços por filtro de eth_getLogs (vários filtros vão no mesmo batch)
+ADDRESSES_PER_FILTER = 500
+
+
+def _words(data: str) -> List[bytes]:
+    raw = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return [raw[i:i + 32] for i in range(0, len(raw), 32)]
+
+
+def _uint(word: bytes) -> int:
+    return int.from_bytes(word, 'big')
+
+
+def _int(word: bytes) -> int:
+    return int.from_bytes(word, 'big', signed=True)
+
+
+def _topic_int(topic: str) -> int:
+    return int.from_bytes(bytes.fromhex(topic[2:]), 'big', signed=True)
+
+
+class PoolEventUpdater:
+    """
+    Mantém o estado dos pools V2/V3 de uma rede a partir dos logs
+
+    - sync(): lê os logs de (último bloco sincronizado, cabeça] e aplica
+    - Sync e Swap trazem o estado absoluto; Mint ajusta liquidez e ticks;
+      Burn (amount > 0) relê só aquele pool, pois pode desligar ticks do bitmap
+    - buraco grande, falha de RPC ou reorg (cabeça para trás): relê tudo
+    - restore(): estado vindo do snapshot em disco; a retomada reaplica até
+      POOL_SNAPSHOT_MAX_GAP blocos de logs antes de desistir e reler tudo
+    """
+
+    def __init__(self, blockchain, network: str, v2_pools=None, v3_pools=None):
+        self.blockchain = blockchain
+        self.network = network
+        self.v2_pools = v2_pools
+        self.v3_pools = v3_pools
+        self.synced_block: Optional[int] = None
+        self.restored = False   # estado veio de snapshot: primeiro sync aceita buraco maior
+        self.dirty: Set[str] = set()
+        self._tracked: Set[str] = set()
+        self._lock = threading.Lock()
+        self.stats = {'syncs': 0, 'logs': 0, 'reloads': 0, 'bootstraps': 0, 'restores': 0}
+
+    # ------------------------------------------------------------------
+
+    def _pool_addresses(self) -> List[str]:
+        addresses = []
+        if self.v2_pools is not None:
+            addresses.extend(self.v2_pools.pair_addresses())
+        if self.v3_pools is not None:
+            addresses.extend(self.v3_pools.pool_addresses())
+        return addresses
+
+    def _bootstrap(self, block: int):
+        """Lê todos os pools no bloco `block` (estado base para os logs seguintes)"""
+        if self.v2_pools is not None:
+            self.v2_pools.load_live(block)
+        if self.v3_pools is not None:
+            self.v3_pools.load_live(block)
+        self._tracked = set(self._pool_addresses())
+        self.dirty.update(self._tracked)
+        self.synced_block = block
+        self.stats['bootstraps'] += 1
+
+    def restore(self, block: int):
+        """Caches preenchidas de um snapshot em `block`: o próximo sync() reaplica os logs desde lá"""
+        with self._lock:
+            self._tracked = set(self._pool_addresses())
+            self.dirty.update(self._tracked)
+            self.synced_block = block
+            self.restored = True
+            self.stats['restores'] += 1
+
+    def save_snapshot(self, store) -> Optional[int]:
+        """Grava o estado (consistente com synced_block) no PoolSnapshotStore; retorna o bloco"""
+        with self._lock:
+            if self.synced_block is None:
+                return None
+            store.save(self.synced_block, self.v2_pools, self.v3_pools)
+            return self.synced_block
+
+    def _fetch_logs(self, from_block: int, to_block: int, addresses: List[str]) -> Optional[List[Dict]]:
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return None
+
+        # Intervalos longos (reinício a partir de snapshot) em fatias de POOL_REGISTRY_CHUNK_BLOCKS
+        chunk = max(1, BotConfig.POOL_REGISTRY_CHUNK_BLOCKS)
+        futures = [
+            batch.add('eth_getLogs', [{
+                'fromBlock': hex(start),
+                'toBlock': hex(min(start + chunk - 1, to_block)),
+                'address': addresses[i:i + ADDRESSES_PER_FILTER],
+                'topics': [POOL_TOPICS]
+            }])
+            for start in range(from_block, to_block + 1, chunk)
+            for i in range(0, len(addresses), ADDRESSES_PER_FILTER)
+        ]
+        batch.execute()
+
+        logs = []
+        for future in futures:
+            try:
+                logs.extend(future.result() or [])
+            except Exception as e:
+                logger.debug(f"📜 {self.network}: eth_getLogs falhou ({e})")
+                return None
+
+        logs.sort(key=lambda log: (int(log['blockNumber'], 16), int(log['logIndex'], 16)))
+        return logs
+
+    def _apply(self, log: Dict, reload: Set[str]):
+        address = log['address'].lower()
+        topics = log['topics']
+        topic0 = topics[0].lower()
+
+        if topic0 == SYNC_TOPIC and self.v2_pools is not None:
+            words = _words(log['data'])
+            self.v2_pools.apply_sync(address, _uint(words[0]), _uint(words[1]))
+
+        elif topic0 == SWAP_V3_TOPIC and self.v3_pools is not None:
+            # amount0, amount1, sqrtPriceX96, liquidity, tick
+            words = _words(log['data'])
+            self.v3_pools.apply_swap(address, _uint(words[2]), _uint(words[3]), _int(words[4]))
+
+        elif topic0 == MINT_V3_TOPIC and self.v3_pools is not None:
+            # topics: owner, tickLower, tickUpper; data: sender, amount, amount0, amount1
+            words = _words(log['data'])
+            self.v3_pools.apply_mint(address, _topic_int(topics[2]), _topic_int(topics[3]), _uint(words[1]))
+
+        elif topic0 == BURN_V3_TOPIC and self.v3_pools is not None:
+            # data: amount, amount0, amount1 (amount 0 = só coleta de fees)
+            if _uint(_words(log['data'])[0]) == 0:
+                return
+            reload.add(address)
+
+        else:
+            return
+
+        self.dirty.add(address)
+
+    def sync(self, head: Optional[int] = None) -> int:
+        """Traz o estado dos pools até `head` (padrão: bloco atual). Retorna pools alterados."""
+        with self._lock:
+            try:
+                if head is None:
+                    head = self.blockchain.get_block_number(self.network)
+                if head is None:
+                    return 0
+
+                before = len(self.dirty)
+                addresses = self._pool_addresses()
+                max_gap = BotConfig.POOL_SNAPSHOT_MAX_GAP if self.restored else BotConfig.POOL_EVENTS_MAX_GAP
+
+                if (self.synced_block is None or head < self.synced_block
+                        or head - self.synced_block > max_gap):
+                    self.restored = False
+                    self._bootstrap(head)
+                    return len(self.dirty) - before
+
+                # Pools descobertos depois do bootstrap entram pelo caminho preguiçoso
+                # das caches (lidos no bloco sincronizado) e passam a ser rastreados
+                self._tracked.update(addresses)
+
+                if head == self.synced_block:
+                    return 0
+
+                logs = self._fetch_logs(self.synced_block + 1, head, addresses) if addresses else []
+                self.restored = False
+                if logs is None:
+                    self._bootstrap(head)
+                    return len(self.dirty) - before
+
+                reload: Set[str] = set()
+                for log in logs:
+                    self._apply(log, reload)
+
+                if reload:
+                    self.v3_pools.reload_live(reload, head)
+                    self.stats['reloads'] += len(reload)
+
+                self.synced_block = head
+                if self.v2_pools is not None:
+                    self.v2_pools.live_block = head
+                if self.v3_pools is not None:
+                    self.v3_pools.live_block = head
+
+                self.stats['syncs'] += 1
+                self.stats['logs'] += len(logs)
+                return len(self.dirty) - before
+
+            except Exception as e:
+                logger.error(f"❌ Erro ao sincronizar pools por eventos em {self.network}: {e}")
+                return 0
+
+    # ------------------------------------------------------------------
+
+    def take_dirty(self) -> Set[str]:
+        """Pools alterados desde a última chamada (e limpa o conjunto)"""
+        with self._lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def take_dirty_pairs(self) -> Set[Tuple[str, str]]:
+        """Pares (token0, token1) com algum pool alterado desde a última chamada"""
+        tokens: Dict[str, Tuple[str, str]] = {}
+        if self.v2_pools is not None:
+            tokens.update(self.v2_pools.pair_tokens())
+        if self.v3_pools is not None:
+            tokens.update(self.v3_pools.pool_tokens())
+        return {tokens[pool] for pool in self.take_dirty() if pool in tokens}
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'synced_block': self.synced_block, 'pools': len(self._tracked)}
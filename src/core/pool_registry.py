@@ -0,0 +1,292 @@
+"""
+🗂️ REGISTRO PERSISTENTE DE POOLS
+Índice em SQLite (um arquivo por rede) de todos os pools criados pelas
+factories configuradas, montado com eth_getLogs em blocos sobre PairCreated
+(V2) e PoolCreated (V3) e retomado do último bloco indexado
+"""
+
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from eth_utils import keccak
+from loguru import logger
+
+from src.config.config import BotConfig
+from src.core.rpc_scheduler import Priority, RPCThrottledError, rpc_priority
+from src.core.v2_pools import sort_tokens
+
+PAIR_CREATED_TOPIC = '0x' + keccak(text="PairCreated(address,address,address,uint256)").hex()
+POOL_CREATED_TOPIC = '0x' + keccak(text="PoolCreated(address,address,uint24,int24,address)").hex()
+
+# Requisições de eth_getLogs enviadas juntas em um batch
+LOG_REQUESTS_PER_BATCH = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pools (
+    address TEXT PRIMARY KEY,
+    dex TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    factory TEXT NOT NULL,
+    token0 TEXT NOT NULL,
+    token1 TEXT NOT NULL,
+    fee INTEGER NOT NULL,
+    created_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    factory TEXT PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+"""
+
+
+class PoolRecord(NamedTuple):
+    address: str
+    dex: str
+    kind: str        # 'v2' ou 'v3'
+    factory: str
+    token0: str
+    token1: str
+    fee: int         # V2: 0 (taxa vem da DEX); V3: fee tier
+    created_block: int
+
+
+def _topic_address(topic: str) -> str:
+    return '0x' + topic[-40:].lower()
+
+
+def _data_word(data: str, index: int) -> str:
+    raw = data[2:] if data.startswith('0x') else data
+    return raw[64 * index:64 * (index + 1)]
+
+
+def parse_creation_log(log: Dict, dex: str, kind: str, factory: str) -> Optional[PoolRecord]:
+    """PairCreated/PoolCreated → PoolRecord (None se o log não for de criação)"""
+    topics = log.get('topics', [])
+    if len(topics) < 3:
+        return None
+
+    block = int(log['blockNumber'], 16)
+    token0, token1 = _topic_address(topics[1]), _topic_address(topics[2])
+
+    if kind == 'v2' and topics[0].lower() == PAIR_CREATED_TOPIC:
+        address = '0x' + _data_word(log['data'], 0)[-40:]
+        return PoolRecord(address.lower(), dex, kind, factory, token0, token1, 0, block)
+
+    if kind == 'v3' and topics[0].lower() == POOL_CREATED_TOPIC and len(topics) >= 4:
+        address = '0x' + _data_word(log['data'], 1)[-40:]
+        return PoolRecord(address.lower(), dex, kind, factory, token0, token1, int(topics[3], 16), block)
+
+    return None
+
+
+class PoolRegistry:
+    """
+    Pools de uma rede em disco + índices em memória
+
+    - pools_for_token / pools_for_pair: O(1) (dicionários carregados na abertura)
+    - index(): avança o índice de cada factory até a cabeça, em blocos de
+      POOL_REGISTRY_CHUNK_BLOCKS (reduzido pela metade se o provedor recusar)
+    """
+
+    def __init__(self, network: str, path: Optional[str] = None):
+        self.network = network
+        self.path = path or os.path.join(BotConfig.POOL_REGISTRY_DIR, f"{network}.sqlite")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self._by_address: Dict[str, PoolRecord] = {}
+        self._by_token: Dict[str, List[PoolRecord]] = defaultdict(list)
+        self._by_pair: Dict[Tuple[str, str], List[PoolRecord]] = defaultdict(list)
+        self._progress: Dict[str, int] = {}
+        self._chunk: Dict[str, int] = {}
+
+        for row in self._db.execute("SELECT address, dex, kind, factory, token0, token1, fee, created_block FROM pools"):
+            self._index_record(PoolRecord(*row))
+        self._progress = dict(self._db.execute("SELECT factory, last_block FROM progress"))
+
+        logger.info(f"🗂️ Registro de pools {network}: {len(self._by_address)} pools ({self.path})")
+
+    def __len__(self) -> int:
+        return len(self._by_address)
+
+    def _index_record(self, record: PoolRecord):
+        self._by_address[record.address] = record
+        self._by_token[record.token0].append(record)
+        self._by_token[record.token1].append(record)
+        self._by_pair[(record.token0, record.token1)].append(record)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def get(self, address: str) -> Optional[PoolRecord]:
+        return self._by_address.get(address.lower())
+
+    def pools_for_token(self, token: str) -> List[PoolRecord]:
+        """Todos os pools (de todas as DEXs) que negociam `token`"""
+        return list(self._by_token.get(token.lower(), ()))
+
+    def pools_for_pair(self, token_a: str, token_b: str) -> List[PoolRecord]:
+        return list(self._by_pair.get(sort_tokens(token_a, token_b), ()))
+
+    def dexes_for_pair(self, token_a: str, token_b: str) -> Set[str]:
+        return {record.dex for record in self._by_pair.get(sort_tokens(token_a, token_b), ())}
+
+    def candidate_pairs(self, tokens: Optional[Iterable[str]] = None, min_dexes: int = 2) -> Set[Tuple[str, str]]:
+        """Pares com pool em pelo menos `min_dexes` DEXs (opcionalmente só entre `tokens`)"""
+        allowed = {t.lower() for t in tokens} if tokens is not None else None
+        return {
+            pair for pair, records in self._by_pair.items()
+            if (allowed is None or (pair[0] in allowed and pair[1] in allowed))
+            and len({record.dex for record in records}) >= min_dexes
+        }
+
+    def last_block(self, factory: str) -> Optional[int]:
+        return self._progress.get(factory.lower())
+
+    def is_synced(self, factory: str, head: int) -> bool:
+        """Índice da factory em dia (dentro de um bloco de indexação da cabeça)"""
+        last = self.last_block(factory)
+        return last is not None and last >= head - BotConfig.POOL_REGISTRY_CHUNK_BLOCKS
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def add(self, records: Iterable[PoolRecord], factory: Optional[str] = None,
+            last_block: Optional[int] = None) -> int:
+        """Grava pools novos (e o progresso da factory) em uma transação"""
+        new = [r for r in records if r.address not in self._by_address]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR IGNORE INTO pools VALUES (?, ?, ?, ?, ?, ?, ?, ?)", new)
+            if factory is not None and last_block is not None:
+                self._db.execute(
+                    "INSERT INTO progress VALUES (?, ?) ON CONFLICT(factory) DO UPDATE SET last_block = excluded.last_block",
+                    (factory.lower(), last_block)
+                )
+            for record in new:
+                self._index_record(record)
+            if factory is not None and last_block is not None:
+                self._progress[factory.lower()] = last_block
+        return len(new)
+
+    def seed(self, v2_pools=None, v3_pools=None, pairs: Iterable[Tuple[str, str]] = (),
+             factories: Iterable[Tuple[str, str, str]] = ()):
+        """
+        Preenche as caches de pares/pools com os endereços já indexados (sem getPair/getPool)
+
+        Para `pairs` de `factories` em dia, o que não está no registro não existe:
+        fica marcado como ausente e a cache não pergunta à factory
+        """
+        for record in self._by_address.values():
+            if record.kind == 'v2' and v2_pools is not None:
+                key = (record.factory, record.token0, record.token1)
+                if not v2_pools.pairs.get(key):
+                    v2_pools.pairs[key] = record.address
+            elif record.kind == 'v3' and v3_pools is not None:
+                key = (record.factory, record.token0, record.token1, record.fee)
+                if not v3_pools.pools.get(key):
+                    v3_pools.pools[key] = record.address
+
+        factories = list(factories)
+        for token0, token1 in pairs:
+            for _, kind, factory in factories:
+                factory = factory.lower()
+                if kind == 'v2' and v2_pools is not None:
+                    v2_pools.pairs.setdefault((factory, token0, token1), None)
+                elif kind == 'v3' and v3_pools is not None:
+                    for fee in v3_pools.fee_tiers:
+                        v3_pools.pools.setdefault((factory, token0, token1, fee), None)
+
+    # ------------------------------------------------------------------
+    # Indexação
+    # ------------------------------------------------------------------
+
+    def index(self, blockchain, factories: Iterable[Tuple[str, str, str]], head: Optional[int] = None,
+              max_requests: Optional[int] = None) -> int:
+        """
+        Avança o índice de cada (dex, tipo, factory) até `head`
+
+        Retorna quantos pools novos foram gravados. Limitado a `max_requests`
+        chamadas eth_getLogs por execução (o restante fica para a próxima).
+        """
+        if head is None:
+            head = blockchain.get_block_number(self.network)
+        if head is None:
+            return 0
+
+        budget = max_requests if max_requests is not None else BotConfig.POOL_REGISTRY_REQUESTS_PER_SCAN
+        added = 0
+
+        for dex, kind, factory in factories:
+            factory = factory.lower()
+            while budget > 0:
+                last = self._progress.get(factory)
+                start = last + 1 if last is not None else max(0, head - BotConfig.POOL_REGISTRY_LOOKBACK_BLOCKS)
+                if start > head:
+                    break
+
+                chunk = self._chunk.get(factory, BotConfig.POOL_REGISTRY_CHUNK_BLOCKS)
+                ranges = []
+                while len(ranges) < min(budget, LOG_REQUESTS_PER_BATCH) and start <= head:
+                    end = min(start + chunk - 1, head)
+                    ranges.append((start, end))
+                    start = end + 1
+                budget -= len(ranges)
+
+                result, throttled = self._index_ranges(blockchain, dex, kind, factory, ranges)
+                added += result
+                if throttled:
+                    return added  # orçamento de RPC esgotado: continuar no próximo scan
+
+                if self._progress.get(factory, -1) < ranges[-1][1]:
+                    # Provedor recusou o intervalo: tentar com blocos menores
+                    self._chunk[factory] = max(1, chunk // 2)
+                    logger.debug(f"🗂️ {self.network}: eth_getLogs recusado, {self._chunk[factory]} blocos por chamada")
+
+        if added:
+            logger.info(f"🗂️ {self.network}: +{added} pools indexados ({len(self)} no total)")
+        return added
+
+    def _index_ranges(self, blockchain, dex: str, kind: str, factory: str,
+                      ranges: List[Tuple[int, int]]) -> Tuple[int, bool]:
+        topic = PAIR_CREATED_TOPIC if kind == 'v2' else POOL_CREATED_TOPIC
+        batch = blockchain.batch(self.network)
+        if batch is None:
+            return 0, True
+
+        futures = [
+            batch.add('eth_getLogs', [{
+                'fromBlock': hex(start),
+                'toBlock': hex(end),
+                'address': [factory],
+                'topics': [[topic]]
+            }])
+            for start, end in ranges
+        ]
+        # Indexação é trabalho de fundo: primeira a ser descartada sob limite de RPC
+        with rpc_priority(Priority.BACKGROUND):
+            batch.execute()
+
+        added = 0
+        for (start, end), future in zip(ranges, futures):
+            try:
+                logs = future.result() or []
+            except RPCThrottledError:
+                return added, True
+            except Exception as e:
+                logger.debug(f"🗂️ {self.network}: eth_getLogs {start}-{end} falhou ({e})")
+                break
+
+            records = [parse_creation_log(log, dex, kind, factory) for log in logs]
+            added += self.add([r for r in records if r is not None], factory, end)
+
+        return added, False
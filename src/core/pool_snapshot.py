@@ -0,0 +1,217 @@
+"""
+💾 SNAPSHOT BINÁRIO DO ESTADO DOS POOLS
+Pares/pools resolvidos e o último estado conhecido (reservas V2; slot0,
+liquidez, bitmap e ticks V3) com o número do bloco, gravados em registros de
+tamanho fixo. Na partida o arquivo é lido via mmap e o PoolEventUpdater
+reaplica os logs do bloco do snapshot até a cabeça, em vez de reler tudo
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from src.config.config import BotConfig
+from src.core.v3_pools import V3PoolState
+
+MAGIC = b'MEVPOOLS'
+VERSION = 1
+
+# magic, versão, crc32 do corpo, bloco, pares V2, pools V3, reservas V2, estados V3
+_HEADER = struct.Struct('>8sIIQIIII')
+_V2_PAIR = struct.Struct('>20s20s20s20s')        # factory, token0, token1, par (zeros = não existe)
+_V3_POOL = struct.Struct('>20s20s20sI20s')       # factory, token0, token1, fee, pool
+_V2_RESERVES = struct.Struct('>20s14s14s')       # par, reserve0, reserve1 (uint112)
+_V3_STATE = struct.Struct('>20s20si16sHH')       # pool, sqrtPriceX96 (uint160), tick, liquidez, palavras, ticks
+_V3_WORD = struct.Struct('>h32s')                # palavra do bitmap, valor
+_V3_TICK = struct.Struct('>i16s')                # tick, liquidityNet (int128)
+
+_NONE = b'\x00' * 20
+
+
+def _addr(address: Optional[str]) -> bytes:
+    return bytes.fromhex(address[2:]) if address else _NONE
+
+
+def _hex(raw: bytes) -> str:
+    return '0x' + raw.hex()
+
+
+class PoolSnapshot(NamedTuple):
+    block: int
+    v2_pairs: Dict[Tuple[str, str, str], Optional[str]]
+    v3_pools: Dict[Tuple[str, str, str, int], Optional[str]]
+    v2_reserves: Dict[str, Tuple[int, int]]
+    v3_states: Dict[str, V3PoolState]
+
+
+def encode_snapshot(block: int, v2_pools=None, v3_pools=None) -> bytes:
+    """Estado das caches → bytes (estado só das caches com live_state)"""
+    body = bytearray()
+    v2_pairs = dict(v2_pools.pairs) if v2_pools is not None else {}
+    v3_keys = dict(v3_pools.pools) if v3_pools is not None else {}
+    v2_reserves = dict(v2_pools.live_state or {}) if v2_pools is not None else {}
+    v3_states = dict(v3_pools.live_state or {}) if v3_pools is not None else {}
+
+    for (factory, token0, token1), pair in v2_pairs.items():
+        body += _V2_PAIR.pack(_addr(factory), _addr(token0), _addr(token1), _addr(pair))
+    for (factory, token0, token1, fee), pool in v3_keys.items():
+        body += _V3_POOL.pack(_addr(factory), _addr(token0), _addr(token1), fee, _addr(pool))
+    for pair, (reserve0, reserve1) in v2_reserves.items():
+        body += _V2_RESERVES.pack(_addr(pair), reserve0.to_bytes(14, 'big'), reserve1.to_bytes(14, 'big'))
+    for address, state in v3_states.items():
+        body += _V3_STATE.pack(_addr(address), state.sqrt_price_x96.to_bytes(20, 'big'), state.tick,
+                               state.liquidity.to_bytes(16, 'big'), len(state.bitmap), len(state.ticks))
+        for word, value in state.bitmap.items():
+            body += _V3_WORD.pack(word, value.to_bytes(32, 'big'))
+        for tick, liquidity_net in state.ticks.items():
+            body += _V3_TICK.pack(tick, liquidity_net.to_bytes(16, 'big', signed=True))
+
+    header = _HEADER.pack(MAGIC, VERSION, zlib.crc32(body), block,
+                          len(v2_pairs), len(v3_keys), len(v2_reserves), len(v3_states))
+    return header + bytes(body)
+
+
+def decode_snapshot(buffer) -> PoolSnapshot:
+    """bytes/mmap → PoolSnapshot (ValueError se o arquivo for de outra versão ou estiver corrompido)"""
+    with memoryview(buffer) as view:
+        return _decode(view)
+
+
+def _decode(view: memoryview) -> PoolSnapshot:
+    if len(view) < _HEADER.size:
+        raise ValueError("snapshot truncado")
+    magic, version, crc, block, n_pairs, n_pools, n_reserves, n_states = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"formato desconhecido ({magic!r} v{version})")
+    if zlib.crc32(view[_HEADER.size:]) != crc:
+        raise ValueError("crc32 não confere")
+
+    offset = _HEADER.size
+    v2_pairs, v3_pools, v2_reserves, v3_states = {}, {}, {}, {}
+
+    end = offset + n_pairs * _V2_PAIR.size
+    for factory, token0, token1, pair in _V2_PAIR.iter_unpack(view[offset:end]):
+        v2_pairs[(_hex(factory), _hex(token0), _hex(token1))] = _hex(pair) if pair != _NONE else None
+    offset = end
+
+    end = offset + n_pools * _V3_POOL.size
+    pool_keys = {}
+    for factory, token0, token1, fee, pool in _V3_POOL.iter_unpack(view[offset:end]):
+        key = (_hex(factory), _hex(token0), _hex(token1), fee)
+        v3_pools[key] = _hex(pool) if pool != _NONE else None
+        if pool != _NONE:
+            pool_keys[v3_pools[key]] = key
+    offset = end
+
+    end = offset + n_reserves * _V2_RESERVES.size
+    for pair, reserve0, reserve1 in _V2_RESERVES.iter_unpack(view[offset:end]):
+        v2_reserves[_hex(pair)] = (int.from_bytes(reserve0, 'big'), int.from_bytes(reserve1, 'big'))
+    offset = end
+
+    for _ in range(n_states):
+        raw_pool, sqrt_price, tick, liquidity, n_words, n_ticks = _V3_STATE.unpack_from(view, offset)
+        offset += _V3_STATE.size
+        bitmap = {
+            word: int.from_bytes(value, 'big')
+            for word, value in _V3_WORD.iter_unpack(view[offset:offset + n_words * _V3_WORD.size])
+        }
+        offset += n_words * _V3_WORD.size
+        ticks = {
+            index: int.from_bytes(net, 'big', signed=True)
+            for index, net in _V3_TICK.iter_unpack(view[offset:offset + n_ticks * _V3_TICK.size])
+        }
+        offset += n_ticks * _V3_TICK.size
+
+        address = _hex(raw_pool)
+        key = pool_keys.get(address)
+        if key is None:
+            continue
+        v3_states[address] = V3PoolState(address, key[1], key[2], key[3], int.from_bytes(sqrt_price, 'big'),
+                                         tick, int.from_bytes(liquidity, 'big'), bitmap, ticks)
+
+    return PoolSnapshot(block, v2_pairs, v3_pools, v2_reserves, v3_states)
+
+
+class PoolSnapshotStore:
+    """
+    Snapshot de uma rede em disco (POOL_SNAPSHOT_DIR/<rede>.snapshot)
+
+    - save(): grava atomicamente (arquivo temporário + rename)
+    - load(): lê via mmap; None se não existir ou for inválido
+    - due(): passou POOL_SNAPSHOT_INTERVAL desde a última gravação
+    """
+
+    def __init__(self, network: str, path: Optional[str] = None):
+        self.network = network
+        self.path = path or os.path.join(BotConfig.POOL_SNAPSHOT_DIR, f"{network}.snapshot")
+        self.last_saved = time.monotonic()
+        self.stats = {'saves': 0, 'bytes': 0, 'restored_block': None}
+
+    def due(self) -> bool:
+        return time.monotonic() - self.last_saved >= BotConfig.POOL_SNAPSHOT_INTERVAL
+
+    def save(self, block: int, v2_pools=None, v3_pools=None) -> int:
+        """Grava o estado das caches no bloco `block`; retorna o tamanho em bytes"""
+        data = encode_snapshot(block, v2_pools, v3_pools)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+        self.last_saved = time.monotonic()
+        self.stats['saves'] += 1
+        self.stats['bytes'] = len(data)
+        logger.debug(f"💾 {self.network}: snapshot de pools no bloco {block:,} ({len(data) / 1024:.0f} KiB)")
+        return len(data)
+
+    def load(self) -> Optional[PoolSnapshot]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                snapshot = decode_snapshot(mapped)
+        except Exception as e:
+            logger.warning(f"⚠️ Snapshot de pools ignorado ({self.path}): {e}")
+            return None
+        self.stats['restored_block'] = snapshot.block
+        return snapshot
+
+    def restore(self, v2_pools=None, v3_pools=None, pool_events=None) -> Optional[int]:
+        """
+        Preenche as caches com o snapshot: endereços sempre; estado (reservas,
+        ticks) só com PoolEventUpdater, que o traz até a cabeça pelos logs.
+        Retorna o bloco do snapshot (None se nada foi restaurado).
+        """
+        snapshot = self.load()
+        if snapshot is None:
+            return None
+
+        if v2_pools is not None:
+            for key, pair in snapshot.v2_pairs.items():
+                v2_pools.pairs.setdefault(key, pair)
+        if v3_pools is not None:
+            for key, pool in snapshot.v3_pools.items():
+                v3_pools.pools.setdefault(key, pool)
+
+        if pool_events is not None:
+            if v2_pools is not None:
+                v2_pools.live_state = dict(snapshot.v2_reserves)
+                v2_pools.live_block = snapshot.block
+            if v3_pools is not None:
+                v3_pools.live_state = dict(snapshot.v3_states)
+                v3_pools.live_block = snapshot.block
+            pool_events.restore(snapshot.block)
+
+        logger.info(
+            f"💾 {self.network}: snapshot do bloco {snapshot.block:,} restaurado "
+            f"({len(snapshot.v2_reserves)} pares V2, {len(snapshot.v3_states)} pools V3)"
+        )
+        return snapshot.block
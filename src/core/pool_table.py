@@ -0,0 +1,169 @@
+"""
+🗃️ TABELA DE POOLS EM ARRAYS
+Estado de todos os pools de uma rede como colunas NumPy (struct-of-arrays):
+tokens, DEX, taxa e reservas por linha. Atualizada no lugar a cada bloco, sem
+criar um objeto por pool; oportunidades referenciam pools pelo índice da linha
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.v2_pools import ZERO_ADDRESS
+
+Q96 = float(2 ** 96)
+
+KIND_V2 = 0
+KIND_V3 = 1
+KINDS = ('v2', 'v3')
+
+
+class PoolTable:
+    """
+    Pools de uma rede, uma linha por pool (append-only: o índice não muda)
+
+    Colunas: token0/token1 (índices em `tokens`), venue (índice em `venues`,
+    nome da DEX), kind (KIND_V2/KIND_V3), fee (tier V3; 0 no V2), gamma
+    (fração que entra no pool) e reserve0/reserve1 (virtuais L/√P e L·√P no
+    V3; 0 = sem liquidez).
+    """
+
+    _COLUMNS = ('token0', 'token1', 'venue', 'kind', 'fee', 'gamma', 'reserve0', 'reserve1')
+
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.addresses: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.token_index: Dict[str, int] = {}
+        self.venues: List[str] = []
+        self.venue_index: Dict[str, int] = {}
+
+        self.token0 = np.zeros(capacity, dtype=np.int32)
+        self.token1 = np.zeros(capacity, dtype=np.int32)
+        self.venue = np.zeros(capacity, dtype=np.int16)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.fee = np.zeros(capacity, dtype=np.int32)
+        self.gamma = np.zeros(capacity)
+        self.reserve0 = np.zeros(capacity)
+        self.reserve1 = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self):
+        capacity = max(256, 2 * len(self.gamma))
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def _intern(self, values: List[str], index: Dict[str, int], value: str) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(values)
+            values.append(value)
+        return position
+
+    def upsert(self, address: str, token0: str, token1: str, venue: str, kind: str, fee: int,
+               gamma: float, reserve0: float, reserve1: float) -> Tuple[int, bool]:
+        """Insere ou atualiza um pool; retorna (linha, reservas mudaram ou pool novo)"""
+        row = self.index.get(address)
+        if row is not None:
+            if self.reserve0[row] == reserve0 and self.reserve1[row] == reserve1:
+                return row, False
+            self.reserve0[row], self.reserve1[row] = reserve0, reserve1
+            return row, True
+
+        if self.size == len(self.gamma):
+            self._grow()
+        row = self.size
+        self.size += 1
+        self.index[address] = row
+        self.addresses.append(address)
+        self.token0[row] = self._intern(self.tokens, self.token_index, token0)
+        self.token1[row] = self._intern(self.tokens, self.token_index, token1)
+        self.venue[row] = self._intern(self.venues, self.venue_index, venue)
+        self.kind[row] = KINDS.index(kind)
+        self.fee[row] = fee
+        self.gamma[row] = gamma
+        self.reserve0[row], self.reserve1[row] = reserve0, reserve1
+        return row, True
+
+    def sync(self, dex_interface) -> np.ndarray:
+        """Lê as caches V2/V3 do bloco; retorna as linhas novas ou com reservas alteradas"""
+        changed = []
+        dex_by_factory = {
+            dex['factory'].lower(): (name, dex) for name, dex in dex_interface.dexs.items()
+            if dex.get('factory', ZERO_ADDRESS) != ZERO_ADDRESS
+        }
+
+        if dex_interface.v2_pools is not None and dex_interface.v2_pools.pairs:
+            reserves = dex_interface.v2_pools.snapshot()
+            for (factory, token0, token1), pair in dex_interface.v2_pools.pairs.items():
+                if not pair or factory not in dex_by_factory or pair not in reserves:
+                    continue
+                name, dex = dex_by_factory[factory]
+                r0, r1 = reserves[pair]
+                row, moved = self.upsert(pair, token0, token1, name, 'v2', 0,
+                                         1.0 - dex.get('fee_bps', 30) / 10_000, float(r0), float(r1))
+                if moved:
+                    changed.append(row)
+
+        if dex_interface.v3_pools is not None and dex_interface.v3_pools.pools:
+            states = dex_interface.v3_pools.snapshot()
+            for (factory, token0, token1, fee), pool in dex_interface.v3_pools.pools.items():
+                state = states.get(pool) if pool else None
+                if state is None or factory not in dex_by_factory:
+                    continue
+                if state.liquidity and state.sqrt_price_x96:
+                    sqrt_price = state.sqrt_price_x96 / Q96
+                    r0, r1 = state.liquidity / sqrt_price, state.liquidity * sqrt_price
+                else:
+                    r0 = r1 = 0.0
+                row, moved = self.upsert(pool, token0, token1, dex_by_factory[factory][0], 'v3', fee,
+                                         1.0 - fee / 1_000_000, r0, r1)
+                if moved:
+                    changed.append(row)
+
+        return np.asarray(changed, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def valid(self) -> np.ndarray:
+        """Linhas com liquidez nos dois lados"""
+        return np.flatnonzero((self.reserve0[:self.size] > 0) & (self.reserve1[:self.size] > 0))
+
+    def row(self, address: Optional[str]) -> int:
+        """Linha de um pool (-1 se desconhecido)"""
+        return self.index.get(address, -1) if address else -1
+
+    def directed(self, rows: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Arestas das linhas nas duas direções: (linha, direção, token_in,
+        token_out, reserva_in, reserva_out); direção 0 = token0 → token1
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        both = np.concatenate([rows, rows])
+        direction = np.repeat(np.array([0, 1], dtype=np.int8), len(rows))
+        forward = direction == 0
+        token0, token1 = self.token0[both], self.token1[both]
+        reserve0, reserve1 = self.reserve0[both], self.reserve1[both]
+        return (
+            both, direction,
+            np.where(forward, token0, token1), np.where(forward, token1, token0),
+            np.where(forward, reserve0, reserve1), np.where(forward, reserve1, reserve0),
+        )
+
+    def rates(self) -> Iterator[Tuple[str, str, float, float]]:
+        """(token_in, token_out, taxa marginal crua, reserva crua de token_out) de cada aresta com liquidez"""
+        _, _, token_in, token_out, reserve_in, reserve_out = self.directed(self.valid())
+        for i in range(len(token_in)):
+            yield self.tokens[token_in[i]], self.tokens[token_out[i]], reserve_out[i] / reserve_in[i], reserve_out[i]
+
+    def memory_bytes(self) -> int:
+        """Bytes das colunas numéricas (capacidade alocada)"""
+        return sum(getattr(self, name).nbytes for name in self._COLUMNS)
@@ -0,0 +1,97 @@
+"""
+🏎️ CLIENTE JSON-RPC ENXUTO (CAMINHO DE EXECUÇÃO)
+Calldata de executeArbitrage codificada à mão, assinatura de transação legacy
+sem web3.py e envio direto pelo pool de endpoints (keep-alive, JSON rápido)
+"""
+
+import itertools
+from typing import Any, List, Optional
+
+import rlp
+from eth_keys import keys
+from eth_utils import keccak
+
+from src.core.address import to_address
+from src.core.rpc_batch import RPCError
+from src.core.rpc_pool import json_dumps
+
+# executeArbitrage(asset, amount, buyDex, sellDex, tokenIn, tokenOut, minProfit, deadline)
+EXECUTE_ARBITRAGE_SIGNATURE = (
+    "executeArbitrage(address,uint256,address,address,address,address,uint256,uint256)"
+)
+EXECUTE_ARBITRAGE_SELECTOR = keccak(text=EXECUTE_ARBITRAGE_SIGNATURE)[:4]
+
+_ADDRESS_PADDING = b'\x00' * 12
+
+
+def address_bytes(address: str) -> bytes:
+    """Endereço hex (com ou sem checksum) → 20 bytes (memoizados no Address internado)"""
+    return to_address(address).raw
+
+
+def encode_execute_arbitrage(asset: str, amount: int, buy_dex: str, sell_dex: str,
+                             token_in: str, token_out: str, min_profit: int,
+                             deadline: int) -> bytes:
+    """Calldata ABI de executeArbitrage (selector + 8 palavras de 32 bytes)"""
+    return b''.join((
+        EXECUTE_ARBITRAGE_SELECTOR,
+        _ADDRESS_PADDING, address_bytes(asset),
+        amount.to_bytes(32, 'big'),
+        _ADDRESS_PADDING, address_bytes(buy_dex),
+        _ADDRESS_PADDING, address_bytes(sell_dex),
+        _ADDRESS_PADDING, address_bytes(token_in),
+        _ADDRESS_PADDING, address_bytes(token_out),
+        min_profit.to_bytes(32, 'big'),
+        deadline.to_bytes(32, 'big'),
+    ))
+
+
+class LegacyTransactionSigner:
+    """
+    Assina transações legacy (EIP-155) direto com eth_keys + RLP
+
+    Produz exatamente os mesmos bytes que Account.sign_transaction para
+    {nonce, gasPrice, gas, to, value, data, chainId}
+    """
+
+    def __init__(self, private_key):
+        key = private_key if isinstance(private_key, bytes) else bytes.fromhex(
+            private_key[2:] if private_key.startswith('0x') else private_key
+        )
+        self._key = keys.PrivateKey(key)
+        self.address = self._key.public_key.to_checksum_address()
+
+    def sign(self, nonce: int, gas_price: int, gas: int, to: str, value: int,
+             data: bytes, chain_id: int) -> bytes:
+        """Retorna a transação assinada (bytes RLP prontos para eth_sendRawTransaction)"""
+        to_bytes = address_bytes(to)
+        unsigned = rlp.encode([nonce, gas_price, gas, to_bytes, value, data, chain_id, 0, 0])
+        signature = self._key.sign_msg_hash(keccak(unsigned))
+        v = signature.v + 35 + 2 * chain_id
+        return rlp.encode([nonce, gas_price, gas, to_bytes, value, data, v, signature.r, signature.s])
+
+
+class RawRPCClient:
+    """Chamadas JSON-RPC diretas pelo RPCEndpointPool, sem middlewares do web3"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, transport):
+        # transport: RPCEndpointPool (ou qualquer objeto com request(payload, hedge))
+        self.transport = transport
+
+    def request(self, method: str, params: Optional[List] = None, hedge: bool = True) -> Any:
+        payload = json_dumps({
+            'jsonrpc': '2.0',
+            'id': next(self._ids),
+            'method': method,
+            'params': params or []
+        })
+        reply = self.transport.request(payload, hedge=hedge, method=method)
+        if 'error' in reply:
+            raise RPCError(method, reply['error'])
+        return reply.get('result')
+
+    def send_raw_transaction(self, raw_transaction: bytes) -> str:
+        """Envia transação assinada e retorna o hash (0x...)"""
+        return self.request('eth_sendRawTransaction', ['0x' + raw_transaction.hex()], hedge=False)
@@ -0,0 +1,169 @@
+"""
+🧾 RASTREADOR DE RECEIPTS
+Acompanha transações enviadas em segundo plano: consulta os receipts em batch
+(a cada bloco novo ou intervalo) e resolve futuros/callbacks sem bloquear o scan
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.config.config import BotConfig
+
+
+@dataclass
+class ReceiptResult:
+    """Desfecho de uma transação acompanhada"""
+    network: str
+    tx_hash: str
+    success: bool
+    receipt: Optional[Dict] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+    context: Dict = field(default_factory=dict)
+
+    @property
+    def gas_used(self) -> int:
+        return int(self.receipt.get('gasUsed', '0x0'), 16) if self.receipt else 0
+
+    @property
+    def effective_gas_price(self) -> int:
+        return int(self.receipt.get('effectiveGasPrice', '0x0'), 16) if self.receipt else 0
+
+    @property
+    def block_number(self) -> Optional[int]:
+        return int(self.receipt['blockNumber'], 16) if self.receipt else None
+
+
+@dataclass
+class _TrackedTransaction:
+    network: str
+    tx_hash: str
+    submitted_at: float
+    future: Future
+    callbacks: List[Callable[[ReceiptResult], None]]
+    context: Dict
+
+
+class ReceiptTracker:
+    """
+    Acompanha transações pendentes de todas as redes em UMA thread
+
+    - cada rodada envia um batch eth_getTransactionReceipt por rede
+    - on_new_block() acorda a thread imediatamente (ligar ao BlockScanScheduler)
+    - transações sem receipt após `timeout` são resolvidas com timed_out=True
+    """
+
+    def __init__(self, blockchain_connector, poll_interval: Optional[float] = None,
+                 timeout: Optional[float] = None):
+        self.blockchain = blockchain_connector
+        self.poll_interval = poll_interval if poll_interval is not None else BotConfig.RECEIPT_POLL_INTERVAL_MS / 1000
+        self.timeout = timeout if timeout is not None else BotConfig.RECEIPT_TIMEOUT
+        self._pending: Dict[str, _TrackedTransaction] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, network: str, tx_hash: str,
+              callback: Optional[Callable[[ReceiptResult], None]] = None,
+              context: Optional[Dict] = None) -> Future:
+        """Começa a acompanhar uma transação e retorna um Future[ReceiptResult]"""
+        tx_hash = tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+        with self._lock:
+            tracked = self._pending.get(tx_hash)
+            if tracked is None:
+                tracked = _TrackedTransaction(
+                    network, tx_hash, time.time(), Future(), [], context or {}
+                )
+                self._pending[tx_hash] = tracked
+            if callback:
+                tracked.callbacks.append(callback)
+
+        self._ensure_running()
+        return tracked.future
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def on_new_block(self, network: str, block_number: int):
+        """Bloco novo: consultar receipts sem esperar o intervalo"""
+        if any(t.network == network for t in list(self._pending.values())):
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Thread
+    # ------------------------------------------------------------------
+
+    def _ensure_running(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="receipts", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._pending:
+                self.poll_once()
+
+    def poll_once(self) -> int:
+        """Uma rodada de consultas; retorna quantas transações foram resolvidas"""
+        by_network: Dict[str, List[_TrackedTransaction]] = {}
+        for tracked in list(self._pending.values()):
+            by_network.setdefault(tracked.network, []).append(tracked)
+
+        resolved = 0
+        for network, items in by_network.items():
+            batch = self.blockchain.batch(network)
+            if batch is None:
+                continue
+
+            futures = [batch.get_transaction_receipt(t.tx_hash) for t in items]
+            batch.execute()
+
+            now = time.time()
+            for tracked, future in zip(items, futures):
+                receipt = future.result_or(None)
+                if receipt:
+                    self._resolve(tracked, ReceiptResult(
+                        network, tracked.tx_hash,
+                        success=int(receipt.get('status', '0x0'), 16) == 1,
+                        receipt=receipt,
+                        elapsed=now - tracked.submitted_at,
+                        context=tracked.context
+                    ))
+                    resolved += 1
+                elif now - tracked.submitted_at > self.timeout:
+                    logger.warning(f"⏰ Sem receipt para {tracked.tx_hash[:10]} após {self.timeout:.0f}s")
+                    self._resolve(tracked, ReceiptResult(
+                        network, tracked.tx_hash,
+                        success=False,
+                        timed_out=True,
+                        elapsed=now - tracked.submitted_at,
+                        context=tracked.context
+                    ))
+                    resolved += 1
+
+        return resolved
+
+    def _resolve(self, tracked: _TrackedTransaction, result: ReceiptResult):
+        with self._lock:
+            self._pending.pop(tracked.tx_hash, None)
+
+        tracked.future.set_result(result)
+        for callback in tracked.callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"❌ Erro no callback do receipt {tracked.tx_hash[:10]}: {e}")
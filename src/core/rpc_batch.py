@@ -0,0 +1,193 @@
+"""
+📦 MÓDULO DE BATCHING JSON-RPC
+Agrupa várias chamadas JSON-RPC em UMA requisição HTTP por rede
+"""
+
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.rpc_pool import NON_HEDGEABLE_METHODS
+
+
+class RPCError(Exception):
+    """Erro retornado pelo nó para uma chamada JSON-RPC"""
+
+    def __init__(self, method: str, error: Dict):
+        self.method = method
+        self.code = error.get('code')
+        self.data = error.get('data')
+        super().__init__(f"{method}: {error.get('message', error)}")
+
+
+class RPCFuture:
+    """Resultado (futuro) de uma chamada dentro de um batch"""
+
+    __slots__ = ('method', 'params', '_formatter', '_result', '_error', '_done')
+
+    def __init__(self, method: str, params: List, formatter: Optional[Callable] = None):
+        self.method = method
+        self.params = params
+        self._formatter = formatter
+        self._result = None
+        self._error: Optional[Exception] = None
+        self._done = False
+
+    def done(self) -> bool:
+        """Indica se o batch já foi executado"""
+        return self._done
+
+    def set_result(self, raw: Any):
+        try:
+            self._result = self._formatter(raw) if self._formatter else raw
+        except Exception as e:
+            self._error = e
+        self._done = True
+
+    def set_error(self, error: Exception):
+        self._error = error
+        self._done = True
+
+    def result(self) -> Any:
+        """Retorna o valor (ou levanta o erro) da chamada"""
+        if not self._done:
+            raise RuntimeError(f"Batch ainda não executado ({self.method})")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def result_or(self, default: Any = None) -> Any:
+        """Retorna o valor, ou `default` se a chamada falhou"""
+        try:
+            return self.result()
+        except Exception:
+            return default
+
+
+def to_int(value: str) -> int:
+    """Converte QUANTITY hexadecimal do JSON-RPC para int"""
+    return int(value, 16)
+
+
+def to_bytes(value: str) -> bytes:
+    """Converte DATA hexadecimal do JSON-RPC para bytes"""
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def block_param(block) -> str:
+    """Normaliza identificador de bloco para o formato JSON-RPC"""
+    if isinstance(block, int):
+        return hex(block)
+    return block
+
+
+class RPCBatch:
+    """
+    Coleta chamadas JSON-RPC e envia todas em um único POST
+
+    Uso:
+        with blockchain.batch('base') as batch:
+            gas = batch.gas_price()
+            nonce = batch.get_transaction_count(address)
+        gas.result(), nonce.result()
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, transport):
+        # transport: qualquer objeto com request(payload) -> resposta JSON
+        # decodificada (ex.: RPCEndpointPool)
+        self.transport = transport
+        self.futures: List[RPCFuture] = []
+
+    def __len__(self) -> int:
+        return len(self.futures)
+
+    def __enter__(self) -> 'RPCBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.execute()
+        return False
+
+    def add(self, method: str, params: Optional[List] = None,
+            formatter: Optional[Callable] = None) -> RPCFuture:
+        """Adiciona uma chamada ao batch e retorna seu futuro"""
+        future = RPCFuture(method, params or [], formatter)
+        self.futures.append(future)
+        return future
+
+    # ------------------------------------------------------------------
+    # Atalhos para as leituras mais comuns
+    # ------------------------------------------------------------------
+
+    def gas_price(self) -> RPCFuture:
+        return self.add('eth_gasPrice', [], to_int)
+
+    def chain_id(self) -> RPCFuture:
+        return self.add('eth_chainId', [], to_int)
+
+    def block_number(self) -> RPCFuture:
+        return self.add('eth_blockNumber', [], to_int)
+
+    def get_balance(self, address: str, block='latest') -> RPCFuture:
+        return self.add('eth_getBalance', [address, block_param(block)], to_int)
+
+    def get_transaction_count(self, address: str, block='latest') -> RPCFuture:
+        return self.add('eth_getTransactionCount', [address, block_param(block)], to_int)
+
+    def call(self, to: str, data: str, block='latest') -> RPCFuture:
+        return self.add('eth_call', [{'to': to, 'data': data}, block_param(block)], to_bytes)
+
+    def get_transaction_receipt(self, tx_hash: str) -> RPCFuture:
+        return self.add('eth_getTransactionReceipt', [tx_hash])
+
+    # ------------------------------------------------------------------
+
+    def execute(self) -> List[RPCFuture]:
+        """Envia todas as chamadas pendentes em uma requisição HTTP"""
+        pending = [f for f in self.futures if not f.done()]
+        if not pending:
+            return self.futures
+
+        by_id = {}
+        payload = []
+        for future in pending:
+            request_id = next(self._ids)
+            by_id[request_id] = future
+            payload.append({
+                'jsonrpc': '2.0',
+                'id': request_id,
+                'method': future.method,
+                'params': future.params
+            })
+
+        try:
+            hedge = all(f.method not in NON_HEDGEABLE_METHODS for f in pending)
+            replies = self.transport.request(payload, hedge=hedge)
+
+            # Alguns provedores respondem objeto único para batch de 1
+            if isinstance(replies, dict):
+                replies = [replies]
+
+            for reply in replies:
+                future = by_id.pop(reply.get('id'), None)
+                if future is None:
+                    continue
+                if 'error' in reply:
+                    future.set_error(RPCError(future.method, reply['error']))
+                else:
+                    future.set_result(reply.get('result'))
+
+            for future in by_id.values():
+                future.set_error(RPCError(future.method, {'message': 'sem resposta no batch'}))
+
+        except Exception as e:
+            logger.debug(f"Erro no batch JSON-RPC ({len(pending)} chamadas): {e}")
+            for future in pending:
+                if not future.done():
+                    future.set_error(e)
+
+        return self.futures
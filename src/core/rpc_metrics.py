@@ -0,0 +1,169 @@
+"""
+📈 MÉTRICAS DE RPC
+Latência e erros de cada chamada por (rede, endpoint, método) em histogramas
+de buckets fixos (memória constante, independente do volume de chamadas)
+"""
+
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Buckets logarítmicos: 0.1ms * 2^(i/4) → 0.1ms .. ~100s com ~19% de resolução
+_BUCKET_BASE = 0.0001
+_BUCKETS_PER_OCTAVE = 4
+_NUM_BUCKETS = 80
+
+
+def _bucket_upper(index: int) -> float:
+    return _BUCKET_BASE * 2 ** ((index + 1) / _BUCKETS_PER_OCTAVE)
+
+
+class LatencyHistogram:
+    """Histograma de latências com buckets logarítmicos fixos"""
+
+    __slots__ = ('counts', 'total', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float):
+        if latency <= _BUCKET_BASE:
+            index = 0
+        else:
+            index = min(_NUM_BUCKETS - 1, int(math.log2(latency / _BUCKET_BASE) * _BUCKETS_PER_OCTAVE))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += latency
+        if latency > self.max:
+            self.max = latency
+
+    def percentile(self, q: float) -> float:
+        """Limite superior do bucket que contém o quantil q (0..1)"""
+        if not self.total:
+            return 0.0
+        target = q * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+
+class MethodStats:
+    """Estatísticas de um método em um endpoint"""
+
+    __slots__ = ('histogram', 'calls', 'errors', 'rpc_errors')
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.calls = 0
+        self.errors = 0        # falhas de transporte (timeout, HTTP, conexão)
+        self.rpc_errors = 0    # respostas com campo "error"
+
+    def to_dict(self) -> Dict:
+        h = self.histogram
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'rpc_errors': self.rpc_errors,
+            'error_rate': (self.errors + self.rpc_errors) / self.calls if self.calls else 0.0,
+            'total_ms': h.sum * 1000,
+            'mean_ms': h.mean * 1000,
+            'p50_ms': h.percentile(0.50) * 1000,
+            'p99_ms': h.percentile(0.99) * 1000,
+            'max_ms': h.max * 1000,
+        }
+
+
+def endpoint_label(url: str) -> str:
+    """Nome curto do endpoint (só o host: chaves de API no path não vão para logs)"""
+    parsed = urlparse(url)
+    return parsed.netloc or url[:40]
+
+
+def method_label(payload: Any) -> str:
+    """Nome do método de um payload JSON-RPC (objeto ou batch)"""
+    if isinstance(payload, dict):
+        return payload.get('method', '?')
+    if isinstance(payload, list) and payload:
+        method, _ = Counter(item.get('method', '?') for item in payload).most_common(1)[0]
+        return f"batch({method})"
+    return '?'
+
+
+def count_rpc_errors(reply: Any) -> int:
+    """Quantas respostas de um reply JSON-RPC vieram com erro"""
+    if isinstance(reply, dict):
+        return 1 if 'error' in reply else 0
+    if isinstance(reply, list):
+        return sum(1 for item in reply if isinstance(item, dict) and 'error' in item)
+    return 0
+
+
+class RPCMetrics:
+    """Registro de todas as chamadas RPC do processo"""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, network: str, endpoint: str, method: str, latency: float,
+               ok: bool = True, rpc_errors: int = 0):
+        """Registra uma chamada (endpoint pode ser URL completa)"""
+        key = (network, endpoint_label(endpoint), method)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = MethodStats()
+            stats.calls += 1
+            stats.histogram.record(latency)
+            if not ok:
+                stats.errors += 1
+            stats.rpc_errors += rpc_errors
+
+    def snapshot(self, network: Optional[str] = None) -> List[Dict]:
+        """Todas as séries, ordenadas por tempo total gasto"""
+        with self._lock:
+            rows = [
+                {'network': net, 'endpoint': endpoint, 'method': method, **stats.to_dict()}
+                for (net, endpoint, method), stats in self._stats.items()
+                if network is None or net == network
+            ]
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def top(self, n: int = 10, by: str = 'total_ms') -> List[Dict]:
+        """As n séries com maior valor de `by` (total_ms, p99_ms, calls, error_rate...)"""
+        rows = self.snapshot()
+        rows.sort(key=lambda row: row[by], reverse=True)
+        return rows[:n]
+
+    def by_endpoint(self) -> Dict[Tuple[str, str], Dict]:
+        """Totais agregados por (rede, endpoint)"""
+        totals: Dict[Tuple[str, str], Dict] = {}
+        for row in self.snapshot():
+            key = (row['network'], row['endpoint'])
+            entry = totals.setdefault(key, {'calls': 0, 'errors': 0, 'rpc_errors': 0, 'total_ms': 0.0})
+            entry['calls'] += row['calls']
+            entry['errors'] += row['errors']
+            entry['rpc_errors'] += row['rpc_errors']
+            entry['total_ms'] += row['total_ms']
+        return totals
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Instância global
+rpc_metrics = RPCMetrics()
@@ -0,0 +1,312 @@
+"""
+🌐 POOL DE ENDPOINTS RPC
+Vários RPCs por rede com roteamento por latência, failover e requisições "hedged"
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+import requests
+from loguru import logger
+from web3.providers.base import JSONBaseProvider
+
+from src.config.config import BotConfig
+from src.core.rpc_metrics import count_rpc_errors, method_label, rpc_metrics
+from src.core.rpc_scheduler import (
+    EndpointScheduler,
+    Priority,
+    RPCThrottledError,
+    priority_for,
+    rate_limit_for
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Métodos que nunca são duplicados em outro endpoint
+NON_HEDGEABLE_METHODS = {
+    'eth_sendRawTransaction',
+    'eth_sendTransaction',
+}
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serializa payload JSON-RPC (orjson se disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def json_loads(data: bytes) -> Any:
+    """Decodifica resposta JSON-RPC (orjson se disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RPCPoolError(Exception):
+    """Todos os endpoints de uma rede falharam"""
+
+
+class EndpointStats:
+    """Latência e taxa de erro (janela móvel) de um endpoint"""
+
+    def __init__(self, url: str, window: int = 256):
+        self.url = url
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.total_requests = 0
+        self.total_errors = 0
+        self._percentiles: Optional[tuple] = None
+
+    def record(self, latency: float, ok: bool):
+        """Registra o resultado de uma requisição"""
+        self.total_requests += 1
+        self.outcomes.append(ok)
+
+        if ok:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+            self._percentiles = None
+        else:
+            self.total_errors += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= BotConfig.RPC_MAX_CONSECUTIVE_ERRORS:
+                self.cooldown_until = time.time() + BotConfig.RPC_ENDPOINT_COOLDOWN
+
+    def _compute_percentiles(self) -> tuple:
+        if self._percentiles is None:
+            ordered = sorted(self.latencies)
+            if ordered:
+                p50 = ordered[len(ordered) // 2]
+                p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+                self._percentiles = (p50, p99)
+            else:
+                self._percentiles = (0.0, 0.0)
+        return self._percentiles
+
+    @property
+    def p50(self) -> float:
+        return self._compute_percentiles()[0]
+
+    @property
+    def p99(self) -> float:
+        return self._compute_percentiles()[1]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - (sum(self.outcomes) / len(self.outcomes))
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.time() < self.cooldown_until
+
+    def score(self) -> float:
+        """Menor = melhor. Endpoints sem amostras são explorados primeiro."""
+        if self.cooling_down:
+            return float('inf')
+        if not self.latencies:
+            # Nunca respondeu: explorar se é novo, penalizar se só teve erros
+            return BotConfig.RPC_REQUEST_TIMEOUT if self.outcomes else 0.0
+        return self.p50 * (1 + 10 * self.error_rate)
+
+    def to_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'p50_ms': self.p50 * 1000,
+            'p99_ms': self.p99 * 1000,
+            'error_rate': self.error_rate,
+            'requests': self.total_requests,
+            'errors': self.total_errors,
+            'cooling_down': self.cooling_down
+        }
+
+
+class RPCEndpointPool:
+    """Conjunto de endpoints RPC de uma rede"""
+
+    def __init__(self, network: str, urls: List[str], timeout: Optional[float] = None,
+                 hedge_delay: Optional[float] = None, rate_limit: Optional[float] = None):
+        if not urls:
+            raise ValueError(f"Nenhum endpoint RPC configurado para {network}")
+
+        self.network = network
+        self.timeout = timeout if timeout is not None else BotConfig.RPC_REQUEST_TIMEOUT
+        if hedge_delay is None:
+            hedge_delay = BotConfig.RPC_HEDGE_DELAY_MS / 1000 if BotConfig.RPC_HEDGE_ENABLED else 0
+        self.hedge_delay = hedge_delay
+
+        self.endpoints = [EndpointStats(url, BotConfig.RPC_LATENCY_WINDOW) for url in urls]
+        self.sessions = {url: requests.Session() for url in urls}
+        self.schedulers = {
+            url: EndpointScheduler(rate_limit if rate_limit is not None else rate_limit_for(url))
+            for url in urls
+        }
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 2 * len(urls)),
+            thread_name_prefix=f"rpc-{network}"
+        )
+
+    # ------------------------------------------------------------------
+    # Roteamento
+    # ------------------------------------------------------------------
+
+    def ranked(self) -> List[EndpointStats]:
+        """Endpoints ordenados do mais rápido para o mais lento"""
+        with self._lock:
+            return sorted(self.endpoints, key=lambda e: e.score())
+
+    def best_url(self) -> str:
+        return self.ranked()[0].url
+
+    def record(self, url: str, latency: float, ok: bool):
+        """Registra amostra de latência de um endpoint"""
+        with self._lock:
+            for endpoint in self.endpoints:
+                if endpoint.url == url:
+                    endpoint.record(latency, ok)
+                    return
+
+    def _post(self, endpoint: EndpointStats, payload: bytes, method: str = '?',
+              priority: Priority = Priority.QUOTE) -> Any:
+        scheduler = self.schedulers[endpoint.url]
+        if not scheduler.acquire(priority):
+            raise RPCThrottledError(f"{self.network}: orçamento de RPC esgotado ({priority.name}, {method})")
+
+        start = time.perf_counter()
+        try:
+            response = self.sessions[endpoint.url].post(
+                endpoint.url,
+                data=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result = json_loads(response.content)
+        except Exception as e:
+            if isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code == 429:
+                scheduler.penalize()
+            latency = time.perf_counter() - start
+            self.record(endpoint.url, latency, False)
+            rpc_metrics.record(self.network, endpoint.url, method, latency, ok=False)
+            raise
+
+        latency = time.perf_counter() - start
+        self.record(endpoint.url, latency, True)
+        rpc_metrics.record(self.network, endpoint.url, method, latency, rpc_errors=count_rpc_errors(result))
+        return result
+
+    def request(self, payload: Any, hedge: bool = True, method: Optional[str] = None) -> Any:
+        """
+        Envia um payload JSON-RPC (objeto ou batch) e retorna a resposta decodificada
+
+        - vai para o endpoint com menor latência
+        - se `hedge` e o primário demorar mais que hedge_delay, duplica no segundo
+        - em erro, tenta os demais endpoints em ordem
+        - cada envio passa pelo token bucket do endpoint (ver rpc_scheduler)
+        """
+        if isinstance(payload, bytes):
+            body = payload
+            if method is None:
+                payload = json_loads(payload)
+        else:
+            body = json_dumps(payload)
+
+        if method is not None:
+            methods = [method]
+        elif isinstance(payload, list):
+            methods = [item.get('method', '') for item in payload]
+        else:
+            methods = [payload.get('method', '')]
+        method = method or method_label(payload)
+        priority = priority_for(methods)
+        ranked = self.ranked()
+        usable = [e for e in ranked if not e.cooling_down] or ranked
+
+        errors = []
+        start_index = 0
+
+        if hedge and self.hedge_delay > 0 and len(usable) > 1:
+            futures = [self._executor.submit(self._post, usable[0], body, method, priority)]
+            done, _ = wait(futures, timeout=self.hedge_delay)
+            if not done:
+                futures.append(self._executor.submit(self._post, usable[1], body, method, priority))
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        errors.append(e)
+            start_index = len(futures)
+
+        for endpoint in usable[start_index:]:
+            try:
+                return self._post(endpoint, body, method, priority)
+            except Exception as e:
+                errors.append(e)
+                logger.debug(f"RPC {self.network} falhou em {endpoint.url[:40]}: {e}")
+
+        if errors and all(isinstance(e, RPCThrottledError) for e in errors):
+            raise errors[-1]
+        raise RPCPoolError(f"Todos os endpoints de {self.network} falharam: {errors[-1] if errors else '?'}")
+
+    # ------------------------------------------------------------------
+    # Saúde
+    # ------------------------------------------------------------------
+
+    def is_healthy(self) -> bool:
+        """Saudável se algum endpoint está fora de cooldown e com erro < 50%"""
+        with self._lock:
+            return any(
+                not e.cooling_down and e.error_rate < 0.5
+                for e in self.endpoints
+            )
+
+    def reset(self):
+        """Zera cooldowns (usado por reconnect)"""
+        with self._lock:
+            for endpoint in self.endpoints:
+                endpoint.cooldown_until = 0.0
+                endpoint.consecutive_failures = 0
+
+    def get_stats(self) -> List[Dict]:
+        return [
+            {**e.to_dict(), 'scheduler': self.schedulers[e.url].get_stats()}
+            for e in self.ranked()
+        ]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        for session in self.sessions.values():
+            session.close()
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """Provider Web3 que roteia cada chamada pelo RPCEndpointPool"""
+
+    def __init__(self, pool: RPCEndpointPool):
+        self.pool = pool
+        super().__init__()
+
+    def __str__(self) -> str:
+        return f"RPC pool {self.pool.network} ({len(self.pool.endpoints)} endpoints)"
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        response = self.pool.request(request_data, hedge=method not in NON_HEDGEABLE_METHODS, method=method)
+        return response
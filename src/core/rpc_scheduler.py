@@ -0,0 +1,161 @@
+"""
+🚦 AGENDADOR DE REQUISIÇÕES RPC
+Token bucket por endpoint com classes de prioridade: execução e receipts
+passam na frente de cotações; trabalho de fundo é descartado primeiro
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Iterable, Optional
+
+from src.config.config import BotConfig
+
+
+class Priority(IntEnum):
+    """Classes de prioridade (menor = mais importante)"""
+    EXECUTION = 0    # envio de transação, nonce, gas
+    RECEIPT = 1      # receipts e cabeça da cadeia
+    QUOTE = 2        # leituras de preço/reservas durante o scan
+    BACKGROUND = 3   # segurança de tokens, estatísticas de contrato
+
+
+METHOD_PRIORITY = {
+    'eth_sendRawTransaction': Priority.EXECUTION,
+    'eth_sendTransaction': Priority.EXECUTION,
+    'eth_getTransactionCount': Priority.EXECUTION,
+    'eth_gasPrice': Priority.EXECUTION,
+    'eth_maxPriorityFeePerGas': Priority.EXECUTION,
+    'eth_estimateGas': Priority.EXECUTION,
+    'eth_chainId': Priority.EXECUTION,
+    'eth_getTransactionReceipt': Priority.RECEIPT,
+    'eth_blockNumber': Priority.RECEIPT,
+    'eth_getBlockByNumber': Priority.RECEIPT,
+}
+
+# Fração do burst que cada classe NÃO pode consumir (reservada às superiores)
+RESERVE_FRACTION = {
+    Priority.EXECUTION: 0.0,
+    Priority.RECEIPT: 0.1,
+    Priority.QUOTE: 0.2,
+    Priority.BACKGROUND: 0.5,
+}
+
+
+class RPCThrottledError(Exception):
+    """Requisição descartada pelo agendador (orçamento do endpoint esgotado)"""
+
+
+_local = threading.local()
+
+
+@contextmanager
+def rpc_priority(priority: Priority):
+    """Força a prioridade de todas as chamadas RPC feitas nesta thread dentro do bloco"""
+    previous = getattr(_local, 'priority', None)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority() -> Optional[Priority]:
+    """Prioridade forçada pela thread atual (None = decidir pelo método)"""
+    return getattr(_local, 'priority', None)
+
+
+def priority_for(methods: Iterable[str]) -> Priority:
+    """Prioridade de uma requisição: override da thread ou a do método mais importante"""
+    override = current_priority()
+    if override is not None:
+        return override
+    return min((METHOD_PRIORITY.get(m, Priority.QUOTE) for m in methods), default=Priority.QUOTE)
+
+
+def max_wait(priority: Priority) -> float:
+    """Quanto tempo cada classe aceita esperar por orçamento"""
+    if priority == Priority.EXECUTION:
+        return BotConfig.RPC_REQUEST_TIMEOUT
+    if priority == Priority.RECEIPT:
+        return 2 * BotConfig.RPC_QUOTE_MAX_WAIT_MS / 1000
+    if priority == Priority.QUOTE:
+        return BotConfig.RPC_QUOTE_MAX_WAIT_MS / 1000
+    return 0.0
+
+
+def rate_limit_for(url: str) -> float:
+    """Requisições/s de um endpoint (RPC_RATE_LIMITS sobrescreve por trecho da URL)"""
+    for pattern, rps in BotConfig.RPC_RATE_LIMITS.items():
+        if pattern in url:
+            return rps
+    return BotConfig.RPC_RATE_LIMIT_RPS
+
+
+class EndpointScheduler:
+    """Token bucket de um endpoint com fila por prioridade"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate * BotConfig.RPC_RATE_LIMIT_BURST_SECONDS)
+        self.tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._waiting = [0] * len(Priority)
+        self._cond = threading.Condition()
+        self.granted = [0] * len(Priority)
+        self.shed = [0] * len(Priority)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _can_take(self, priority: Priority) -> bool:
+        if any(self._waiting[p] for p in range(priority)):
+            return False
+        # Reserva sobre o burst além do primeiro token: com burst=1 nenhuma classe fica sem vez
+        return self.tokens - 1 >= RESERVE_FRACTION[priority] * (self.burst - 1)
+
+    def acquire(self, priority: Priority, timeout: Optional[float] = None) -> bool:
+        """Consome um token; espera até `timeout` (padrão por classe). False = descartada."""
+        if not self.enabled:
+            return True
+
+        deadline = time.monotonic() + (max_wait(priority) if timeout is None else timeout)
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    if self._can_take(priority):
+                        self.tokens -= 1
+                        self.granted[priority] += 1
+                        return True
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed[priority] += 1
+                        return False
+                    self._cond.wait(min(remaining, 1 / self.rate))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def penalize(self):
+        """Provedor respondeu 429: esvaziar o bucket"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+    def get_stats(self) -> Dict:
+        return {
+            'rps': self.rate,
+            'tokens': round(self.tokens, 1),
+            'granted': {p.name: self.granted[p] for p in Priority},
+            'shed': {p.name: self.shed[p] for p in Priority},
+        }
@@ -0,0 +1,265 @@
+"""
+🧠 ESTADO DE POOLS EM MEMÓRIA COMPARTILHADA
+A PoolTable de cada rede espelhada em multiprocessing.shared_memory com um
+seqlock no cabeçalho: o processo principal (dono da conexão RPC) publica a
+cada bloco e N processos de cotação leem sem cópia, cada um avaliando uma
+fatia disjunta (por par de tokens) das rotas compra → venda
+"""
+
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import BotConfig
+from src.core.trade_sizing import optimal_input
+
+# Cabeçalho (uint64): sequência do seqlock, linhas, tokens, venues, bloco
+_SEQ, _SIZE, _TOKENS, _VENUES, _BLOCK = range(5)
+_HEADER_WORDS = 8
+
+# Colunas numéricas da PoolTable (mesmos dtypes) + nomes em bytes de largura fixa
+_COLUMNS = (
+    ('token0', np.int32), ('token1', np.int32), ('venue', np.int16), ('kind', np.uint8),
+    ('fee', np.int32), ('gamma', np.float64), ('reserve0', np.float64), ('reserve1', np.float64),
+)
+_NAME = 'S42'       # '0x' + 40 hex
+_MAX_VENUES = 64
+
+
+class RouteCandidate(NamedTuple):
+    buy_row: int      # linhas da PoolTable
+    sell_row: int
+    direction: int    # 0 = token0 → token1 na compra
+    amount_in: float  # entrada ótima (reservas virtuais)
+    estimate: float   # lucro estimado em unidades de token_in
+
+
+def _layout(capacity: int):
+    """(nome, dtype, offset, tamanho) de cada array no segmento, e o tamanho total"""
+    arrays = [('header', np.uint64, _HEADER_WORDS)]
+    arrays += [(name, dtype, capacity) for name, dtype in _COLUMNS]
+    arrays += [('addresses', _NAME, capacity), ('tokens', _NAME, 2 * capacity), ('venues', _NAME, _MAX_VENUES)]
+
+    layout, offset = [], 0
+    for name, dtype, count in arrays:
+        itemsize = np.dtype(dtype).itemsize
+        offset = (offset + 7) // 8 * 8   # alinhamento de 8 bytes
+        layout.append((name, dtype, offset, count))
+        offset += itemsize * count
+    return layout, offset
+
+
+class SharedPoolTable:
+    """
+    PoolTable em memória compartilhada (mesmas colunas e índices de linha)
+
+    Seqlock: o escritor deixa a sequência ímpar durante a publicação e par ao
+    terminar; read() executa a leitura sobre as views e a repete se a
+    sequência mudou no meio. Um escritor por tabela.
+    """
+
+    def __init__(self, shm: SharedMemory, capacity: int, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.capacity = capacity
+        self.owner = owner
+        for name, dtype, offset, count in _layout(capacity)[0]:
+            setattr(self, name, np.ndarray((count,), dtype=dtype, buffer=shm.buf, offset=offset))
+        self._rows = self._token_count = self._venue_count = 0   # nomes já publicados (escritor)
+
+    @classmethod
+    def create(cls, capacity: Optional[int] = None) -> 'SharedPoolTable':
+        capacity = capacity or BotConfig.SHARED_POOL_CAPACITY
+        shm = SharedMemory(create=True, size=_layout(capacity)[1])
+        table = cls(shm, capacity, owner=True)
+        table.header[:] = 0
+        table.header[7] = capacity
+        atexit.register(table.close)
+        return table
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedPoolTable':
+        shm = SharedMemory(name=name)
+        # Só o dono remove o segmento: o leitor não entra no resource tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        capacity = int(np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=shm.buf)[7])
+        return cls(shm, capacity, owner=False)
+
+    @property
+    def size(self) -> int:
+        return int(self.header[_SIZE])
+
+    @property
+    def block(self) -> int:
+        return int(self.header[_BLOCK])
+
+    def close(self):
+        if self.shm is None:
+            return
+        # Views numpy seguram o buffer: soltar antes de fechar
+        for name, _, _, _ in _layout(self.capacity)[0]:
+            setattr(self, name, None)
+        shm, self.shm = self.shm, None
+        shm.close()
+        if self.owner:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Escrita (processo principal)
+    # ------------------------------------------------------------------
+
+    def publish(self, table, block: int = 0):
+        """Copia a PoolTable (colunas inteiras; nomes só das linhas novas) dentro do seqlock"""
+        if table.size > self.capacity or len(table.tokens) > 2 * self.capacity or len(table.venues) > _MAX_VENUES:
+            raise ValueError(f"PoolTable com {table.size} pools excede SHARED_POOL_CAPACITY={self.capacity}")
+
+        size = table.size
+        self.header[_SEQ] += 1   # ímpar: leitores esperam
+        try:
+            for name, _ in _COLUMNS:
+                getattr(self, name)[:size] = getattr(table, name)[:size]
+            self.addresses[self._rows:size] = [a.encode() for a in table.addresses[self._rows:size]]
+            self.tokens[self._token_count:len(table.tokens)] = [t.encode() for t in table.tokens[self._token_count:]]
+            self.venues[self._venue_count:len(table.venues)] = [v.encode() for v in table.venues[self._venue_count:]]
+            self._rows, self._token_count, self._venue_count = size, len(table.tokens), len(table.venues)
+            self.header[_SIZE], self.header[_TOKENS], self.header[_VENUES] = size, len(table.tokens), len(table.venues)
+            self.header[_BLOCK] = block
+        finally:
+            self.header[_SEQ] += 1   # par: versão consistente
+
+    # ------------------------------------------------------------------
+    # Leitura (qualquer processo)
+    # ------------------------------------------------------------------
+
+    def read(self, reader: Callable[['SharedPoolTable'], object], max_retries: int = 1000):
+        """Executa `reader` sobre as views; repete se o escritor publicou no meio"""
+        for _ in range(max_retries):
+            start = int(self.header[_SEQ])
+            if not start & 1:
+                result = reader(self)
+                if int(self.header[_SEQ]) == start:
+                    return result
+            time.sleep(0)   # cede ao escritor
+        raise RuntimeError(f"seqlock de {self.name}: sem leitura consistente em {max_retries} tentativas")
+
+    def token_names(self) -> List[str]:
+        return [t.decode() for t in self.tokens[:int(self.header[_TOKENS])]]
+
+
+def route_candidates(table, shard: int = 0, shards: int = 1, flash_fee: float = 0.0) -> List[RouteCandidate]:
+    """
+    Rotas compra → venda lucrativas entre pools do mesmo par em DEXs diferentes
+
+    `table`: PoolTable ou SharedPoolTable. Só os pares de tokens com
+    (token0·T + token1) % shards == shard: fatias disjuntas por processo.
+    """
+    size = table.size
+    if size < 2:
+        return []
+    reserve0, reserve1 = table.reserve0[:size], table.reserve1[:size]
+    rows = np.flatnonzero((reserve0 > 0) & (reserve1 > 0))
+    token_count = int(max(table.token0[:size].max(), table.token1[:size].max())) + 1
+    key = table.token0[rows].astype(np.int64) * token_count + table.token1[rows]
+    mine = key % shards == shard
+    rows, key = rows[mine], key[mine]
+
+    order = np.argsort(key, kind='stable')
+    rows, key = rows[order], key[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.array([], dtype=np.int64)
+    ends = np.r_[starts[1:], len(key)]
+
+    candidates = []
+    for start, end in zip(starts, ends):
+        if end - start < 2:
+            continue
+        group = rows[start:end]
+        buy, sell = (grid.ravel() for grid in np.meshgrid(group, group, indexing='ij'))
+        # Venues (DEXs) diferentes, como em vector_scan.cycle_profits: tiers da mesma DEX ficam de fora
+        distinct = table.venue[buy] != table.venue[sell]
+        buy, sell = buy[distinct], sell[distinct]
+        gamma_buy, gamma_sell = table.gamma[buy], table.gamma[sell]
+
+        for direction in (0, 1):
+            if direction == 0:
+                in_a, out_a, in_b, out_b = reserve0[buy], reserve1[buy], reserve1[sell], reserve0[sell]
+            else:
+                in_a, out_a, in_b, out_b = reserve1[buy], reserve0[buy], reserve0[sell], reserve1[sell]
+            amount = optimal_input(in_a, out_a, gamma_buy, in_b, out_b, gamma_sell, flash_fee)
+            bought = out_a * amount * gamma_buy / (in_a + amount * gamma_buy)
+            sold = out_b * bought * gamma_sell / (in_b + bought * gamma_sell)
+            profit = sold - amount * (1.0 + flash_fee)
+            for k in np.flatnonzero((amount > 0) & (profit > 0)):
+                candidates.append(RouteCandidate(int(buy[k]), int(sell[k]), direction, float(amount[k]), float(profit[k])))
+
+    return candidates
+
+
+# Segmentos já abertos neste processo de cotação
+_attached: Dict[str, SharedPoolTable] = {}
+
+
+def evaluate_shard(name: str, shard: int, shards: int, flash_fee: float) -> List[RouteCandidate]:
+    """Ponto de entrada dos processos de cotação"""
+    table = _attached.get(name)
+    if table is None:
+        table = _attached[name] = SharedPoolTable.attach(name)
+    return table.read(lambda view: route_candidates(view, shard, shards, flash_fee))
+
+
+class RouteWorkers:
+    """Processos de cotação (spawn: sem herdar threads/conexões do processo principal)"""
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = max(1, processes or BotConfig.SCAN_WORKERS)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+        )
+        self.stats = {'scans': 0, 'candidates': 0, 'errors': 0}
+
+    def scan(self, shared: SharedPoolTable, flash_fee: float = 0.0,
+             timeout: Optional[float] = None) -> List[RouteCandidate]:
+        """Uma fatia por processo; candidatos de todas as fatias"""
+        timeout = BotConfig.SCAN_NETWORK_TIMEOUT if timeout is None else timeout
+        futures = [
+            self._executor.submit(evaluate_shard, shared.name, shard, self.processes, flash_fee)
+            for shard in range(self.processes)
+        ]
+        candidates = []
+        for future in futures:
+            try:
+                candidates.extend(future.result(timeout=timeout))
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"❌ Erro em processo de cotação: {e}")
+        self.stats['scans'] += 1
+        self.stats['candidates'] += len(candidates)
+        return candidates
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_workers: Optional[RouteWorkers] = None
+_workers_lock = threading.Lock()
+
+
+def get_route_workers() -> RouteWorkers:
+    """Processos de cotação compartilhados pelas redes (SCAN_WORKERS)"""
+    global _workers
+    with _workers_lock:
+        if _workers is None:
+            _workers = RouteWorkers()
+            atexit.register(_workers.close)
+            logger.info(f"🧠 {_workers.processes} processos de cotação iniciados")
+        return _workers
@@ -0,0 +1,215 @@
+"""
+🪙 METADADOS DE TOKENS
+Decimais, símbolo e preço de referência em USD por rede: carregados em lote
+(um batch/Multicall3) na inicialização, persistidos em disco e usados para
+converter USD ↔ unidades cruas sem RPC por token
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from eth_abi import decode
+from loguru import logger
+
+from src.config.config import BotConfig, MAJOR_TOKENS, get_native_token_price
+
+DECIMALS_SELECTOR = '0x313ce567'  # decimals()
+SYMBOL_SELECTOR = '0x95d89b41'    # symbol()
+
+# Preço de referência sem consulta a pools
+STABLECOINS = {'USDC', 'USDBC', 'USDT', 'DAI', 'BUSD'}
+WRAPPED_NATIVE = {'WETH', 'WBNB'}
+
+
+class TokenInfo(NamedTuple):
+    address: str
+    symbol: str
+    decimals: int
+
+
+def _decode_symbol(raw: bytes) -> Optional[str]:
+    """symbol() como string ABI ou bytes32 (tokens antigos)"""
+    if not raw:
+        return None
+    if len(raw) == 32:
+        return raw.rstrip(b'\x00').decode('utf-8', 'ignore') or None
+    try:
+        return decode(['string'], raw)[0]
+    except Exception:
+        return None
+
+
+class TokenMetadataStore:
+    """
+    Metadados dos tokens de uma rede
+
+    - load(): decimals()/symbol() de todos os tokens desconhecidos em um batch
+    - price_usd(): stablecoins = 1, token nativo embrulhado = preço da config,
+      demais pelo preço marginal dos pools (update_prices)
+    - to_raw() / to_usd(): conversão sem RPC
+    """
+
+    def __init__(self, network: str, path: Optional[str] = None):
+        self.network = network
+        self.path = path or os.path.join(BotConfig.TOKEN_METADATA_DIR, f"{network}.json")
+        self._tokens: Dict[str, TokenInfo] = {}
+        self._prices: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    for address, (symbol, decimals) in json.load(f).items():
+                        self._tokens[address] = TokenInfo(address, symbol, decimals)
+            except Exception as e:
+                logger.error(f"❌ Erro ao ler metadados de tokens ({self.path}): {e}")
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {address: [info.symbol, info.decimals] for address, info in self._tokens.items()}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+
+    def load(self, blockchain, addresses: Iterable[str]) -> int:
+        """Busca decimals/symbol dos tokens ainda desconhecidos (um batch). Retorna quantos entraram."""
+        missing = sorted({address.lower() for address in addresses} - set(self._tokens))
+        if not missing or blockchain is None:
+            return 0
+
+        batch = blockchain.batch(self.network)
+        if batch is None:
+            return 0
+        futures = [(address, batch.call(address, DECIMALS_SELECTOR), batch.call(address, SYMBOL_SELECTOR))
+                   for address in missing]
+        batch.execute()
+
+        known = {address.lower(): symbol for symbol, address in MAJOR_TOKENS.get(self.network, {}).items()}
+        added = []
+        for address, decimals, symbol in futures:
+            raw = decimals.result_or(None)
+            if not raw or len(raw) < 32:
+                continue
+            name = known.get(address) or _decode_symbol(symbol.result_or(None)) or address[:10]
+            added.append(TokenInfo(address, name, int.from_bytes(raw[:32], 'big')))
+
+        if added:
+            with self._lock:
+                for info in added:
+                    self._tokens[info.address] = info
+                try:
+                    self._save()
+                except Exception as e:
+                    logger.error(f"❌ Erro ao salvar metadados de tokens: {e}")
+            logger.info(f"🪙 {self.network}: metadados de {len(added)} tokens carregados")
+        return len(added)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def get(self, address: str) -> Optional[TokenInfo]:
+        return self._tokens.get(address.lower())
+
+    def decimals(self, address: str) -> Optional[int]:
+        info = self._tokens.get(address.lower())
+        return info.decimals if info else None
+
+    def symbol(self, address: str) -> Optional[str]:
+        info = self._tokens.get(address.lower())
+        return info.symbol if info else None
+
+    def price_usd(self, address: str) -> Optional[float]:
+        """Preço de referência de 1 token (unidade inteira) em USD"""
+        address = address.lower()
+        info = self._tokens.get(address)
+        if info is not None:
+            symbol = info.symbol.upper()
+            if symbol in STABLECOINS:
+                return 1.0
+            if symbol in WRAPPED_NATIVE:
+                return get_native_token_price(self.network)
+        return self._prices.get(address)
+
+    def set_price(self, address: str, price_usd: float):
+        self._prices[address.lower()] = price_usd
+
+    def update_prices(self, rates: Iterable[tuple]) -> int:
+        """
+        Preço dos tokens sem referência a partir de taxas marginais dos pools
+
+        rates: (token_in, token_out, unidades cruas de token_out por unidade
+        crua de token_in, reserva crua de token_out). O pool mais profundo (em
+        USD) com o outro lado já precificado define o preço. Retorna quantos
+        preços mudaram.
+        """
+        best: Dict[str, tuple] = {}
+        for token_in, token_out, rate, reserve_out in rates:
+            if self._reference(token_in) or self.price_usd(token_out) is None:
+                continue
+            dec_in, dec_out = self.decimals(token_in), self.decimals(token_out)
+            if dec_in is None or dec_out is None or rate <= 0:
+                continue
+            price = rate * 10 ** (dec_in - dec_out) * self.price_usd(token_out)
+            depth = self.to_usd(token_out, reserve_out)
+            if token_in not in best or depth > best[token_in][1]:
+                best[token_in] = (price, depth)
+
+        for token, (price, _) in best.items():
+            self._prices[token.lower()] = price
+        return len(best)
+
+    def _reference(self, address: str) -> bool:
+        info = self._tokens.get(address.lower())
+        return info is not None and info.symbol.upper() in STABLECOINS | WRAPPED_NATIVE
+
+    # ------------------------------------------------------------------
+    # Conversões
+    # ------------------------------------------------------------------
+
+    def to_raw(self, address: str, amount_usd: float) -> Optional[int]:
+        """USD → unidades cruas do token (None sem decimais ou preço)"""
+        decimals, price = self.decimals(address), self.price_usd(address)
+        if decimals is None or not price:
+            return None
+        return int(amount_usd / price * 10 ** decimals)
+
+    def to_usd(self, address: str, amount: int) -> Optional[float]:
+        """Unidades cruas do token → USD (None sem decimais ou preço)"""
+        decimals, price = self.decimals(address), self.price_usd(address)
+        if decimals is None or price is None:
+            return None
+        return amount / 10 ** decimals * price
+
+
+_stores: Dict[str, TokenMetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_token_store(network: str) -> TokenMetadataStore:
+    """Store compartilhado da rede (DEXs, executores e IA usam os mesmos metadados)"""
+    with _stores_lock:
+        if network not in _stores:
+            _stores[network] = TokenMetadataStore(network)
+        return _stores[network]
+
+
+def opportunity_usd(opportunity: Dict, field: str = 'amount_in') -> float:
+    """Valor em USD de um campo de oportunidade (unidades de token_in); 0 sem preço conhecido"""
+    value = opportunity.get(field, 0)
+    if not value or 'network' not in opportunity or 'token_in' not in opportunity:
+        return 0.0
+    usd = get_token_store(opportunity['network']).to_usd(opportunity['token_in'], value)
+    return usd if usd is not None else 0.0
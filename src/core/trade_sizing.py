@@ -0,0 +1,257 @@
+"""
+📐 TAMANHO ÓTIMO DE TRADE
+Entrada que maximiza o lucro de cada rota compra → venda entre dois pools:
+forma fechada para V2/V2 (em lote, NumPy), busca por seção áurea sobre a
+cotação exata para rotas com V3, limitada pela liquidez do flash loan e por
+MAX_TRADE_AMOUNT_USD
+"""
+
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import AAVE_V3_POOL, BotConfig
+from src.core.rpc_scheduler import Priority, rpc_priority
+from src.core.v2_pools import ZERO_ADDRESS
+
+GET_RESERVE_DATA_SELECTOR = '0x35ea6a75'  # getReserveData(address)
+BALANCE_OF_SELECTOR = '0x70a08231'        # balanceOf(address)
+
+INV_PHI = (math.sqrt(5) - 1) / 2
+
+
+def optimal_input(reserve_in_a, reserve_out_a, fee_a, reserve_in_b, reserve_out_b, fee_b,
+                  flash_fee: float = 0.0):
+    """
+    Entrada ótima de token_in → pool A → pool B → token_in (produto constante)
+
+    A rota composta é z(x) = K·x / (M + N·x), com K = γa·γb·Ra_out·Rb_out,
+    M = Ra_in·Rb_in e N = γa·(Rb_in + γb·Ra_out). Maximizar z(x) − (1 + φ)·x:
+    x* = (√(K·M / (1 + φ)) − M) / N, e 0 quando a rota não tem lucro.
+    Aceita escalares ou arrays (broadcast).
+    """
+    k = fee_a * fee_b * reserve_out_a * reserve_out_b
+    m = reserve_in_a * reserve_in_b
+    n = fee_a * (reserve_in_b + fee_b * reserve_out_a)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (np.sqrt(k * m / (1.0 + flash_fee)) - m) / n
+    return np.where(np.isfinite(x) & (x > 0), x, 0.0)
+
+
+def optimal_path_input(hops: Sequence[Tuple[float, float, float]], flash_fee: float = 0.0) -> float:
+    """
+    Entrada ótima de um ciclo de N pools [(R_in, R_out, γ)] (N ≥ 2)
+
+    Cada swap x → γ·R_out·x / (R_in + γ·x) é uma transformação de Möbius
+    [[γ·R_out, 0], [γ, R_in]]; o produto das matrizes mantém a forma
+    K·x / (M + N·x), então vale o mesmo x* de optimal_input.
+    """
+    k, n, m = 1.0, 0.0, 1.0   # z(x) = k·x / (m + n·x), começando da identidade
+    for reserve_in, reserve_out, fee in hops:
+        k, n, m = fee * reserve_out * k, fee * k + reserve_in * n, reserve_in * m
+    if n <= 0 or k * m <= 0:
+        return 0.0
+    x = (math.sqrt(k * m / (1.0 + flash_fee)) - m) / n
+    return x if math.isfinite(x) and x > 0 else 0.0
+
+
+def golden_section_max(profit: Callable[[int], Optional[int]], low: int, high: int,
+                       tolerance: int = 1, max_iterations: int = 80) -> Tuple[int, Optional[int]]:
+    """
+    Máximo de uma função de lucro côncava em [low, high] (inteiros)
+
+    `profit` devolve None quando a cotação falha (tratado como −∞).
+    Retorna (entrada, lucro).
+    """
+    def evaluate(x: int) -> float:
+        value = profit(x)
+        return -math.inf if value is None else value
+
+    a, b = low, high
+    c = b - int((b - a) * INV_PHI)
+    d = a + int((b - a) * INV_PHI)
+    fc, fd = evaluate(c), evaluate(d)
+
+    for _ in range(max_iterations):
+        if b - a <= tolerance:
+            break
+        if fc < fd:
+            a, c, fc = c, d, fd
+            d = a + int((b - a) * INV_PHI)
+            fd = evaluate(d)
+        else:
+            b, d, fd = d, c, fc
+            c = b - int((b - a) * INV_PHI)
+            fc = evaluate(c)
+
+    x, value = (c, fc) if fc >= fd else (d, fd)
+    return x, (None if value == -math.inf else int(value))
+
+
+class TradeSizer:
+    """
+    Dimensiona as rotas de uma rede
+
+    - caps(): teto por token de entrada (liquidez do Aave no bloco e
+      MAX_TRADE_AMOUNT_USD), em um batch por bloco
+    - refine(): entrada exata da rota sobre as cotações inteiras dos pools
+    """
+
+    def __init__(self, dex_interface):
+        self.dex = dex_interface
+        self.network = dex_interface.network
+        self._a_tokens: Dict[str, Optional[str]] = {}
+        self.stats = {'refined': 0, 'closed_form': 0, 'searches': 0, 'capped': 0}
+
+    # ------------------------------------------------------------------
+    # Limites
+    # ------------------------------------------------------------------
+
+    def max_trade_amount(self, token: str) -> int:
+        """MAX_TRADE_AMOUNT_USD em unidades cruas do token (0 sem decimais ou preço de referência)"""
+        return self.dex.tokens.to_raw(token, BotConfig.MAX_TRADE_AMOUNT_USD) or 0
+
+    def _resolve_a_tokens(self, pool: str, tokens: List[str]):
+        batch = self.dex.blockchain.batch(self.network)
+        if batch is None:
+            return
+        futures = [
+            (token, batch.call(pool, GET_RESERVE_DATA_SELECTOR + token[2:].lower().rjust(64, '0')))
+            for token in tokens
+        ]
+        batch.execute()
+        for token, future in futures:
+            raw = future.result_or(None)
+            # ReserveData: aTokenAddress é a 9ª palavra
+            a_token = '0x' + raw[8 * 32 + 12:9 * 32].hex() if raw and len(raw) >= 9 * 32 else None
+            self._a_tokens[token] = a_token if a_token and int(a_token, 16) else None
+
+    def _load_flash_liquidity(self, tokens: Tuple[str, ...]) -> Dict[str, Optional[int]]:
+        pool = AAVE_V3_POOL.get(self.network, ZERO_ADDRESS)
+        if self.dex.blockchain is None or pool == ZERO_ADDRESS:
+            return {token: None for token in tokens}
+
+        with rpc_priority(Priority.QUOTE):
+            missing = [token for token in tokens if token not in self._a_tokens]
+            if missing:
+                self._resolve_a_tokens(pool, missing)
+
+            batch = self.dex.blockchain.batch(self.network)
+            futures = {
+                token: batch.call(token, BALANCE_OF_SELECTOR + self._a_tokens[token][2:].rjust(64, '0'))
+                for token in tokens if self._a_tokens.get(token)
+            }
+            if futures:
+                batch.execute()
+
+        liquidity = {}
+        for token in tokens:
+            raw = futures[token].result_or(None) if token in futures else None
+            liquidity[token] = int.from_bytes(raw[:32], 'big') if raw and len(raw) >= 32 else None
+        return liquidity
+
+    def flash_liquidity(self, tokens: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Saldo do aToken de cada token (o máximo que o flash loan empresta); None = sem reserva"""
+        key = tuple(sorted({token.lower() for token in tokens}))
+        return self.dex.blockchain.cache.get_or_load_head(
+            self.network, ('flash_liquidity', key), lambda: self._load_flash_liquidity(key)
+        )
+
+    def caps(self, tokens_in: List[str]) -> List[int]:
+        """Teto de entrada de cada rota (pelo token de entrada)"""
+        try:
+            liquidity = self.flash_liquidity(tokens_in)
+        except Exception as e:
+            logger.error(f"❌ Erro ao ler liquidez de flash loan em {self.network}: {e}")
+            liquidity = {}
+
+        caps = []
+        for token in tokens_in:
+            limit = self.max_trade_amount(token)
+            available = liquidity.get(token.lower())
+            caps.append(min(limit, available) if available is not None else limit)
+        return caps
+
+    # ------------------------------------------------------------------
+    # Refinamento exato
+    # ------------------------------------------------------------------
+
+    def route_profit(self, buy_dex: str, sell_dex: str, token_in: str, token_out: str, amount_in: int,
+                     buy_fee: Optional[int] = None,
+                     sell_fee: Optional[int] = None) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """
+        (lucro líquido da taxa de flash loan, saída da compra, saída da venda)
+        com a matemática exata; buy_fee/sell_fee fixam o pool V3 de cada perna
+        """
+        if amount_in <= 0:
+            return None, None, None
+        bought = self.dex.get_price(buy_dex, token_in, token_out, amount_in, buy_fee)
+        if not bought:
+            return None, None, None
+        sold = self.dex.get_price(sell_dex, token_out, token_in, bought, sell_fee)
+        if not sold:
+            return None, bought, None
+        return sold - amount_in - int(amount_in * BotConfig.FLASH_LOAN_FEE), bought, sold
+
+    def refine(self, buy_dex: str, sell_dex: str, token_in: str, token_out: str,
+               estimate: int, cap: int, closed_form: bool,
+               buy_fee: Optional[int] = None, sell_fee: Optional[int] = None) -> int:
+        """
+        Entrada final da rota
+
+        closed_form (V2/V2): a estimativa já é o ótimo, só limitada ao teto.
+        Rotas com V3: seção áurea em [1, min(teto, 4·estimativa)] sobre a
+        cotação exata (cruza ticks, que as reservas virtuais não veem).
+        """
+        self.stats['refined'] += 1
+        if estimate >= cap:
+            self.stats['capped'] += 1
+
+        if closed_form:
+            self.stats['closed_form'] += 1
+            return max(1, min(estimate, cap))
+
+        self.stats['searches'] += 1
+        high = max(2, min(cap, 4 * max(estimate, 1)))
+        amount, _ = golden_section_max(
+            lambda x: self.route_profit(buy_dex, sell_dex, token_in, token_out, x, buy_fee, sell_fee)[0],
+            1, high, tolerance=max(1, high // 1_000_000)
+        )
+        return amount
+
+    def path_profit(self, route: Sequence[Tuple[str, str, str, Optional[int]]],
+                    amount_in: int) -> Tuple[Optional[int], List[int]]:
+        """Lucro líquido (taxa de flash loan inclusa) e saídas de cada swap de [(dex, token_in, token_out, fee)]"""
+        if amount_in <= 0:
+            return None, []
+        outputs = []
+        amount = amount_in
+        for dex_name, token_in, token_out, fee in route:
+            amount = self.dex.get_price(dex_name, token_in, token_out, amount, fee)
+            if not amount:
+                return None, outputs
+            outputs.append(amount)
+        return amount - amount_in - int(amount_in * BotConfig.FLASH_LOAN_FEE), outputs
+
+    def refine_path(self, route: Sequence[Tuple[str, str, str, Optional[int]]], estimate: int, cap: int,
+                    closed_form: bool) -> int:
+        """Entrada final de um ciclo multi-hop (mesmo critério de refine)"""
+        self.stats['refined'] += 1
+        if estimate >= cap:
+            self.stats['capped'] += 1
+
+        if closed_form:
+            self.stats['closed_form'] += 1
+            return max(1, min(estimate, cap))
+
+        self.stats['searches'] += 1
+        high = max(2, min(cap, 4 * max(estimate, 1)))
+        amount, _ = golden_section_max(
+            lambda x: self.path_profit(route, x)[0], 1, high, tolerance=max(1, high // 1_000_000)
+        )
+        return amount
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
@@ -0,0 +1,197 @@
+"""
+💧 CACHE DE POOLS V2
+Endereços dos pares resolvidos na factory uma única vez, reservas de todos os
+pares lidas em UM batch por bloco e cotação local com a fórmula de produto
+constante (mesmo resultado que getAmountsOut do router, sem chamadas RPC)
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from eth_utils import keccak
+from loguru import logger
+
+GET_PAIR_SELECTOR = keccak(text="getPair(address,address)")[:4].hex()
+GET_RESERVES_SELECTOR = '0x' + keccak(text="getReserves()")[:4].hex()
+
+ZERO_ADDRESS = '0x' + '0' * 40
+
+_MISSING = object()
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int = 30) -> int:
+    """
+    UniswapV2Library.getAmountOut com a taxa em basis points
+
+    997/1000 (Uniswap) == 9970/10000 e 9975/10000 (PancakeSwap): a divisão
+    inteira dá exatamente o mesmo resultado do contrato
+    """
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (10000 - fee_bps)
+    return (amount_in_with_fee * reserve_out) // (reserve_in * 10000 + amount_in_with_fee)
+
+
+def sort_tokens(token_a: str, token_b: str) -> Tuple[str, str]:
+    """Ordem token0/token1 do par (menor endereço primeiro)"""
+    a, b = token_a.lower(), token_b.lower()
+    return (a, b) if a < b else (b, a)
+
+
+def _word(address: str) -> str:
+    return address.lower()[2:].rjust(64, '0')
+
+
+class V2PoolCache:
+    """
+    Estado dos pares V2 de uma rede
+
+    - pares: (factory, token0, token1) -> endereço (imutável, None = não existe)
+    - reservas: valor de cabeça no BlockReadCache do conector, recarregado
+      em batch quando chega bloco novo (ou expira o TTL), sempre em um número
+      de bloco fixo (scan_block ou a cabeça atual), nunca em 'latest'
+    - com PoolEventUpdater: estado persistente (live_state) lido uma vez em
+      um bloco fixo e atualizado pelos logs Sync
+    """
+
+    def __init__(self, blockchain, network: str):
+        self.blockchain = blockchain
+        self.network = network
+        self.pairs: Dict[Tuple[str, str, str], Optional[str]] = {}
+        self.reserve_loads = 0
+        self.live_state: Optional[Dict[str, Tuple[int, int]]] = None
+        self.live_block: Optional[int] = None
+        self.scan_block: Optional[int] = None   # cabeça fixada pelo scan em andamento
+
+    # ------------------------------------------------------------------
+    # Pares
+    # ------------------------------------------------------------------
+
+    def prepare(self, factories: Iterable[str], tokens: Iterable[str]) -> int:
+        """Resolve (uma vez) o par de cada combinação de tokens em cada factory"""
+        tokens = sorted({t.lower() for t in tokens})
+        missing = [
+            (factory.lower(), a, b)
+            for factory in factories
+            for i, a in enumerate(tokens)
+            for b in tokens[i + 1:]
+            if (factory.lower(), a, b) not in self.pairs
+        ]
+        if missing:
+            self._resolve(missing)
+        return sum(1 for key in missing if self.pairs.get(key))
+
+    def _resolve(self, keys):
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return
+
+        futures = [
+            (key, batch.call(key[0], '0x' + GET_PAIR_SELECTOR + _word(key[1]) + _word(key[2])))
+            for key in keys
+        ]
+        batch.execute()
+
+        for key, future in futures:
+            raw = future.result_or(_MISSING)
+            if raw is _MISSING or len(raw) < 32:
+                continue  # falha de RPC: tentar de novo na próxima vez
+            pair = '0x' + raw[12:32].hex()
+            self.pairs[key] = pair if pair != ZERO_ADDRESS else None
+
+        found = sum(1 for key, _ in futures if self.pairs.get(key))
+        logger.debug(f"💧 {self.network}: {found}/{len(keys)} pares V2 resolvidos")
+
+    def get_pair(self, factory: str, token_a: str, token_b: str) -> Optional[str]:
+        key = (factory.lower(), *sort_tokens(token_a, token_b))
+        if key not in self.pairs:
+            self._resolve([key])
+        return self.pairs.get(key)
+
+    # ------------------------------------------------------------------
+    # Reservas
+    # ------------------------------------------------------------------
+
+    def pair_addresses(self) -> List[str]:
+        return sorted({pair for pair in self.pairs.values() if pair})
+
+    def pair_tokens(self) -> Dict[str, Tuple[str, str]]:
+        """Endereço do par -> (token0, token1)"""
+        return {pair: (key[1], key[2]) for key, pair in self.pairs.items() if pair}
+
+    def _fetch_reserves(self, pairs, block='latest') -> Dict[str, Tuple[int, int]]:
+        batch = self.blockchain.batch(self.network)
+        if batch is None or not pairs:
+            return {}
+
+        futures = [(pair, batch.call(pair, GET_RESERVES_SELECTOR, block)) for pair in pairs]
+        batch.execute()
+
+        reserves = {}
+        for pair, future in futures:
+            raw = future.result_or(None)
+            if raw and len(raw) >= 64:
+                reserves[pair] = (int.from_bytes(raw[:32], 'big'), int.from_bytes(raw[32:64], 'big'))
+        return reserves
+
+    def _read_block(self):
+        """Bloco das leituras: o dos logs, o fixado pelo scan ou a cabeça atual"""
+        if self.live_state is not None:
+            return self.live_block
+        if self.scan_block is not None:
+            return self.scan_block
+        head = self.blockchain.get_block_number(self.network)
+        return head if head is not None else 'latest'
+
+    def _load_reserves(self, block) -> Dict[str, Tuple[int, int]]:
+        self.reserve_loads += 1
+        return self._fetch_reserves(self.pair_addresses(), block)
+
+    def load_live(self, block: int):
+        """Lê todas as reservas no bloco `block` e passa a manter o estado pelos logs"""
+        self.reserve_loads += 1
+        self.live_state = self._fetch_reserves(self.pair_addresses(), block)
+        self.live_block = block
+
+    def apply_sync(self, pair: str, reserve0: int, reserve1: int):
+        """Log Sync: reservas absolutas do par após a transação"""
+        if self.live_state is not None:
+            self.live_state[pair] = (reserve0, reserve1)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Reservas de todos os pares conhecidos no bloco atual"""
+        if self.live_state is not None:
+            return self.live_state
+        block = self._read_block()
+        return self.blockchain.cache.get_or_load_head(
+            self.network, ('v2_reserves', id(self), block), lambda: self._load_reserves(block)
+        )
+
+    def get_reserves(self, pair: str) -> Optional[Tuple[int, int]]:
+        snapshot = self.snapshot()
+        reserves = snapshot.get(pair)
+        if reserves is None:
+            # Par que apareceu depois da carga do bloco: buscar só ele
+            reserves = self._fetch_reserves([pair], self._read_block()).get(pair)
+            if reserves is not None:
+                snapshot[pair] = reserves
+        return reserves
+
+    # ------------------------------------------------------------------
+    # Cotação
+    # ------------------------------------------------------------------
+
+    def quote(self, factory: str, token_in: str, token_out: str, amount_in: int,
+              fee_bps: int = 30) -> Optional[int]:
+        """Quantidade de token_out recebida por amount_in (None = par inexistente)"""
+        pair = self.get_pair(factory, token_in, token_out)
+        if not pair:
+            return None
+
+        reserves = self.get_reserves(pair)
+        if reserves is None:
+            return None
+
+        reserve0, reserve1 = reserves
+        if token_in.lower() < token_out.lower():
+            return get_amount_out(amount_in, reserve0, reserve1, fee_bps)
+        return get_amount_out(amount_in, reserve1, reserve0, fee_bps)
@@ -0,0 +1,593 @@
+"""
+🦄 SIMULADOR LOCAL DE POOLS UNISWAP V3
+Estado de cada pool (slot0, liquidez, tick bitmap e ticks inicializados) lido
+em batch por bloco e swap exactInput reproduzido em aritmética inteira,
+idêntico a quoteExactInputSingle, inclusive cruzando ticks. QuoterV2 via
+eth_call continua disponível como fallback e como oráculo de verificação
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from eth_utils import keccak
+from loguru import logger
+
+from src.config.config import BotConfig
+from src.core.v2_pools import ZERO_ADDRESS, sort_tokens
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+Q96 = 1 << 96
+MAX_UINT256 = (1 << 256) - 1
+
+# Fee tier (centésimos de bp) -> tick spacing fixado pela factory
+FEE_TICK_SPACING = {100: 1, 500: 10, 3000: 60, 10000: 200}
+
+GET_POOL_SELECTOR = keccak(text="getPool(address,address,uint24)")[:4].hex()
+SLOT0_SELECTOR = '0x' + keccak(text="slot0()")[:4].hex()
+LIQUIDITY_SELECTOR = '0x' + keccak(text="liquidity()")[:4].hex()
+TICK_BITMAP_SELECTOR = keccak(text="tickBitmap(int16)")[:4].hex()
+TICKS_SELECTOR = keccak(text="ticks(int24)")[:4].hex()
+QUOTE_EXACT_INPUT_SINGLE_SELECTOR = keccak(
+    text="quoteExactInputSingle((address,address,uint256,uint24,uint160))"
+)[:4].hex()
+
+_MISSING = object()
+
+# Multiplicadores de TickMath.getSqrtRatioAtTick (Q128.128), um por bit de |tick|
+_TICK_RATIOS = (
+    0xfff97272373d413259a46990580e213a,
+    0xfff2e50f5f656932ef12357cf3c7fdcc,
+    0xffe5caca7e10e4e61c3624eaa0941cd0,
+    0xffcb9843d60f6159c9db58835c926644,
+    0xff973b41fa98c081472e6896dfb254c0,
+    0xff2ea16466c96a3843ec78b326b52861,
+    0xfe5dee046a99a2a811c461f1969c3053,
+    0xfcbe86c7900a88aedcffc83b479aa3a4,
+    0xf987a7253ac413176f2b074cf7815e54,
+    0xf3392b0822b70005940c7a398e4b70f3,
+    0xe7159475a2c29b7443b29c7fa6e889d9,
+    0xd097f3bdfd2022b8845ad8f792aa5825,
+    0xa9f746462d870fdf8a65dc1f90e061e5,
+    0x70d869a156d2a1b890bb3df62baf32f7,
+    0x31be135f97d08fd981231505542fcfa6,
+    0x9aa508b5b7a84e1c677de54f3e99bc9,
+    0x5d6af8dedb81196699c329225ee604,
+    0x2216e584f5fa1ea926041bedfe98,
+    0x48a170391f7dc42444e8fa2,
+)
+
+
+class TickRangeExceeded(Exception):
+    """O swap saiu das palavras do bitmap carregadas: usar o QuoterV2"""
+
+
+# ============================================================================
+# MATEMÁTICA (FullMath, TickMath, SqrtPriceMath, SwapMath)
+# ============================================================================
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    quotient, remainder = divmod(a * b, denominator)
+    return quotient + 1 if remainder else quotient
+
+
+def div_rounding_up(a: int, denominator: int) -> int:
+    quotient, remainder = divmod(a, denominator)
+    return quotient + 1 if remainder else quotient
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """TickMath.getSqrtRatioAtTick: sqrt(1.0001^tick) em Q64.96"""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick fora do intervalo: {tick}")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 1 << 128
+    for bit, multiplier in enumerate(_TICK_RATIOS, start=1):
+        if abs_tick & (1 << bit):
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    return (ratio >> 32) + (1 if ratio & 0xffffffff else 0)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """TickMath.getTickAtSqrtRatio: maior tick com getSqrtRatioAtTick(tick) <= preço"""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 fora do intervalo: {sqrt_price_x96}")
+
+    # Estimativa em ponto flutuante, corrigida com a função exata
+    tick = math.floor(2 * math.log(sqrt_price_x96 / Q96) / math.log(1.0001))
+    tick = max(MIN_TICK, min(MAX_TICK, tick))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_amount0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_b - sqrt_a
+    if round_up:
+        return div_rounding_up(mul_div_rounding_up(numerator1, numerator2, sqrt_b), sqrt_a)
+    return mul_div(numerator1, numerator2, sqrt_b) // sqrt_a
+
+
+def get_amount1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return mul_div(liquidity, sqrt_b - sqrt_a, Q96)
+
+
+def get_next_sqrt_price_from_input(sqrt_price: int, liquidity: int, amount_in: int,
+                                   zero_for_one: bool) -> int:
+    """SqrtPriceMath.getNextSqrtPriceFromInput (arredondamento a favor do pool)"""
+    if amount_in == 0:
+        return sqrt_price
+
+    if zero_for_one:
+        numerator1 = liquidity << 96
+        product = amount_in * sqrt_price
+        # Mesmo desvio do contrato quando amount * sqrtPrice estoura 256 bits
+        if product <= MAX_UINT256 and numerator1 + product <= MAX_UINT256:
+            return mul_div_rounding_up(numerator1, sqrt_price, numerator1 + product)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price + amount_in)
+
+    return sqrt_price + (amount_in << 96) // liquidity
+
+
+def compute_swap_step(sqrt_current: int, sqrt_target: int, liquidity: int,
+                      amount_remaining: int, fee_pips: int) -> Tuple[int, int, int, int]:
+    """SwapMath.computeSwapStep para exactInput → (sqrtNext, amountIn, amountOut, fee)"""
+    zero_for_one = sqrt_current >= sqrt_target
+
+    amount_remaining_less_fee = mul_div(amount_remaining, 1_000_000 - fee_pips, 1_000_000)
+    if zero_for_one:
+        amount_in = get_amount0_delta(sqrt_target, sqrt_current, liquidity, True)
+    else:
+        amount_in = get_amount1_delta(sqrt_current, sqrt_target, liquidity, True)
+
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_next = sqrt_target
+    else:
+        sqrt_next = get_next_sqrt_price_from_input(
+            sqrt_current, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_next == sqrt_target
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(sqrt_next, sqrt_current, liquidity, True)
+        amount_out = get_amount1_delta(sqrt_next, sqrt_current, liquidity, False)
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(sqrt_current, sqrt_next, liquidity, True)
+        amount_out = get_amount0_delta(sqrt_current, sqrt_next, liquidity, False)
+
+    if not reached_target:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 1_000_000 - fee_pips)
+
+    return sqrt_next, amount_in, amount_out, fee_amount
+
+
+# ============================================================================
+# ESTADO DO POOL
+# ============================================================================
+
+class V3PoolState:
+    """Snapshot de um pool em um bloco"""
+
+    __slots__ = ('address', 'token0', 'token1', 'fee', 'tick_spacing', 'sqrt_price_x96',
+                 'tick', 'liquidity', 'bitmap', 'ticks')
+
+    def __init__(self, address: str, token0: str, token1: str, fee: int, sqrt_price_x96: int,
+                 tick: int, liquidity: int, bitmap: Dict[int, int], ticks: Dict[int, int]):
+        self.address = address
+        self.token0 = token0
+        self.token1 = token1
+        self.fee = fee
+        self.tick_spacing = FEE_TICK_SPACING[fee]
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+        self.bitmap = bitmap    # palavra -> uint256 (só as palavras carregadas)
+        self.ticks = ticks      # tick -> liquidityNet
+
+    def next_initialized_tick(self, tick: int, lte: bool) -> Tuple[int, bool]:
+        """TickBitmap.nextInitializedTickWithinOneWord"""
+        spacing = self.tick_spacing
+        compressed = tick // spacing  # floor, como o contrato para ticks negativos
+
+        if lte:
+            word, bit = compressed >> 8, compressed % 256
+            if word not in self.bitmap:
+                raise TickRangeExceeded(word)
+            masked = self.bitmap[word] & ((1 << (bit + 1)) - 1)
+            if masked:
+                return (compressed - (bit - (masked.bit_length() - 1))) * spacing, True
+            return (compressed - bit) * spacing, False
+
+        word, bit = (compressed + 1) >> 8, (compressed + 1) % 256
+        if word not in self.bitmap:
+            raise TickRangeExceeded(word)
+        masked = self.bitmap[word] & ~((1 << bit) - 1)
+        if masked:
+            lowest = (masked & -masked).bit_length() - 1
+            return (compressed + 1 + (lowest - bit)) * spacing, True
+        return (compressed + 1 + (255 - bit)) * spacing, False
+
+    def quote_exact_input(self, token_in: str, amount_in: int, sqrt_price_limit_x96: int = 0) -> int:
+        """
+        UniswapV3Pool.swap com amountSpecified > 0, como executado pelo QuoterV2
+
+        Levanta TickRangeExceeded se o swap sair das palavras carregadas
+        """
+        zero_for_one = token_in.lower() == self.token0
+        if sqrt_price_limit_x96 == 0:
+            sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+
+        amount_remaining = amount_in
+        amount_out = 0
+        sqrt_price = self.sqrt_price_x96
+        tick = self.tick
+        liquidity = self.liquidity
+
+        while amount_remaining != 0 and sqrt_price != sqrt_price_limit_x96:
+            sqrt_start = sqrt_price
+            tick_next, initialized = self.next_initialized_tick(tick, zero_for_one)
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_next = get_sqrt_ratio_at_tick(tick_next)
+
+            if zero_for_one:
+                target = sqrt_price_limit_x96 if sqrt_next < sqrt_price_limit_x96 else sqrt_next
+            else:
+                target = sqrt_price_limit_x96 if sqrt_next > sqrt_price_limit_x96 else sqrt_next
+
+            sqrt_price, step_in, step_out, step_fee = compute_swap_step(
+                sqrt_price, target, liquidity, amount_remaining, self.fee
+            )
+            amount_remaining -= step_in + step_fee
+            amount_out += step_out
+
+            if sqrt_price == sqrt_next:
+                if initialized:
+                    liquidity_net = self.ticks.get(tick_next, 0)
+                    liquidity += -liquidity_net if zero_for_one else liquidity_net
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price != sqrt_start:
+                tick = get_tick_at_sqrt_ratio(sqrt_price)
+
+        return amount_out
+
+
+# ============================================================================
+# CACHE DE POOLS
+# ============================================================================
+
+def _word(address: str) -> str:
+    return address.lower()[2:].rjust(64, '0')
+
+
+def _int_word(value: int) -> str:
+    return f'{value & MAX_UINT256:064x}'
+
+
+def _signed(raw: bytes, index: int) -> int:
+    return int.from_bytes(raw[32 * index:32 * (index + 1)], 'big', signed=True)
+
+
+def _unsigned(raw: bytes, index: int) -> int:
+    return int.from_bytes(raw[32 * index:32 * (index + 1)], 'big')
+
+
+class V3PoolCache:
+    """
+    Pools Uniswap V3 de uma rede
+
+    - pools: (factory, token0, token1, fee) -> endereço (imutável)
+    - estado: valor de cabeça no BlockReadCache do conector, lido em três
+      batches por bloco (slot0+liquidez, bitmap, ticks) para todos os pools,
+      os três no mesmo número de bloco (scan_block ou a cabeça atual)
+    - com PoolEventUpdater: estado persistente (live_state) lido uma vez em
+      um bloco fixo e atualizado pelos logs Swap/Mint/Burn
+    """
+
+    def __init__(self, blockchain, network: str, fee_tiers: Iterable[int] = (100, 500, 3000, 10000)):
+        self.blockchain = blockchain
+        self.network = network
+        self.fee_tiers = tuple(fee_tiers)
+        self.pools: Dict[Tuple[str, str, str, int], Optional[str]] = {}
+        self.state_loads = 0
+        self.quoter_calls = 0
+        self.live_state: Optional[Dict[str, V3PoolState]] = None
+        self.live_block: Optional[int] = None
+        self.scan_block: Optional[int] = None   # cabeça fixada pelo scan em andamento
+
+    # ------------------------------------------------------------------
+    # Descoberta de pools
+    # ------------------------------------------------------------------
+
+    def prepare(self, factory: str, tokens: Iterable[str]) -> int:
+        """Resolve (uma vez) o pool de cada par de tokens em cada fee tier"""
+        tokens = sorted({t.lower() for t in tokens})
+        factory = factory.lower()
+        missing = [
+            (factory, a, b, fee)
+            for i, a in enumerate(tokens)
+            for b in tokens[i + 1:]
+            for fee in self.fee_tiers
+            if (factory, a, b, fee) not in self.pools
+        ]
+        if missing:
+            self._resolve(missing)
+        return sum(1 for key in missing if self.pools.get(key))
+
+    def _resolve(self, keys):
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return
+
+        futures = [
+            (key, batch.call(key[0], '0x' + GET_POOL_SELECTOR + _word(key[1]) + _word(key[2])
+                             + _int_word(key[3])))
+            for key in keys
+        ]
+        batch.execute()
+
+        for key, future in futures:
+            raw = future.result_or(_MISSING)
+            if raw is _MISSING or len(raw) < 32:
+                continue  # falha de RPC: tentar de novo na próxima vez
+            pool = '0x' + raw[12:32].hex()
+            self.pools[key] = pool if pool != ZERO_ADDRESS else None
+
+        found = sum(1 for key, _ in futures if self.pools.get(key))
+        logger.debug(f"🦄 {self.network}: {found}/{len(keys)} pools V3 resolvidos")
+
+    def get_pools(self, factory: str, token_a: str, token_b: str) -> List[Tuple[int, str]]:
+        """[(fee, endereço)] dos pools existentes para o par"""
+        token0, token1 = sort_tokens(token_a, token_b)
+        keys = [(factory.lower(), token0, token1, fee) for fee in self.fee_tiers]
+        missing = [key for key in keys if key not in self.pools]
+        if missing:
+            self._resolve(missing)
+        return [(key[3], self.pools[key]) for key in keys if self.pools.get(key)]
+
+    # ------------------------------------------------------------------
+    # Estado por bloco
+    # ------------------------------------------------------------------
+
+    def pool_addresses(self) -> List[str]:
+        return sorted({pool for pool in self.pools.values() if pool})
+
+    def pool_tokens(self) -> Dict[str, Tuple[str, str]]:
+        """Endereço do pool -> (token0, token1)"""
+        return {pool: (key[1], key[2]) for key, pool in self.pools.items() if pool}
+
+    def _fetch_states(self, keys, block='latest') -> Dict[str, V3PoolState]:
+        if not keys:
+            return {}
+
+        # 1) slot0 + liquidez
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return {}
+        heads = [(key, batch.call(self.pools[key], SLOT0_SELECTOR, block),
+                  batch.call(self.pools[key], LIQUIDITY_SELECTOR, block)) for key in keys]
+        batch.execute()
+
+        pools = []
+        for key, slot0, liquidity in heads:
+            raw_slot0 = slot0.result_or(None)
+            raw_liquidity = liquidity.result_or(None)
+            if not raw_slot0 or len(raw_slot0) < 64 or not raw_liquidity:
+                continue
+            pools.append((key, _unsigned(raw_slot0, 0), _signed(raw_slot0, 1), _unsigned(raw_liquidity, 0)))
+
+        # 2) palavras do bitmap ao redor do tick atual
+        words = BotConfig.V3_TICK_WORDS
+        batch = self.blockchain.batch(self.network)
+        bitmaps = []
+        for key, sqrt_price, tick, liquidity in pools:
+            center = (tick // FEE_TICK_SPACING[key[3]]) >> 8
+            bitmaps.append({
+                word: batch.call(self.pools[key], '0x' + TICK_BITMAP_SELECTOR + _int_word(word), block)
+                for word in range(center - words, center + words + 1)
+            })
+        batch.execute()
+
+        # 3) liquidityNet de cada tick inicializado
+        batch = self.blockchain.batch(self.network)
+        tick_futures = []
+        for (key, _, _, _), futures in zip(pools, bitmaps):
+            spacing = FEE_TICK_SPACING[key[3]]
+            bitmap = {}
+            for word, future in futures.items():
+                raw = future.result_or(None)
+                if raw is not None and len(raw) >= 32:
+                    bitmap[word] = _unsigned(raw, 0)
+            initialized = {
+                tick: batch.call(self.pools[key], '0x' + TICKS_SELECTOR + _int_word(tick), block)
+                for word, value in bitmap.items()
+                for bit in range(256) if value >> bit & 1
+                for tick in ((word * 256 + bit) * spacing,)
+            }
+            tick_futures.append((bitmap, initialized))
+        if len(batch):
+            batch.execute()
+
+        states = {}
+        for (key, sqrt_price, tick, liquidity), (bitmap, initialized) in zip(pools, tick_futures):
+            ticks = {}
+            complete = True
+            for tick_index, future in initialized.items():
+                raw = future.result_or(None)
+                if raw is None or len(raw) < 64:
+                    complete = False
+                    break
+                ticks[tick_index] = _signed(raw, 1)
+            if not complete:
+                continue
+
+            address = self.pools[key]
+            states[address] = V3PoolState(address, key[1], key[2], key[3], sqrt_price, tick,
+                                          liquidity, bitmap, ticks)
+        return states
+
+    def _read_block(self):
+        """Bloco das leituras: o dos logs, o fixado pelo scan ou a cabeça atual"""
+        if self.live_state is not None:
+            return self.live_block
+        if self.scan_block is not None:
+            return self.scan_block
+        head = self.blockchain.get_block_number(self.network)
+        return head if head is not None else 'latest'
+
+    def _load_states(self, block) -> Dict[str, V3PoolState]:
+        self.state_loads += 1
+        keys = [key for key, pool in self.pools.items() if pool]
+        return self._fetch_states(keys, block)
+
+    def load_live(self, block: int):
+        """Lê todos os pools no bloco `block` e passa a manter o estado pelos logs"""
+        self.state_loads += 1
+        keys = [key for key, pool in self.pools.items() if pool]
+        self.live_state = self._fetch_states(keys, block)
+        self.live_block = block
+
+    def reload_live(self, addresses: Iterable[str], block: int):
+        """Relê só os pools indicados (ex.: após Burn, que pode desligar ticks do bitmap)"""
+        if self.live_state is None:
+            return
+        addresses = set(addresses)
+        keys = [key for key, pool in self.pools.items() if pool in addresses]
+        states = self._fetch_states(keys, block)
+        for address in addresses:
+            if address in states:
+                self.live_state[address] = states[address]
+            else:
+                self.live_state.pop(address, None)
+
+    def apply_swap(self, address: str, sqrt_price_x96: int, liquidity: int, tick: int):
+        """Log Swap: preço, liquidez ativa e tick absolutos após o swap"""
+        state = self.live_state.get(address) if self.live_state is not None else None
+        if state is not None:
+            state.sqrt_price_x96 = sqrt_price_x96
+            state.liquidity = liquidity
+            state.tick = tick
+
+    def apply_mint(self, address: str, tick_lower: int, tick_upper: int, amount: int):
+        """Log Mint: liquidez nova em [tick_lower, tick_upper) (os dois ticks ficam inicializados)"""
+        state = self.live_state.get(address) if self.live_state is not None else None
+        if state is None or amount == 0:
+            return
+
+        for tick, delta in ((tick_lower, amount), (tick_upper, -amount)):
+            compressed = tick // state.tick_spacing
+            word = compressed >> 8
+            if word in state.bitmap:
+                state.bitmap[word] |= 1 << (compressed % 256)
+                state.ticks[tick] = state.ticks.get(tick, 0) + delta
+
+        if tick_lower <= state.tick < tick_upper:
+            state.liquidity += amount
+
+    def snapshot(self) -> Dict[str, V3PoolState]:
+        """Estado de todos os pools conhecidos no bloco atual"""
+        if self.live_state is not None:
+            return self.live_state
+        block = self._read_block()
+        return self.blockchain.cache.get_or_load_head(
+            self.network, ('v3_pools', id(self), block), lambda: self._load_states(block)
+        )
+
+    def get_state(self, factory: str, token_a: str, token_b: str, fee: int) -> Optional[V3PoolState]:
+        token0, token1 = sort_tokens(token_a, token_b)
+        key = (factory.lower(), token0, token1, fee)
+        pool = self.pools.get(key)
+        if not pool:
+            return None
+
+        snapshot = self.snapshot()
+        state = snapshot.get(pool)
+        if state is None:
+            # Pool que apareceu depois da carga do bloco: buscar só ele
+            state = self._fetch_states([key], self._read_block()).get(pool)
+            if state is not None:
+                snapshot[pool] = state
+        return state
+
+    # ------------------------------------------------------------------
+    # Cotação
+    # ------------------------------------------------------------------
+
+    def quote_via_quoter(self, quoter: str, token_in: str, token_out: str, amount_in: int,
+                         fee: int) -> Optional[int]:
+        """QuoterV2.quoteExactInputSingle via eth_call (uma chamada RPC)"""
+        if not quoter or quoter == ZERO_ADDRESS:
+            return None
+
+        self.quoter_calls += 1
+        data = ('0x' + QUOTE_EXACT_INPUT_SINGLE_SELECTOR + _word(token_in) + _word(token_out)
+                + _int_word(amount_in) + _int_word(fee) + _int_word(0))
+        batch = self.blockchain.batch(self.network)
+        if batch is None:
+            return None
+        future = batch.call(quoter, data, self._read_block())
+        batch.execute()
+
+        raw = future.result_or(None)
+        if not raw or len(raw) < 32:
+            return None
+        return _unsigned(raw, 0)
+
+    def quote_pool(self, factory: str, quoter: str, token_in: str, token_out: str,
+                   amount_in: int, fee: int) -> Optional[int]:
+        """Cotação em um fee tier: local, ou QuoterV2 se faltar estado"""
+        state = self.get_state(factory, token_in, token_out, fee)
+        if state is not None:
+            try:
+                return state.quote_exact_input(token_in, amount_in)
+            except TickRangeExceeded:
+                logger.debug(f"🦄 Swap sai do bitmap carregado em {state.address[:10]}...: usando QuoterV2")
+        return self.quote_via_quoter(quoter, token_in, token_out, amount_in, fee)
+
+    def quote(self, factory: str, quoter: str, token_in: str, token_out: str,
+              amount_in: int) -> Optional[int]:
+        """Melhor amountOut entre os fee tiers do par (None = sem pool)"""
+        best = None
+        for fee, _ in self.get_pools(factory, token_in, token_out):
+            amount_out = self.quote_pool(factory, quoter, token_in, token_out, amount_in, fee)
+            if amount_out is not None and (best is None or amount_out > best):
+                best = amount_out
+        return best
+
+    def verify(self, factory: str, quoter: str, token_in: str, token_out: str,
+               amount_in: int, fee: int) -> Tuple[Optional[int], Optional[int]]:
+        """(local, QuoterV2) para o mesmo swap: oráculo para conferir o simulador"""
+        state = self.get_state(factory, token_in, token_out, fee)
+        local = None
+        if state is not None:
+            try:
+                local = state.quote_exact_input(token_in, amount_in)
+            except TickRangeExceeded:
+                pass
+        remote = self.quote_via_quoter(quoter, token_in, token_out, amount_in, fee)
+        if local is not None and remote is not None and local != remote:
+            logger.warning(f"⚠️ Cotação V3 divergente em {state.address[:10]}...: local={local} quoter={remote}")
+        return local, remote
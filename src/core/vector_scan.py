@@ -0,0 +1,305 @@
+"""
+🧮 SCANNER VETORIZADO DE ARBITRAGEM
+Reservas de todos os pares em arrays NumPy (pares × venues): tamanho ótimo,
+compra, venda e lucro de todas as rotas calculados de uma vez; só os melhores
+candidatos são recotados com a matemática inteira exata dos pools
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import BotConfig
+from src.core.opportunity import Opportunity
+from src.core.pool_table import KINDS
+from src.core.trade_sizing import TradeSizer, optimal_input
+from src.core.v2_pools import ZERO_ADDRESS, sort_tokens
+
+Q96 = float(2 ** 96)
+
+
+class Venue(NamedTuple):
+    dex: str
+    kind: str   # 'v2' ou 'v3'
+    fee: int    # V3: fee tier; V2: 0
+
+
+class PriceTensor(NamedTuple):
+    """Estado de um bloco em arrays (P pares × V venues), orientado token_in → token_out"""
+    reserve_in: np.ndarray    # (P, V) reserva (virtual, no V3) de token_in
+    reserve_out: np.ndarray   # (P, V) reserva (virtual, no V3) de token_out
+    fee: np.ndarray           # (V,) fração que entra no pool (1 - taxa)
+    dex_index: np.ndarray     # (V,) DEX de cada venue (compra e venda em DEXs diferentes)
+    valid: np.ndarray         # (P, V) venue tem pool com liquidez para o par
+
+
+class Candidate(NamedTuple):
+    pair: int
+    buy: int
+    sell: int
+    amount_in: int
+    estimate: float   # lucro estimado (float) em unidades de token_in
+
+
+def _swap_out(amount_in: np.ndarray, reserve_in: np.ndarray, reserve_out: np.ndarray,
+              fee: np.ndarray) -> np.ndarray:
+    """Produto constante: out = R_out·x·γ / (R_in + x·γ)"""
+    effective = amount_in * fee
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(reserve_in > 0, reserve_out * effective / (reserve_in + effective), 0.0)
+
+
+def route_inputs(tensor: PriceTensor, caps: np.ndarray, flash_fee: float = 0.0) -> np.ndarray:
+    """Entrada ótima (forma fechada) de cada rota compra → venda, limitada ao teto do par: (P, V, V, 1)"""
+    optimal = optimal_input(
+        tensor.reserve_in[:, :, None], tensor.reserve_out[:, :, None], tensor.fee[None, :, None],
+        tensor.reserve_out[:, None, :], tensor.reserve_in[:, None, :], tensor.fee[None, None, :],
+        flash_fee
+    )
+    return np.floor(np.minimum(optimal, caps[:, None, None]))[..., None]
+
+
+def cycle_profits(tensor: PriceTensor, amounts: np.ndarray, flash_fee: float = 0.0) -> np.ndarray:
+    """
+    Lucro de token_in → token_out (venue de compra) → token_in (venue de venda)
+
+    amounts: entradas em formato compatível com (P, V, V, S) — ex.: (P, 1, 1, S)
+    para uma grade por par, (P, V, V, 1) para um tamanho por rota. Retorna
+    (P, V, V, S), líquido da taxa do flash loan, com -inf onde compra e venda
+    são da mesma DEX ou algum venue não tem o par.
+    """
+    # token_out recebido em cada venue de compra
+    bought = _swap_out(amounts, tensor.reserve_in[:, :, None, None], tensor.reserve_out[:, :, None, None],
+                       tensor.fee[None, :, None, None])
+    # token_in de volta vendendo em cada venue de venda
+    sold = _swap_out(bought, tensor.reserve_out[:, None, :, None], tensor.reserve_in[:, None, :, None],
+                     tensor.fee[None, None, :, None])
+    profit = sold - amounts * (1.0 + flash_fee)
+
+    # DEXs diferentes (não só pools): o contrato recebe as pernas pelo router da DEX,
+    # sem fee tier, então dois tiers V3 da mesma DEX não formam uma rota executável
+    distinct = tensor.dex_index[:, None] != tensor.dex_index[None, :]
+    usable = tensor.valid[:, :, None] & tensor.valid[:, None, :] & distinct[None]
+    return np.where(usable[..., None], profit, -np.inf)
+
+
+def top_candidates(profits: np.ndarray, amounts: np.ndarray, scale: np.ndarray, top_k: int) -> List[Candidate]:
+    """
+    Melhor (compra, venda, tamanho) de cada par lucrativo; os `top_k` maiores
+    em lucro / scale (scale: unidades cruas de 1 USD do token_in do par)
+    """
+    pairs, venues, _, sizes = profits.shape
+    flat = profits.reshape(pairs, -1)
+    best = flat.argmax(axis=1)
+    best_profit = flat[np.arange(pairs), best]
+
+    buy, sell, _ = np.unravel_index(best, (venues, venues, sizes))
+    chosen = np.broadcast_to(amounts, profits.shape).reshape(pairs, -1)[np.arange(pairs), best]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.where(best_profit > 0, best_profit / scale, -np.inf)
+
+    profitable = np.flatnonzero(relative > 0)
+    ranked = profitable[np.argsort(-relative[profitable], kind='stable')][:top_k]
+    return [
+        Candidate(int(p), int(buy[p]), int(sell[p]), int(chosen[p]), float(best_profit[p]))
+        for p in ranked
+    ]
+
+
+class VectorScanner:
+    """
+    Varredura de todos os pares de uma rede em arrays
+
+    - build(): monta o tensor de preços a partir das caches V2/V3 do bloco
+      (V3 como reservas virtuais L/√P, L·√P: exato dentro do tick atual)
+    - scan(): tamanho ótimo e lucro de pares × venues × venues em operações
+      NumPy; os top-k são dimensionados e recotados pelo TradeSizer sobre
+      DEXInterface.get_price (inteiros, cruza ticks)
+    """
+
+    def __init__(self, dex_interface, top_k: Optional[int] = None):
+        self.dex = dex_interface
+        self.sizer = TradeSizer(dex_interface)
+        self.top_k = top_k or BotConfig.VECTOR_SCAN_TOP_K
+        self.stats = {'scans': 0, 'pairs': 0, 'candidates': 0, 'confirmed': 0}
+
+    def venues(self) -> List[Venue]:
+        """Colunas do tensor: um venue por DEX V2 e um por fee tier V3"""
+        venues = []
+        for dex_name, dex in self.dex.dexs.items():
+            if dex.get('factory', ZERO_ADDRESS) == ZERO_ADDRESS:
+                continue
+            if dex['type'] == 'v2' and self.dex.v2_pools is not None:
+                venues.append(Venue(dex_name, 'v2', 0))
+            elif dex['type'] == 'v3' and self.dex.v3_pools is not None:
+                venues.extend(Venue(dex_name, 'v3', fee) for fee in self.dex.v3_pools.fee_tiers)
+        return venues
+
+    def _pool_address(self, venue: Venue, token_in: str, token_out: str) -> Optional[str]:
+        factory = self.dex.dexs[venue.dex]['factory']
+        if venue.kind == 'v2':
+            return self.dex.v2_pools.get_pair(factory, token_in, token_out)
+        return dict(self.dex.v3_pools.get_pools(factory, token_in, token_out)).get(venue.fee)
+
+    def build(self, pairs: Sequence[Tuple[str, str]], venues: List[Venue]) -> PriceTensor:
+        count = len(pairs)
+        reserve_in = np.zeros((count, len(venues)))
+        reserve_out = np.zeros((count, len(venues)))
+        fee = np.array([
+            1.0 - (self.dex.dexs[v.dex].get('fee_bps', 30) / 10_000 if v.kind == 'v2' else v.fee / 1_000_000)
+            for v in venues
+        ])
+
+        v2_reserves = self.dex.v2_pools.snapshot() if any(v.kind == 'v2' for v in venues) else {}
+        v3_states = self.dex.v3_pools.snapshot() if any(v.kind == 'v3' for v in venues) else {}
+
+        for column, venue in enumerate(venues):
+            for row, (token_in, token_out) in enumerate(pairs):
+                token0, _ = sort_tokens(token_in, token_out)
+                forward = token_in.lower() == token0
+                pool = self._pool_address(venue, token_in, token_out)
+
+                if venue.kind == 'v2':
+                    reserves = v2_reserves.get(pool) if pool else None
+                    if reserves is None:
+                        continue
+                    r0, r1 = float(reserves[0]), float(reserves[1])
+                else:
+                    state = v3_states.get(pool)
+                    if state is None or not state.liquidity or not state.sqrt_price_x96:
+                        continue
+                    sqrt_price = state.sqrt_price_x96 / Q96
+                    r0, r1 = state.liquidity / sqrt_price, state.liquidity * sqrt_price
+
+                reserve_in[row, column], reserve_out[row, column] = (r0, r1) if forward else (r1, r0)
+
+        names = list(dict.fromkeys(v.dex for v in venues))
+        dex_index = np.array([names.index(v.dex) for v in venues])
+        return PriceTensor(reserve_in, reserve_out, fee, dex_index, (reserve_in > 0) & (reserve_out > 0))
+
+    def scan(self, token_pairs: Sequence[Tuple[Tuple[str, str], Tuple[str, str]]],
+             caps: Optional[Sequence[int]] = None,
+             on_opportunity: Optional[Callable[[Opportunity], None]] = None) -> List[Opportunity]:
+        """
+        token_pairs: [((símbolo_in, endereço_in), (símbolo_out, endereço_out))]
+        caps: entrada máxima (token_in) de cada par; padrão: TradeSizer.caps()
+        on_opportunity: chamado com cada oportunidade assim que confirmada
+        """
+        opportunities = []
+        try:
+            venues = self.venues()
+            if len(venues) < 2 or not token_pairs:
+                return []
+
+            pairs = [(addr_in, addr_out) for (_, addr_in), (_, addr_out) in token_pairs]
+            if caps is None:
+                caps = self.sizer.caps([addr_in for addr_in, _ in pairs])
+            caps = np.asarray(caps, dtype=float)
+
+            tensor = self.build(pairs, venues)
+            amounts = route_inputs(tensor, caps, BotConfig.FLASH_LOAN_FEE)
+            profits = cycle_profits(tensor, amounts, BotConfig.FLASH_LOAN_FEE)
+            # Lucro comparado em USD: unidades cruas de 1 USD de cada token_in
+            scale = np.array([self.dex.tokens.to_raw(addr_in, 1.0) or cap or 1.0
+                              for (addr_in, _), cap in zip(pairs, caps)], dtype=float)
+            candidates = top_candidates(profits, amounts, scale, self.top_k)
+            self.stats['scans'] += 1
+            self.stats['pairs'] += len(pairs)
+            self.stats['candidates'] += len(candidates)
+
+            for candidate in candidates:
+                (symbol_in, token_in), (symbol_out, token_out) = token_pairs[candidate.pair]
+                opp = self._confirm(token_in, token_out, venues[candidate.buy], venues[candidate.sell],
+                                    candidate.amount_in, int(caps[candidate.pair]))
+                if opp:
+                    opp['symbol_in'] = symbol_in
+                    opp['symbol_out'] = symbol_out
+                    opportunities.append(opp)
+                    if on_opportunity is not None:
+                        on_opportunity(opp)
+
+            self.stats['confirmed'] += len(opportunities)
+
+        except Exception as e:
+            logger.error(f"❌ Erro no scan vetorizado: {e}")
+
+        return opportunities
+
+    def confirm_rows(self, candidates: Sequence,
+                     on_opportunity: Optional[Callable[[Opportunity], None]] = None) -> List[Opportunity]:
+        """
+        Recota candidatos por linha da PoolTable (RouteCandidate dos processos
+        de cotação): os top_k de maior lucro estimado em USD
+        """
+        opportunities = []
+        try:
+            table = self.dex.pool_table
+            ranked = []
+            for candidate in candidates:
+                token0 = table.tokens[table.token0[candidate.buy_row]]
+                token1 = table.tokens[table.token1[candidate.buy_row]]
+                token_in, token_out = (token1, token0) if candidate.direction else (token0, token1)
+                ranked.append((self.dex.tokens.to_usd(token_in, candidate.estimate) or 0.0,
+                               candidate, token_in, token_out))
+            ranked.sort(key=lambda item: -item[0])
+            ranked = ranked[:self.top_k]
+            if not ranked:
+                return []
+
+            caps = self.sizer.caps([token_in for _, _, token_in, _ in ranked])
+            self.stats['scans'] += 1
+            self.stats['candidates'] += len(ranked)
+
+            for (_, candidate, token_in, token_out), cap in zip(ranked, caps):
+                buy, sell = (
+                    Venue(table.venues[table.venue[row]], KINDS[table.kind[row]], int(table.fee[row]))
+                    for row in (candidate.buy_row, candidate.sell_row)
+                )
+                opp = self._confirm(token_in, token_out, buy, sell, int(min(candidate.amount_in, cap)), int(cap))
+                if opp:
+                    opp['symbol_in'] = self.dex.tokens.symbol(token_in) or token_in[:10]
+                    opp['symbol_out'] = self.dex.tokens.symbol(token_out) or token_out[:10]
+                    opportunities.append(opp)
+                    if on_opportunity is not None:
+                        on_opportunity(opp)
+
+            self.stats['confirmed'] += len(opportunities)
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao confirmar candidatos dos processos de cotação: {e}")
+
+        return opportunities
+
+    def _confirm(self, token_in: str, token_out: str, buy: Venue, sell: Venue, estimate: int,
+                 cap: int) -> Optional[Opportunity]:
+        """Dimensiona e recota o candidato com a matemática inteira exata (mesmas chaves de find_arbitrage_opportunity)"""
+        for token in (token_in, token_out):
+            safe, reason = self.dex.token_security.is_token_safe(token)
+            if not safe:
+                logger.debug(f"❌ Token rejeitado: {reason}")
+                return None
+
+        # Recotação no pool escolhido (fee tier do venue): valores batem com `pools`
+        buy_fee, sell_fee = (venue.fee if venue.kind == 'v3' else None for venue in (buy, sell))
+        closed_form = buy.kind == 'v2' and sell.kind == 'v2'
+        amount_in = self.sizer.refine(buy.dex, sell.dex, token_in, token_out, estimate, cap, closed_form,
+                                      buy_fee, sell_fee)
+        _, amount_out_buy, amount_out_sell = self.sizer.route_profit(buy.dex, sell.dex, token_in, token_out,
+                                                                    amount_in, buy_fee, sell_fee)
+        if not amount_out_sell:
+            return None
+
+        profit = amount_out_sell - amount_in
+        if profit <= 0:
+            return None
+
+        table = self.dex.pool_table
+        return Opportunity(
+            self.dex.network, buy.dex, sell.dex, token_in, token_out,
+            amount_in, amount_out_buy, amount_out_sell, profit,
+            pools=[table.row(self._pool_address(venue, token_in, token_out)) for venue in (buy, sell)]
+        )
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'sizing': self.sizer.get_stats()}
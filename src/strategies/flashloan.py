@@ -3,13 +3,15 @@
 Implementa Flash Loan Arbitrage usando Aave V3
 """
 
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from web3 import Web3
 from loguru import logger
 import json
 import time
 
-from src.config.config import AAVE_V3_POOL, BotConfig
+from src.config.config import AAVE_V3_POOL, BotConfig, convert_native_to_usd
+from src.core.address import checksum
+from src.core.token_metadata import get_token_store, opportunity_usd
 
 # ABI simplificada do Aave V3 Pool
 AAVE_POOL_ABI = json.loads('''[
@@ -35,8 +37,13 @@ class FlashLoanExecutor:
     def __init__(self, blockchain_connector):
         self.blockchain = blockchain_connector
         self.pools = {}
+        self.result_callbacks: List[Callable[[Dict], None]] = []
         self._initialize_pools()
     
+    def add_result_callback(self, callback: Callable[[Dict], None]):
+        """Registra callback chamado com o resultado de cada trade"""
+        self.result_callbacks.append(callback)
+    
     def _initialize_pools(self):
         """Inicializa contratos Aave Pool"""
         try:
@@ -49,7 +56,7 @@ class FlashLoanExecutor:
                         continue
                     
                     pool_contract = w3.eth.contract(
-                        address=Web3.to_checksum_address(pool_address),
+                        address=checksum(pool_address),
                         abi=AAVE_POOL_ABI
                     )
                     
@@ -78,18 +85,22 @@ class FlashLoanExecutor:
             
             # Estimar gas
             network = opportunity['network']
-            w3 = self.blockchain.get_web3(network)
-            gas_price = w3.eth.gas_price
-            estimated_gas = 500000  # Estimativa conservadora
+            gas_price = self.blockchain.get_gas_price(network)
+            estimated_gas = BotConfig.ARBITRAGE_GAS_UNITS  # mesma estimativa do ranking do scanner
             gas_cost_wei = gas_price * estimated_gas
-            gas_cost_token = gas_cost_wei  # Simplificado
+            
+            # Gas em unidades do token de entrada, pelos metadados (decimais + preço de referência)
+            tokens = get_token_store(network)
+            gas_cost_token = tokens.to_raw(opportunity['token_in'], convert_native_to_usd(gas_cost_wei / 1e18, network))
+            if gas_cost_token is None:
+                return {'profitable': False, 'reason': 'Token sem decimais/preço de referência'}
             
             # Lucro líquido
             gross_profit = amount_out - amount_in
             net_profit = gross_profit - flash_loan_fee - gas_cost_token
             
-            # Converter para USD (simplificado)
-            net_profit_usd = float(w3.from_wei(net_profit, 'mwei'))
+            # Converter para USD
+            net_profit_usd = tokens.to_usd(opportunity['token_in'], net_profit)
             
             return {
                 'gross_profit': gross_profit,
@@ -136,8 +147,25 @@ class FlashLoanExecutor:
             logger.warning("⚠️ Flash loan real requer contrato inteligente customizado!")
             logger.info("📝 Esta é uma simulação para demonstração")
             
-            # Simulação de execução
-            return self._simulate_flash_loan(opportunity, profit_analysis)
+            # Simulação de execução (resultado imediato, sem receipt)
+            tx_hash = self._simulate_flash_loan(opportunity, profit_analysis)
+            if tx_hash:
+                trade = {
+                    'tx_hash': tx_hash,
+                    'network': network,
+                    'success': True,
+                    'opportunity': opportunity,
+                    'profit': profit_analysis,
+                    'profit_usd': profit_analysis['net_profit_usd'],
+                    'gas_cost_usd': 0.0,
+                    'timestamp': time.time()
+                }
+                for callback in self.result_callbacks:
+                    try:
+                        callback(trade)
+                    except Exception as e:
+                        logger.error(f"❌ Erro no callback de resultado: {e}")
+            return tx_hash
             
         except Exception as e:
             logger.error(f"❌ Erro ao executar flash loan: {e}")
@@ -151,7 +179,7 @@ class FlashLoanExecutor:
             logger.info(f"  💱 Par: {opportunity.get('symbol_in', '?')} → {opportunity.get('symbol_out', '?')}")
             logger.info(f"  🏪 Compra em: {opportunity['buy_dex']}")
             logger.info(f"  🏪 Vende em: {opportunity['sell_dex']}")
-            logger.info(f"  💵 Valor: ${opportunity['amount_in'] / 1e6:.2f}")
+            logger.info(f"  💵 Valor: ${opportunity_usd(opportunity):.2f}")
             logger.info(f"  💰 Lucro: ${profit_analysis['net_profit_usd']:.2f}")
             logger.info(f"  📊 ROI: {opportunity['profit_percentage']:.2f}%")
             
@@ -184,15 +212,20 @@ class FlashLoanStrategy:
             'success_rate': 0.0
         }
     
-    def find_and_execute(self) -> Optional[Dict]:
-        """Encontra e executa a melhor oportunidade"""
+    def add_result_callback(self, callback: Callable[[Dict], None]):
+        """Recebe o resultado de cada trade (ver executor)"""
+        self.executor.add_result_callback(callback)
+    
+    def find_and_execute(self, networks: Optional[List[str]] = None) -> Optional[Dict]:
+        """Encontra e executa a melhor oportunidade (opcionalmente só em `networks`)"""
         try:
             # Buscar melhor oportunidade
             logger.info("🔍 Buscando oportunidades...")
             
             opportunity = self.dex_scanner.get_best_opportunity(
                 min_profit_usd=BotConfig.MIN_PROFIT_USD,
-                min_profit_pct=BotConfig.MIN_PROFIT_PERCENTAGE
+                min_profit_pct=BotConfig.MIN_PROFIT_PERCENTAGE,
+                networks=networks
             )
             
             if not opportunity:
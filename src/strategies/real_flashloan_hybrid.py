@@ -4,7 +4,7 @@ Execução REAL com suporte híbrido para diferentes redes
 VERSÃO MELHORADA - Funciona em TODAS as redes
 """
 
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from web3 import Web3
 from web3.contract import Contract
 from loguru import logger
@@ -12,7 +12,12 @@ import json
 import time
 from eth_account import Account
 
-from src.config.config import AAVE_V3_POOL, BotConfig
+from src.config.config import AAVE_V3_POOL, BotConfig, convert_native_to_usd
+from src.core.address import checksum
+from src.core.raw_rpc import encode_execute_arbitrage
+from src.core.token_metadata import get_token_store, opportunity_usd
+from src.core.receipt_tracker import ReceiptResult
+from src.core.rpc_scheduler import Priority, rpc_priority
 
 # ABI do contrato FlashLoanArbitrageHybrid
 FLASH_LOAN_HYBRID_ABI = json.loads('''[
@@ -88,6 +93,8 @@ class HybridFlashLoanExecutor:
         self.blockchain = blockchain_connector
         self.contracts = {}
         self.contract_addresses = {}
+        self.result_callbacks: List[Callable[[Dict], None]] = []
+        self.profit_analyses: Dict[str, Dict] = {}  # tx_hash -> análise da decisão de envio
         
         # Carregar endereços dos contratos deployados
         self._load_contract_addresses()
@@ -135,7 +142,7 @@ class HybridFlashLoanExecutor:
                         contract_address = contract_data
                     
                     contract = w3.eth.contract(
-                        address=Web3.to_checksum_address(contract_address),
+                        address=checksum(contract_address),
                         abi=FLASH_LOAN_HYBRID_ABI
                     )
                     
@@ -163,7 +170,7 @@ class HybridFlashLoanExecutor:
         """Calcula taxa de flash loan (0.09%)"""
         return int(amount * BotConfig.FLASH_LOAN_FEE)
     
-    def estimate_profit(self, opportunity: Dict) -> Dict:
+    def estimate_profit(self, opportunity: Dict, tx_params: Optional[Dict] = None) -> Dict:
         """Estima lucro líquido REAL considerando todas as taxas"""
         try:
             network = opportunity['network']
@@ -179,16 +186,22 @@ class HybridFlashLoanExecutor:
             flash_loan_fee = self.calculate_flash_loan_fee(amount_in)
             
             # Estimar gas REAL
-            gas_estimate = self._estimate_gas_cost(network, opportunity)
+            gas_estimate = self._estimate_gas_cost(network, opportunity, tx_params)
+            
+            # Gas (wei do token nativo) em unidades do token de entrada, pelos metadados
+            tokens = get_token_store(network)
+            gas_cost_token = tokens.to_raw(opportunity['token_in'], convert_native_to_usd(gas_estimate / 1e18, network))
+            if gas_cost_token is None:
+                return {'profitable': False, 'reason': 'Token sem decimais/preço de referência'}
             
             # Lucro bruto
             gross_profit = amount_out - amount_in
             
             # Lucro líquido
-            net_profit = gross_profit - flash_loan_fee - gas_estimate
+            net_profit = gross_profit - flash_loan_fee - gas_cost_token
             
-            # Converter para USD (simplificado - em produção usar oracle)
-            net_profit_usd = float(w3.from_wei(net_profit, 'mwei')) if net_profit > 0 else 0
+            # Converter para USD (decimais e preço de referência do token)
+            net_profit_usd = tokens.to_usd(opportunity['token_in'], net_profit) if net_profit > 0 else 0
             
             return {
                 'gross_profit': gross_profit,
@@ -204,19 +217,18 @@ class HybridFlashLoanExecutor:
             logger.error(f"❌ Erro ao estimar lucro: {e}")
             return {'profitable': False, 'reason': str(e)}
     
-    def _estimate_gas_cost(self, network: str, opportunity: Dict) -> int:
+    def _estimate_gas_cost(self, network: str, opportunity: Dict, tx_params: Optional[Dict] = None) -> int:
         """Estima custo de gas REAL"""
         try:
-            w3 = self.blockchain.get_web3(network)
-            if not w3:
-                return 0
-            
-            # Gas price atual
-            gas_price = w3.eth.gas_price
+            # Gas price do bloco atual (cache compartilhado com build/send)
+            if tx_params and 'gasPrice' in tx_params:
+                gas_price = tx_params['gasPrice']
+            else:
+                gas_price = self.blockchain.get_gas_price(network)
             
-            # Estimativa de gas units (baseado em execuções anteriores)
-            # Flash loan + 2 swaps = ~500k gas
-            estimated_gas_units = 500000
+            # Gas units da arbitragem (flash loan + 2 swaps): o mesmo valor que
+            # ordena as oportunidades no scanner
+            estimated_gas_units = BotConfig.ARBITRAGE_GAS_UNITS
             
             # Custo total em wei
             gas_cost_wei = gas_price * estimated_gas_units
@@ -232,6 +244,9 @@ class HybridFlashLoanExecutor:
         Executa flash loan arbitrage HÍBRIDO na blockchain
         
         Esta versão funciona em TODAS as redes, inclusive Ethereum Sepolia
+        
+        Retorna logo após o envio; o resultado confirmado chega pelos
+        callbacks de add_result_callback
         """
         try:
             network = opportunity['network']
@@ -246,8 +261,14 @@ class HybridFlashLoanExecutor:
             contract = contract_info['contract']
             w3 = self.blockchain.get_web3(network)
             
+            # Gas price e chain ID do cache do bloco (nonce é reservado só no envio)
+            tx_params = self.blockchain.get_tx_params(network, reserve_nonce=False)
+            if not tx_params:
+                logger.error(f"❌ Não foi possível obter parâmetros da transação em {network}")
+                return None
+            
             # Estimar lucro
-            profit_analysis = self.estimate_profit(opportunity)
+            profit_analysis = self.estimate_profit(opportunity, tx_params)
             
             if not profit_analysis['profitable']:
                 logger.warning(f"⚠️ Não lucrativo: {profit_analysis.get('reason', 'Unknown')}")
@@ -257,78 +278,71 @@ class HybridFlashLoanExecutor:
             logger.info(f"📊 ROI estimado: {profit_analysis['roi']:.2f}%")
             logger.info(f"🎯 Modo: {contract_info.get('mode', 'Unknown')}")
             
-            # Preparar parâmetros da transação
-            asset = Web3.to_checksum_address(opportunity['token_in'])
+            # Preparar parâmetros da transação (endereços vão crus para o encoder)
+            zero_address = '0x0000000000000000000000000000000000000000'
+            asset = opportunity['token_in']
             amount = opportunity['amount_in']
             
             # Endereços das DEXs (ou address(0) para modo Aave-only)
-            buy_dex = Web3.to_checksum_address(
-                opportunity.get('buy_dex_address', '0x0000000000000000000000000000000000000000')
-            )
-            sell_dex = Web3.to_checksum_address(
-                opportunity.get('sell_dex_address', '0x0000000000000000000000000000000000000000')
-            )
+            buy_dex = opportunity.get('buy_dex_address', zero_address)
+            sell_dex = opportunity.get('sell_dex_address', zero_address)
             
-            token_in = Web3.to_checksum_address(opportunity['token_in'])
-            token_out = Web3.to_checksum_address(opportunity['token_out'])
+            token_in = opportunity['token_in']
+            token_out = opportunity['token_out']
             min_profit = int(profit_analysis['net_profit'] * 0.95)  # 95% do estimado
             deadline = int(time.time()) + 300  # 5 minutos
             
             # Verificar se está em DRY RUN
             if BotConfig.DRY_RUN:
                 logger.warning("🎭 MODO DRY RUN - Simulando execução...")
-                return self._simulate_real_execution(opportunity, profit_analysis)
+                tx_hash_hex = self._simulate_real_execution(opportunity, profit_analysis)
+                if tx_hash_hex:
+                    self.profit_analyses[tx_hash_hex] = profit_analysis
+                    self._emit_result(network, tx_hash_hex, True, opportunity, profit_analysis)
+                return tx_hash_hex
             
             # EXECUTAR TRANSAÇÃO REAL
             logger.info("🚀 Executando flash loan HÍBRIDO na blockchain...")
             
-            # Construir transação
-            tx = contract.functions.executeArbitrage(
-                asset,
-                amount,
-                buy_dex,
-                sell_dex,
-                token_in,
-                token_out,
-                min_profit,
-                deadline
-            ).build_transaction({
-                'from': self.blockchain.account.address,
-                'nonce': w3.eth.get_transaction_count(self.blockchain.account.address),
-                'gas': 800000,  # Limite de gas
-                'gasPrice': w3.eth.gas_price,
-                'chainId': w3.eth.chain_id
-            })
-            
-            # Assinar transação
-            signed_tx = w3.eth.account.sign_transaction(tx, self.blockchain.account.key)
-            
-            # Enviar transação
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_hash_hex = tx_hash.hex()
+            # Nonce local: várias transações podem ficar em voo na mesma rede
+            nonce = self.blockchain.reserve_nonce(network)
+            try:
+                # Calldata, assinatura e envio sem o pipeline do web3.py
+                calldata = encode_execute_arbitrage(
+                    asset,
+                    amount,
+                    buy_dex,
+                    sell_dex,
+                    token_in,
+                    token_out,
+                    min_profit,
+                    deadline
+                )
+                raw_tx = self.blockchain.signer.sign(
+                    nonce,
+                    tx_params['gasPrice'],
+                    800000,  # Limite de gas
+                    contract_info['address'],
+                    0,
+                    calldata,
+                    tx_params['chainId']
+                )
+                tx_hash_hex = self.blockchain.raw_client(network).send_raw_transaction(raw_tx)
+            except Exception as e:
+                self.blockchain.handle_send_error(network, nonce, e)
+                raise
+            self.blockchain.invalidate_account_state(network)
             
             logger.success(f"✅ Transação enviada: {tx_hash_hex}")
-            logger.info("⏳ Aguardando confirmação...")
+            self.profit_analyses[tx_hash_hex] = profit_analysis
             
-            # Aguardar confirmação
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
+            # Confirmação em segundo plano: o scan continua enquanto a transação minera
+            self.blockchain.track_receipt(
+                network, tx_hash_hex, self._on_receipt,
+                context={'opportunity': opportunity, 'profit_analysis': profit_analysis}
+            )
             
-            if receipt.status == 1:
-                logger.success(f"🎉 FLASH LOAN EXECUTADO COM SUCESSO!")
-                logger.info(f"  📝 TX: {tx_hash_hex}")
-                logger.info(f"  ⛽ Gas usado: {receipt.gasUsed:,}")
-                logger.info(f"  💰 Lucro estimado: ${profit_analysis['net_profit_usd']:.2f}")
-                
-                # Obter lucro real do contrato
-                real_profit = self._get_actual_profit(network, receipt)
-                if real_profit:
-                    logger.success(f"  💵 Lucro REAL: ${real_profit:.2f}")
-                
-                return tx_hash_hex
-            else:
-                logger.error(f"❌ Transação FALHOU!")
-                logger.error(f"  📝 TX: {tx_hash_hex}")
-                return None
+            return tx_hash_hex
                 
         except Exception as e:
             logger.error(f"❌ Erro ao executar flash loan: {e}")
@@ -344,9 +358,10 @@ class HybridFlashLoanExecutor:
             logger.info(f"  💱 Par: {opportunity.get('symbol_in', '?')} → {opportunity.get('symbol_out', '?')}")
             logger.info(f"  🏪 Compra em: {opportunity.get('buy_dex', 'N/A')}")
             logger.info(f"  🏪 Vende em: {opportunity.get('sell_dex', 'N/A')}")
-            logger.info(f"  💵 Valor: ${opportunity['amount_in'] / 1e6:.2f}")
-            logger.info(f"  💰 Lucro bruto: ${profit_analysis.get('gross_profit', 0) / 1e6:.2f}")
-            logger.info(f"  💸 Taxa flash loan: ${profit_analysis.get('flash_loan_fee', 0) / 1e6:.2f}")
+            tokens = get_token_store(opportunity['network'])
+            logger.info(f"  💵 Valor: ${opportunity_usd(opportunity):.2f}")
+            logger.info(f"  💰 Lucro bruto: ${tokens.to_usd(opportunity['token_in'], profit_analysis.get('gross_profit', 0)) or 0:.2f}")
+            logger.info(f"  💸 Taxa flash loan: ${tokens.to_usd(opportunity['token_in'], profit_analysis.get('flash_loan_fee', 0)) or 0:.2f}")
             logger.info(f"  ⛽ Gas estimado: ${profit_analysis.get('gas_cost', 0) / 1e18:.4f} ETH")
             logger.info(f"  💚 Lucro líquido: ${profit_analysis['net_profit_usd']:.2f}")
             logger.info(f"  📊 ROI: {profit_analysis['roi']:.2f}%")
@@ -367,6 +382,66 @@ class HybridFlashLoanExecutor:
             logger.error(f"❌ Erro na simulação: {e}")
             return None
     
+    def pop_profit_analysis(self, tx_hash: str) -> Dict:
+        """Análise usada na decisão de envio de `tx_hash` (a estratégia não reestima após o envio)"""
+        return self.profit_analyses.pop(tx_hash, {})
+    
+    def add_result_callback(self, callback: Callable[[Dict], None]):
+        """Registra callback chamado com o resultado confirmado de cada trade"""
+        self.result_callbacks.append(callback)
+    
+    def _on_receipt(self, result: ReceiptResult):
+        """Receipt da arbitragem chegou (thread do ReceiptTracker)"""
+        opportunity = result.context['opportunity']
+        profit_analysis = result.context['profit_analysis']
+        real_profit = None
+        
+        if result.success:
+            logger.success(f"🎉 FLASH LOAN EXECUTADO COM SUCESSO!")
+            logger.info(f"  📝 TX: {result.tx_hash}")
+            logger.info(f"  ⛽ Gas usado: {result.gas_used:,}")
+            logger.info(f"  💰 Lucro estimado: ${profit_analysis['net_profit_usd']:.2f}")
+            
+            # Obter lucro real do contrato
+            real_profit = self._get_actual_profit(result.network, result.receipt)
+            if real_profit:
+                logger.success(f"  💵 Lucro REAL: ${real_profit:.2f}")
+        elif result.timed_out:
+            logger.error(f"⏰ Transação sem confirmação: {result.tx_hash}")
+        else:
+            logger.error(f"❌ Transação FALHOU!")
+            logger.error(f"  📝 TX: {result.tx_hash}")
+        
+        self._emit_result(
+            result.network, result.tx_hash, result.success, opportunity, profit_analysis,
+            gas_cost_wei=result.gas_used * result.effective_gas_price,
+            actual_profit=real_profit
+        )
+    
+    def _emit_result(self, network: str, tx_hash: str, success: bool, opportunity: Dict,
+                     profit_analysis: Dict, gas_cost_wei: int = 0,
+                     actual_profit: Optional[float] = None):
+        """Entrega o resultado do trade aos callbacks registrados"""
+        if actual_profit is None:
+            actual_profit = profit_analysis.get('net_profit_usd', 0) if success else 0.0
+        
+        trade = {
+            'tx_hash': tx_hash,
+            'network': network,
+            'success': success,
+            'opportunity': opportunity,
+            'profit': profit_analysis,
+            'profit_usd': actual_profit,
+            'gas_cost_usd': convert_native_to_usd(gas_cost_wei / 1e18, network),
+            'timestamp': time.time()
+        }
+        
+        for callback in self.result_callbacks:
+            try:
+                callback(trade)
+            except Exception as e:
+                logger.error(f"❌ Erro no callback de resultado: {e}")
+    
     def _get_actual_profit(self, network: str, receipt) -> Optional[float]:
         """Obtém lucro real do contrato após execução"""
         try:
@@ -384,7 +459,9 @@ class HybridFlashLoanExecutor:
             
             contract = self.contracts[network]['contract']
             
-            stats = contract.functions.getStats().call()
+            # Polling de estatísticas é o primeiro a ser descartado sob limite de RPC
+            with rpc_priority(Priority.BACKGROUND):
+                stats = contract.functions.getStats().call()
             
             return {
                 'total_arbitrages': stats[0],
@@ -415,16 +492,27 @@ class HybridFlashLoanStrategy:
             'total_profit': 0.0,
             'success_rate': 0.0
         }
+        self.executor.add_result_callback(self._on_trade_result)
+    
+    def _on_trade_result(self, trade: Dict):
+        """Lucro só entra nas estatísticas com o receipt (thread do ReceiptTracker)"""
+        if trade['success']:
+            self.stats['total_profit'] += trade['profit_usd'] or 0.0
+    
+    def add_result_callback(self, callback: Callable[[Dict], None]):
+        """Recebe o resultado confirmado de cada trade (ver executor)"""
+        self.executor.add_result_callback(callback)
     
-    def find_and_execute(self) -> Optional[Dict]:
-        """Encontra e executa a melhor oportunidade HÍBRIDA"""
+    def find_and_execute(self, networks: Optional[List[str]] = None) -> Optional[Dict]:
+        """Encontra e executa a melhor oportunidade HÍBRIDA (opcionalmente só em `networks`)"""
         try:
             # Buscar melhor oportunidade
             logger.info("🔍 Buscando oportunidades...")
             
             opportunity = self.dex_scanner.get_best_opportunity(
                 min_profit_usd=BotConfig.MIN_PROFIT_USD,
-                min_profit_pct=BotConfig.MIN_PROFIT_PERCENTAGE
+                min_profit_pct=BotConfig.MIN_PROFIT_PERCENTAGE,
+                networks=networks
             )
             
             if not opportunity:
@@ -442,9 +530,7 @@ class HybridFlashLoanStrategy:
             if tx_hash:
                 self.stats['opportunities_executed'] += 1
                 
-                # Atualizar estatísticas
-                profit_analysis = self.executor.estimate_profit(opportunity)
-                self.stats['total_profit'] += profit_analysis.get('net_profit_usd', 0)
+                # Atualizar estatísticas (lucro chega depois, em _on_trade_result)
                 self.stats['success_rate'] = (
                     self.stats['opportunities_executed'] / self.stats['opportunities_found'] * 100
                 )
@@ -452,7 +538,7 @@ class HybridFlashLoanStrategy:
                 return {
                     'tx_hash': tx_hash,
                     'opportunity': opportunity,
-                    'profit': profit_analysis,
+                    'profit': self.executor.pop_profit_analysis(tx_hash),
                     'timestamp': time.time()
                 }
             
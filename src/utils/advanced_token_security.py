@@ -7,6 +7,8 @@ Abrange TODO o mercado com segurança máxima
 from typing import Dict, List, Optional, Tuple
 from web3 import Web3
 from loguru import logger
+
+from src.core.address import checksum, to_address
 import json
 import time
 from datetime import datetime, timedelta
@@ -53,6 +55,8 @@ class AdvancedTokenSecurity:
         self.network = network
         self.verified_tokens = {}  # Cache de tokens verificados
         self.rejected_tokens = {}  # Cache de tokens rejeitados
+        # Whitelist da rede internada uma vez (consulta por hash, sem reconstruir a lista)
+        self._trusted = frozenset(to_address(addr) for addr in self.TRUSTED_ADDRESSES.get(network, []))
         
     def is_token_safe(self, token_address: str) -> Tuple[bool, str]:
         """
@@ -62,7 +66,7 @@ class AdvancedTokenSecurity:
             (is_safe, reason)
         """
         try:
-            token_address = Web3.to_checksum_address(token_address)
+            token_address = to_address(token_address)  # chave canônica (whitelist e caches)
             
             # 1. Verificar whitelist (bypass)
             if self._is_whitelisted(token_address):
@@ -126,18 +130,12 @@ class AdvancedTokenSecurity:
     
     def _is_whitelisted(self, token_address: str) -> bool:
         """Verifica se token está na whitelist"""
-        token_address_lower = token_address.lower()
-        
-        if self.network in self.TRUSTED_ADDRESSES:
-            trusted = [addr.lower() for addr in self.TRUSTED_ADDRESSES[self.network]]
-            return token_address_lower in trusted
-        
-        return False
+        return to_address(token_address) in self._trusted
     
     def _verify_contract_exists(self, token_address: str) -> Tuple[bool, str]:
         """Verifica se contrato existe e tem código"""
         try:
-            code = self.w3.eth.get_code(token_address)
+            code = self.w3.eth.get_code(checksum(token_address))
             
             if code == b'' or code == '0x' or len(code) < 10:
                 return False, "Não é um contrato válido"
@@ -153,7 +151,7 @@ class AdvancedTokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[{"name":"","type":"address"}],"name":"balanceOf","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
@@ -185,7 +183,7 @@ class AdvancedTokenSecurity:
     def _check_malicious_functions(self, token_address: str) -> Tuple[bool, str]:
         """Verifica se tem funções maliciosas"""
         try:
-            code = self.w3.eth.get_code(token_address).hex()
+            code = self.w3.eth.get_code(checksum(token_address)).hex()
             
             # Procurar por assinaturas de funções perigosas
             dangerous_signatures = [
@@ -234,7 +232,7 @@ class AdvancedTokenSecurity:
             owner_abi = json.loads('[{"constant":true,"inputs":[],"name":"owner","outputs":[{"name":"","type":"address"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=owner_abi
             )
             
@@ -280,7 +278,7 @@ class AdvancedTokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"name","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
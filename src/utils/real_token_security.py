@@ -12,6 +12,9 @@ import time
 import requests
 from datetime import datetime, timedelta
 
+from src.core.address import checksum, to_address
+from src.core.rpc_scheduler import Priority, rpc_priority
+
 class RealTokenSecurity:
     """Sistema REAL de verificação de segurança de tokens"""
     
@@ -59,6 +62,8 @@ class RealTokenSecurity:
         self.rejected_tokens = {}  # Cache de tokens rejeitados
         self.api_cache = {}  # Cache de chamadas API
         self.cache_duration = 3600  # 1 hora
+        # Whitelist da rede internada uma vez (consulta por hash, sem reconstruir a lista)
+        self._trusted = frozenset(to_address(addr) for addr in self.TRUSTED_ADDRESSES.get(network, []))
         
     def is_token_safe(self, token_address: str) -> Tuple[bool, str]:
         """
@@ -68,7 +73,7 @@ class RealTokenSecurity:
             (is_safe, reason)
         """
         try:
-            token_address = Web3.to_checksum_address(token_address)
+            token_address = to_address(token_address)  # chave canônica (whitelist e caches)
             
             # 1. Verificar whitelist (bypass)
             if self._is_whitelisted(token_address):
@@ -113,14 +118,16 @@ class RealTokenSecurity:
                 logger.warning(f"⚠️ {reason}")
                 # Não rejeita automaticamente, mas avisa
             
-            # 3.5 Verificar holders (on-chain REAL)
-            has_enough_holders, reason = self._check_holders(token_address)
+            # 3.5 Verificar holders (on-chain REAL, baixa prioridade: descartada sob limite de RPC)
+            with rpc_priority(Priority.BACKGROUND):
+                has_enough_holders, reason = self._check_holders(token_address)
             if not has_enough_holders:
                 logger.warning(f"⚠️ {reason}")
                 # Não rejeita automaticamente
             
-            # 3.6 Verificar ownership
-            is_safe_ownership, reason = self._verify_ownership(token_address)
+            # 3.6 Verificar ownership (informativo, baixa prioridade)
+            with rpc_priority(Priority.BACKGROUND):
+                is_safe_ownership, reason = self._verify_ownership(token_address)
             if not is_safe_ownership:
                 logger.warning(f"⚠️ {reason}")
             
@@ -306,7 +313,7 @@ class RealTokenSecurity:
             erc20_abi = json.loads('[{"anonymous":false,"inputs":[{"indexed":true,"name":"from","type":"address"},{"indexed":true,"name":"to","type":"address"},{"indexed":false,"name":"value","type":"uint256"}],"name":"Transfer","type":"event"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
@@ -346,18 +353,12 @@ class RealTokenSecurity:
     
     def _is_whitelisted(self, token_address: str) -> bool:
         """Verifica se token está na whitelist"""
-        token_address_lower = token_address.lower()
-        
-        if self.network in self.TRUSTED_ADDRESSES:
-            trusted = [addr.lower() for addr in self.TRUSTED_ADDRESSES[self.network]]
-            return token_address_lower in trusted
-        
-        return False
+        return to_address(token_address) in self._trusted
     
     def _verify_contract_exists(self, token_address: str) -> Tuple[bool, str]:
         """Verifica se contrato existe e tem código"""
         try:
-            code = self.w3.eth.get_code(token_address)
+            code = self.w3.eth.get_code(checksum(token_address))
             
             if code == b'' or code == '0x' or len(code) < 10:
                 return False, "Não é um contrato válido"
@@ -373,7 +374,7 @@ class RealTokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
@@ -393,7 +394,7 @@ class RealTokenSecurity:
             owner_abi = json.loads('[{"constant":true,"inputs":[],"name":"owner","outputs":[{"name":"","type":"address"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=owner_abi
             )
             
@@ -473,7 +474,7 @@ class RealTokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"name","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
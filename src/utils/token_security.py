@@ -6,6 +6,8 @@ Proteção anti-scam - Apenas tokens confiáveis
 from typing import Dict, List, Optional, Set
 from web3 import Web3
 from loguru import logger
+
+from src.core.address import checksum, to_address
 import json
 
 class TokenSecurity:
@@ -65,6 +67,8 @@ class TokenSecurity:
         self.network = network
         self.verified_tokens: Set[str] = set()
         self.rejected_tokens: Set[str] = set()
+        # Whitelist da rede internada uma vez (consulta por hash, sem reconstruir a lista)
+        self._trusted = frozenset(to_address(addr) for addr in self.TRUSTED_ADDRESSES.get(network, []))
     
     def is_token_safe(self, token_address: str) -> bool:
         """
@@ -74,7 +78,7 @@ class TokenSecurity:
             True se token é seguro, False caso contrário
         """
         try:
-            token_address = Web3.to_checksum_address(token_address)
+            token_address = to_address(token_address)  # chave canônica (whitelist e caches)
             
             # 1. Verificar se está na whitelist
             if self.is_whitelisted(token_address):
@@ -109,13 +113,7 @@ class TokenSecurity:
     
     def is_whitelisted(self, token_address: str) -> bool:
         """Verifica se token está na whitelist"""
-        token_address = token_address.lower()
-        
-        if self.network in self.TRUSTED_ADDRESSES:
-            trusted = [addr.lower() for addr in self.TRUSTED_ADDRESSES[self.network]]
-            return token_address in trusted
-        
-        return False
+        return to_address(token_address) in self._trusted
     
     def is_blacklisted(self, token_address: str) -> bool:
         """Verifica se token está na blacklist"""
@@ -133,7 +131,7 @@ class TokenSecurity:
         """
         try:
             # 1. Verificar se contrato existe
-            code = self.w3.eth.get_code(token_address)
+            code = self.w3.eth.get_code(checksum(token_address))
             if code == b'' or code == '0x':
                 logger.warning(f"❌ Token {token_address[:10]}... não é um contrato!")
                 return False
@@ -160,7 +158,7 @@ class TokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
@@ -184,7 +182,7 @@ class TokenSecurity:
             erc20_abi = json.loads('[{"constant":true,"inputs":[],"name":"name","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"symbol","outputs":[{"name":"","type":"string"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"},{"constant":true,"inputs":[],"name":"totalSupply","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
             
             contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
+                address=checksum(token_address),
                 abi=erc20_abi
             )
             
@@ -0,0 +1,2155 @@
+"""
+🧪 TESTES DA CAMADA RPC
+Valida o conector blockchain contra um nó JSON-RPC falso (local, sem internet)
+"""
+
+import sys
+import json
+import asyncio
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from loguru import logger
+from colorama import init, Fore, Style
+
+init(autoreset=True)
+
+TEST_PRIVATE_KEY = "0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+
+class FakeNode:
+    """Nó JSON-RPC mínimo rodando em uma thread local"""
+    
+    def __init__(self, chain_id: int = 8453, delay: float = 0.0):
+        self.chain_id = chain_id
+        self.delay = delay
+        self.block_number = 1000
+        self.gas_price = 1_000_000_000
+        self.balance = 10**18
+        self.nonce = 7
+        self.send_error = None
+        self.sent = []
+        self.receipts = {}
+        self.contracts = {}  # endereço -> função(calldata hex) -> retorno hex
+        self.logs = []
+        self.max_log_range = None  # provedores limitam o intervalo de eth_getLogs
+        self.http_requests = 0
+        self.calls = []
+        self.call_blocks = []  # tag de bloco de cada eth_call
+        self.multicalls = 0
+        
+        node = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                payload = json.loads(body)
+                node.http_requests += 1
+                if node.delay:
+                    time.sleep(node.delay)
+                
+                if isinstance(payload, list):
+                    response = [node.handle(item) for item in payload]
+                else:
+                    response = node.handle(payload)
+                
+                data = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def handle(self, request: dict) -> dict:
+        method = request['method']
+        self.calls.append(method)
+        if method == 'eth_sendRawTransaction':
+            if self.send_error:
+                return {'jsonrpc': '2.0', 'id': request['id'],
+                        'error': {'code': -32000, 'message': self.send_error}}
+            self.sent.append(request['params'][0])
+            self.nonce += 1
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x' + f'{len(self.sent):064x}'}
+        if method == 'eth_call':
+            call = request['params'][0]
+            self.call_blocks.append(request['params'][1] if len(request['params']) > 1 else 'latest')
+            if call['to'].lower() == MULTICALL3.lower():
+                return {'jsonrpc': '2.0', 'id': request['id'], 'result': self.multicall(call['data'])}
+            contract = self.contracts.get(call['to'].lower())
+            if contract is None:
+                return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x'}
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': contract(call['data'])}
+        if method == 'eth_getLogs':
+            query = request['params'][0]
+            span = int(query['toBlock'], 16) - int(query['fromBlock'], 16) + 1
+            if self.max_log_range and span > self.max_log_range:
+                return {'jsonrpc': '2.0', 'id': request['id'],
+                        'error': {'code': -32005, 'message': 'query exceeds max block range'}}
+            addresses = {a.lower() for a in query['address']}
+            logs = [
+                log for log in self.logs
+                if int(query['fromBlock'], 16) <= int(log['blockNumber'], 16) <= int(query['toBlock'], 16)
+                and log['address'].lower() in addresses and log['topics'][0] in query['topics'][0]
+            ]
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': logs}
+        if method == 'eth_getTransactionReceipt':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': self.receipts.get(request['params'][0])}
+        if method == 'eth_getBlockByNumber':
+            block = {'number': hex(self.block_number), 'timestamp': hex(1_700_000_000 + self.block_number),
+                     'baseFeePerGas': hex(self.gas_price // 2)}
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': block}
+        results = {
+            'eth_chainId': hex(self.chain_id),
+            'eth_blockNumber': hex(self.block_number),
+            'eth_gasPrice': hex(self.gas_price),
+            'eth_getBalance': hex(self.balance),
+            'eth_getTransactionCount': hex(self.nonce),
+            'net_version': str(self.chain_id),
+            'web3_clientVersion': 'FakeNode/1.0',
+        }
+        if method not in results:
+            return {'jsonrpc': '2.0', 'id': request['id'],
+                    'error': {'code': -32601, 'message': f'method {method} not found'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': results[method]}
+    
+    def multicall(self, data: str) -> str:
+        """Multicall3.aggregate3 sobre os contratos falsos (exceção = chamada revertida)"""
+        from eth_abi import decode, encode
+        self.multicalls += 1
+        calls = decode(['(address,bool,bytes)[]'], bytes.fromhex(data[10:]))[0]
+        results = []
+        for target, _, calldata in calls:
+            contract = self.contracts.get(target.lower())
+            try:
+                raw = contract('0x' + calldata.hex()) if contract else '0x'
+                results.append((True, bytes.fromhex(raw[2:])))
+            except Exception:
+                results.append((False, b''))
+        return '0x' + encode(['(bool,bytes)[]'], [results]).hex()
+    
+    def close(self):
+        self.server.shutdown()
+
+
+def word(value: int) -> str:
+    """Palavra ABI (two's complement) em hex"""
+    return f'{value % 2**256:064x}'
+
+
+class FakeV3Pool:
+    """Pool Uniswap V3 falso: slot0, liquidity, tickBitmap e ticks a partir das posições"""
+    
+    def __init__(self, fee: int, spacing: int, tick: int, sqrt_price: int, positions):
+        self.fee, self.spacing = fee, spacing
+        self.tick, self.sqrt_price = tick, sqrt_price
+        self.positions = list(positions)
+    
+    @property
+    def liquidity_net(self) -> dict:
+        net = {}
+        for lower, upper, amount in self.positions:
+            net[lower] = net.get(lower, 0) + amount
+            net[upper] = net.get(upper, 0) - amount
+        return {tick: value for tick, value in net.items()
+                if any(tick in (lower, upper) for lower, upper, amount in self.positions if amount)}
+    
+    @property
+    def liquidity(self) -> int:
+        return sum(amount for lower, upper, amount in self.positions if lower <= self.tick < upper)
+    
+    def __call__(self, data: str) -> str:
+        from src.core.v3_pools import LIQUIDITY_SELECTOR, SLOT0_SELECTOR, TICK_BITMAP_SELECTOR, TICKS_SELECTOR
+        
+        selector, args = data[:10], data[10:]
+        if selector == SLOT0_SELECTOR:
+            return '0x' + word(self.sqrt_price) + word(self.tick) + word(0) * 5
+        if selector == LIQUIDITY_SELECTOR:
+            return '0x' + word(self.liquidity)
+        value = int(args, 16)
+        value -= 2**256 if value >= 2**255 else 0
+        if selector[2:] == TICK_BITMAP_SELECTOR:
+            bits = sum(1 << ((t // self.spacing) % 256) for t in self.liquidity_net
+                       if (t // self.spacing) >> 8 == value)
+            return '0x' + word(bits)
+        if selector[2:] == TICKS_SELECTOR:
+            return '0x' + word(0) + word(self.liquidity_net.get(value, 0)) + word(0) * 6
+        raise AssertionError(selector)
+
+
+TOKEN_DECIMALS = {'USDC': 6, 'WETH': 18, 'DAI': 18}
+
+
+def erc20_metadata(symbol: str, decimals: int):
+    """Token ERC-20 falso: decimals() e symbol()"""
+    def contract(data):
+        from eth_abi import encode
+        from src.core.token_metadata import DECIMALS_SELECTOR, SYMBOL_SELECTOR
+        if data[:10] == DECIMALS_SELECTOR:
+            return '0x' + word(decimals)
+        if data[:10] == SYMBOL_SELECTOR:
+            return '0x' + encode(['string'], [symbol]).hex()
+        raise AssertionError(data[:10])
+    return contract
+
+
+def add_token_metadata(node, network: str = 'base'):
+    """Metadados dos tokens principais da rede no nó falso"""
+    from src.config.config import MAJOR_TOKENS
+    for symbol, address in MAJOR_TOKENS[network].items():
+        node.contracts[address.lower()] = erc20_metadata(symbol, TOKEN_DECIMALS.get(symbol, 18))
+
+
+def print_section(title):
+    """Imprime seção de teste"""
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"{Fore.YELLOW}{title}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
+
+
+def make_connector(nodes: dict):
+    """Cria um BlockchainConnector apontando para nós falsos"""
+    from src.config.config import BotConfig, NetworkConfig
+    from src.core.blockchain import BlockchainConnector
+    
+    BotConfig.PRIVATE_KEY = TEST_PRIVATE_KEY
+    BotConfig.WALLET_ADDRESS = ""
+    
+    connector = BlockchainConnector()
+    connector.networks = {
+        name: NetworkConfig(
+            name=name,
+            chain_id=node.chain_id,
+            rpc_url=node.url,
+            native_token="ETH",
+            explorer_url="",
+            priority=0.5
+        )
+        for name, node in nodes.items()
+    }
+    return connector
+
+
+def test_concurrent_startup():
+    """Teste 1: Redes conectam em paralelo e a lenta é descartada pelo prazo"""
+    print_section("TESTE 1: INICIALIZAÇÃO CONCORRENTE")
+    
+    from src.config.config import BotConfig
+    
+    nodes = {
+        'fast_a': FakeNode(chain_id=8453, delay=0.2),
+        'fast_b': FakeNode(chain_id=42161, delay=0.2),
+        'slow': FakeNode(chain_id=56, delay=3.0),
+    }
+    old_timeout = BotConfig.RPC_CONNECT_TIMEOUT
+    BotConfig.RPC_CONNECT_TIMEOUT = 1.5
+    try:
+        connector = make_connector(nodes)
+        
+        start = time.time()
+        assert connector.initialize()
+        elapsed = time.time() - start
+        
+        assert set(connector.get_connected_networks()) == {'fast_a', 'fast_b'}
+        assert connector.get_async_web3('fast_a') is not None
+        # Sequencial levaria >= 2 x (várias chamadas x 0.2s) + 1.5s
+        assert elapsed < 2.5, f"inicialização demorou {elapsed:.2f}s"
+        
+        # Primeiro endpoint que responde vence; a sonda do lento é cancelada e aguardada
+        from src.core.rpc_pool import RPCEndpointPool
+        
+        async def probe_endpoints():
+            pool = RPCEndpointPool('fast_a', [nodes['slow'].url, nodes['fast_a'].url])
+            probe_start = time.time()
+            aw3 = await connector._first_responsive_endpoint(pool)
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            return aw3, time.time() - probe_start, pending
+        
+        aw3, probe_elapsed, pending = asyncio.run(probe_endpoints())
+        assert aw3 is not None and not pending
+        assert probe_elapsed < 1.0, f"sonda esperou o endpoint lento ({probe_elapsed:.2f}s)"
+        logger.success(f"✅ 2/3 redes conectadas em {elapsed:.2f}s")
+    finally:
+        BotConfig.RPC_CONNECT_TIMEOUT = old_timeout
+        for node in nodes.values():
+            node.close()
+
+
+def test_async_api():
+    """Teste 2: Versões async de gas price e envio de transação"""
+    print_section("TESTE 2: API ASSÍNCRONA")
+    
+    import asyncio
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        
+        gas_price = asyncio.run(connector.get_gas_price_async('base'))
+        assert gas_price == node.gas_price
+        assert asyncio.run(connector.get_gas_price_async('missing')) == 0
+        logger.success(f"✅ Gas price async: {gas_price}")
+    finally:
+        node.close()
+
+
+def test_batching():
+    """Teste 3: Várias leituras em uma única requisição HTTP"""
+    print_section("TESTE 3: BATCHING JSON-RPC")
+    
+    from src.core.rpc_batch import RPCError
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        
+        before = node.http_requests
+        params = connector.get_tx_params('base')
+        assert params == {'nonce': node.nonce, 'gasPrice': node.gas_price, 'chainId': 8453}
+        assert node.http_requests - before == 1
+        
+        # Erro em uma chamada não afeta as outras
+        with connector.batch('base') as batch:
+            ok = batch.block_number()
+            bad = batch.add('eth_naoExiste')
+        assert ok.result() == node.block_number
+        assert isinstance(bad.result_or(RPCError('x', {})), RPCError)
+        
+        balances = connector.get_balances()
+        assert balances == {'base': 1.0}
+        logger.success(f"✅ 3 leituras em 1 requisição: {params}")
+    finally:
+        node.close()
+
+
+def test_endpoint_pool():
+    """Teste 4: Roteamento por latência, hedge e failover"""
+    print_section("TESTE 4: POOL DE ENDPOINTS")
+    
+    from src.core.rpc_pool import RPCEndpointPool
+    
+    slow = FakeNode(delay=0.5)
+    fast = FakeNode(delay=0.0)
+    dead_url = "http://127.0.0.1:9"
+    try:
+        pool = RPCEndpointPool('base', [slow.url, fast.url, dead_url], timeout=2, hedge_delay=0.05)
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_blockNumber', 'params': []}
+        
+        # Hedge: o primário lento é superado pela duplicata no segundo endpoint
+        start = time.time()
+        for _ in range(5):
+            assert pool.request(request)['result'] == hex(1000)
+        elapsed = time.time() - start
+        assert elapsed < 2.0, f"hedge não funcionou ({elapsed:.2f}s)"
+        
+        # Depois de aquecer, o rápido é o primeiro do ranking
+        time.sleep(0.6)
+        assert pool.best_url() == fast.url, pool.get_stats()
+        
+        # Failover: sem hedge, endpoint morto é pulado
+        pool_no_hedge = RPCEndpointPool('base', [dead_url, fast.url], timeout=1, hedge_delay=0)
+        for _ in range(4):
+            assert pool_no_hedge.request(request)['result'] == hex(1000)
+        stats = pool_no_hedge.get_stats()
+        assert stats[-1]['url'] == dead_url and stats[-1]['errors'] >= 1
+        assert pool_no_hedge.is_healthy()
+        logger.success(f"✅ Pool: melhor={pool.best_url()} em {elapsed:.2f}s")
+    finally:
+        slow.close()
+        fast.close()
+
+
+def test_block_scheduler():
+    """Teste 5: Um scan por bloco novo, com latência medida"""
+    print_section("TESTE 5: SCAN ORIENTADO A BLOCOS")
+    
+    from src.config.config import BotConfig
+    from src.core.block_listener import BlockScanScheduler
+    
+    node = FakeNode(chain_id=42161)
+    old_interval = BotConfig.BLOCK_POLL_INTERVAL_MS
+    BotConfig.BLOCK_POLL_INTERVAL_MS = 20
+    try:
+        connector = make_connector({'arbitrum': node})
+        assert connector.initialize()
+        
+        scheduler = BlockScanScheduler(connector)
+        scheduler.start()
+        
+        first = scheduler.next_block(timeout=2)
+        assert first is not None and first.block_number == node.block_number
+        
+        # Mesmo bloco não gera segundo scan
+        assert scheduler.next_block(timeout=0.2) is None
+        
+        node.block_number += 1
+        second = scheduler.next_block(timeout=2)
+        assert second.block_number == first.block_number + 1
+        assert second.network == 'arbitrum'
+        
+        stats = scheduler.get_stats()['arbitrum']
+        assert stats['scans'] == 2 and stats['source'] == 'poll'
+        scheduler.stop()
+        logger.success(f"✅ 2 blocos → 2 scans (p50 bloco→scan {stats['p50_ms']:.2f}ms)")
+    finally:
+        BotConfig.BLOCK_POLL_INTERVAL_MS = old_interval
+        node.close()
+
+
+def test_block_cache():
+    """Teste 6: Leituras repetidas no mesmo bloco não geram RPC"""
+    print_section("TESTE 6: CACHE POR BLOCO")
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        connector.on_new_block('base', node.block_number)
+        
+        # Chain ID e nonce já vieram da conexão; só o gas price é buscado
+        before = node.http_requests
+        params = connector.get_tx_params('base')
+        assert params['chainId'] == 8453
+        assert node.http_requests - before == 1
+        
+        # Mesmo bloco: tudo do cache (nonce é local)
+        before = node.http_requests
+        again = connector.get_tx_params('base')
+        assert again['gasPrice'] == params['gasPrice'] and again['nonce'] == params['nonce'] + 1
+        assert connector.get_gas_price('base') == node.gas_price
+        assert connector.get_chain_id('base') == 8453
+        connector.get_balance('base')
+        connector.get_balances()
+        assert node.http_requests - before == 1  # só o saldo
+        
+        # Bloco novo invalida valores de cabeça, mas não o chain ID
+        node.gas_price *= 2
+        connector.on_new_block('base', node.block_number + 1)
+        before_calls = len(node.calls)
+        assert connector.get_gas_price('base') == node.gas_price
+        assert connector.get_chain_id('base') == 8453
+        assert node.calls[before_calls:] == ['eth_gasPrice']
+        
+        # Transação enviada: saldo em cache deixa de valer
+        before = node.http_requests
+        connector.invalidate_account_state('base')
+        connector.get_balance('base')
+        assert node.http_requests - before == 1
+        
+        # Sem listener: get_base_fee() não fixa a cabeça; valores expiram pelo TTL
+        idle = make_connector({'base': node})
+        assert idle.initialize()
+        idle.cache.ttl = 0.2
+        assert idle.get_base_fee('base') == node.gas_price // 2
+        assert idle.cache.head_block('base') is None
+        assert idle.get_block_number('base') == node.block_number
+        node.block_number += 1
+        node.gas_price *= 2
+        time.sleep(0.3)
+        assert idle.get_block_number('base') == node.block_number
+        assert idle.get_gas_price('base') == node.gas_price
+        
+        logger.success(f"✅ Cache: {connector.cache.get_stats()['hit_rate']:.0%} de acertos")
+    finally:
+        node.close()
+
+
+def test_nonce_manager():
+    """Teste 7: Nonces locais, envios em sequência e ressincronização"""
+    print_section("TESTE 7: GERENCIADOR DE NONCES")
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        start_nonce = node.nonce
+        
+        # Três envios seguidos, sem consultar eth_getTransactionCount
+        txs = [{'to': connector.account.address, 'value': 0, 'gas': 21000} for _ in range(3)]
+        before_calls = len(node.calls)
+        hashes = connector.send_transactions('base', txs)
+        assert all(hashes)
+        assert [tx['nonce'] for tx in txs] == [start_nonce, start_nonce + 1, start_nonce + 2]
+        assert 'eth_getTransactionCount' not in node.calls[before_calls:]
+        
+        # Falha comum devolve o nonce
+        node.send_error = 'insufficient funds for gas * price + value'
+        assert connector.send_transaction('base', {'to': connector.account.address, 'value': 0, 'gas': 21000}) is None
+        assert connector.nonces.peek('base', connector.account.address) == start_nonce + 3
+        
+        # Erro de nonce força leitura de `pending` no próximo envio
+        node.send_error = 'nonce too low'
+        assert connector.send_transaction('base', {'to': connector.account.address, 'value': 0, 'gas': 21000}) is None
+        node.send_error = None
+        node.nonce = start_nonce + 10
+        tx = {'to': connector.account.address, 'value': 0, 'gas': 21000}
+        assert connector.send_transaction('base', tx)
+        assert tx['nonce'] == start_nonce + 10
+        
+        # Timeout depois do POST: a transação pode ter chegado, o nonce não é reaproveitado
+        import requests
+        from src.core.rpc_batch import RPCError
+        address = connector.account.address
+        nonce = connector.nonces.reserve('base', address)
+        connector.nonces.handle_send_error('base', address, nonce, requests.exceptions.ReadTimeout('read timed out'))
+        assert connector.nonces.peek('base', address) == -1
+        node.nonce = nonce + 1   # o nó aceitou a transação
+        assert connector.nonces.reserve('base', address) == nonce + 1
+        
+        # Objeto de erro JSON-RPC (cliente cru) prova a recusa: nonce devolvido
+        nonce = connector.nonces.reserve('base', address)
+        error = RPCError('eth_sendRawTransaction', {'code': -32000, 'message': 'insufficient funds'})
+        connector.nonces.handle_send_error('base', address, nonce, error)
+        assert connector.nonces.peek('base', address) == nonce
+        
+        logger.success(f"✅ Nonces: {len(node.sent)} envios em sequência")
+    finally:
+        node.close()
+
+
+def test_receipt_tracker():
+    """Teste 8: Receipts acompanhados em segundo plano, em batch"""
+    print_section("TESTE 8: RASTREADOR DE RECEIPTS")
+    
+    from src.core.receipt_tracker import ReceiptTracker
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        
+        tx_hash = connector.send_transaction('base', {'to': connector.account.address, 'value': 0, 'gas': 21000})
+        other = connector.send_transaction('base', {'to': connector.account.address, 'value': 0, 'gas': 21000})
+        assert tx_hash and other
+        
+        results = []
+        start = time.time()
+        future = connector.track_receipt('base', tx_hash, results.append, context={'id': 1})
+        connector.track_receipt('base', other)
+        assert time.time() - start < 0.1  # não bloqueia
+        assert not future.done()
+        
+        # Receipt aparece no bloco seguinte
+        for h, status in ((tx_hash, '0x1'), (other, '0x0')):
+            node.receipts['0x' + h.removeprefix('0x')] = {
+                'transactionHash': h, 'status': status, 'blockNumber': hex(node.block_number + 1),
+                'gasUsed': hex(21000), 'effectiveGasPrice': hex(node.gas_price)
+            }
+        before = node.http_requests
+        connector.on_new_block('base', node.block_number + 1)
+        result = future.result(timeout=2)
+        assert result.success and result.gas_used == 21000 and result.context == {'id': 1}
+        assert results == [result]
+        assert node.http_requests - before == 1  # as duas transações em um batch
+        
+        # Transação que nunca minera expira
+        tracker = ReceiptTracker(connector, poll_interval=0.01, timeout=0.05)
+        lost = tracker.track('base', '0x' + 'ab' * 32)
+        assert lost.result(timeout=2).timed_out
+        tracker.stop()
+        
+        logger.success(f"✅ Receipt em {result.elapsed * 1000:.0f}ms após o envio")
+    finally:
+        connector.close_all()
+        node.close()
+
+
+def test_raw_transaction():
+    """Teste 9: Caminho enxuto gera os mesmos bytes que o web3.py"""
+    print_section("TESTE 9: CLIENTE JSON-RPC ENXUTO")
+    
+    from web3 import Web3
+    from src.core.raw_rpc import encode_execute_arbitrage
+    from src.strategies.real_flashloan import FLASH_LOAN_CONTRACT_ABI
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        
+        contract_address = "0x" + "ab" * 20
+        args = (
+            "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913", 1_000 * 10**6,
+            "0x" + "12" * 20, "0x" + "34" * 20,
+            "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913", "0x4200000000000000000000000000000000000006",
+            12_345, 1_700_000_000
+        )
+        
+        # Referência: web3.py
+        contract = Web3().eth.contract(address=Web3.to_checksum_address(contract_address),
+                                       abi=FLASH_LOAN_CONTRACT_ABI)
+        tx = contract.functions.executeArbitrage(
+            *[Web3.to_checksum_address(a) if isinstance(a, str) else a for a in args]
+        ).build_transaction({
+            'from': connector.account.address,
+            'nonce': 5, 'gas': 800000, 'gasPrice': node.gas_price, 'chainId': 8453
+        })
+        expected = connector.account.sign_transaction(tx).rawTransaction
+        
+        raw_tx = connector.signer.sign(5, node.gas_price, 800000, contract_address, 0,
+                                       encode_execute_arbitrage(*args), 8453)
+        assert raw_tx == expected
+        
+        tx_hash = connector.raw_client('base').send_raw_transaction(raw_tx)
+        assert node.sent == ['0x' + raw_tx.hex()] and tx_hash.startswith('0x')
+        
+        logger.success(f"✅ {len(raw_tx)} bytes idênticos ao web3.py")
+    finally:
+        node.close()
+
+
+def test_rpc_metrics():
+    """Teste 10: Latência e erros por (rede, endpoint, método)"""
+    print_section("TESTE 10: MÉTRICAS DE RPC")
+    
+    import asyncio
+    from src.core.rpc_metrics import LatencyHistogram, rpc_metrics
+    
+    # Histograma: memória fixa e percentis dentro da resolução do bucket
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)  # 1ms .. 1s
+    assert len(histogram.counts) == 80
+    assert 0.45 <= histogram.percentile(0.5) <= 0.6
+    assert 0.95 <= histogram.percentile(0.99) <= 1.0
+    
+    node = FakeNode(chain_id=8453)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        rpc_metrics.reset()
+        
+        connector.get_web3('base').eth.block_number
+        connector.get_tx_params('base')
+        with connector.batch('base') as batch:
+            batch.add('eth_naoExiste')
+        assert asyncio.run(connector.get_gas_price_async('base')) == node.gas_price
+        
+        rows = {row['method']: row for row in connector.get_rpc_metrics('base')}
+        assert rows['eth_blockNumber']['calls'] == 1
+        assert rows['batch(eth_gasPrice)']['calls'] == 1
+        assert rows['batch(eth_naoExiste)']['rpc_errors'] == 1
+        assert rows['eth_gasPrice']['calls'] == 1  # AsyncWeb3 também é medido
+        assert all(row['endpoint'].startswith('127.0.0.1') for row in rows.values())
+        
+        top = rpc_metrics.top(1)[0]
+        logger.success(f"✅ {len(rows)} séries; mais cara: {top['method']} ({top['total_ms']:.1f}ms)")
+    finally:
+        node.close()
+
+
+def test_rpc_scheduler():
+    """Teste 11: Token bucket com prioridade para o caminho de execução"""
+    print_section("TESTE 11: AGENDADOR DE RPC")
+    
+    from src.core.rpc_pool import RPCEndpointPool
+    from src.core.rpc_scheduler import EndpointScheduler, Priority, RPCThrottledError, rpc_priority
+    
+    # Reserva: trabalho de fundo não consome a parte do burst das classes superiores
+    scheduler = EndpointScheduler(rate=1, burst=10)
+    background = sum(scheduler.acquire(Priority.BACKGROUND, timeout=0) for _ in range(10))
+    assert background == 5
+    quotes = sum(scheduler.acquire(Priority.QUOTE, timeout=0) for _ in range(10))
+    assert quotes == 3
+    assert scheduler.acquire(Priority.EXECUTION, timeout=0)
+    assert scheduler.get_stats()['shed']['BACKGROUND'] == 5
+    
+    # Execução esperando bloqueia cotações até ser atendida
+    scheduler = EndpointScheduler(rate=20, burst=1)
+    assert scheduler.acquire(Priority.EXECUTION, timeout=0)
+    order = []
+    execution = threading.Thread(
+        target=lambda: scheduler.acquire(Priority.EXECUTION, timeout=1) and order.append('execution')
+    )
+    execution.start()
+    time.sleep(0.005)
+    assert scheduler.acquire(Priority.QUOTE, timeout=1)
+    order.append('quote')
+    execution.join()
+    assert order == ['execution', 'quote']
+    
+    # No pool: sob pressão o fundo é descartado e o envio continua passando
+    node = FakeNode(chain_id=8453)
+    try:
+        pool = RPCEndpointPool('base', [node.url], rate_limit=5)
+        payload = {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_blockNumber', 'params': []}
+        
+        shed = 0
+        with rpc_priority(Priority.BACKGROUND):
+            for _ in range(20):
+                try:
+                    pool.request(payload)
+                except RPCThrottledError:
+                    shed += 1
+        assert shed > 0
+        
+        reply = pool.request({'jsonrpc': '2.0', 'id': 2, 'method': 'eth_sendRawTransaction',
+                              'params': ['0x00']})
+        assert reply['result'].startswith('0x')
+        
+        stats = pool.get_stats()[0]['scheduler']
+        assert stats['granted']['EXECUTION'] == 1 and stats['shed']['BACKGROUND'] == shed
+        logger.success(f"✅ {shed} requisições de fundo descartadas, envio atendido")
+    finally:
+        node.close()
+
+
+def test_v2_pools():
+    """Teste 12: Cotação V2 local a partir das reservas do bloco"""
+    print_section("TESTE 12: COTAÇÃO V2 LOCAL")
+    
+    from src.config.config import PANCAKESWAP_V2_FACTORY
+    from src.core.dex import DEXInterface
+    from src.core.v2_pools import GET_PAIR_SELECTOR, GET_RESERVES_SELECTOR, get_amount_out, sort_tokens
+    
+    def router_amount_out(amount_in, reserve_in, reserve_out, fee_num=997, fee_den=1000):
+        # Fórmula do UniswapV2Library/PancakeLibrary
+        amount_in_with_fee = amount_in * fee_num
+        return amount_in_with_fee * reserve_out // (reserve_in * fee_den + amount_in_with_fee)
+    
+    for amount in (1, 10**6, 123_456_789, 10**24):
+        assert get_amount_out(amount, 5 * 10**20, 7 * 10**12, 30) == router_amount_out(amount, 5 * 10**20, 7 * 10**12)
+        assert get_amount_out(amount, 7 * 10**12, 5 * 10**20, 25) == \
+            router_amount_out(amount, 7 * 10**12, 5 * 10**20, 9975, 10000)
+    
+    token_a, token_b, token_c = '0x' + 'a1' * 20, '0x' + 'b2' * 20, '0x' + 'c3' * 20
+    pair_ab, pair_ac = '0x' + 'ab' * 20, '0x' + 'ac' * 20
+    pairs = {sort_tokens(token_a, token_b): pair_ab, sort_tokens(token_a, token_c): pair_ac}
+    reserves = {pair_ab: [4 * 10**20, 9 * 10**10], pair_ac: [10**18, 3 * 10**21]}
+    
+    def factory(data):
+        assert data[2:10] == GET_PAIR_SELECTOR
+        key = ('0x' + data[34:74], '0x' + data[98:138])
+        return '0x' + pairs.get(key, '0x' + '00' * 20)[2:].rjust(64, '0')
+    
+    def pair_contract(address):
+        def call(data):
+            assert data == GET_RESERVES_SELECTOR
+            r0, r1 = reserves[address]
+            return '0x' + f'{r0:064x}{r1:064x}' + '0' * 64
+        return call
+    
+    node = FakeNode(chain_id=8453)
+    node.contracts[PANCAKESWAP_V2_FACTORY['base'].lower()] = factory
+    node.contracts[pair_ab] = pair_contract(pair_ab)
+    node.contracts[pair_ac] = pair_contract(pair_ac)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        
+        resolved = dex.v2_pools.prepare([PANCAKESWAP_V2_FACTORY['base']], [token_a, token_b, token_c])
+        assert resolved == 2
+        
+        # Cabeça conhecida (listener): reservas lidas nesse número de bloco, não em 'latest'
+        connector.on_new_block('base', node.block_number)
+        requests_before = node.http_requests
+        node.call_blocks.clear()
+        quotes = [dex.get_price('pancakeswap', token_b, token_a, amount) for amount in range(10**6, 10**8, 10**6)]
+        assert node.http_requests - requests_before == 1  # um batch de getReserves para todos os pares
+        assert node.call_blocks == [hex(node.block_number)]
+        
+        # token_a < token_b: reserve0 é de token_a
+        assert quotes[0] == router_amount_out(10**6, 9 * 10**10, 4 * 10**20, 9975, 10000)
+        assert dex.get_price('pancakeswap', token_a, token_c, 10**15) == \
+            router_amount_out(10**15, 10**18, 3 * 10**21, 9975, 10000)
+        assert dex.get_price('pancakeswap', token_b, token_c, 10**6) is None
+        assert node.http_requests - requests_before == 1
+        
+        # Bloco novo: reservas recarregadas em um único batch
+        reserves[pair_ab] = [5 * 10**20, 8 * 10**10]
+        connector.on_new_block('base', 1001)
+        assert dex.get_price('pancakeswap', token_b, token_a, 10**6) == \
+            router_amount_out(10**6, 8 * 10**10, 5 * 10**20, 9975, 10000)
+        assert node.http_requests - requests_before == 2
+        
+        logger.success(f"✅ {len(quotes)} cotações com 1 requisição por bloco")
+    finally:
+        node.close()
+
+
+def test_v3_pools():
+    """Teste 13: Simulação local de swaps Uniswap V3"""
+    print_section("TESTE 13: COTAÇÃO V3 LOCAL")
+    
+    from decimal import Decimal, getcontext
+    from src.config.config import UNISWAP_V3_FACTORY, UNISWAP_V3_QUOTER_V2
+    from src.core.dex import DEXInterface
+    from src.core.v3_pools import (
+        GET_POOL_SELECTOR, LIQUIDITY_SELECTOR, MAX_TICK, MIN_SQRT_RATIO, MIN_TICK, MAX_SQRT_RATIO,
+        Q96, QUOTE_EXACT_INPUT_SINGLE_SELECTOR, SLOT0_SELECTOR, TICK_BITMAP_SELECTOR, TICKS_SELECTOR,
+        get_sqrt_ratio_at_tick, get_tick_at_sqrt_ratio
+    )
+    
+    getcontext().prec = 60
+    
+    # TickMath: extremos exatos e ida/volta tick <-> preço
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(50) == 79426470787362580746886972461
+    for tick in (MIN_TICK, -200_001, -61, -1, 0, 1, 59, 123_456, MAX_TICK - 1):
+        assert get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick)) == tick
+        assert get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick + 1) - 1) == tick
+    
+    # Pool fee 0.3% (spacing 60) com duas posições: [-600, 600] e [-1200, -120]
+    fee, spacing = 3000, 60
+    positions = [(-600, 600, 10**18), (-1200, -120, 5 * 10**17)]
+    liquidity_net = {}
+    for lower, upper, amount in positions:
+        liquidity_net[lower] = liquidity_net.get(lower, 0) + amount
+        liquidity_net[upper] = liquidity_net.get(upper, 0) - amount
+    current_tick = 17
+    sqrt_price = get_sqrt_ratio_at_tick(current_tick) + 12345
+    active = sum(amount for lower, upper, amount in positions if lower <= current_tick < upper)
+    
+    token0, token1 = '0x' + '11' * 20, '0x' + '22' * 20
+    pool = '0x' + '33' * 20
+    factory_address = UNISWAP_V3_FACTORY['base'].lower()
+    quoter_address = UNISWAP_V3_QUOTER_V2['base'].lower()
+    
+    def reference_swap(amount_in: int, zero_for_one: bool) -> Decimal:
+        # Modelo contínuo (Decimal) do mesmo pool: oráculo independente do simulador
+        remaining = Decimal(amount_in) * (1 - Decimal(fee) / 10**6)
+        price = Decimal(sqrt_price) / Q96
+        ticks = sorted(liquidity_net, reverse=zero_for_one)
+        ticks = [t for t in ticks if (t <= current_tick if zero_for_one else t > current_tick)]
+        liquidity = Decimal(active)
+        out = Decimal(0)
+        for tick in ticks + [None]:
+            target = (Decimal(get_sqrt_ratio_at_tick(tick)) / Q96) if tick is not None else None
+            if liquidity > 0:
+                if zero_for_one:
+                    needed = liquidity * (1 / target - 1 / price) if target else None
+                    if needed is None or remaining <= needed:
+                        new_price = 1 / (1 / price + remaining / liquidity)
+                        return out + liquidity * (price - new_price)
+                    out += liquidity * (price - target)
+                else:
+                    needed = liquidity * (target - price) if target else None
+                    if needed is None or remaining <= needed:
+                        new_price = price + remaining / liquidity
+                        return out + liquidity * (1 / price - 1 / new_price)
+                    out += liquidity * (1 / price - 1 / target)
+                remaining -= needed
+            if tick is None:
+                return out
+            price = target
+            liquidity += -liquidity_net[tick] if zero_for_one else liquidity_net[tick]
+        return out
+    
+    def word(value: int) -> str:
+        return f'{value % 2**256:064x}'
+    
+    def pool_contract(data: str) -> str:
+        selector, args = data[:10], data[10:]
+        if selector == SLOT0_SELECTOR:
+            return '0x' + word(sqrt_price) + word(current_tick) + word(0) * 5
+        if selector == LIQUIDITY_SELECTOR:
+            return '0x' + word(active)
+        if selector[2:] == TICK_BITMAP_SELECTOR:
+            position = int(args, 16)
+            position -= 2**256 if position >= 2**255 else 0
+            bits = sum(1 << ((t // spacing) % 256) for t in liquidity_net if (t // spacing) >> 8 == position)
+            return '0x' + word(bits)
+        if selector[2:] == TICKS_SELECTOR:
+            tick = int(args, 16)
+            tick -= 2**256 if tick >= 2**255 else 0
+            return '0x' + word(0) + word(liquidity_net.get(tick, 0)) + word(0) * 6
+        raise AssertionError(selector)
+    
+    def factory(data: str) -> str:
+        assert data[2:10] == GET_POOL_SELECTOR
+        found = int(data[-64:], 16) == fee and data[34:74] == token0[2:] and data[98:138] == token1[2:]
+        return '0x' + (pool[2:] if found else '00' * 20).rjust(64, '0')
+    
+    quoter_requests = []
+    
+    def quoter(data: str) -> str:
+        assert data[2:10] == QUOTE_EXACT_INPUT_SINGLE_SELECTOR
+        amount_in = int(data[138:202], 16)
+        quoter_requests.append(amount_in)
+        out = int(reference_swap(amount_in, '0x' + data[34:74] == token0))
+        return '0x' + word(out) + word(0) * 3
+    
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({factory_address: factory, pool: pool_contract, quoter_address: quoter})
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        assert dex.v3_pools.prepare(factory_address, [token0, token1]) == 1
+        
+        connector.on_new_block('base', node.block_number)
+        requests_before = node.http_requests
+        node.call_blocks.clear()
+        # token0 -> token1 cruza -120 e -600; token1 -> token0 fica dentro de [-600, 600]
+        cases = [(token0, token1, 10**15), (token0, token1, 3 * 10**16), (token0, token1, 5 * 10**16),
+                 (token1, token0, 10**15), (token1, token0, 2 * 10**16)]
+        for token_in, token_out, amount in cases:
+            local = dex.get_price('uniswap_v3', token_in, token_out, amount)
+            expected = reference_swap(amount, token_in == token0)
+            assert local is not None and abs(local - expected) <= max(4, expected * Decimal('1e-15')), \
+                (amount, local, expected)
+        assert node.http_requests - requests_before == 3  # slot0+liquidez, bitmap, ticks
+        assert node.call_blocks == [hex(node.block_number)] * 3  # os três no mesmo bloco
+        assert not quoter_requests
+        
+        # Swap além das palavras carregadas: QuoterV2 como fallback
+        huge = 10**20
+        assert dex.get_price('uniswap_v3', token0, token1, huge) == int(reference_swap(huge, True))
+        assert quoter_requests == [huge]
+        
+        local, remote = dex.v3_pools.verify(factory_address, quoter_address, token0, token1, 3 * 10**16, fee)
+        assert abs(local - remote) <= 4
+        
+        logger.success(f"✅ {len(cases)} swaps simulados (com cruzamento de ticks) = modelo de referência")
+    finally:
+        node.close()
+
+
+def test_pool_events():
+    """Teste 14: Estado dos pools atualizado por logs Sync/Swap/Mint/Burn"""
+    print_section("TESTE 14: POOLS POR EVENTOS")
+    
+    from src.config.config import PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY, UNISWAP_V3_QUOTER_V2
+    from src.core.pool_events import (
+        BURN_V3_TOPIC, MINT_V3_TOPIC, SWAP_V3_TOPIC, SYNC_TOPIC, PoolEventUpdater
+    )
+    from src.core.v2_pools import GET_PAIR_SELECTOR, GET_RESERVES_SELECTOR, V2PoolCache
+    from src.core.v3_pools import GET_POOL_SELECTOR, V3PoolCache, get_sqrt_ratio_at_tick
+    
+    token0, token1 = '0x' + '11' * 20, '0x' + '22' * 20
+    pair, pool_address = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    quoter = UNISWAP_V3_QUOTER_V2['base'].lower()
+    
+    reserves = [10**21, 2 * 10**12]
+    pool = FakeV3Pool(3000, 60, 5, get_sqrt_ratio_at_tick(5) + 999, [(-600, 600, 10**18)])
+    reserve_reads = []
+    
+    def pair_contract(data):
+        assert data == GET_RESERVES_SELECTOR
+        reserve_reads.append(1)
+        return '0x' + word(reserves[0]) + word(reserves[1]) + word(0)
+    
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({
+        v2_factory: lambda data: '0x' + word(int(pair, 16)),
+        v3_factory: lambda data: '0x' + word(int(pool_address, 16) if int(data[-64:], 16) == 3000 else 0),
+        pair: pair_contract,
+        pool_address: pool,
+    })
+    
+    def emit(block, address, topics, data):
+        node.logs.append({'blockNumber': hex(block), 'logIndex': hex(len(node.logs)), 'address': address,
+                          'topics': topics, 'data': '0x' + ''.join(word(v) for v in data)})
+    
+    def fresh_quote(token_in, amount):
+        # Oráculo: releitura completa do pool no estado atual do nó
+        cache = V3PoolCache(connector, 'base')
+        cache.prepare(v3_factory, [token0, token1])
+        return cache.quote(v3_factory, quoter, token_in, token1 if token_in == token0 else token0, amount)
+    
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        v2, v3 = V2PoolCache(connector, 'base'), V3PoolCache(connector, 'base')
+        v2.prepare([v2_factory], [token0, token1])
+        v3.prepare(v3_factory, [token0, token1])
+        updater = PoolEventUpdater(connector, 'base', v2, v3)
+        
+        # Bootstrap: todos os pools lidos uma vez, todos sujos
+        updater.sync(head=1000)
+        assert updater.take_dirty() == {pair, pool_address}
+        assert v2.reserve_loads == 1 and v3.state_loads == 1
+        
+        # Sync (V2): reservas corrigidas sem getReserves
+        reserves[:] = [11 * 10**20, 19 * 10**11]
+        emit(1001, pair, [SYNC_TOPIC], reserves)
+        calls_before = node.calls.count('eth_call')
+        assert updater.sync(head=1001) == 1
+        assert v2.snapshot()[pair] == tuple(reserves)
+        assert node.calls.count('eth_call') == calls_before
+        assert updater.take_dirty_pairs() == {(token0, token1)}
+        
+        # Swap (V3): preço, tick e liquidez absolutos
+        pool.tick, pool.sqrt_price = -130, get_sqrt_ratio_at_tick(-130) + 77
+        emit(1002, pool_address, [SWAP_V3_TOPIC, '0x' + word(1), '0x' + word(2)],
+             [10**15, -(10**12), pool.sqrt_price, pool.liquidity, pool.tick])
+        
+        # Mint (V3): posição nova atravessando o tick atual + posição fora do preço
+        for lower, upper, amount in ((-240, 120, 3 * 10**17), (-1200, -600, 10**17)):
+            pool.positions.append((lower, upper, amount))
+            emit(1003, pool_address, [MINT_V3_TOPIC, '0x' + word(9), '0x' + word(lower), '0x' + word(upper)],
+                 [0, amount, 1, 1])
+        
+        calls_before = node.calls.count('eth_call')
+        assert updater.sync(head=1003) == 1
+        assert node.calls.count('eth_call') == calls_before  # nada relido
+        for token_in, amount in ((token0, 2 * 10**16), (token1, 10**16), (token0, 10**14)):
+            state = v3.get_state(v3_factory, token0, token1, 3000)
+            assert state.quote_exact_input(token_in, amount) == fresh_quote(token_in, amount)
+        
+        # Burn com amount > 0: relê só esse pool; Burn de 0 (coleta de fees) é ignorado
+        pool.positions[1] = (-240, 120, 0)
+        emit(1004, pool_address, [BURN_V3_TOPIC, '0x' + word(9), '0x' + word(-240), '0x' + word(120)],
+             [3 * 10**17, 1, 1])
+        emit(1004, pool_address, [BURN_V3_TOPIC, '0x' + word(9), '0x' + word(-600), '0x' + word(600)], [0, 0, 0])
+        updater.sync(head=1004)
+        assert updater.stats['reloads'] == 1 and updater.stats['bootstraps'] == 1
+        state = v3.get_state(v3_factory, token0, token1, 3000)
+        assert state.quote_exact_input(token0, 2 * 10**16) == fresh_quote(token0, 2 * 10**16)
+        
+        # Sem logs novos: nada sujo
+        updater.take_dirty()
+        updater.sync(head=1005)
+        assert not updater.take_dirty()
+        
+        logger.success(f"✅ {updater.stats['logs']} logs aplicados, estado = releitura completa")
+    finally:
+        node.close()
+
+
+def test_pool_registry():
+    """Teste 15: Registro de pools em disco a partir dos logs das factories"""
+    print_section("TESTE 15: REGISTRO DE POOLS")
+    
+    import tempfile
+    from src.config.config import BotConfig, MAJOR_TOKENS, PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY
+    from src.core.dex import DEXInterface
+    from src.core.pool_registry import PAIR_CREATED_TOPIC, POOL_CREATED_TOPIC, PoolRegistry
+    
+    tokens = sorted(address.lower() for address in list(MAJOR_TOKENS['base'].values())[:3])
+    token_a, token_b, token_c = tokens
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    
+    node = FakeNode(chain_id=8453)
+    node.block_number = 1000
+    node.max_log_range = 100
+    
+    def created(block, factory, topic, token0, token1, data, fee=None):
+        topics = [topic, '0x' + token0[2:].rjust(64, '0'), '0x' + token1[2:].rjust(64, '0')]
+        if fee is not None:
+            topics.append('0x' + word(fee))
+        node.logs.append({'blockNumber': hex(block), 'logIndex': '0x0', 'address': factory,
+                          'topics': topics, 'data': '0x' + ''.join(data)})
+    
+    pair_ab, pair_ac, pool_ab, pool_bc = ('0x' + c * 40 for c in 'abcd')
+    created(120, v2_factory, PAIR_CREATED_TOPIC, token_a, token_b, [pair_ab[2:].rjust(64, '0'), word(1)])
+    created(450, v2_factory, PAIR_CREATED_TOPIC, token_a, token_c, [pair_ac[2:].rjust(64, '0'), word(2)])
+    created(300, v3_factory, POOL_CREATED_TOPIC, token_a, token_b, [word(10), pool_ab[2:].rjust(64, '0')], fee=500)
+    created(900, v3_factory, POOL_CREATED_TOPIC, token_b, token_c, [word(60), pool_bc[2:].rjust(64, '0')], fee=3000)
+    
+    saved = (BotConfig.POOL_REGISTRY_DIR, BotConfig.POOL_REGISTRY_CHUNK_BLOCKS, BotConfig.POOL_REGISTRY_LOOKBACK_BLOCKS)
+    with tempfile.TemporaryDirectory() as directory:
+        BotConfig.POOL_REGISTRY_DIR = directory
+        BotConfig.POOL_REGISTRY_CHUNK_BLOCKS = 200
+        BotConfig.POOL_REGISTRY_LOOKBACK_BLOCKS = 1000
+        try:
+            connector = make_connector({'base': node})
+            assert connector.initialize()
+            dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+            factories = dex._indexed_factories()
+            assert {f.lower() for _, _, f in factories} == {v2_factory, v3_factory}
+            
+            # Orçamento por scan: retomado na próxima chamada; intervalo recusado → metade
+            registry = PoolRegistry('base')
+            registry.index(connector, factories, head=1000, max_requests=3)
+            assert not all(registry.is_synced(f, 1000) for _, _, f in factories)
+            while not all(registry.is_synced(f, 1000) for _, _, f in factories):
+                registry.index(connector, factories, head=1000, max_requests=10)
+            assert registry.last_block(v2_factory) == 1000 and len(registry) == 4
+            
+            # Consultas O(1)
+            assert {r.address for r in registry.pools_for_token(token_a)} == {pair_ab, pair_ac, pool_ab}
+            assert registry.dexes_for_pair(token_b, token_a) == {'pancakeswap', 'uniswap_v3'}
+            assert registry.candidate_pairs(tokens) == {(token_a, token_b)}
+            assert registry.pools_for_pair(token_b, token_c)[0].fee == 3000
+            
+            # Persistência: reabrir retoma do último bloco indexado
+            created(1050, v2_factory, PAIR_CREATED_TOPIC, token_b, token_c, ['e' * 64, word(3)])
+            node.calls.clear()
+            reopened = PoolRegistry('base')
+            assert len(reopened) == 4
+            assert reopened.index(connector, factories, head=1100) == 1
+            assert node.calls.count('eth_getLogs') == 2  # um intervalo por factory
+            assert reopened.candidate_pairs(tokens) == {(token_a, token_b), (token_b, token_c)}
+            
+            # Scanner: candidatos vêm do registro e as caches não perguntam às factories
+            node.block_number = 1100
+            connector.cache.invalidate('base')
+            candidates = dex._registry_candidates(MAJOR_TOKENS['base'].values(), 1100)
+            assert candidates == {(token_a, token_b), (token_b, token_c)}
+            assert dex.v2_pools.pairs[(v2_factory, token_a, token_b)] == pair_ab
+            assert dex.v3_pools.pools[(v3_factory, token_a, token_b, 3000)] is None
+            assert dex.v3_pools.get_pools(v3_factory, token_a, token_b) == [(500, pool_ab)]
+            
+            logger.success(f"✅ {len(reopened)} pools indexados, {len(candidates)} pares candidatos")
+        finally:
+            BotConfig.POOL_REGISTRY_DIR, BotConfig.POOL_REGISTRY_CHUNK_BLOCKS, \
+                BotConfig.POOL_REGISTRY_LOOKBACK_BLOCKS = saved
+            node.close()
+
+
+
+def test_multicall():
+    """Teste 16: eth_calls de um batch agregadas em um Multicall3.aggregate3"""
+    print_section("TESTE 16: MULTICALL3")
+    
+    from eth_abi import decode, encode
+    from src.config.config import MAJOR_TOKENS, PANCAKESWAP_V3_ROUTER
+    from src.core.dex import GET_AMOUNTS_OUT_SELECTOR, DEXInterface
+    from src.core.multicall import MulticallBatch
+    from src.core.rpc_batch import RPCError
+    from src.core.v2_pools import ZERO_ADDRESS
+    
+    targets = ['0x' + f'{i:040x}' for i in range(1, 41)]
+    
+    def echo(index):
+        def call(data):
+            if index == 7:
+                raise ValueError('revert')
+            return '0x' + word(index * 1000 + len(data))
+        return call
+    
+    def router(data):
+        assert bytes.fromhex(data[2:10]) == GET_AMOUNTS_OUT_SELECTOR
+        amount, path = decode(['uint256', 'address[]'], bytes.fromhex(data[10:]))
+        return '0x' + encode(['uint256[]'], [[amount, amount * 3]]).hex()
+    
+    node = FakeNode(chain_id=8453)
+    for i, target in enumerate(targets[:-1]):
+        node.contracts[target] = echo(i)
+    node.contracts[PANCAKESWAP_V3_ROUTER['base'].lower()] = router
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        transport = connector.rpc_pools['base']
+        
+        # 40 eth_calls + 1 leitura comum: uma requisição HTTP, um eth_call
+        node.calls.clear()
+        before = node.http_requests
+        batch = connector.batch('base')
+        assert isinstance(batch, MulticallBatch)
+        futures = [batch.call(target, '0x12345678') for target in targets]
+        balance = batch.get_balance(targets[0])
+        batch.execute()
+        assert node.http_requests - before == 1
+        assert node.calls.count('eth_call') == 1 and node.multicalls == 1
+        assert balance.result() == node.balance
+        assert int.from_bytes(futures[3].result(), 'big') == 3000 + 10
+        assert futures[-1].result() == b''  # sem contrato: sucesso vazio, como eth_call direta
+        try:
+            futures[7].result()
+            assert False, "chamada revertida deveria falhar"
+        except RPCError:
+            pass
+        
+        # Limite de chamadas por aggregate3: vários aggregate3 no mesmo POST, todos
+        # no mesmo número de bloco ('latest' resolvido antes em um eth_blockNumber)
+        before = node.http_requests
+        node.call_blocks.clear()
+        batch = MulticallBatch(transport, max_calls=15)
+        futures = [batch.call(target, '0x12') for target in targets]
+        batch.execute()
+        assert node.http_requests - before == 2 and node.multicalls == 4
+        assert node.call_blocks == [hex(node.block_number)] * 3
+        assert int.from_bytes(futures[20].result(), 'big') == 20000 + 4
+        
+        # Multicall3 ausente: chamadas reenviadas individualmente
+        before = node.http_requests
+        batch = MulticallBatch(transport, address='0x' + 'ee' * 20)
+        futures = [batch.call(target, '0x12') for target in targets[:5]]
+        batch.execute()
+        assert node.http_requests - before == 2
+        assert [int.from_bytes(f.result(), 'big') for f in futures] == [i * 1000 + 4 for i in range(5)]
+        
+        # Router sem factory: pernas de compra de todos os pares em um batch
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        dex.dexs['pancakeswap']['factory'] = ZERO_ADDRESS
+        token_list = list(MAJOR_TOKENS['base'].items())
+        pairs = [(a, b) for i, a in enumerate(token_list) for b in token_list[i+1:]]
+        before = node.http_requests
+        dex.scan_block = node.block_number
+        node.call_blocks.clear()
+        dex._prefetch_router_quotes(pairs, [10**6] * len(pairs))
+        assert node.http_requests - before == 1
+        assert node.call_blocks == [hex(node.block_number)]
+        (_, addr_in), (_, addr_out) = pairs[0]
+        assert dex.get_price('pancakeswap', addr_in, addr_out, 10**6) == 3 * 10**6
+        assert node.http_requests - before == 1
+
+        # Fora do prefetch: uma eth_call no bloco do scan, guardada para a próxima cotação igual
+        calls_before = node.calls.count('eth_call')
+        assert dex.get_price('pancakeswap', addr_in, addr_out, 2 * 10**6) == 6 * 10**6
+        assert node.calls.count('eth_call') - calls_before == 1 and node.call_blocks[-1] == hex(node.block_number)
+        assert dex.get_price('pancakeswap', addr_in, addr_out, 2 * 10**6) == 6 * 10**6
+        assert node.calls.count('eth_call') - calls_before == 1
+
+        logger.success(f"✅ {len(targets)} eth_calls em 1 requisição ({node.multicalls} aggregate3)")
+    finally:
+        node.close()
+
+
+
+def test_vector_scan():
+    """Teste 17: Scanner vetorizado (pares × venues × tamanhos) com confirmação exata"""
+    print_section("TESTE 17: SCANNER VETORIZADO")
+    
+    import numpy as np
+    from src.config.config import MAJOR_TOKENS, PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY
+    from src.core.dex import DEXInterface
+    from src.core.v2_pools import get_amount_out
+    from src.core.v3_pools import get_sqrt_ratio_at_tick
+    from src.core.vector_scan import PriceTensor, Venue, cycle_profits, top_candidates
+    
+    # Matemática em arrays = fórmula inteira do par V2 (a menos do arredondamento)
+    tensor = PriceTensor(
+        reserve_in=np.array([[1e21, 2e21], [5e20, 5e20]]),
+        reserve_out=np.array([[3e12, 5e12], [7e11, 7e11]]),
+        fee=np.array([0.997, 0.9975]),
+        dex_index=np.array([0, 1]),
+        valid=np.ones((2, 2), dtype=bool)
+    )
+    amounts = np.array([[1e17, 1e18, 1e19], [1e17, 1e18, 1e19]])[:, None, None, :]
+    profits = cycle_profits(tensor, amounts)
+    bought = get_amount_out(10**18, 10**21, 3 * 10**12, 30)
+    exact = get_amount_out(bought, 5 * 10**12, 2 * 10**21, 25) - 10**18
+    assert abs(profits[0, 0, 1, 1] - exact) / 10**18 < 1e-6
+    assert np.isneginf(profits[:, 0, 0]).all()  # mesma DEX nos dois lados
+    candidates = top_candidates(profits, amounts, np.ones(2), top_k=5)
+    assert [(c.pair, c.buy, c.sell) for c in candidates] == [(0, 0, 1)]  # par 1 sem diferença de preço
+    
+    token0, token1 = sorted(address.lower() for address in list(MAJOR_TOKENS['base'].values())[:2])
+    pair, pool_address = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({
+        v2_factory: lambda data: '0x' + word(int(pair, 16)),
+        v3_factory: lambda data: '0x' + word(int(pool_address, 16) if int(data[-64:], 16) == 3000 else 0),
+        pair: lambda data: '0x' + word(10**22) + word(11 * 10**21) + word(0),  # token1 10% mais caro
+        pool_address: FakeV3Pool(3000, 60, 0, get_sqrt_ratio_at_tick(0), [(-60000, 60000, 10**22)]),
+    })
+    add_token_metadata(node)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        dex.v2_pools.prepare([v2_factory], [token0, token1])
+        dex.v3_pools.prepare(v3_factory, [token0, token1])
+        
+        token_pairs = [(('T0', token0), ('T1', token1)), (('T1', token1), ('T0', token0))]
+        started = time.perf_counter()
+        opportunities = dex.vector_scanner.scan(token_pairs, caps=[10**21, 10**21])
+        elapsed = time.perf_counter() - started
+        
+        by_direction = {opp['token_in']: opp for opp in opportunities}
+        opp = by_direction[token0]
+        assert (opp['buy_dex'], opp['sell_dex']) == ('pancakeswap', 'uniswap_v3')
+        # Tamanho ótimo da rota mista (seção áurea sobre a cotação exata)
+        profit_at = lambda x: dex.vector_scanner.sizer.route_profit('pancakeswap', 'uniswap_v3', token0, token1, x)[0]
+        assert 10**18 < opp['amount_in'] < 10**21
+        assert all(profit_at(opp['amount_in']) >= profit_at(int(opp['amount_in'] * f)) for f in (0.99, 1.01))
+        assert opp['amount_out_sell'] == dex.get_price('uniswap_v3', token1, token0, opp['amount_out_buy'])
+        assert opp['profit'] == opp['amount_out_sell'] - opp['amount_in'] > 0
+        
+        # Caminho inverso (token1 → token0) também é avaliado, pelo outro lado
+        assert by_direction[token1]['buy_dex'] == 'uniswap_v3'
+        
+        # Tier 0,05% com preço melhor na mesma DEX: a confirmação recota o pool do venue
+        # escolhido (3000), não o melhor tier, e os valores batem com `pools`
+        pool_500 = '0x' + 'bc' * 20
+        node.contracts[pool_500] = FakeV3Pool(500, 10, -2000, get_sqrt_ratio_at_tick(-2000), [(-60000, 60000, 10**22)])
+        dex.v3_pools.pools[(v3_factory, token0, token1, 500)] = pool_500
+        connector.cache.invalidate('base')
+        dex.pool_table.sync(dex)
+        confirmed = dex.vector_scanner._confirm(token0, token1, Venue('pancakeswap', 'v2', 0),
+                                                Venue('uniswap_v3', 'v3', 3000), opp['amount_in'], 10**21)
+        sell_3000 = dex.v3_pools.quote_pool(v3_factory, '', token1, token0, confirmed['amount_out_buy'], 3000)
+        assert confirmed['amount_out_sell'] == sell_3000
+        assert dex.get_price('uniswap_v3', token1, token0, confirmed['amount_out_buy']) > sell_3000
+        assert confirmed['pools'][1] == dex.pool_table.row(pool_address) >= 0
+        
+        logger.success(f"✅ {len(opportunities)} oportunidades confirmadas em {elapsed * 1000:.1f}ms")
+    finally:
+        node.close()
+
+
+
+def test_trade_sizing():
+    """Teste 18: Tamanho ótimo de trade (forma fechada, seção áurea e tetos)"""
+    print_section("TESTE 18: TAMANHO ÓTIMO DE TRADE")
+    
+    from src.config.config import AAVE_V3_POOL, BotConfig, MAJOR_TOKENS
+    from src.core.dex import DEXInterface
+    from src.core.trade_sizing import BALANCE_OF_SELECTOR, GET_RESERVE_DATA_SELECTOR, golden_section_max, optimal_input
+    from src.core.v2_pools import get_amount_out
+    
+    # V2/V2: x* da forma fechada = máximo do lucro inteiro exato (taxa de flash loan inclusa)
+    a_in, a_out, b_in, b_out = 8 * 10**20, 3 * 10**12, 2 * 10**12, 6 * 10**20
+    flash_fee = 0.0009
+    
+    def profit(x):
+        sold = get_amount_out(get_amount_out(x, a_in, a_out, 30), b_in, b_out, 25)
+        return sold - x - int(x * flash_fee)
+    
+    x = int(optimal_input(float(a_in), float(a_out), 0.997, float(b_in), float(b_out), 0.9975, flash_fee))
+    assert profit(x) > 0
+    assert all(profit(x) >= profit(int(x * f)) for f in (0.999, 1.001, 0.9, 1.1))
+    assert optimal_input(1e21, 1e12, 0.997, 1e12, 1e21, 0.997) == 0  # mesmo preço: sem rota
+    
+    # Seção áurea em inteiros
+    best, value = golden_section_max(lambda v: -(v - 123_456) ** 2, 1, 10**7)
+    assert abs(best - 123_456) <= 1 and value > -4
+    assert golden_section_max(lambda v: None, 1, 100)[1] is None  # cotação sempre falhando
+    
+    # Tetos: liquidez do Aave (aToken.balanceOf) e MAX_TRADE_AMOUNT_USD
+    token_a, token_b = list(MAJOR_TOKENS['base'].values())[:2]
+    a_token = '0x' + 'a7' * 20
+    
+    def aave_pool(data):
+        assert data[:10] == GET_RESERVE_DATA_SELECTOR
+        asset = '0x' + data[-40:]
+        words = [0] * 15
+        if asset == token_a.lower():
+            words[8] = int(a_token, 16)
+        return '0x' + ''.join(word(w) for w in words)
+    
+    node = FakeNode(chain_id=8453)
+    add_token_metadata(node)
+    metadata = node.contracts[token_a.lower()]
+    
+    def erc20(data):
+        if data[:10] != BALANCE_OF_SELECTOR:
+            return metadata(data)
+        assert data[-40:] == a_token[2:]
+        return '0x' + word(5 * 10**8)
+    
+    node.contracts[AAVE_V3_POOL['base'].lower()] = aave_pool
+    node.contracts[token_a.lower()] = erc20
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        sizer = dex.vector_scanner.sizer
+        
+        # Teto em unidades de cada token: USDC (6 decimais) e WETH (18 decimais, preço do ETH)
+        limit = int(BotConfig.MAX_TRADE_AMOUNT_USD * 10**6)
+        limit_b = int(BotConfig.MAX_TRADE_AMOUNT_USD / BotConfig.ETH_PRICE_USD * 10**18)
+        assert sizer.caps([token_a, token_b]) == [min(5 * 10**8, limit), limit_b]
+        
+        before = node.http_requests
+        assert sizer.caps([token_b, token_a]) == [limit_b, min(5 * 10**8, limit)]
+        assert node.http_requests == before  # mesmo bloco: liquidez em cache
+        
+        # Rota V2/V2 com teto menor que o ótimo: limitada ao teto
+        assert sizer.refine('pancakeswap', 'pancakeswap', token_a, token_b, 10**12, 10**9, True) == 10**9
+        
+        logger.success(f"✅ x* = {x} (lucro {profit(x)}), tetos {sizer.caps([token_a, token_b])}")
+    finally:
+        node.close()
+
+
+
+def test_cycle_finder():
+    """Teste 19: Ciclos multi-hop no grafo de log-preços (busca incremental)"""
+    print_section("TESTE 19: CICLOS MULTI-HOP")
+    
+    import math
+    import random
+    from src.config.config import BotConfig, MAJOR_TOKENS, PANCAKESWAP_V2_FACTORY
+    from src.core.cycle_finder import CycleFinder
+    from src.core.dex import DEXInterface
+    from src.core.v2_pools import GET_PAIR_SELECTOR, sort_tokens
+    
+    # Escala: 150 tokens, ~3000 arestas sem arbitragem + um ciclo de 4 pools com 2%
+    rng = random.Random(7)
+    tokens = [f'0x{i:040x}' for i in range(1, 151)]
+    prices = {token: 10 ** rng.uniform(-3, 3) for token in tokens}
+    finder = CycleFinder(None, None, max_hops=4, top_k=10)
+    
+    def connect(a, b, pool, bonus=1.0):
+        depth = 10**24
+        finder.table.upsert(pool, a, b, 'dex', 'v2', 0, 0.997, depth, depth * prices[a] / prices[b] * bonus)
+    
+    for i in range(1500):
+        a, b = rng.sample(tokens[:146], 2)
+        connect(a, b, f'pool{i}')
+    ring = tokens[146:150]
+    for i in range(4):
+        connect(ring[i], ring[(i + 1) % 4], f'ring{i}', bonus=1.02 if i == 0 else 1.0)
+    connect(ring[2], tokens[0], 'bridge')  # anel ligado ao resto do grafo
+    
+    touched = finder.edges_for([finder.table.index['ring0']])
+    started = time.perf_counter()
+    cycles = finder.find_cycles(touched)
+    elapsed = time.perf_counter() - started
+    assert len(cycles) == 1 and set(cycles[0].tokens) == set(ring)
+    assert abs(cycles[0].weight - (4 * -math.log(0.997) - math.log(1.02))) < 1e-9
+    assert elapsed < 1.0
+    assert not finder.find_cycles(finder.edges_for([finder.table.index['pool3']]))
+    
+    # Triângulo real em uma DEX: USDC → WETH → DAI → USDC
+    usdc, weth, dai = (MAJOR_TOKENS['base'][s].lower() for s in ('USDC', 'WETH', 'DAI'))
+    pairs = {sort_tokens(usdc, weth): '0x' + 'a1' * 20, sort_tokens(weth, dai): '0x' + 'a2' * 20,
+             sort_tokens(dai, usdc): '0x' + 'a3' * 20}
+    # reservas por token (unidades cruas): preço de WETH mais alto no par WETH/DAI
+    balances = {
+        pairs[sort_tokens(usdc, weth)]: {usdc: 3 * 10**15, weth: 10**24},
+        pairs[sort_tokens(weth, dai)]: {weth: 10**24, dai: 3150 * 10**24},
+        pairs[sort_tokens(dai, usdc)]: {dai: 3 * 10**27, usdc: 3 * 10**15},
+    }
+    
+    def factory(data):
+        assert data[2:10] == GET_PAIR_SELECTOR
+        return '0x' + pairs.get(('0x' + data[34:74], '0x' + data[98:138]), '0x' + '00' * 20)[2:].rjust(64, '0')
+    
+    def pair_contract(pair):
+        token0, token1 = next(k for k, v in pairs.items() if v == pair)
+        return lambda data: '0x' + word(balances[pair][token0]) + word(balances[pair][token1]) + word(0)
+    
+    node = FakeNode(chain_id=8453)
+    add_token_metadata(node)
+    node.contracts[PANCAKESWAP_V2_FACTORY['base'].lower()] = factory
+    for pair in pairs.values():
+        node.contracts[pair] = pair_contract(pair)
+    
+    saved = BotConfig.MAX_TRADE_AMOUNT_USD
+    BotConfig.MAX_TRADE_AMOUNT_USD = 10**15
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        dex.v2_pools.prepare([PANCAKESWAP_V2_FACTORY['base']], [usdc, weth, dai])
+        dex.token_security.verified_tokens[MAJOR_TOKENS['base']['DAI']] = {'time': time.time(), 'reason': 'teste'}
+        finder = dex.cycle_finder
+        
+        opportunities = finder.scan()
+        assert len(opportunities) == 1
+        opp = opportunities[0]
+        assert opp['type'] == 'cycle' and opp['token_in'] == usdc  # começa no primeiro token de MAJOR_TOKENS
+        assert [hop['token_out'] for hop in opp['route']] == [weth, dai, usdc]
+        assert {finder.table.addresses[row] for row in opp['pools']} == set(pairs.values())  # pools por linha da tabela
+        
+        route = [(hop['dex'], hop['token_in'], hop['token_out'], hop['fee']) for hop in opp['route']]
+        profit_at = lambda x: finder.sizer.path_profit(route, x)[0]
+        assert opp['profit'] == opp['amount_out_sell'] - opp['amount_in'] > 0
+        assert all(profit_at(opp['amount_in']) >= profit_at(int(opp['amount_in'] * f)) for f in (0.99, 1.01))
+        
+        # Mesmo bloco / reservas iguais: nenhuma aresta alterada, nada a buscar
+        assert finder.refresh() == []
+        
+        # Bloco novo com o par WETH/DAI equilibrado: arestas alteradas, ciclo some
+        balances[pairs[sort_tokens(weth, dai)]][dai] = 3000 * 10**24
+        connector.on_new_block('base', 1001)
+        touched = finder.refresh()
+        assert {edge.pool for edge in touched} == {pairs[sort_tokens(weth, dai)]}
+        assert finder.find_cycles(touched) == []
+        
+        # O contrato executa 2 swaps: ciclos ficam fora da melhor oportunidade executável
+        assert len(opp['route']) > BotConfig.EXECUTION_MAX_HOPS
+        
+        logger.success(f"✅ Ciclo de 4 pools entre {2 * len(finder.table)} arestas em {elapsed * 1000:.1f}ms")
+    finally:
+        BotConfig.MAX_TRADE_AMOUNT_USD = saved
+        node.close()
+
+
+def test_token_metadata():
+    """Teste 20: Metadados de tokens (decimais em lote, disco e conversões USD)"""
+    print_section("TESTE 20: METADADOS DE TOKENS")
+    
+    import os
+    import tempfile
+    from src.config.config import BotConfig, MAJOR_TOKENS
+    from src.core.dex import DEXInterface
+    from src.core.token_metadata import TokenMetadataStore, opportunity_usd
+    from src.core.v2_pools import sort_tokens
+    
+    usdc, weth, dai = (MAJOR_TOKENS['base'][s].lower() for s in ('USDC', 'WETH', 'DAI'))
+    usdt, aero = '0x' + 'de' * 20, '0x' + 'ae' * 20
+    
+    node = FakeNode(chain_id=8453)
+    add_token_metadata(node)
+    node.contracts[usdt] = erc20_metadata('USDT', 18)   # stablecoin com 18 decimais (ex.: BSC)
+    node.contracts[aero] = erc20_metadata('AERO', 18)   # sem preço de referência
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'base.json')
+            store = TokenMetadataStore('base', path)
+            
+            # Todos os tokens em uma requisição (Multicall3); conhecidos não são buscados de novo
+            before = node.http_requests
+            assert store.load(connector, [usdc, weth, dai, usdt, aero, '0x' + '00' * 19 + '01']) == 5
+            assert node.http_requests - before == 1
+            assert store.load(connector, [usdc, weth]) == 0 and node.http_requests - before == 1
+            assert (store.decimals(usdc), store.decimals(weth), store.symbol(aero)) == (6, 18, 'AERO')
+            
+            # Recarregado do disco sem RPC
+            reloaded = TokenMetadataStore('base', path)
+            assert len(reloaded) == 5 and reloaded.get(usdt) == store.get(usdt)
+        
+        # USD → unidades cruas pelos decimais de cada token
+        assert store.to_raw(usdc, 1000) == 1000 * 10**6
+        assert store.to_raw(usdt, 1000) == 1000 * 10**18
+        assert store.to_raw(weth, BotConfig.ETH_PRICE_USD) == 10**18
+        assert store.to_raw(aero, 1000) is None
+        
+        # Preço de AERO pelo pool mais profundo com USDC (2 USD); o raso é ignorado
+        store.update_prices([
+            (aero, usdc, 2 * 10**12 / 10**24, 2 * 10**12),
+            (aero, usdc, 3 * 10**9 / 10**21, 3 * 10**9),
+        ])
+        assert abs(store.price_usd(aero) - 2.0) < 1e-9
+        assert abs(store.to_usd(aero, 5 * 10**18) - 10.0) < 1e-9
+        
+        # Scan por router: entrada de cada par nos decimais do token de entrada
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        dex.vector_scanner = None
+        saved = BotConfig.POOL_REGISTRY
+        BotConfig.POOL_REGISTRY = False
+        try:
+            dex.scan_all_pairs(1000)
+        finally:
+            BotConfig.POOL_REGISTRY = saved
+        amounts = {key[:2]: key[2] for key in dex._pair_results}
+        assert amounts[sort_tokens(usdc, weth)] == 1000 * 10**6
+        assert amounts[sort_tokens(weth, dai)] == dex.tokens.to_raw(weth, 1000)
+        
+        # Oportunidades em USD pelo token de entrada
+        assert opportunity_usd({'network': 'base', 'token_in': usdc, 'profit': 5 * 10**6}, 'profit') == 5.0
+        assert opportunity_usd({'network': 'base', 'token_in': weth, 'profit': 10**18}, 'profit') == BotConfig.ETH_PRICE_USD
+        
+        logger.success(f"✅ {len(store)} tokens em 1 requisição; 1000 USD = {store.to_raw(weth, 1000)} wei de WETH")
+    finally:
+        node.close()
+
+
+def test_parallel_scan():
+    """Teste 21: Redes escaneadas em paralelo, com prazo por rede"""
+    print_section("TESTE 21: SCAN PARALELO POR REDE")
+    
+    from src.config.config import BotConfig
+    from src.core.dex import MultiDEXScanner
+    
+    nodes = {'base': FakeNode(chain_id=8453), 'arbitrum': FakeNode(chain_id=42161), 'bsc': FakeNode(chain_id=56)}
+    delays = {'base': 0.3, 'arbitrum': 0.3, 'bsc': 0.3}
+    release = threading.Event()
+    
+    def slow_scan(network):
+        def scan_all_pairs(amount_usd, on_opportunity=None):
+            if delays[network] is None:
+                release.wait(5)   # rede travada até o fim do teste
+            else:
+                time.sleep(delays[network])
+            opportunities = [{'network': network, 'profit_percentage': 1.0, 'profit': 0, 'amount_in': 0}]
+            for opp in opportunities:
+                on_opportunity(opp)
+            return opportunities
+        return scan_all_pairs
+    
+    saved = BotConfig.SCANNING_THREADS
+    BotConfig.SCANNING_THREADS = 3
+    try:
+        connector = make_connector(nodes)
+        assert connector.initialize()
+        scanner = MultiDEXScanner(connector)
+        for network, dex_interface in scanner.dex_interfaces.items():
+            dex_interface.scan_all_pairs = slow_scan(network)
+        
+        # Latência do ciclo = rede mais lenta, não a soma (3 × 0.3s)
+        started = time.perf_counter()
+        opportunities = scanner.scan_all_networks(timeout=2.0)
+        elapsed = time.perf_counter() - started
+        assert {opp['network'] for opp in opportunities} == set(nodes)
+        assert elapsed < 0.6
+        
+        # Rede travada: descartada no prazo sem bloquear as outras
+        delays['bsc'] = None
+        started = time.perf_counter()
+        opportunities = scanner.scan_all_networks(timeout=0.5)
+        assert time.perf_counter() - started < 1.0
+        assert {opp['network'] for opp in opportunities} == {'base', 'arbitrum'}
+        
+        # Ciclo seguinte: o scan anterior da rede ainda corre, ela não é reenviada
+        opportunities = scanner.scan_all_networks(timeout=0.5)
+        assert {opp['network'] for opp in opportunities} == {'base', 'arbitrum'}
+        assert scanner.scan_all_networks(networks=['base'], timeout=0.5)[0]['network'] == 'base'
+        
+        logger.success(f"✅ 3 redes escaneadas em {elapsed * 1000:.0f}ms (serial: ~900ms)")
+    finally:
+        release.set()
+        BotConfig.SCANNING_THREADS = saved
+        for node in nodes.values():
+            node.close()
+
+
+def test_streaming_best():
+    """Teste 22: Top-k por lucro líquido com saída antecipada"""
+    print_section("TESTE 22: MELHOR OPORTUNIDADE EM STREAMING")
+    
+    from src.config.config import BotConfig, MAJOR_TOKENS
+    from src.core.dex import MultiDEXScanner, OpportunityHeap
+    
+    # Heap limitado: mantém só as melhores pelo lucro líquido
+    heap = OpportunityHeap(3)
+    for value in [5, 1, 9, 3, 7, 2]:
+        heap.push({'net_profit_usd': float(value)})
+    assert len(heap) == 3 and [o['net_profit_usd'] for o in heap.ranked()] == [9, 7, 5]
+    assert heap.best()['net_profit_usd'] == 9 and not heap.push({'net_profit_usd': 4.0})
+    
+    nodes = {'base': FakeNode(chain_id=8453), 'arbitrum': FakeNode(chain_id=42161)}
+    add_token_metadata(nodes['base'])
+    delays = {'base': 0.0, 'arbitrum': 1.0}
+    tail = {'base': 0.0}   # pausa de base depois da primeira oportunidade (resto do scan)
+    usdc = MAJOR_TOKENS['base']['USDC'].lower()
+    
+    def opportunity(network, profit_usd, hops=2):
+        return {'network': 'base', 'scanned_on': network, 'token_in': usdc, 'amount_in': 10**10,
+                'profit': int(profit_usd * 10**6), 'profit_percentage': 2.0,
+                'route': [{}] * hops if hops > 2 else []}
+    
+    results = {
+        'base': [opportunity('base', 60), opportunity('base', 500, hops=3)],  # ciclo: fora da execução
+        'arbitrum': [opportunity('arbitrum', 200)],
+    }
+    
+    def scan(network):
+        def scan_all_pairs(amount_usd, on_opportunity=None):
+            time.sleep(delays[network])
+            opportunities = []
+            for i, opp in enumerate(results[network]):
+                if i == 1:
+                    time.sleep(tail.get(network, 0.0))
+                opportunities.append(dict(opp))
+                on_opportunity(opportunities[-1])
+            return opportunities
+        return scan_all_pairs
+    
+    try:
+        connector = make_connector(nodes)
+        assert connector.initialize()
+        scanner = MultiDEXScanner(connector)
+        for network, dex_interface in scanner.dex_interfaces.items():
+            dex_interface.scan_all_pairs = scan(network)
+        
+        # Lucro líquido = bruto − taxa do flash loan − gas do bloco
+        gas_usd = nodes['base'].gas_price * BotConfig.ARBITRAGE_GAS_UNITS / 1e18 * BotConfig.ETH_PRICE_USD
+        ranked = scanner.scan_all_networks()
+        assert [o['scanned_on'] for o in ranked] == ['base', 'arbitrum', 'base']
+        best = next(o for o in ranked if o['scanned_on'] == 'arbitrum')
+        assert abs(best['net_profit_usd'] - (200 - 10**4 * BotConfig.FLASH_LOAN_FEE - gas_usd)) < 1e-6
+        
+        # Sem limiar: espera todas as redes e devolve a melhor executável
+        while any(not f.done() for f in scanner._running.values()):
+            time.sleep(0.05)
+        opp = scanner.get_best_opportunity(min_profit_usd=10, min_profit_pct=1.0, good_enough_usd=0)
+        assert opp['scanned_on'] == 'arbitrum'
+        assert [o['scanned_on'] for o in scanner.last_candidates] == ['arbitrum', 'base']
+        
+        # "Bom o bastante": a primeira oportunidade que passa o limiar volta sem esperar
+        # a rede lenta nem o resto do scan da própria rede
+        while any(not f.done() for f in scanner._running.values()):
+            time.sleep(0.05)
+        tail['base'] = 1.0
+        started = time.perf_counter()
+        opp = scanner.get_best_opportunity(min_profit_usd=10, min_profit_pct=1.0, good_enough_usd=40)
+        elapsed = time.perf_counter() - started
+        assert opp['scanned_on'] == 'base' and elapsed < 0.5
+        
+        logger.success(f"✅ Executável em {elapsed * 1000:.0f}ms com a rede lenta ainda escaneando")
+        while any(not f.done() for f in scanner._running.values()):
+            time.sleep(0.05)
+    finally:
+        for node in nodes.values():
+            node.close()
+
+
+def test_pool_table():
+    """Teste 23: Pools em arrays (PoolTable) e oportunidades com __slots__"""
+    print_section("TESTE 23: TABELA DE POOLS E OPPORTUNITY")
+    
+    from src.config.config import MAJOR_TOKENS
+    from src.core.opportunity import Opportunity
+    from src.core.pool_table import PoolTable
+    from src.core.token_metadata import opportunity_usd
+    
+    # Milhares de pools: colunas crescem no lugar, linhas estáveis
+    table = PoolTable(capacity=16)
+    tokens = [f'0x{i:040x}' for i in range(1, 101)]
+    for i in range(5000):
+        table.upsert(f'pool{i}', tokens[i % 100], tokens[(i * 7 + 1) % 100], f'dex{i % 3}', 'v2', 0, 0.997,
+                     1e21 + i, 2e21 + i)
+    assert len(table) == 5000 and table.row('pool123') == 123 and table.row('nada') == -1
+    assert table.memory_bytes() / len(table.gamma) <= 40   # bytes por pool nas colunas
+    assert len(table.venues) == 3 and len(table.tokens) == 100
+    
+    # Só o que mudou é reportado
+    assert table.upsert('pool10', '', '', 'dex1', 'v2', 0, 0.997, 1e21 + 10, 2e21 + 10) == (10, False)
+    assert table.upsert('pool10', '', '', 'dex1', 'v2', 0, 0.997, 5e20, 2e21) == (10, True)
+    table.upsert('vazio', tokens[0], tokens[1], 'dex0', 'v3', 500, 0.9995, 0.0, 0.0)
+    assert len(table.valid()) == 5000
+    rates = list(table.rates())
+    assert len(rates) == 10000 and rates[10][2] == 4.0   # pool10: 2e21 / 5e20
+    
+    # Opportunity: sem __dict__, acesso por chave e conversão de/para dict
+    usdc = MAJOR_TOKENS['base']['USDC'].lower()
+    legacy = {
+        'buy_dex': 'uniswap_v3', 'sell_dex': 'pancakeswap', 'token_in': usdc, 'token_out': tokens[1],
+        'amount_in': 10**9, 'amount_out_buy': 5 * 10**17, 'amount_out_sell': 1_010_000_000,
+        'profit': 10**7, 'profit_percentage': 1.0, 'network': 'base',
+    }
+    opp = Opportunity.from_dict(legacy, pools=(3, 7))
+    assert not hasattr(opp, '__dict__')
+    assert opp['profit'] == opp.profit == 10**7 and opp.get('symbol_in', '?') == '?'
+    assert 'network' in opp and 'symbol_in' not in opp and opp.pools == (3, 7)
+    opp['symbol_in'] = 'USDC'
+    assert opp.symbol_in == 'USDC'
+    try:
+        opp['inexistente'] = 1
+        raise AssertionError('chave desconhecida aceita')
+    except KeyError:
+        pass
+    assert opp.to_dict() == {**legacy, 'symbol_in': 'USDC', 'pools': [3, 7]}
+    assert Opportunity.from_dict(opp.to_dict()).to_dict() == opp.to_dict()
+    assert opportunity_usd(opp) == opportunity_usd(legacy)
+    assert sys.getsizeof(opp) < sys.getsizeof(dict(legacy))
+    
+    cycle = Opportunity('base', 'a', 'b', usdc, tokens[1], 100, 50, 120, kind='cycle', route=[{'dex': 'a'}] * 3)
+    assert cycle['type'] == 'cycle' and cycle['profit'] == 20 and cycle['profit_percentage'] == 20.0
+    
+    logger.success(f"✅ {len(table)} pools em {table.memory_bytes() / 1024:.0f} KiB; Opportunity {sys.getsizeof(opp)} bytes")
+
+
+def test_shared_pools():
+    """Teste 24: Pools em memória compartilhada (seqlock) e processos de cotação"""
+    print_section("TESTE 24: MEMÓRIA COMPARTILHADA E PROCESSOS DE COTAÇÃO")
+    
+    import threading
+    from src.config.config import MAJOR_TOKENS, PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY
+    from src.core.dex import DEXInterface
+    from src.core.pool_table import PoolTable
+    from src.core.shared_pools import RouteWorkers, SharedPoolTable, route_candidates
+    from src.core.v3_pools import get_sqrt_ratio_at_tick
+    
+    # Seqlock: leitor nunca vê uma publicação pela metade (invariante reserve1 = 2·reserve0)
+    table = PoolTable()
+    for i in range(50):
+        table.upsert(f'0x{i:040x}', 'a', 'b', 'dex0', 'v2', 0, 0.997, 1.0, 2.0)
+    shared = SharedPoolTable.create(capacity=64)
+    shared.publish(table)
+    stop = threading.Event()
+    
+    def writer():
+        version = 1
+        while not stop.is_set():
+            version += 1
+            table.reserve0[:50], table.reserve1[:50] = version, 2 * version
+            shared.publish(table, block=version)
+            time.sleep(0.0001)
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        reads = 0
+        deadline = time.time() + 0.5
+        while time.time() < deadline:
+            r0, r1, block = shared.read(lambda view: (view.reserve0[:50].copy(), view.reserve1[:50].copy(), view.block))
+            assert (r1 == 2 * r0).all() and (r0 == r0[0]).all() and (block == 0 or r0[0] == block)
+            reads += 1
+    finally:
+        stop.set()
+        thread.join()
+    assert shared.size == 50 and shared.header[0] % 2 == 0
+    shared.close()
+    
+    # Fatias disjuntas em processos = avaliação no processo
+    table = PoolTable()
+    tokens = [f'0x{i:040x}' for i in range(1, 21)]
+    for i in range(600):
+        token0, token1 = tokens[i % 20], tokens[(i * 3 + 1) % 20]
+        if token0 != token1:
+            table.upsert(f'pool{i}', *sorted((token0, token1)), f'dex{i % 4}', 'v2', 0, 0.997,
+                         1e21 * (1 + (i % 7) / 50), 2e21 * (1 + (i % 5) / 50))
+    shared = SharedPoolTable.create(capacity=1024)
+    shared.publish(table, block=123)
+    workers = RouteWorkers(2)
+    try:
+        started = time.perf_counter()
+        in_workers = workers.scan(shared, flash_fee=0.0009)
+        elapsed = time.perf_counter() - started
+        expected = route_candidates(table, flash_fee=0.0009)
+        assert expected and sorted(in_workers) == sorted(expected)
+        assert workers.stats['errors'] == 0 and shared.block == 123 and shared.token_names() == table.tokens
+        assert all(table.venue[c.buy_row] != table.venue[c.sell_row] for c in expected)
+    finally:
+        workers.close()
+        shared.close()
+    
+    # Candidatos por linha recotados com a matemática exata (mesmo cenário do teste 17)
+    token0, token1 = sorted(address.lower() for address in list(MAJOR_TOKENS['base'].values())[:2])
+    pair, pool_address = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({
+        v2_factory: lambda data: '0x' + word(int(pair, 16)),
+        v3_factory: lambda data: '0x' + word(int(pool_address, 16) if int(data[-64:], 16) == 3000 else 0),
+        pair: lambda data: '0x' + word(10**22) + word(11 * 10**21) + word(0),
+        pool_address: FakeV3Pool(3000, 60, 0, get_sqrt_ratio_at_tick(0), [(-60000, 60000, 10**22)]),
+    })
+    add_token_metadata(node)
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        dex = DEXInterface(connector.get_web3('base'), 'base', connector)
+        dex.v2_pools.prepare([v2_factory], [token0, token1])
+        dex.v3_pools.prepare(v3_factory, [token0, token1])
+        dex.pool_table.sync(dex)
+        
+        by_direction = {
+            opp['token_in']: opp
+            for opp in dex.vector_scanner.confirm_rows(route_candidates(dex.pool_table))
+        }
+        opp = by_direction[token0]
+        assert (opp['buy_dex'], opp['sell_dex']) == ('pancakeswap', 'uniswap_v3')
+        assert opp['profit'] == opp['amount_out_sell'] - opp['amount_in'] > 0
+        assert [dex.pool_table.addresses[row] for row in opp['pools']] == [pair, pool_address]
+    finally:
+        node.close()
+    
+    logger.success(f"✅ {reads} leituras consistentes; {len(expected)} rotas em 2 processos em {elapsed * 1000:.0f}ms")
+
+
+def test_addresses():
+    """Teste 25: Endereços internados (Address) com checksum memoizado"""
+    print_section("TESTE 25: ENDEREÇOS CANÔNICOS")
+    
+    from web3 import Web3
+    from src.config.config import MAJOR_TOKENS
+    from src.core.address import Address, checksum, to_address
+    from src.core.raw_rpc import address_bytes
+    from src.utils.real_token_security import RealTokenSecurity
+    
+    usdc = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+    address = to_address(usdc)
+    # Uma instância por endereço, qualquer grafia; chave de dict igual ao hex minúsculo
+    assert address is to_address(usdc.lower()) is to_address(usdc.upper().replace('0X', '0x'))
+    assert address is to_address(bytes.fromhex(usdc[2:]))
+    assert address == usdc.lower() and {usdc.lower(): 1}[address] == 1
+    assert address.checksum == checksum(usdc.lower()) == Web3.to_checksum_address(usdc)
+    assert address.raw == address_bytes(usdc) == bytes.fromhex(usdc[2:])
+    for invalid in ('0x1234', '0x' + 'zz' * 20, b'\x00' * 19):
+        try:
+            to_address(invalid)
+            raise AssertionError(f'endereço inválido aceito: {invalid!r}')
+        except ValueError:
+            pass
+    
+    # Mapas de tokens da config já canônicos
+    assert all(isinstance(a, Address) for tokens in MAJOR_TOKENS.values() for a in tokens.values())
+    assert MAJOR_TOKENS['base']['USDC'] is address
+    
+    # Whitelist e caches do anti-scam pela chave canônica
+    security = RealTokenSecurity(Web3(), 'base')
+    assert security.is_token_safe(usdc) == (True, "Whitelist")
+    assert security.is_token_safe(usdc.lower()) == (True, "Whitelist")
+    dai = MAJOR_TOKENS['base']['DAI']
+    security.verified_tokens[dai] = {'time': time.time(), 'reason': 'teste'}
+    assert security.is_token_safe(dai.checksum) == (True, 'teste')
+    
+    started = time.perf_counter()
+    for _ in range(10000):
+        checksum(usdc)
+    elapsed = (time.perf_counter() - started) / 10000
+    assert elapsed < 20e-6
+    
+    logger.success(f"✅ checksum memoizado em {elapsed * 1e6:.2f} µs")
+
+
+def test_pool_snapshot():
+    """Teste 26: Snapshot binário dos pools e reinício a quente por logs"""
+    print_section("TESTE 26: SNAPSHOT DE POOLS (REINÍCIO A QUENTE)")
+    
+    import os
+    import tempfile
+    from src.config.config import BotConfig, PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY, UNISWAP_V3_QUOTER_V2
+    from src.core.pool_events import MINT_V3_TOPIC, SWAP_V3_TOPIC, SYNC_TOPIC, PoolEventUpdater
+    from src.core.pool_snapshot import PoolSnapshotStore
+    from src.core.v2_pools import V2PoolCache
+    from src.core.v3_pools import V3PoolCache, V3PoolState, get_sqrt_ratio_at_tick
+    
+    token0, token1 = '0x' + '11' * 20, '0x' + '22' * 20
+    pair, pool_address = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    quoter = UNISWAP_V3_QUOTER_V2['base'].lower()
+    
+    reserves = [10**21, 2 * 10**12]
+    pool = FakeV3Pool(3000, 60, 5, get_sqrt_ratio_at_tick(5) + 999, [(-600, 600, 10**18)])
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({
+        v2_factory: lambda data: '0x' + word(int(pair, 16)),
+        v3_factory: lambda data: '0x' + word(int(pool_address, 16) if int(data[-64:], 16) == 3000 else 0),
+        pair: lambda data: '0x' + word(reserves[0]) + word(reserves[1]) + word(0),
+        pool_address: pool,
+    })
+    
+    def emit(block, address, topics, data):
+        node.logs.append({'blockNumber': hex(block), 'logIndex': hex(len(node.logs)), 'address': address,
+                          'topics': topics, 'data': '0x' + ''.join(word(v) for v in data)})
+    
+    def caches():
+        v2, v3 = V2PoolCache(connector, 'base'), V3PoolCache(connector, 'base')
+        return v2, v3, PoolEventUpdater(connector, 'base', v2, v3)
+    
+    saved = BotConfig.POOL_REGISTRY_CHUNK_BLOCKS
+    BotConfig.POOL_REGISTRY_CHUNK_BLOCKS = 100
+    node.max_log_range = 100
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            connector = make_connector({'base': node})
+            assert connector.initialize()
+            
+            # Primeira execução: descoberta + leitura completa, Mint aplicado, snapshot gravado
+            v2, v3, updater = caches()
+            calls_before = node.calls.count('eth_call')
+            v2.prepare([v2_factory], [token0, token1])
+            v3.prepare(v3_factory, [token0, token1])
+            updater.sync(head=1000)
+            cold_calls = node.calls.count('eth_call') - calls_before
+            pool.positions.append((-240, 120, 3 * 10**17))
+            emit(1001, pool_address, [MINT_V3_TOPIC, '0x' + word(9), '0x' + word(-240), '0x' + word(120)],
+                 [0, 3 * 10**17, 1, 1])
+            updater.sync(head=1001)
+            
+            store = PoolSnapshotStore('base', os.path.join(directory, 'base.snapshot'))
+            assert updater.save_snapshot(store) == 1001
+            snapshot = store.load()
+            assert snapshot.block == 1001 and snapshot.v2_reserves == v2.live_state
+            assert snapshot.v2_pairs == v2.pairs and snapshot.v3_pools == v3.pools
+            before, after = v3.live_state[pool_address], snapshot.v3_states[pool_address]
+            assert all(getattr(before, name) == getattr(after, name) for name in V3PoolState.__slots__)
+            
+            # Mercado anda enquanto o bot está parado (buraco > POOL_EVENTS_MAX_GAP)
+            reserves[:] = [11 * 10**20, 19 * 10**11]
+            emit(1150, pair, [SYNC_TOPIC], reserves)
+            pool.tick, pool.sqrt_price = -130, get_sqrt_ratio_at_tick(-130) + 77
+            emit(1240, pool_address, [SWAP_V3_TOPIC, '0x' + word(1), '0x' + word(2)],
+                 [10**15, -(10**12), pool.sqrt_price, pool.liquidity, pool.tick])
+            
+            # Reinício: nenhum eth_call; logs de 1002..1250 em fatias de 100 blocos
+            v2, v3, updater = caches()
+            calls_before, logs_before = node.calls.count('eth_call'), node.calls.count('eth_getLogs')
+            assert store.restore(v2, v3, updater) == 1001
+            updater.sync(head=1250)
+            assert node.calls.count('eth_call') == calls_before
+            assert node.calls.count('eth_getLogs') - logs_before == 3
+            assert updater.stats['bootstraps'] == 0 and updater.synced_block == 1250 and not updater.restored
+            assert v2.snapshot()[pair] == tuple(reserves)
+            oracle = V3PoolCache(connector, 'base')
+            oracle.prepare(v3_factory, [token0, token1])
+            for token_in, amount in ((token0, 2 * 10**16), (token1, 10**16)):
+                token_out = token1 if token_in == token0 else token0
+                assert (v3.quote(v3_factory, quoter, token_in, token_out, amount)
+                        == oracle.quote(v3_factory, quoter, token_in, token_out, amount))
+            
+            # Buraco além de POOL_SNAPSHOT_MAX_GAP ou arquivo corrompido: leitura completa
+            v2, v3, updater = caches()
+            store.restore(v2, v3, updater)
+            updater.sync(head=1001 + BotConfig.POOL_SNAPSHOT_MAX_GAP + 1)
+            assert updater.stats['bootstraps'] == 1
+            with open(store.path, 'r+b') as f:
+                f.seek(60)
+                f.write(b'\xff')
+            assert store.load() is None and store.restore(*caches()) is None
+            
+            logger.success(f"✅ Reinício sem eth_call (partida a frio: {cold_calls}); "
+                           f"snapshot de {store.stats['bytes']} bytes")
+    finally:
+        BotConfig.POOL_REGISTRY_CHUNK_BLOCKS = saved
+        node.close()
+
+
+def test_dry_run_execution():
+    """Teste 27: Opportunity real (com __slots__) pelo executor em DRY_RUN"""
+    print_section("TESTE 27: EXECUÇÃO DRY RUN COM OPPORTUNITY")
+    
+    from src.config.config import BotConfig, MAJOR_TOKENS
+    from src.core.opportunity import Opportunity
+    from src.strategies.real_flashloan import RealFlashLoanStrategy
+    from src.strategies.real_flashloan_hybrid import HybridFlashLoanStrategy
+    
+    usdc, weth = MAJOR_TOKENS['base']['USDC'].lower(), MAJOR_TOKENS['base']['WETH'].lower()
+    node = FakeNode(chain_id=8453)
+    add_token_metadata(node)
+    
+    class Scanner:
+        def get_best_opportunity(self, min_profit_usd, min_profit_pct, networks=None):
+            return Opportunity('base', 'uniswap_v3', 'aerodrome', usdc, weth,
+                               10**10, 4 * 10**18, 10**10 + 100 * 10**6)
+    
+    saved = BotConfig.DRY_RUN
+    BotConfig.DRY_RUN = True
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        for strategy_class in (RealFlashLoanStrategy, HybridFlashLoanStrategy):
+            strategy = strategy_class(connector, Scanner())
+            strategy.executor.contracts['base'] = {'address': '0x' + 'cc' * 20, 'contract': None}
+            trades = []
+            strategy.add_result_callback(trades.append)
+            
+            # Análise da decisão volta com o hash, sem escrever na oportunidade
+            result = strategy.find_and_execute()
+            assert result and result['tx_hash'] and isinstance(result['opportunity'], Opportunity)
+            assert result['profit']['profitable'] and result['profit']['net_profit_usd'] > 80
+            assert not strategy.executor.profit_analyses
+            assert len(trades) == 1 and trades[0]['success'] and trades[0]['profit'] == result['profit']
+            stats = strategy.get_stats()
+            assert stats['opportunities_executed'] == 1
+            assert abs(stats['total_profit'] - result['profit']['net_profit_usd']) < 1e-9
+        
+        logger.success(f"✅ Lucro líquido estimado ${result['profit']['net_profit_usd']:.2f} nas duas estratégias")
+    finally:
+        BotConfig.DRY_RUN = saved
+        node.close()
+
+
+def test_scan_to_execution():
+    """Teste 28: Oportunidade do scan real (get_best_opportunity) até o executor"""
+    print_section("TESTE 28: DO SCAN À EXECUÇÃO")
+    
+    from src.config.config import BotConfig, MAJOR_TOKENS, PANCAKESWAP_V2_FACTORY, UNISWAP_V3_FACTORY
+    from src.core.dex import MultiDEXScanner
+    from src.core.opportunity import Opportunity
+    from src.core.v3_pools import get_sqrt_ratio_at_tick
+    from src.strategies.real_flashloan import RealFlashLoanStrategy
+    
+    token0, token1 = sorted(address.lower() for address in list(MAJOR_TOKENS['base'].values())[:2])
+    pair, pool_address = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    v2_factory = PANCAKESWAP_V2_FACTORY['base'].lower()
+    v3_factory = UNISWAP_V3_FACTORY['base'].lower()
+    
+    def tokens_of(data):
+        return {'0x' + data[34:74], '0x' + data[98:138]}
+    
+    node = FakeNode(chain_id=8453)
+    node.contracts.update({
+        v2_factory: lambda data: '0x' + word(int(pair, 16) if tokens_of(data) == {token0, token1} else 0),
+        v3_factory: lambda data: '0x' + word(int(pool_address, 16) if tokens_of(data) == {token0, token1}
+                                             and int(data[-64:], 16) == 3000 else 0),
+        pair: lambda data: '0x' + word(10**22) + word(11 * 10**21) + word(0),  # token1 10% mais caro
+        pool_address: FakeV3Pool(3000, 60, 0, get_sqrt_ratio_at_tick(0), [(-60000, 60000, 10**22)]),
+    })
+    add_token_metadata(node)
+    
+    names = ('DRY_RUN', 'POOL_REGISTRY', 'POOL_SNAPSHOT', 'GOOD_ENOUGH_PROFIT_USD')
+    saved = {name: getattr(BotConfig, name) for name in names}
+    BotConfig.DRY_RUN, BotConfig.POOL_REGISTRY, BotConfig.POOL_SNAPSHOT = True, False, False
+    BotConfig.GOOD_ENOUGH_PROFIT_USD = 0
+    try:
+        connector = make_connector({'base': node})
+        assert connector.initialize()
+        scanner = MultiDEXScanner(connector)
+        
+        # O scan produz registros Opportunity; quem consome o scanner recebe dicts
+        records = scanner.dex_interfaces['base'].scan_all_pairs()
+        assert records and all(isinstance(opp, Opportunity) for opp in records)
+        strategy = RealFlashLoanStrategy(connector, scanner)
+        strategy.executor.contracts['base'] = {'address': '0x' + 'cc' * 20, 'contract': None}
+        
+        result = strategy.find_and_execute(networks=['base'])
+        assert result and result['tx_hash'] and result['profit']['profitable']
+        opportunity = result['opportunity']
+        assert type(opportunity) is dict and opportunity['net_profit_usd'] > 0
+        assert {opportunity['token_in'], opportunity['token_out']} == {token0, token1}
+        assert all(type(opp) is dict for opp in scanner.last_candidates)
+        assert all(type(opp) is dict for opp in scanner.scan_all_networks(networks=['base']))
+        
+        # O registro do scan não é alterado pelo consumidor
+        opportunity['profit_analysis'] = result['profit']
+        assert 'profit_analysis' not in scanner.dex_interfaces['base'].scan_all_pairs()[0]
+        
+        logger.success(f"✅ {len(records)} oportunidades do scan; executada ${opportunity['net_profit_usd']:.2f} líquido")
+    finally:
+        for name, value in saved.items():
+            setattr(BotConfig, name, value)
+        node.close()
+
+
+TESTS = [
+    ("Inicialização concorrente", test_concurrent_startup),
+    ("API assíncrona", test_async_api),
+    ("Batching JSON-RPC", test_batching),
+    ("Pool de endpoints", test_endpoint_pool),
+    ("Scan orientado a blocos", test_block_scheduler),
+    ("Cache por bloco", test_block_cache),
+    ("Gerenciador de nonces", test_nonce_manager),
+    ("Rastreador de receipts", test_receipt_tracker),
+    ("Cliente JSON-RPC enxuto", test_raw_transaction),
+    ("Métricas de RPC", test_rpc_metrics),
+    ("Agendador de RPC", test_rpc_scheduler),
+    ("Cotação V2 local", test_v2_pools),
+    ("Cotação V3 local", test_v3_pools),
+    ("Pools por eventos", test_pool_events),
+    ("Registro de pools", test_pool_registry),
+    ("Multicall3", test_multicall),
+    ("Scanner vetorizado", test_vector_scan),
+    ("Tamanho ótimo de trade", test_trade_sizing),
+    ("Ciclos multi-hop", test_cycle_finder),
+    ("Metadados de tokens", test_token_metadata),
+    ("Scan paralelo por rede", test_parallel_scan),
+    ("Melhor oportunidade em streaming", test_streaming_best),
+    ("Tabela de pools e Opportunity", test_pool_table),
+    ("Pools em memória compartilhada", test_shared_pools),
+    ("Endereços canônicos", test_addresses),
+    ("Snapshot de pools", test_pool_snapshot),
+    ("Execução DRY RUN com Opportunity", test_dry_run_execution),
+    ("Do scan à execução", test_scan_to_execution),
+]
+
+
+def main():
+    """Executar todos os testes"""
+    results = []
+    
+    for name, test in TESTS:
+        try:
+            test()
+            results.append((name, True))
+        except Exception as e:
+            logger.error(f"❌ {name}: {e}")
+            results.append((name, False))
+    
+    print_section("RESUMO DOS TESTES")
+    
+    failed = 0
+    for name, result in results:
+        if result:
+            logger.success(f"✅ {name}: PASSOU")
+        else:
+            logger.error(f"❌ {name}: FALHOU")
+            failed += 1
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())